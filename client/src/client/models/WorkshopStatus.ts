@@ -6,4 +6,5 @@ export enum WorkshopStatus {
     ACTIVE = 'active',
     COMPLETED = 'completed',
     CANCELLED = 'cancelled',
+    ARCHIVED = 'archived',
 }
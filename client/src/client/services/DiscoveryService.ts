@@ -675,13 +675,18 @@ export class DiscoveryService {
     }
     /**
      * Suggest Draft Rubric Groups
-     * LLM-suggested grouping of draft rubric items (not persisted).
+     * Suggested grouping of draft rubric items (not persisted).
+     *
+     * ``local`` clusters item text instantly; ``llm`` refines those clusters with the
+     * workshop's model and falls back to them if the model is unavailable.
      * @param workshopId
+     * @param method
      * @returns SuggestGroupsResponse Successful Response
      * @throws ApiError
      */
     public static suggestDraftRubricGroupsWorkshopsWorkshopIdDraftRubricItemsSuggestGroupsPost(
         workshopId: string,
+        method: 'local' | 'llm' = 'local',
     ): CancelablePromise<SuggestGroupsResponse> {
         return __request(OpenAPI, {
             method: 'POST',
@@ -689,6 +694,9 @@ export class DiscoveryService {
             path: {
                 'workshop_id': workshopId,
             },
+            query: {
+                'method': method,
+            },
             errors: {
                 422: `Validation Error`,
             },
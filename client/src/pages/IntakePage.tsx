@@ -287,14 +287,30 @@ export function IntakePage() {
       });
 
       if (response.ok) {
-        const result = await response.json();
+        const { job_id } = await response.json();
+
+        // Rows are logged to MLflow in a background job; poll until it finishes
+        let job: any = null;
+        for (let pollCount = 0; pollCount < 1800; pollCount++) {
+          await new Promise(resolve => setTimeout(resolve, 1000));
+          const statusResponse = await fetch(`/workshops/${workshopId}/alignment-job/${job_id}?since_log_index=0`);
+          if (!statusResponse.ok) continue;
+          job = await statusResponse.json();
+          if (job.status === 'completed' || job.status === 'failed') break;
+        }
 
-        toast.success(`Successfully created ${result.mlflow_traces_created} MLflow traces! Use "Import from MLflow" to bring them into Discovery.`);
-        setCsvFile(null);
+        const result = job?.result;
+        if (job?.status === 'completed' && result) {
+          toast.success(`Successfully created ${result.mlflow_traces_created} MLflow traces! Use "Import from MLflow" to bring them into Discovery.`);
+          setCsvFile(null);
 
-        if (result.warnings && result.warnings.length > 0) {
-          toast.warning(`${result.warnings.length} rows had issues. Check console for details.`);
-          console.warn('CSV upload warnings:', result.warnings);
+          if (result.warnings && result.warnings.length > 0) {
+            toast.warning(`${result.failed_rows ?? result.warnings.length} rows had issues. Check console for details.`);
+            console.warn('CSV upload warnings:', result.warnings);
+          }
+        } else {
+          const warnings = result?.warnings?.length ? `. Errors: ${result.warnings.slice(0, 5).join('; ')}` : '';
+          setError(`${job?.error || 'CSV upload to MLflow did not finish'}${warnings}`);
         }
       } else {
         const errorData = await response.json().catch(() => ({}));
@@ -0,0 +1,49 @@
+"""Add email_normalized column to users table.
+
+Stores a lowercased copy of the email with a unique index so login lookups
+can use an equality match instead of an unindexable ILIKE.
+
+users.email is only unique case-sensitively, so existing accounts may differ
+only by case. Those rows are left NULL (the index ignores NULLs) and listed
+in the upgrade output; they keep logging in by exact email until merged.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_add_users_email_normalized"
+down_revision = "0016_add_span_attribute_filter"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("email_normalized", sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    # Skip emails that normalise to the same value as another row's
+    conn.execute(
+        sa.text(
+            "UPDATE users SET email_normalized = lower(trim(email)) "
+            "WHERE email_normalized IS NULL AND lower(trim(email)) IN ("
+            "SELECT lower(trim(email)) FROM users GROUP BY lower(trim(email)) HAVING count(*) = 1)"
+        )
+    )
+    conflicts = conn.execute(sa.text("SELECT email FROM users WHERE email_normalized IS NULL ORDER BY email")).all()
+    if conflicts:
+        print(
+            f"⚠️ {len(conflicts)} users share an email differing only by case and were not normalized "
+            f"(merge them to enable case-insensitive login): {', '.join(row.email for row in conflicts)}"
+        )
+    op.create_index("ix_users_email_normalized", "users", ["email_normalized"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_normalized", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("email_normalized")
@@ -0,0 +1,127 @@
+"""Compress existing trace payloads.
+
+Trace input/output text and span contexts at or above
+TRACE_PAYLOAD_COMPRESSION_MIN_BYTES are rewritten in their zstd-compressed
+stored form, "zstd:" + base64(zstd frame), which
+server/utils/payload_compression.py reads back. Column types are unchanged.
+
+The application reads any value starting with "zstd:" as compressed, so plain
+values that already start with it are compressed too, whatever their size. A
+value only counts as already compressed if the rest is base64 of a zstd frame.
+
+The stored form is spelled out here rather than imported from the application
+so this migration keeps doing the same thing as that code changes. Downgrade
+decompresses every payload.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision = "0018_compress_trace_payloads"
+down_revision = "0017_add_users_email_normalized"
+branch_labels = None
+depends_on = None
+
+MARKER = "zstd:"
+ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+BATCH_SIZE = 500
+COMPRESS_LARGE = os.getenv("TRACE_PAYLOAD_COMPRESSION", "zstd").lower() == "zstd"
+MIN_BYTES = int(os.getenv("TRACE_PAYLOAD_COMPRESSION_MIN_BYTES", "1024"))
+LEVEL = int(os.getenv("TRACE_PAYLOAD_COMPRESSION_LEVEL", "3"))
+
+traces = sa.table(
+    "traces",
+    sa.column("id", sa.String),
+    sa.column("input", sa.Text),
+    sa.column("output", sa.Text),
+    sa.column("context", sa.JSON),
+)
+
+
+def _is_compressed(value) -> bool:
+    if not isinstance(value, str) or not value.startswith(MARKER):
+        return False
+    try:
+        return base64.b64decode(value[len(MARKER) :], validate=True).startswith(ZSTD_FRAME_MAGIC)
+    except (binascii.Error, ValueError):
+        return False
+
+
+def _compress(text: str) -> str:
+    frame = zstandard.ZstdCompressor(level=LEVEL).compress(text.encode("utf-8"))
+    return MARKER + base64.b64encode(frame).decode("ascii")
+
+
+def _decompress(value: str) -> str:
+    return zstandard.ZstdDecompressor().decompress(base64.b64decode(value[len(MARKER) :])).decode("utf-8")
+
+
+def _compress_text(value):
+    if value is None or _is_compressed(value):
+        return value
+    if value.startswith(MARKER) or (COMPRESS_LARGE and len(value) >= MIN_BYTES):
+        return _compress(value)
+    return value
+
+
+def _compress_json(value):
+    if value is None or _is_compressed(value):
+        return value
+    if isinstance(value, str) and value.startswith(MARKER):
+        return _compress(json.dumps(value))
+    if not COMPRESS_LARGE:
+        return value
+    serialized = json.dumps(value, separators=(",", ":"))
+    return _compress(serialized) if len(serialized) >= MIN_BYTES else value
+
+
+def _decompress_text(value):
+    return _decompress(value) if _is_compressed(value) else value
+
+
+def _decompress_json(value):
+    return json.loads(_decompress(value)) if _is_compressed(value) else value
+
+
+def _rewrite(to_text, to_json) -> None:
+    conn = op.get_bind()
+    last_id = None
+    while True:
+        query = sa.select(traces).order_by(traces.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(traces.c.id > last_id)
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            values = {"input": to_text(row.input), "output": to_text(row.output), "context": to_json(row.context)}
+            if (values["input"], values["output"], values["context"]) != (row.input, row.output, row.context):
+                conn.execute(traces.update().where(traces.c.id == row.id).values(**values))
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    if zstandard is None:
+        print("⚠️ zstandard is not installed; trace payloads left uncompressed")
+        return
+    _rewrite(_compress_text, _compress_json)
+
+
+def downgrade() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to decompress trace payloads")
+    _rewrite(_decompress_text, _decompress_json)
@@ -0,0 +1,143 @@
+"""Add span_index column to traces table.
+
+Stores the per-trace span lookup index built at ingest (see
+server/utils/span_filter_utils.py) and builds it for existing rows. Stored
+contexts are not rewritten; rows left without an index (unparseable spans, or
+compressed contexts when zstandard is not installed) still work via a full
+scan.
+
+The index format (version 2) is spelled out here rather than imported from the
+application so this migration keeps doing the same thing as that code changes.
+"""
+
+from __future__ import annotations
+
+import ast
+import base64
+import binascii
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision = "0019_add_trace_span_index"
+down_revision = "0018_compress_trace_payloads"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+INDEX_VERSION = 2
+MARKER = "zstd:"
+ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _decode_context(value):
+    """Stored context as a dict, decompressing it if needed (None if unreadable)."""
+    if isinstance(value, str) and value.startswith(MARKER):
+        try:
+            frame = base64.b64decode(value[len(MARKER) :], validate=True)
+        except (binascii.Error, ValueError):
+            return None
+        if zstandard is None or not frame.startswith(ZSTD_FRAME_MAGIC):
+            return None
+        value = json.loads(zstandard.ZstdDecompressor().decompress(frame).decode("utf-8"))
+    return value if isinstance(value, dict) else None
+
+
+def _parse_spans(raw):
+    if isinstance(raw, list):
+        return raw
+    if not isinstance(raw, str):
+        return None
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            parsed = parse(raw)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(parsed, list):
+            return parsed
+    return None
+
+
+def _span_type(span):
+    span_type = span.get("span_type")
+    if span_type is None:
+        attributes = span.get("attributes")
+        if isinstance(attributes, dict):
+            span_type = attributes.get("mlflow.spanType")
+            if isinstance(span_type, str):
+                try:
+                    span_type = json.loads(span_type)
+                except ValueError:
+                    pass
+    return span_type
+
+
+def _value_key(value) -> str:
+    return hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _build_span_index(context):
+    spans = _parse_spans(context.get("spans")) if context is not None else None
+    if spans is None:
+        return None
+
+    index = {"version": INDEX_VERSION, "size": len(spans), "name": {}, "type": {}, "attr": {}}
+    attr_values = {}
+    for position, span in enumerate(spans):
+        if not isinstance(span, dict):
+            continue
+        name = span.get("name")
+        if isinstance(name, str):
+            index["name"].setdefault(name, []).append(position)
+        span_type = _span_type(span)
+        if isinstance(span_type, str):
+            index["type"].setdefault(span_type, []).append(position)
+        attributes = span.get("attributes")
+        if isinstance(attributes, dict):
+            for key, value in attributes.items():
+                if value is None:
+                    continue
+                index["attr"].setdefault(key, []).append(position)
+                attr_values.setdefault(key, {}).setdefault(_value_key(value), []).append(position)
+    index["attr_value"] = attr_values
+    return index
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("traces") as batch_op:
+        batch_op.add_column(sa.Column("span_index", sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    traces = sa.table(
+        "traces",
+        sa.column("id", sa.String),
+        sa.column("context", sa.JSON),
+        sa.column("span_index", sa.JSON),
+    )
+    last_id = None
+    while True:
+        query = sa.select(traces.c.id, traces.c.context).order_by(traces.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(traces.c.id > last_id)
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            span_index = _build_span_index(_decode_context(row.context))
+            if span_index is not None:
+                conn.execute(traces.update().where(traces.c.id == row.id).values(span_index=span_index))
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("traces") as batch_op:
+        batch_op.drop_column("span_index")
@@ -0,0 +1,226 @@
+"""Add the full-text search index and backfill it.
+
+Creates the search tables (FTS5 on SQLite, tsvector + GIN on PostgreSQL) and
+indexes the existing traces, discovery findings, discovery feedback and
+participant notes. The application keeps the index in sync from then on (see
+server/services/search_index.py).
+
+The table layout and document bodies are spelled out here rather than imported
+from the application so this migration keeps doing the same thing as that code
+changes. SQLite builds without FTS5 are left without the index; search then
+reports itself unavailable. Compressed trace payloads are skipped when
+zstandard is not installed.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision = "0020_add_search_index"
+down_revision = "0019_add_trace_span_index"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+MAX_BODY_CHARS = int(os.getenv("SEARCH_MAX_BODY_CHARS", "100000"))
+MARKER = "zstd:"
+ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+
+SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS search_documents (
+        id INTEGER PRIMARY KEY,
+        doc_type VARCHAR NOT NULL,
+        doc_id VARCHAR NOT NULL,
+        workshop_id VARCHAR NOT NULL,
+        trace_id VARCHAR,
+        user_id VARCHAR,
+        UNIQUE (doc_type, doc_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_workshop ON search_documents (workshop_id, doc_type)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts "
+    "USING fts5(body, tokenize = 'unicode61 remove_diacritics 2')",
+)
+POSTGRES_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS search_documents (
+        id BIGSERIAL PRIMARY KEY,
+        doc_type VARCHAR NOT NULL,
+        doc_id VARCHAR NOT NULL,
+        workshop_id VARCHAR NOT NULL,
+        trace_id VARCHAR,
+        user_id VARCHAR,
+        body TEXT NOT NULL,
+        tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', body)) STORED,
+        UNIQUE (doc_type, doc_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING GIN (tsv)",
+    "CREATE INDEX IF NOT EXISTS ix_search_documents_workshop ON search_documents (workshop_id, doc_type)",
+)
+
+traces = sa.table(
+    "traces",
+    sa.column("id", sa.String),
+    sa.column("workshop_id", sa.String),
+    sa.column("input", sa.Text),
+    sa.column("output", sa.Text),
+)
+findings = sa.table(
+    "discovery_findings",
+    sa.column("id", sa.String),
+    sa.column("workshop_id", sa.String),
+    sa.column("trace_id", sa.String),
+    sa.column("user_id", sa.String),
+    sa.column("insight", sa.Text),
+)
+feedback = sa.table(
+    "discovery_feedback",
+    sa.column("id", sa.String),
+    sa.column("workshop_id", sa.String),
+    sa.column("trace_id", sa.String),
+    sa.column("user_id", sa.String),
+    sa.column("comment", sa.Text),
+    sa.column("followup_qna", sa.JSON),
+)
+notes = sa.table(
+    "participant_notes",
+    sa.column("id", sa.String),
+    sa.column("workshop_id", sa.String),
+    sa.column("trace_id", sa.String),
+    sa.column("user_id", sa.String),
+    sa.column("content", sa.Text),
+)
+
+
+class _Unreadable(Exception):
+    """A compressed payload that cannot be decompressed here."""
+
+
+def _decode_text(value):
+    if not isinstance(value, str) or not value.startswith(MARKER):
+        return value
+    try:
+        frame = base64.b64decode(value[len(MARKER) :], validate=True)
+    except (binascii.Error, ValueError):
+        return value
+    if not frame.startswith(ZSTD_FRAME_MAGIC):
+        return value
+    if zstandard is None:
+        raise _Unreadable
+    return zstandard.ZstdDecompressor().decompress(frame).decode("utf-8")
+
+
+def _join(*parts) -> str:
+    body = "\n".join(str(part) for part in parts if part)[:MAX_BODY_CHARS]
+    return body.replace("\x02", "").replace("\x03", "")
+
+
+def _documents(conn, doc_type, table, body):
+    last_id = None
+    while True:
+        query = sa.select(table).order_by(table.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            if row.workshop_id is None:
+                continue
+            try:
+                doc_body = body(row)
+            except _Unreadable:
+                continue
+            yield {
+                "doc_type": doc_type,
+                "doc_id": row.id,
+                "workshop_id": row.workshop_id,
+                "trace_id": row.id if doc_type == "trace" else row.trace_id,
+                "user_id": None if doc_type == "trace" else row.user_id,
+                "body": doc_body,
+            }
+        last_id = rows[-1].id
+
+
+def _feedback_body(row) -> str:
+    qna = row.followup_qna
+    if isinstance(qna, str):
+        qna = json.loads(qna)
+    parts = [part for item in qna or [] for part in (item.get("question"), item.get("answer"))]
+    return _join(row.comment, *parts)
+
+
+def _all_documents(conn):
+    yield from _documents(conn, "trace", traces, lambda row: _join(_decode_text(row.input), _decode_text(row.output)))
+    yield from _documents(conn, "finding", findings, lambda row: _join(row.insight))
+    yield from _documents(conn, "feedback", feedback, _feedback_body)
+    yield from _documents(conn, "note", notes, lambda row: _join(row.content))
+
+
+def _insert_sqlite(conn, doc) -> None:
+    exists = conn.execute(
+        sa.text("SELECT 1 FROM search_documents WHERE doc_type = :doc_type AND doc_id = :doc_id"), doc
+    ).first()
+    if exists is None:
+        rowid = conn.execute(
+            sa.text(
+                "INSERT INTO search_documents (doc_type, doc_id, workshop_id, trace_id, user_id) "
+                "VALUES (:doc_type, :doc_id, :workshop_id, :trace_id, :user_id)"
+            ),
+            doc,
+        ).lastrowid
+        conn.execute(
+            sa.text("INSERT INTO search_documents_fts (rowid, body) VALUES (:rowid, :body)"),
+            {"rowid": rowid, "body": doc["body"]},
+        )
+
+
+def _insert_postgres(conn, doc) -> None:
+    conn.execute(
+        sa.text(
+            "INSERT INTO search_documents (doc_type, doc_id, workshop_id, trace_id, user_id, body) "
+            "VALUES (:doc_type, :doc_id, :workshop_id, :trace_id, :user_id, :body) "
+            "ON CONFLICT (doc_type, doc_id) DO NOTHING"
+        ),
+        doc,
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        fts5 = sa.text("SELECT 1 FROM pragma_compile_options WHERE compile_options = 'ENABLE_FTS5'")
+        if conn.execute(fts5).first() is None:
+            print("⚠️ SQLite was built without FTS5; full-text search index not created")
+            return
+        schema, insert = SQLITE_SCHEMA, _insert_sqlite
+    elif conn.dialect.name == "postgresql":
+        schema, insert = POSTGRES_SCHEMA, _insert_postgres
+    else:
+        return
+
+    for statement in schema:
+        conn.execute(sa.text(statement))
+    for doc in _all_documents(conn):
+        insert(conn, doc)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS search_documents_fts")
+    op.execute("DROP TABLE IF EXISTS search_documents")
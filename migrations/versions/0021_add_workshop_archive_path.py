@@ -0,0 +1,27 @@
+"""Add archive_path column to workshops table.
+
+Records where an archived workshop's Parquet files live (see
+server/services/workshop_archive.py).
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0021_add_workshop_archive_path"
+down_revision = "0020_add_search_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("workshops") as batch_op:
+        batch_op.add_column(sa.Column("archive_path", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("workshops") as batch_op:
+        batch_op.drop_column("archive_path")
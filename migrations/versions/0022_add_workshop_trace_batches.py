@@ -0,0 +1,28 @@
+"""Add trace_batches column to workshops table.
+
+Records which addition batch each active discovery/annotation trace belongs
+to, so randomized per-user orders append newly added traces after the
+existing ones (see server/services/trace_order.py).
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0022_add_workshop_trace_batches"
+down_revision = "0021_add_workshop_archive_path"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("workshops") as batch_op:
+        batch_op.add_column(sa.Column("trace_batches", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("workshops") as batch_op:
+        batch_op.drop_column("trace_batches")
@@ -8,13 +8,14 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from server import metrics
 from server.config import ServerConfig
 from server.db_bootstrap import maybe_bootstrap_db_on_startup
-from server.db_config import DatabaseBackend, detect_database_backend
+from server.db_config import DatabaseBackend, detect_database_backend, get_token_manager
 from server.routers import router
 from server.sqlite_rescue import (
     backup_to_volume,
@@ -40,6 +41,13 @@ async def lifespan(app: FastAPI):
     if db_backend == DatabaseBackend.POSTGRESQL:
         print("🐘 Using Lakebase (PostgreSQL) - data persists automatically")
         rescue_status = {"configured": False}  # SQLite rescue not needed for PostgreSQL
+
+        # Renew the Lakebase OAuth token ahead of expiry so new connections never fetch inline
+        try:
+            get_token_manager().start_background_refresh()
+            print("🔑 Lakebase OAuth token refresher started")
+        except Exception as e:
+            print(f"⚠️  Lakebase OAuth token refresher not started (tokens will refresh on demand): {e}")
     else:
         print("📁 Using SQLite database backend")
         # SQLite Rescue: Restore from Unity Catalog Volume if configured
@@ -77,6 +85,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Table creation safety net failed (non-fatal): {e}")
 
+    # Full-text search tables: created here rather than from request transactions
+    from server.services import search_index
+
+    try:
+        with engine.connect() as conn:
+            if search_index.ensure_schema(conn):
+                conn.commit()
+                print("✅ Full-text search index tables verified/created")
+            else:
+                conn.rollback()
+                print("ℹ️  Full-text search is not available on this database")
+    except Exception as e:
+        print(f"⚠️  Full-text search index setup failed (non-fatal): {e}")
+
     # For PostgreSQL/Lakebase: ensure schema and tables exist.
     # Lakebase requires tables in a schema owned by the service principal.
     if db_backend == DatabaseBackend.POSTGRESQL:
@@ -144,6 +166,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown: Backup SQLite to Unity Catalog Volume if configured
     print("🔄 Application shutting down...")
+    if db_backend == DatabaseBackend.POSTGRESQL:
+        get_token_manager().stop_background_refresh()
+
     if using_sqlite and rescue_status["configured"]:
         # Stop the periodic backup timer first
         stop_backup_timer()
@@ -158,12 +183,18 @@ async def lifespan(app: FastAPI):
 
 # Request timing middleware
 class ProcessTimeMiddleware(BaseHTTPMiddleware):
-    """Add process time header to responses for monitoring."""
+    """Add process time header to responses and record per-route latency and DB metrics."""
 
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
+        stats = metrics.start_request()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            process_time = time.time() - start_time
+            metrics.finish_request(stats, request.method, metrics.route_template(request.scope), status, process_time)
         response.headers["X-Process-Time"] = str(process_time)
         return response
 
@@ -237,6 +268,7 @@ async def detailed_health():
     from sqlalchemy import text
 
     from server.database import engine
+    from server.utils import llm_admission
 
     try:
         # Test database connection
@@ -261,12 +293,49 @@ async def detailed_health():
             "database": "connected",
             "connection_pool": pool_info,
             "sqlite_rescue": rescue_status,
+            "llm_admission": llm_admission.snapshot(),
             "timestamp": time.time(),
         }
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e), "timestamp": time.time()}
 
 
+def _runtime_metrics() -> list[metrics.GaugeFamily]:
+    """Scrape-time gauges: DB pool usage, write queue depth and LLM admission queues."""
+    from server.database import engine
+    from server.sqlite_writer import pending_writes
+    from server.utils import llm_admission
+
+    families = metrics.pool_gauges(engine)
+    families.append(
+        metrics.GaugeFamily(
+            "sqlite_write_queue_depth", "Writes waiting for the SQLite writer thread.", [({}, pending_writes())]
+        )
+    )
+
+    in_flight = metrics.GaugeFamily("llm_in_flight", "LLM calls currently running, by endpoint.")
+    queued = metrics.GaugeFamily("llm_queue_depth", "LLM calls waiting for admission, by endpoint and priority.")
+    timeouts = metrics.GaugeFamily(
+        "llm_admission_timeouts_total", "LLM calls rejected after waiting for admission.", kind="counter"
+    )
+    for endpoint, gate in sorted(llm_admission.snapshot().items()):
+        in_flight.samples.append(({"endpoint": endpoint}, gate["in_flight"]))
+        for priority, depth in gate["queued"].items():
+            queued.samples.append(({"endpoint": endpoint, "priority": priority}, depth))
+        for priority, count in gate["timeouts_total"].items():
+            timeouts.samples.append(({"endpoint": endpoint, "priority": priority}, count))
+    return [*families, in_flight, queued, timeouts]
+
+
+metrics.register_collector(_runtime_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (per worker process)."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/test")
 async def test():
     """Test endpoint."""
@@ -25,7 +25,7 @@ from sqlalchemy import (
     event,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import deferred, relationship, sessionmaker, validates
 from sqlalchemy.sql import func
 
 from .db_config import (
@@ -33,6 +33,8 @@ from .db_config import (
     create_engine_for_backend,
     detect_database_backend,
 )
+from .metrics import instrument_engine
+from .utils.payload_compression import CompressedPayload
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +57,7 @@ else:
 
 # Create engine using the appropriate backend configuration
 engine = create_engine_for_backend(DATABASE_BACKEND)
+instrument_engine(engine)
 
 
 # SQLite Rescue: Track write operations for backup triggering
@@ -85,6 +88,11 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def normalize_email(email: str | None) -> str | None:
+    """Canonical form of an email address used for case-insensitive lookups."""
+    return email.strip().lower() if email else email
+
+
 class UserDB(Base):
     """Database model for users."""
 
@@ -92,6 +100,8 @@ class UserDB(Base):
 
     id = Column(String, primary_key=True)
     email = Column(String, unique=True, nullable=False)
+    # Lowercased copy of email for indexed case-insensitive lookups (kept in sync by normalize_email)
+    email_normalized = Column(String, unique=True, index=True, nullable=True)
     name = Column(String, nullable=False)
     role = Column(String, nullable=False)
     workshop_id = Column(String, ForeignKey("workshops.id"), nullable=True)  # Nullable for facilitators
@@ -104,6 +114,11 @@ class UserDB(Base):
     workshop = relationship("WorkshopDB", back_populates="users")
     participants = relationship("WorkshopParticipantDB", back_populates="user")
 
+    @validates("email")
+    def _sync_email_normalized(self, key, value):
+        self.email_normalized = normalize_email(value)
+        return value
+
 
 class FacilitatorConfigDB(Base):
     """Database model for facilitator configurations."""
@@ -165,6 +180,8 @@ class WorkshopDB(Base):
     auto_evaluation_model = Column(String, nullable=True)  # Model used for auto-evaluation
     show_participant_notes = Column(Boolean, default=False)  # Facilitator toggle: show notepad to SMEs
     span_attribute_filter = Column(JSON, nullable=True)  # Filter config for selecting a span's inputs/outputs
+    archive_path = Column(Text, nullable=True)  # Parquet archive location while status is "archived"
+    trace_batches = Column(JSON, nullable=True)  # {phase: {trace_id: addition batch}} for randomized order
     created_at = Column(DateTime, default=func.now())
 
     # Relationships
@@ -209,9 +226,16 @@ class TraceDB(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     workshop_id = Column(String, ForeignKey("workshops.id", ondelete="CASCADE"))
-    input = Column(Text, nullable=False)
-    output = Column(Text, nullable=False)
-    context = Column(JSON, nullable=True)
+    # Payload columns hold the stored (possibly zstd-compressed) form; the
+    # attributes below decode it lazily. See server/utils/payload_compression.py.
+    stored_input = Column("input", Text, nullable=False)
+    stored_output = Column("output", Text, nullable=False)
+    stored_context = Column("context", JSON, nullable=True)
+    input = CompressedPayload("stored_input")
+    output = CompressedPayload("stored_output")
+    context = CompressedPayload("stored_context", kind="json")
+    # Span lookup index built at ingest (see span_filter_utils); only loaded by span filtering
+    span_index = deferred(Column(JSON, nullable=True))
     trace_metadata = Column(JSON, nullable=True)  # Renamed from metadata to avoid SQLAlchemy conflict
     mlflow_trace_id = Column(String, nullable=True)  # Optional MLflow trace ID
     mlflow_url = Column(String, nullable=True)  # Optional MLflow URL
@@ -990,6 +1014,84 @@ def _apply_schema_updates():
             except Exception as e:
                 print(f"ℹ️ workshops span_attribute_filter column skipped (may already exist): {e}")
 
+            try:
+                # Add archive_path column to workshops table (Parquet cold storage location)
+                if is_postgres:
+                    conn.execute(text("ALTER TABLE workshops ADD COLUMN IF NOT EXISTS archive_path TEXT"))
+                else:
+                    conn.execute(text("ALTER TABLE workshops ADD COLUMN archive_path TEXT"))
+                conn.commit()
+                print("✅ Database schema updated for workshops (added archive_path column)")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ workshops archive_path column skipped (may already exist): {e}")
+
+            try:
+                # Add trace_batches column to workshops table (addition batch of each active trace)
+                if is_postgres:
+                    conn.execute(text("ALTER TABLE workshops ADD COLUMN IF NOT EXISTS trace_batches JSON"))
+                else:
+                    conn.execute(text("ALTER TABLE workshops ADD COLUMN trace_batches JSON"))
+                conn.commit()
+                print("✅ Database schema updated for workshops (added trace_batches column)")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ workshops trace_batches column skipped (may already exist): {e}")
+
+            try:
+                # Add span_index column to traces table (span lookup index built at ingest)
+                if is_postgres:
+                    conn.execute(text("ALTER TABLE traces ADD COLUMN IF NOT EXISTS span_index JSON"))
+                else:
+                    conn.execute(text("ALTER TABLE traces ADD COLUMN span_index JSON"))
+                conn.commit()
+                print("✅ Database schema updated for traces (added span_index column)")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ traces span_index column skipped (may already exist): {e}")
+
+            try:
+                # Create full-text search tables (FTS5 on SQLite, tsvector + GIN on PostgreSQL)
+                from server.services import search_index
+
+                if search_index.ensure_schema(conn):
+                    conn.commit()
+                    print("✅ Database schema updated: full-text search index tables")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ Full-text search index setup skipped: {e}")
+
+            try:
+                # Add email_normalized column to users table for indexed case-insensitive login lookups
+                if is_postgres:
+                    conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS email_normalized VARCHAR"))
+                else:
+                    conn.execute(text("ALTER TABLE users ADD COLUMN email_normalized VARCHAR"))
+                conn.commit()
+                print("✅ Database schema updated for users (added email_normalized column)")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ users email_normalized column skipped (may already exist): {e}")
+
+            try:
+                # Backfill rows created before the column existed, then enforce uniqueness.
+                # Emails differing only by case stay NULL (see migration 0017).
+                conn.execute(
+                    text(
+                        "UPDATE users SET email_normalized = lower(trim(email)) "
+                        "WHERE email_normalized IS NULL AND lower(trim(email)) IN ("
+                        "SELECT lower(trim(email)) FROM users GROUP BY lower(trim(email)) HAVING count(*) = 1)"
+                    )
+                )
+                conn.execute(
+                    text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_normalized ON users (email_normalized)")
+                )
+                conn.commit()
+                print("✅ Database schema updated: backfilled and indexed users.email_normalized")
+            except Exception as e:
+                conn.rollback()
+                print(f"ℹ️ users email_normalized index skipped: {e}")
+
     except Exception as e:
         # Schema updates are optional, don't fail if they error
         print(f"ℹ️ Schema update error (non-critical): {e}")
@@ -14,14 +14,18 @@ When using PostgreSQL, these environment variables configure the connection:
 - PGAPPNAME: Application name for connection tracking
 
 The OAuth token for Lakebase authentication is automatically refreshed
-using the Databricks SDK WorkspaceClient.
+using the Databricks SDK WorkspaceClient. When the background refresher is
+running (started from the app lifespan), tokens are renewed ahead of expiry
+so opening a connection never waits on a token fetch.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
@@ -74,18 +78,34 @@ class LakebaseConfig:
 
 
 class OAuthTokenManager:
-    """Manages OAuth token refresh for Lakebase connections."""
+    """Manages OAuth token refresh for Lakebase connections.
 
-    def __init__(self, refresh_interval_seconds: int = 900):
+    Tokens are refreshed lazily in ``get_token`` by default. Once
+    ``start_background_refresh`` has been called, a daemon thread renews the
+    token ``refresh_lead_seconds`` before the interval elapses and
+    ``get_token`` returns the cached token without ever fetching inline.
+    """
+
+    def __init__(self, refresh_interval_seconds: int = 900, refresh_lead_seconds: int | None = None):
         """Initialize token manager.
 
         Args:
             refresh_interval_seconds: Interval between token refreshes (default 15 min).
+            refresh_lead_seconds: How long before the interval elapses the background
+                refresher renews the token (default: a fifth of the interval).
         """
         self._token: str | None = None
         self._last_refresh: float = 0
         self._refresh_interval = refresh_interval_seconds
+        self._refresh_lead = (
+            refresh_lead_seconds if refresh_lead_seconds is not None else refresh_interval_seconds // 5
+        )
         self._workspace_client = None
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str], None]] = []
+        self._refresher: threading.Thread | None = None
+        self._stop_refresher = False
+        self._wake = threading.Event()
 
     def _get_workspace_client(self):
         """Lazily initialize WorkspaceClient."""
@@ -95,34 +115,124 @@ class OAuthTokenManager:
             self._workspace_client = WorkspaceClient()
         return self._workspace_client
 
-    def get_token(self) -> str:
-        """Get OAuth token, refreshing if needed."""
-        current_time = time.time()
+    def _refresh(self) -> str:
+        """Fetch a new token and notify listeners. Raises on failure."""
+        client = self._get_workspace_client()
+        token = client.config.oauth_token().access_token
+        self._token = token
+        self._last_refresh = time.time()
+        logger.info("Successfully refreshed Lakebase OAuth token")
 
-        if self._token is None or (current_time - self._last_refresh) > self._refresh_interval:
+        for listener in list(self._listeners):
             try:
-                client = self._get_workspace_client()
-                self._token = client.config.oauth_token().access_token
-                self._last_refresh = current_time
-                logger.info("Successfully refreshed Lakebase OAuth token")
+                listener(token)
             except Exception as e:
-                logger.error(f"Failed to refresh OAuth token: {e}")
-                if self._token is None:
-                    raise RuntimeError(f"Cannot obtain OAuth token for Lakebase: {e}") from e
-                # Use stale token if we have one
-                logger.warning("Using potentially stale OAuth token")
+                logger.warning(f"OAuth token refresh listener failed: {e}")
+        return token
+
+    def get_token(self) -> str:
+        """Get OAuth token, refreshing if needed."""
+        # The background refresher keeps the token current; never fetch on the caller's thread
+        if self._token is not None and self.background_refresh_running:
+            return self._token
+
+        if self._token is None or (time.time() - self._last_refresh) > self._refresh_interval:
+            with self._lock:
+                # Another thread may have refreshed while we waited
+                if self._token is not None and not self.needs_refresh:
+                    return self._token
+                try:
+                    self._refresh()
+                except Exception as e:
+                    logger.error(f"Failed to refresh OAuth token: {e}")
+                    if self._token is None:
+                        raise RuntimeError(f"Cannot obtain OAuth token for Lakebase: {e}") from e
+                    # Use stale token if we have one
+                    logger.warning("Using potentially stale OAuth token")
 
         return self._token
 
     def force_refresh(self) -> None:
-        """Force an immediate token refresh on the next get_token() call."""
+        """Force an immediate token refresh.
+
+        Without the background refresher this happens on the next get_token()
+        call; with it, the refresher thread is woken to fetch a new token.
+        """
         self._last_refresh = 0
+        self._wake.set()
+
+    def add_refresh_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the new token after every refresh."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
 
     @property
     def needs_refresh(self) -> bool:
         """Check if token needs to be refreshed."""
         return self._token is None or (time.time() - self._last_refresh) > self._refresh_interval
 
+    @property
+    def background_refresh_running(self) -> bool:
+        """Whether the background refresher thread is alive."""
+        return self._refresher is not None and self._refresher.is_alive()
+
+    def _seconds_until_prerefresh(self) -> float:
+        return self._last_refresh + self._refresh_interval - self._refresh_lead - time.time()
+
+    def _refresh_loop(self) -> None:
+        retry_delay = 5.0
+        while not self._stop_refresher:
+            wait = self._seconds_until_prerefresh()
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            try:
+                with self._lock:
+                    self._refresh()
+                retry_delay = 5.0
+            except Exception as e:
+                # Keep serving the current token; it stays valid past the refresh interval
+                logger.error(f"Background OAuth token refresh failed, retrying in {retry_delay:.0f}s: {e}")
+                self._wake.wait(retry_delay)
+                self._wake.clear()
+                retry_delay = min(retry_delay * 2, 60.0)
+
+    def start_background_refresh(self) -> None:
+        """Fetch a token now and keep renewing it ahead of expiry on a daemon thread."""
+        if self.background_refresh_running:
+            return
+
+        if self._token is None:
+            self.get_token()
+
+        self._stop_refresher = False
+        self._wake.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name="lakebase-token-refresher", daemon=True)
+        self._refresher.start()
+        logger.info(
+            f"Lakebase OAuth token refresher started "
+            f"(interval={self._refresh_interval}s, lead={self._refresh_lead}s)"
+        )
+
+    def stop_background_refresh(self, timeout: float = 5.0) -> None:
+        """Stop the background refresher thread."""
+        refresher = self._refresher
+        if refresher is None:
+            return
+
+        self._stop_refresher = True
+        self._wake.set()
+        refresher.join(timeout)
+        self._refresher = None
+        logger.info("Lakebase OAuth token refresher stopped")
+
+    @property
+    def refresh_interval(self) -> int:
+        """Seconds between token refreshes."""
+        return self._refresh_interval
+
 
 # Global token manager instance
 _token_manager: OAuthTokenManager | None = None
@@ -248,7 +358,9 @@ def create_engine_for_backend(backend: DatabaseBackend) -> Engine:
     # Use a creator callable so every NEW connection fetches a fresh OAuth
     # token.  Previously the token was baked into the URL at engine creation
     # time, so after it expired all new connections (including retries after
-    # pool reset) would fail with "Invalid authorization".
+    # pool reset) would fail with "Invalid authorization".  With the background
+    # refresher running, get_token() is a cached read.  Existing connections
+    # stay authenticated and rotate onto the new token via pool_recycle.
     def _create_pg_connection():
         import psycopg
 
@@ -0,0 +1,367 @@
+"""In-process request, database and outbound-call metrics.
+
+Exposed at ``/metrics`` in the Prometheus text format. Metrics are kept per
+worker process; scrape each worker (or aggregate on the Prometheus side) in a
+multi-worker deployment.
+
+What is recorded:
+
+- Per-route request latency, labelled by the route template (``/workshops/{workshop_id}``)
+  rather than the raw path so label cardinality stays bounded.
+- SQL statements and their durations per route, plus the time spent waiting
+  for a pooled connection, via SQLAlchemy engine hooks (``instrument_engine``).
+  Statements issued outside a request (background jobs) use the route
+  ``background``.
+- Outbound LLM and MLflow call latency by operation (``timed``).
+- Background jobs: status transitions, counted as they happen, and the number
+  of jobs currently in each status (``background_jobs``, the job queue depth).
+- Point-in-time gauges (pool usage, queue depths) from registered collectors,
+  evaluated at scrape time.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"
+
+# (labels, value) pairs for one gauge/counter family
+Samples = list[tuple[dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(dict(zip(self.labelnames, key, strict=True)))} {_format_value(v)}" for key, v in values]
+
+
+class Gauge(Counter):
+    """Gauge with labels, maintained by the code that changes it."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return int(sum(state[:-1])) if state else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in values:
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0.0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), state[:-1], strict=True):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {int(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {int(cumulative)}")
+        return lines
+
+
+@dataclass
+class GaugeFamily:
+    """A gauge (or externally maintained counter) produced by a collector at scrape time."""
+
+    name: str
+    documentation: str
+    samples: Samples = field(default_factory=list)
+    kind: str = "gauge"
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in self.samples]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], list[GaugeFamily]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], list[GaugeFamily]]) -> None:
+        """Register a callable evaluated on every scrape; failures are logged and skipped."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            families = list(self._metrics)
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.warning("Metrics collector %s failed: %s", getattr(collector, "__name__", collector), e)
+
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+    )
+)
+db_queries = REGISTRY.register(Counter("db_queries_total", "SQL statements executed, by route.", ("route",)))
+db_query_duration = REGISTRY.register(
+    Histogram("db_query_duration_seconds", "SQL statement execution time, by route.", ("route",), QUERY_BUCKETS)
+)
+db_queries_per_request = REGISTRY.register(
+    Histogram("db_queries_per_request", "SQL statements executed per request, by route.", ("route",), COUNT_BUCKETS)
+)
+db_pool_wait = REGISTRY.register(
+    Histogram(
+        "db_pool_checkout_seconds", "Time spent obtaining a pooled database connection, by route.", ("route",)
+    )
+)
+external_call_duration = REGISTRY.register(
+    Histogram(
+        "external_call_duration_seconds",
+        "Outbound LLM and MLflow call latency by operation.",
+        ("system", "operation", "outcome"),
+    )
+)
+background_job_transitions = REGISTRY.register(
+    Counter("background_jobs_total", "Alignment/evaluation jobs that entered each status.", ("status",))
+)
+background_jobs = REGISTRY.register(
+    Gauge("background_jobs", "Alignment/evaluation jobs started by this worker, by current status.", ("status",))
+)
+
+register_collector = REGISTRY.register_collector
+render = REGISTRY.render
+
+
+class RequestStats:
+    """Database activity accumulated while serving one request."""
+
+    __slots__ = ("pool_waits", "query_durations")
+
+    def __init__(self):
+        self.query_durations: list[float] = []
+        self.pool_waits: list[float] = []
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    """Begin collecting database activity for the current request context.
+
+    Work started from this context (including sync endpoints, which FastAPI
+    runs in a thread with a copy of the context) records into the returned
+    object; call ``finish_request`` once the route is known.
+    """
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def finish_request(stats: RequestStats, method: str, route: str, status: int, duration: float) -> None:
+    http_request_duration.observe(duration, method=method, route=route, status=str(status))
+    # Copy first: threads spawned by the handler may still be appending
+    durations = list(stats.query_durations)
+    for seconds in durations:
+        db_query_duration.observe(seconds, route=route)
+    for seconds in list(stats.pool_waits):
+        db_pool_wait.observe(seconds, route=route)
+    if durations:
+        db_queries.inc(len(durations), route=route)
+    db_queries_per_request.observe(len(durations), route=route)
+
+
+def route_template(scope: dict[str, Any]) -> str:
+    """Route path template for a handled request, or ``unmatched``."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _record_query(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is None:
+        db_queries.inc(route=BACKGROUND_ROUTE)
+        db_query_duration.observe(seconds, route=BACKGROUND_ROUTE)
+    else:
+        stats.query_durations.append(seconds)
+
+
+def _record_pool_wait(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is None:
+        db_pool_wait.observe(seconds, route=BACKGROUND_ROUTE)
+    else:
+        stats.pool_waits.append(seconds)
+
+
+_instrumented_engines: weakref.WeakSet = weakref.WeakSet()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statement timings and connection checkout waits for ``engine``. Idempotent."""
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if starts:
+            _record_query(time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("metrics_query_start") if conn is not None else None
+        if starts:
+            _record_query(time.perf_counter() - starts.pop())
+
+    # The pool has no "checkout requested" event, so time raw_connection(),
+    # which Connection calls to take a connection from the pool
+    raw_connection = engine.raw_connection
+
+    def _timed_raw_connection():
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            _record_pool_wait(time.perf_counter() - start)
+
+    engine.raw_connection = _timed_raw_connection
+
+
+@contextmanager
+def timed(system: str, operation: str) -> Iterator[None]:
+    """Record the latency of an outbound call, e.g. ``timed("mlflow", "search_traces")``."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        external_call_duration.observe(time.perf_counter() - start, system=system, operation=operation, outcome=outcome)
+
+
+def pool_gauges(engine: Engine) -> list[GaugeFamily]:
+    """Connection pool usage for pools that report it (QueuePool)."""
+    pool = engine.pool
+    families = []
+    for name, attr, documentation in (
+        ("db_pool_size", "size", "Configured connection pool size."),
+        ("db_pool_checked_out", "checkedout", "Connections currently checked out of the pool."),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool."),
+        ("db_pool_overflow", "overflow", "Connections open beyond the pool size."),
+    ):
+        getter = getattr(pool, attr, None)
+        if callable(getter):
+            families.append(GaugeFamily(name, documentation, [({}, float(getter()))]))
+    return families
@@ -11,6 +11,7 @@ class WorkshopStatus(StrEnum):
     ACTIVE = "active"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    ARCHIVED = "archived"  # Rows moved to Parquet cold storage (see services/workshop_archive.py)
 
 
 class WorkshopPhase(StrEnum):
@@ -192,6 +193,7 @@ class Trace(BaseModel):
     mlflow_experiment_id: str | None = None
     include_in_alignment: bool = True  # Whether to include in judge alignment
     sme_feedback: str | None = None  # Concatenated SME feedback for alignment
+    span_index: dict[str, Any] | None = Field(default=None, exclude=True)  # Server-side span lookup index
     created_at: datetime = Field(default_factory=datetime.now)
 
 
@@ -287,6 +289,29 @@ class Annotation(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
 
 
+class BulkAnnotationCreate(BaseModel):
+    """A batch of annotations validated against one rubric and saved in one transaction."""
+
+    annotations: list[AnnotationCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkAnnotationItemResult(BaseModel):
+    index: int  # Position of the item in the submitted batch
+    trace_id: str
+    user_id: str
+    status: str  # created, updated, error
+    annotation_id: str | None = None
+    error: str | None = None
+
+
+class BulkAnnotationResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: list[BulkAnnotationItemResult] = Field(default_factory=list)
+    sync_job_id: str | None = None  # Background MLflow sync for the saved annotations
+
+
 class IRRResult(BaseModel):
     workshop_id: str
     score: float
@@ -518,6 +543,44 @@ class UserTraceOrder(BaseModel):
     updated_at: datetime
 
 
+class AnnotationQueuePage(BaseModel):
+    """The next traces a user has yet to annotate, in their trace order."""
+
+    traces: list[Trace]
+    next_cursor: str | None = None  # Pass back as ``cursor`` to continue; None when the order is exhausted
+    total: int  # Traces in the user's annotation order
+    annotated: int  # Of those, how many the user has annotated
+
+
+class SearchHit(BaseModel):
+    """One full-text search match."""
+
+    doc_type: str  # 'trace' | 'finding' | 'feedback' | 'note'
+    doc_id: str
+    trace_id: str | None = None
+    user_id: str | None = None
+    snippet: str  # Matching excerpt, matches wrapped in <mark></mark> (not HTML-escaped)
+    score: float  # Relevance, higher is better
+
+
+class SearchResults(BaseModel):
+    """A page of ranked full-text search matches within a workshop."""
+
+    query: str
+    total: int  # Matches across all pages
+    results: list[SearchHit]
+    next_offset: int | None = None  # Pass back as ``offset`` for the next page; None on the last page
+
+
+class WorkshopArchive(BaseModel):
+    """A workshop's Parquet archive."""
+
+    workshop_id: str
+    location: str
+    archived_at: datetime
+    tables: dict[str, int]  # Rows per archived table
+
+
 # Authentication Models
 class FacilitatorConfig(BaseModel):
     """Configuration for pre-configured facilitators."""
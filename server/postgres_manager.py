@@ -16,13 +16,23 @@ Usage::
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 import time
+import uuid
+from collections.abc import Iterator
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Pooled connections are retired after this long (the pool adds jitter), so a
+# token refresh rolls through the pool gradually instead of rebuilding it.
+POOL_MAX_LIFETIME_SECONDS = float(os.getenv("PG_POOL_MAX_LIFETIME_SECONDS", "900"))
+
+# Rows streamed per COPY (and committed per transaction) by write_many / upsert_many.
+COPY_CHUNK_SIZE = int(os.getenv("PG_COPY_CHUNK_SIZE", "5000"))
+
 # Predefined app tables that the manager is allowed to operate on.
 # Matches the SQLAlchemy models defined in server/database.py.
 ALLOWED_TABLES: set[str] = {
@@ -52,6 +62,21 @@ def _validate_table_name(table_name: str) -> None:
         )
 
 
+def _chunks(rows: list[dict[str, Any]], chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    """Yield consecutive slices of *rows* of at most *chunk_size*."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start : start + chunk_size]
+
+
+def _copy_value(value: Any) -> Any:
+    """Adapt a Python value for COPY text format (JSON columns arrive as dicts/lists)."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
 # ---------------------------------------------------------------------------
 # DDL for all predefined tables (PostgreSQL syntax)
 # ---------------------------------------------------------------------------
@@ -276,8 +301,8 @@ class PostgresManager:
     """Direct psycopg-based manager for Lakebase table operations.
 
     Provides ``create_tables``, ``read``, ``write``, ``write_many``,
-    ``upsert``, and ``execute`` methods that bypass SQLAlchemy and speak
-    directly to PostgreSQL via a ``psycopg_pool.ConnectionPool``.
+    ``upsert``, ``upsert_many``, and ``execute`` methods that bypass
+    SQLAlchemy and speak directly to PostgreSQL via a ``psycopg_pool.ConnectionPool``.
     """
 
     _instance: PostgresManager | None = None
@@ -309,7 +334,9 @@ class PostgresManager:
         # Derive schema name the same way as db_config.py (hyphens → underscores)
         self._schema_name = self._config.app_name.replace("-", "_")
         self._pool = None  # lazy init
+        self._pool_kwargs: dict[str, Any] | None = None
         self._pool_created_at: float = 0
+        self._token_manager.add_refresh_listener(self._on_token_refresh)
 
         logger.info("=" * 60)
         logger.info("PostgresManager initialised")
@@ -335,30 +362,41 @@ class PostgresManager:
             f"options='-csearch_path={self._schema_name},public'"
         )
 
+    def _on_token_refresh(self, token: str) -> None:
+        """Point new pool connections at the refreshed token.
+
+        Connections already in the pool stay authenticated and are rotated out
+        gradually by the pool's ``max_lifetime`` instead of all at once.
+        """
+        if self._pool_kwargs is not None:
+            self._pool_kwargs["password"] = token
+
     def _ensure_pool(self):
-        """Create or recreate the connection pool when the token has expired."""
+        """Create the connection pool on first use.
+
+        The pool is long-lived: token refreshes update the password used for new
+        connections (see ``_on_token_refresh``) rather than rebuilding the pool.
+        """
         from psycopg.rows import dict_row
         from psycopg_pool import ConnectionPool
 
-        needs_new_pool = self._pool is None or self._token_manager.needs_refresh
-
-        if needs_new_pool:
-            # Close old pool if present
-            if self._pool is not None:
-                try:
-                    self._pool.close()
-                except Exception:
-                    pass
+        # Cached read when the background refresher runs; otherwise refreshes a
+        # stale token inline, which updates the pool kwargs via the listener.
+        token = self._token_manager.get_token()
 
+        if self._pool is None:
             conn_string = self._build_conn_string()
+            # The pool reads this dict on every connect, so updating it in place is enough
+            self._pool_kwargs = {"row_factory": dict_row, "password": token}
             self._pool = ConnectionPool(
                 conn_string,
                 min_size=2,
                 max_size=10,
-                kwargs={"row_factory": dict_row},
+                kwargs=self._pool_kwargs,
+                max_lifetime=POOL_MAX_LIFETIME_SECONDS,
             )
             self._pool_created_at = time.time()
-            logger.info("PostgresManager: connection pool created/refreshed")
+            logger.info("PostgresManager: connection pool created")
 
         return self._pool
 
@@ -433,14 +471,26 @@ class PostgresManager:
         logger.debug(f"Inserted 1 row into {table_name}")
         return row
 
-    def write_many(self, table_name: str, rows: list[dict[str, Any]]) -> int:
+    def write_many(
+        self,
+        table_name: str,
+        rows: list[dict[str, Any]],
+        chunk_size: int = COPY_CHUNK_SIZE,
+        use_copy: bool = True,
+    ) -> int:
         """Batch-insert multiple rows.
 
-        All rows must have the same set of keys.
+        All rows must have the same set of keys. By default rows are streamed
+        with ``COPY ... FROM STDIN`` in chunks of *chunk_size*, one transaction
+        per chunk, so a load costs a handful of round trips instead of one per
+        row. If a chunk fails, earlier chunks stay committed.
 
         Args:
             table_name: One of the predefined app table names.
             rows: List of column-name → value dicts.
+            chunk_size: Rows per COPY / transaction.
+            use_copy: Set False to fall back to ``executemany`` with a
+                      parameterised INSERT (kept for comparison and debugging).
 
         Returns:
             Number of rows inserted.
@@ -450,15 +500,22 @@ class PostgresManager:
             return 0
 
         columns = list(rows[0].keys())
-        placeholders = [f"%({c})s" for c in columns]
-
-        sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-
         pool = self._ensure_pool()
-        with pool.connection() as conn:
-            with conn.cursor() as cur:
-                cur.executemany(sql, rows)
-            conn.commit()
+
+        if not use_copy:
+            placeholders = [f"%({c})s" for c in columns]
+            sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+            with pool.connection() as conn:
+                for chunk in _chunks(rows, chunk_size):
+                    with conn.cursor() as cur:
+                        cur.executemany(sql, chunk)
+                    conn.commit()
+        else:
+            with pool.connection() as conn:
+                for chunk in _chunks(rows, chunk_size):
+                    with conn.cursor() as cur:
+                        self._copy_rows(cur, table_name, columns, chunk)
+                    conn.commit()
 
         count = len(rows)
         logger.debug(f"Inserted {count} rows into {table_name}")
@@ -510,6 +567,81 @@ class PostgresManager:
         logger.debug(f"Upserted 1 row into {table_name}")
         return row
 
+    def upsert_many(
+        self,
+        table_name: str,
+        rows: list[dict[str, Any]],
+        conflict_columns: list[str],
+        chunk_size: int = COPY_CHUNK_SIZE,
+    ) -> int:
+        """Insert or update many rows with COPY into a staging table plus one merge.
+
+        Each chunk is streamed into a temporary table shaped like *table_name*
+        and merged with a single set-based ``INSERT ... SELECT ... ON CONFLICT``,
+        one transaction per chunk. Rows repeating a conflict key keep the last
+        occurrence, matching what calling ``upsert`` in order would leave.
+
+        Args:
+            table_name: One of the predefined app table names.
+            rows: List of column-name → value dicts, all with the same keys.
+            conflict_columns: Columns that form the unique/primary key
+                              constraint for the ``ON CONFLICT`` clause.
+            chunk_size: Rows per COPY / merge transaction.
+
+        Returns:
+            Number of rows inserted or updated.
+        """
+        _validate_table_name(table_name)
+        if not conflict_columns:
+            raise ValueError("conflict_columns must be a non-empty list")
+        if not rows:
+            return 0
+
+        columns = list(rows[0].keys())
+        missing = [c for c in conflict_columns if c not in columns]
+        if missing:
+            raise ValueError(f"conflict_columns {missing} are not present in the rows")
+
+        # ON CONFLICT DO UPDATE cannot touch the same target row twice in one statement
+        deduped = list({tuple(row[c] for c in conflict_columns): row for row in rows}.values())
+
+        staging = f"_stage_{table_name}_{uuid.uuid4().hex[:8]}"
+        column_list = ", ".join(columns)
+        update_cols = [c for c in columns if c not in conflict_columns]
+        if update_cols:
+            conflict_action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+        else:
+            conflict_action = "DO NOTHING"
+        merge_sql = (
+            f"INSERT INTO {table_name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {conflict_action}"
+        )
+
+        affected = 0
+        pool = self._ensure_pool()
+        with pool.connection() as conn:
+            for chunk in _chunks(deduped, chunk_size):
+                with conn.cursor() as cur:
+                    # Column defaults are kept so omitted columns behave like a plain INSERT
+                    cur.execute(
+                        f"CREATE TEMP TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    self._copy_rows(cur, staging, columns, chunk)
+                    cur.execute(merge_sql)
+                    affected += max(cur.rowcount, 0)
+                conn.commit()
+
+        logger.debug(f"Upserted {affected} rows into {table_name} ({len(rows)} given)")
+        return affected
+
+    @staticmethod
+    def _copy_rows(cur, table_name: str, columns: list[str], rows: list[dict[str, Any]]) -> None:
+        """Stream *rows* into *table_name* with ``COPY ... FROM STDIN``."""
+        with cur.copy(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([_copy_value(row[c]) for c in columns])
+
     # ------------------------------------------------------------------
     # Read operations
     # ------------------------------------------------------------------
@@ -596,4 +728,5 @@ class PostgresManager:
         if self._pool is not None:
             self._pool.close()
             self._pool = None
+            self._pool_kwargs = None
             logger.info("PostgresManager: connection pool closed")
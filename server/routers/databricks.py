@@ -4,6 +4,7 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from server.database import get_db
 from server.models import (
@@ -110,7 +111,7 @@ async def call_serving_endpoint(request: DatabricksEndpointCall, config: Databri
             params["model_parameters"] = request.model_parameters
 
         # Make the API call
-        result = service.call_serving_endpoint(**params)
+        result = await run_in_threadpool(service.call_serving_endpoint, **params)
 
         return DatabricksResponse(success=True, data=result, endpoint_name=request.endpoint_name)
 
@@ -149,7 +150,7 @@ async def call_chat_completion(request: DatabricksChatCompletion, config: Databr
             params["model_parameters"] = request.model_parameters
 
         # Make the API call
-        result = service.call_chat_completion(**params)
+        result = await run_in_threadpool(service.call_chat_completion, **params)
 
         return DatabricksResponse(success=True, data=result, endpoint_name=request.endpoint_name)
 
@@ -233,7 +234,8 @@ async def evaluate_judge_prompt(request: dict, db: Session = Depends(get_db)) ->
             )
 
         # Call the serving endpoint with judge-specific parameters using SDK (same as intake)
-        result = service.call_serving_endpoint(
+        result = await run_in_threadpool(
+            service.call_serving_endpoint,
             endpoint_name=endpoint_name, prompt=prompt, temperature=temperature, max_tokens=max_tokens
         )
 
@@ -278,7 +280,7 @@ async def simple_endpoint_call(
             params["max_tokens"] = max_tokens
 
         # Make the API call
-        result = service.call_serving_endpoint(**params)
+        result = await run_in_threadpool(service.call_serving_endpoint, **params)
 
         return {"success": True, "data": result, "endpoint_name": endpoint_name}
 
@@ -5,11 +5,12 @@ and non-discovery flows.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from server.database import get_db
 from server.models import (
@@ -112,7 +113,9 @@ async def get_discovery_questions(
     db: Session = Depends(get_db),
 ) -> DiscoveryQuestionsResponse:
     svc = DiscoveryService(db)
-    result = svc.get_discovery_questions(workshop_id=workshop_id, trace_id=trace_id, user_id=user_id, append=append)
+    result = await run_in_threadpool(
+        svc.get_discovery_questions, workshop_id=workshop_id, trace_id=trace_id, user_id=user_id, append=append
+    )
     return DiscoveryQuestionsResponse(
         questions=[DiscoveryQuestion(**q) for q in result["questions"]],
         can_generate_more=result.get("can_generate_more", True),
@@ -166,7 +169,7 @@ def _build_summaries_response(payload: dict[str, Any]) -> DiscoverySummariesResp
 
 
 @router.post("/{workshop_id}/discovery-summaries", response_model=DiscoverySummariesResponse)
-async def generate_discovery_summaries(
+def generate_discovery_summaries(
     workshop_id: str, refresh: bool = False, db: Session = Depends(get_db)
 ) -> DiscoverySummariesResponse:
     svc = DiscoveryService(db)
@@ -275,7 +278,8 @@ async def generate_followup_question(
 ) -> dict[str, Any]:
     """Generate the next follow-up question for a trace's feedback."""
     svc = DiscoveryService(db)
-    return svc.generate_followup_question(
+    return await run_in_threadpool(
+        svc.generate_followup_question,
         workshop_id=workshop_id,
         trace_id=request.trace_id,
         user_id=request.user_id,
@@ -484,13 +488,18 @@ async def get_draft_rubric_items(
 
 
 @router.post("/{workshop_id}/draft-rubric-items/suggest-groups")
-async def suggest_draft_rubric_groups(
+def suggest_draft_rubric_groups(
     workshop_id: str,
+    method: Literal["local", "llm"] = "local",
     db: Session = Depends(get_db),
 ) -> SuggestGroupsResponse:
-    """LLM-suggested grouping of draft rubric items (not persisted)."""
+    """Suggested grouping of draft rubric items (not persisted).
+
+    ``local`` clusters item text instantly; ``llm`` refines those clusters with the
+    workshop's model and falls back to them if the model is unavailable.
+    """
     svc = DiscoveryService(db)
-    groups = svc.suggest_draft_rubric_groups(workshop_id)
+    groups = svc.suggest_draft_rubric_groups(workshop_id, method=method)
     return SuggestGroupsResponse(groups=[ProposedGroup(**g) if isinstance(g, dict) else g for g in groups])
 
 
@@ -30,8 +30,12 @@ router = APIRouter()
 
 
 @router.post("/auth/login", response_model=AuthResponse)
-async def login(login_data: UserLogin, db_service=Depends(get_database_service)):
-    """Authenticate a user with email and password."""
+def login(login_data: UserLogin, db_service=Depends(get_database_service)):
+    """Authenticate a user with email and password.
+
+    Declared sync so FastAPI runs it in the threadpool: the DB lookups and bcrypt
+    checks below block, and a burst of logins must not stall the event loop.
+    """
     # First, try to authenticate as a facilitator from YAML config
     facilitator_data = db_service.authenticate_facilitator_from_yaml(login_data.email, login_data.password)
 
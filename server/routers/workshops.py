@@ -9,7 +9,7 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -109,6 +109,10 @@ class AlignmentJob:
 
     def set_status(self, status: str):
         """Update job status and save."""
+        if status != self.status:
+            metrics.background_job_transitions.inc(status=status)
+            metrics.background_jobs.dec(status=self.status)
+            metrics.background_jobs.inc(status=status)
         self.status = status
         self.updated_at = time.time()
         self.save()
@@ -123,6 +127,8 @@ def get_job(job_id: str) -> AlignmentJob | None:
 def create_job(job_id: str, workshop_id: str) -> AlignmentJob:
     job = AlignmentJob(job_id=job_id, workshop_id=workshop_id)
     job.save()
+    metrics.background_job_transitions.inc(status=job.status)
+    metrics.background_jobs.inc(status=job.status)
     # Ensure empty log file exists
     open(job._log_path, "a").close()
     return job
@@ -132,11 +138,15 @@ import random
 
 from sqlalchemy.exc import OperationalError
 
+from server import metrics
 from server.database import WorkshopDB, get_db
 from server.models import (
     AnalyzeDiscoveryRequest,
     Annotation,
     AnnotationCreate,
+    AnnotationQueuePage,
+    BulkAnnotationCreate,
+    BulkAnnotationResult,
     DiscoveryFinding,
     DiscoveryFindingCreate,
     DiscoveryFindingWithUser,
@@ -160,14 +170,20 @@ from server.models import (
     RubricCreate,
     RubricGenerationRequest,
     RubricSuggestion,
+    SearchResults,
     Trace,
     TraceUpload,
     Workshop,
+    WorkshopArchive,
     WorkshopCreate,
     WorkshopPhase,
+    WorkshopStatus,
 )
+from server.services import workshop_archive
 from server.services.database_service import DatabaseService
 from server.services.irr_service import calculate_irr_for_workshop
+from server.services.search_index import DOC_TYPES, MAX_PAGE_SIZE, SearchUnavailableError
+from server.services.workshop_archive import ArchiveError
 
 
 def _retry_db_operations(operations_fn, db_session, max_retries=5, base_delay=0.5):
@@ -228,6 +244,26 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def get_results_db(workshop_id: str, db: Session = Depends(get_db)):
+    """Session for reading a workshop's results.
+
+    Archived workshops are read from their Parquet archive, which is loaded on
+    first use and kept for later requests.
+    """
+    workshop = db.query(WorkshopDB.status, WorkshopDB.archive_path).filter(WorkshopDB.id == workshop_id).first()
+    if workshop is None or workshop.status != WorkshopStatus.ARCHIVED:
+        yield db
+        return
+    try:
+        archive_db = workshop_archive.archive_session(workshop_id, workshop.archive_path)
+    except ArchiveError as e:
+        raise HTTPException(status_code=503, detail=f"Workshop archive is unavailable: {e!s}") from e
+    try:
+        yield archive_db
+    finally:
+        archive_db.close()
+
+
 @router.get("/")
 async def list_workshops(
     facilitator_id: str | None = None, user_id: str | None = None, db: Session = Depends(get_db)
@@ -470,18 +506,53 @@ async def preview_span_filter(
     }
 
 
+def _run_resync_job(
+    job: AlignmentJob, workshop_id: str, reason: str, annotation_ids: list[str] | None = None
+) -> None:
+    """Run an MLflow annotation re-sync on its own DB session, reporting progress to the job.
+
+    With ``annotation_ids`` only those annotations are synced.
+    """
+    from server.database import SessionLocal
+
+    job.set_status("running")
+    job.add_log(f"MLflow re-sync started ({reason})")
+    try:
+        with SessionLocal() as bg_db:
+            bg_service = DatabaseService(bg_db)
+            resync_result = bg_service.resync_annotations_to_mlflow(
+                workshop_id, progress_callback=job.add_log, annotation_ids=annotation_ids
+            )
+        logger.info(f"MLflow re-sync after {reason}: {resync_result}")
+        job.result = resync_result
+        job.set_status("failed" if resync_result.get("error") else "completed")
+    except Exception as e:
+        logger.warning(f"MLflow re-sync failed after {reason}: {e}")
+        job.error = str(e)
+        job.add_log(f"Error: {e!s}")
+        job.set_status("failed")
+
+
 @router.post("/{workshop_id}/resync-annotations")
-async def resync_annotations(workshop_id: str, db: Session = Depends(get_db)):
+async def resync_annotations(workshop_id: str, background: bool = False, db: Session = Depends(get_db)):
     """Re-sync all annotations to MLflow with the current workshop judge_name.
 
     This is useful when the judge_name changes after annotations were created.
     Creates new MLflow feedback entries with the correct judge_name.
+
+    With ``background=true`` the re-sync runs as a job; poll its progress via
+    ``/evaluation-job/{job_id}``.
     """
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
     if not workshop:
         raise HTTPException(status_code=404, detail="Workshop not found")
 
+    if background:
+        job = create_job(str(uuid.uuid4()), workshop_id)
+        threading.Thread(target=_run_resync_job, args=(job, workshop_id, "manual request"), daemon=True).start()
+        return {"job_id": job.job_id, "status": "running"}
+
     result = db_service.resync_annotations_to_mlflow(workshop_id)
     return result
 
@@ -531,8 +602,59 @@ async def get_traces(workshop_id: str, user_id: str | None = None, db: Session =
     return db_service.get_traces(workshop_id)
 
 
+@router.get("/{workshop_id}/traces/next")
+async def get_next_annotation_traces(
+    workshop_id: str,
+    user_id: str,
+    limit: int = Query(3, ge=1, le=50),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+) -> AnnotationQueuePage:
+    """Get the next traces the user has not annotated yet, in their annotation order.
+
+    Returns ``limit`` traces plus a ``next_cursor`` to fetch the following ones,
+    so clients can show the first trace immediately and prefetch the rest
+    instead of loading every active trace up front.
+    """
+    db_service = DatabaseService(db)
+    if not db_service.get_workshop(workshop_id):
+        raise HTTPException(status_code=404, detail="Workshop not found")
+
+    try:
+        return db_service.get_next_annotation_traces(workshop_id, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/{workshop_id}/search")
+async def search_workshop(
+    workshop_id: str,
+    q: str = Query(..., min_length=1, max_length=500),
+    types: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(DOC_TYPES)}"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+) -> SearchResults:
+    """Full-text search over a workshop's traces, findings, discovery feedback and participant notes.
+
+    Results are ranked by relevance and paginated with ``offset``/``next_offset``,
+    so facilitators can find content without downloading the whole workshop.
+    """
+    db_service = DatabaseService(db)
+    if not db_service.get_workshop(workshop_id):
+        raise HTTPException(status_code=404, detail="Workshop not found")
+
+    doc_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    try:
+        return db_service.search_workshop(workshop_id, q, doc_types, limit=limit, offset=offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+
 @router.get("/{workshop_id}/all-traces")
-async def get_all_traces(workshop_id: str, db: Session = Depends(get_db)) -> list[Trace]:
+async def get_all_traces(workshop_id: str, db: Session = Depends(get_results_db)) -> list[Trace]:
     """Get ALL traces for a workshop, unfiltered by phase."""
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
@@ -578,7 +700,7 @@ async def submit_finding(
 
 @router.get("/{workshop_id}/findings")
 async def get_findings(
-    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_db)
+    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_results_db)
 ) -> list[DiscoveryFinding]:
     """Get discovery findings for a workshop, optionally filtered by user."""
     db_service = DatabaseService(db)
@@ -591,7 +713,7 @@ async def get_findings(
 
 @router.get("/{workshop_id}/findings-with-users", response_model=list[DiscoveryFindingWithUser])
 async def get_findings_with_user_details(
-    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_db)
+    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_results_db)
 ) -> list[DiscoveryFindingWithUser]:
     """Get discovery findings with user details for facilitator view."""
     db_service = DatabaseService(db)
@@ -683,19 +805,14 @@ async def create_rubric(workshop_id: str, rubric_data: RubricCreate, db: Session
 
     rubric = db_service.create_rubric(workshop_id, rubric_data)
 
-    # Re-sync annotations to MLflow in background (non-blocking)
-    def background_resync():
-        try:
-            from server.database import SessionLocal
+    # Re-sync annotations to MLflow in background (non-blocking), tracked as a job
+    resync_job = create_job(str(uuid.uuid4()), workshop_id)
 
-            with SessionLocal() as bg_db:
-                bg_service = DatabaseService(bg_db)
-                resync_result = bg_service.resync_annotations_to_mlflow(workshop_id)
-                logger.info(f"MLflow re-sync after rubric create: {resync_result}")
-        except Exception as e:
-            logger.warning(f"MLflow re-sync failed after rubric create: {e}")
+    def background_resync():
+        _run_resync_job(resync_job, workshop_id, "rubric create")
 
     threading.Thread(target=background_resync, daemon=True).start()
+    logger.info("Started MLflow re-sync job %s after rubric create", resync_job.job_id)
 
     return rubric
 
@@ -713,25 +830,20 @@ async def update_rubric(workshop_id: str, rubric_data: RubricCreate, db: Session
 
     rubric = db_service.create_rubric(workshop_id, rubric_data)
 
-    # Re-sync annotations to MLflow in background (non-blocking)
-    def background_resync():
-        try:
-            from server.database import SessionLocal
+    # Re-sync annotations to MLflow in background (non-blocking), tracked as a job
+    resync_job = create_job(str(uuid.uuid4()), workshop_id)
 
-            with SessionLocal() as bg_db:
-                bg_service = DatabaseService(bg_db)
-                resync_result = bg_service.resync_annotations_to_mlflow(workshop_id)
-                logger.info(f"MLflow re-sync after rubric update: {resync_result}")
-        except Exception as e:
-            logger.warning(f"MLflow re-sync failed after rubric update: {e}")
+    def background_resync():
+        _run_resync_job(resync_job, workshop_id, "rubric update")
 
     threading.Thread(target=background_resync, daemon=True).start()
+    logger.info("Started MLflow re-sync job %s after rubric update", resync_job.job_id)
 
     return rubric
 
 
 @router.get("/{workshop_id}/rubric")
-async def get_rubric(workshop_id: str, db: Session = Depends(get_db)) -> Rubric:
+async def get_rubric(workshop_id: str, db: Session = Depends(get_results_db)) -> Rubric:
     """Get rubric for a workshop."""
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
@@ -834,9 +946,47 @@ async def submit_annotation(
         raise HTTPException(status_code=500, detail=f"Failed to save annotation: {e!s}") from e
 
 
+@router.post("/{workshop_id}/annotations/bulk")
+def submit_annotations_bulk(
+    workshop_id: str, batch: BulkAnnotationCreate, db: Session = Depends(get_db)
+) -> BulkAnnotationResult:
+    """Submit many annotations at once (e.g. all Likert questions, or an import of prior labels).
+
+    The batch is validated against one parsed rubric and saved in a single
+    transaction; the response reports the outcome of each item. Saved
+    annotations are synced to MLflow by one background job, whose progress can
+    be polled via ``/evaluation-job/{job_id}``.
+
+    Declared sync so FastAPI runs it in the threadpool: the save blocks on the
+    SQLite write queue or on Postgres retries and must not stall the event loop.
+    """
+    db_service = DatabaseService(db)
+    workshop = db_service.get_workshop(workshop_id)
+    if not workshop:
+        raise HTTPException(status_code=404, detail="Workshop not found")
+
+    try:
+        result = db_service.add_annotations_bulk(workshop_id, batch.annotations)
+    except Exception as e:
+        logger.error(f"❌ Failed to save annotation batch: {type(e).__name__}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to save annotations: {e!s}") from e
+
+    saved_ids = [item.annotation_id for item in result.results if item.annotation_id]
+    if saved_ids:
+        sync_job = create_job(str(uuid.uuid4()), workshop_id)
+        threading.Thread(
+            target=_run_resync_job,
+            args=(sync_job, workshop_id, f"bulk submit of {len(saved_ids)} annotations", saved_ids),
+            daemon=True,
+        ).start()
+        result.sync_job_id = sync_job.job_id
+
+    return result
+
+
 @router.get("/{workshop_id}/annotations")
 async def get_annotations(
-    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_db)
+    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_results_db)
 ) -> list[Annotation]:
     """Get annotations for a workshop, optionally filtered by user."""
     db_service = DatabaseService(db)
@@ -855,7 +1005,7 @@ async def get_annotations(
 
 @router.get("/{workshop_id}/annotations-with-users")
 async def get_annotations_with_user_details(
-    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_db)
+    workshop_id: str, user_id: str | None = None, db: Session = Depends(get_results_db)
 ) -> list[dict[str, Any]]:
     """Get annotations with user details for facilitator view."""
     db_service = DatabaseService(db)
@@ -867,7 +1017,7 @@ async def get_annotations_with_user_details(
 
 
 @router.get("/{workshop_id}/irr")
-async def get_irr(workshop_id: str, db: Session = Depends(get_db)) -> IRRResult:
+async def get_irr(workshop_id: str, db: Session = Depends(get_results_db)) -> IRRResult:
     """Calculate Inter-Rater Reliability for a workshop.
 
     Only considers ratings for questions that currently exist in the rubric.
@@ -1041,6 +1191,13 @@ async def begin_discovery_phase(
     # Store the active discovery trace IDs in the workshop
     db_service.update_active_discovery_traces(workshop_id, trace_ids_to_use)
 
+    # Warm the discovery question pool so SMEs don't wait on the LLM when they open a trace
+    from server.services.discovery_service import start_question_pregeneration
+
+    pregenerating = start_question_pregeneration(
+        workshop_id, trace_ids_to_use, getattr(workshop, "discovery_questions_model_name", None)
+    )
+
     randomize_msg = "randomized per user" if randomize else "in chronological order"
     return {
         "message": f"Discovery phase started with {traces_used} traces from {total_traces} total ({randomize_msg})",
@@ -1049,6 +1206,7 @@ async def begin_discovery_phase(
         "traces_used": traces_used,
         "trace_limit": trace_limit,
         "randomize": randomize,
+        "questions_pregenerating": pregenerating,
     }
 
 
@@ -1532,57 +1690,26 @@ async def begin_annotation_phase(workshop_id: str, request: dict | None = None,
                             job.add_log(f"Initial tagging result: {tag_result}")
                             job.add_log(f"Trace IDs to evaluate: {trace_ids_to_use}")
 
-                            # Wait for MLflow tag indexing (eventual consistency)
-                            # Tags were just set via mlflow.set_trace_tag but search_traces
-                            # may not find them immediately due to index lag
-                            import os as _os
-                            import time as _time
-
+                            # Wait for MLflow tag indexing (eventual consistency). Tags were just
+                            # set via mlflow.set_trace_tag but search_traces may lag; verify with
+                            # batched searches and re-tag only the traces that are still missing.
                             try:
-                                import mlflow as _mlflow
-
-                                _os.environ["DATABRICKS_HOST"] = mlflow_config.databricks_host.rstrip("/")
-                                has_oauth = bool(
-                                    _os.environ.get("DATABRICKS_CLIENT_ID")
-                                    and _os.environ.get("DATABRICKS_CLIENT_SECRET")
+                                verify_result = thread_db_service.verify_trace_tags(
+                                    workshop_id, trace_ids_to_use, tag_type="eval"
                                 )
-                                if not has_oauth:
-                                    _os.environ["DATABRICKS_TOKEN"] = mlflow_config.databricks_token
-                                _mlflow.set_tracking_uri("databricks")
-
-                                filter_str = f"tags.eval = 'true' AND tags.workshop_id = '{workshop_id}'"
-                                job.add_log(f"Polling MLflow for tagged traces: {filter_str}")
-                                job.add_log(f"Experiment ID: {mlflow_config.experiment_id}")
-                                tag_verified = False
-                                for wait_attempt in range(5):  # Up to 10 seconds (5 x 2s)
-                                    _time.sleep(2)
-                                    try:
-                                        test_df = _mlflow.search_traces(
-                                            experiment_ids=[mlflow_config.experiment_id],
-                                            filter_string=filter_str,
-                                            return_type="pandas",
-                                        )
-                                        found_count = len(test_df) if test_df is not None and not test_df.empty else 0
-                                        job.add_log(f"Tag poll attempt {wait_attempt + 1}/5: found {found_count} traces")
-                                        if found_count > 0:
-                                            job.add_log(f"MLflow tags verified after {(wait_attempt + 1) * 2}s ({found_count} traces)")
-                                            tag_verified = True
-                                            break
-                                    except Exception as search_err:
-                                        job.add_log(f"Tag poll attempt {wait_attempt + 1}/5 error: {search_err}")
-                                        logger.debug("Tag verification attempt %d failed: %s", wait_attempt + 1, search_err)
-                                if not tag_verified:
-                                    job.add_log("WARNING: MLflow tags not found after 10s, re-tagging traces...")
-                                    try:
-                                        retag_result = thread_db_service.tag_traces_for_evaluation(
-                                            workshop_id, trace_ids_to_use, tag_type='eval'
-                                        )
-                                        job.add_log(f"Re-tagged {retag_result.get('tagged', 0)} traces (failed: {retag_result.get('failed', [])})")
-                                        _time.sleep(2)
-                                    except Exception as retag_err:
-                                        job.add_log(f"WARNING: Re-tagging failed: {retag_err}")
+                                job.add_log(
+                                    f"MLflow tags verified for {verify_result.get('verified', 0)} traces "
+                                    f"after {verify_result.get('attempts', 0)} search(es) "
+                                    f"(re-tagged {verify_result.get('retagged', 0)})"
+                                )
+                                if verify_result.get("missing"):
+                                    job.add_log(
+                                        f"WARNING: {len(verify_result['missing'])} traces still not visible in MLflow"
+                                    )
+                                if verify_result.get("error"):
+                                    job.add_log(f"WARNING: Tag verification skipped: {verify_result['error']}")
                             except Exception as tag_wait_err:
-                                job.add_log(f"WARNING: Tag verification setup failed: {tag_wait_err}")
+                                job.add_log(f"WARNING: Tag verification failed: {tag_wait_err}")
 
                             # Get rubric questions again in thread context
                             questions_to_eval = thread_db_service.get_rubric_questions_for_evaluation(workshop_id)
@@ -2534,6 +2661,86 @@ async def download_workshop_database(workshop_id: str, db: Session = Depends(get
         raise HTTPException(status_code=500, detail=f"Failed to download database: {e!s}") from e
 
 
+def _run_archive_job(job: AlignmentJob, workshop_id: str, restore: bool = False) -> None:
+    """Archive or restore a workshop on its own DB session, reporting the outcome to the job."""
+    from server.database import SessionLocal
+
+    action = "restore" if restore else "archive"
+    job.set_status("running")
+    job.add_log(f"Workshop {action} started")
+    try:
+        with SessionLocal() as bg_db:
+            bg_service = DatabaseService(bg_db)
+            archive = bg_service.restore_workshop(workshop_id) if restore else bg_service.archive_workshop(workshop_id)
+        job.result = archive.model_dump(mode="json")
+        job.add_log(f"Workshop {action} finished: {sum(archive.tables.values())} rows")
+        job.set_status("completed")
+    except Exception as e:
+        logger.warning(f"Workshop {action} failed for {workshop_id}: {e}")
+        job.error = str(e)
+        job.add_log(f"Error: {e!s}")
+        job.set_status("failed")
+
+
+def _start_archive_job(workshop_id: str, restore: bool) -> dict[str, str]:
+    job = create_job(str(uuid.uuid4()), workshop_id)
+    threading.Thread(target=_run_archive_job, args=(job, workshop_id, restore), daemon=True).start()
+    return {"job_id": job.job_id, "status": "running"}
+
+
+@router.post("/{workshop_id}/archive")
+def archive_workshop(
+    workshop_id: str, background: bool = False, db: Session = Depends(get_db)
+) -> WorkshopArchive | dict[str, str]:
+    """Move a completed or cancelled workshop's rows to Parquet cold storage (facilitator only).
+
+    The archive is written under WORKSHOP_ARCHIVE_PATH. Results stay readable
+    from the archive; use /restore to bring the rows back.
+
+    With ``background=true`` the archive is written by a job; poll its progress
+    via ``/evaluation-job/{job_id}``. Otherwise the endpoint is declared sync so
+    the export runs in the threadpool rather than on the event loop.
+    """
+    db_service = DatabaseService(db)
+    workshop = db_service.get_workshop(workshop_id)
+    if not workshop:
+        raise HTTPException(status_code=404, detail="Workshop not found")
+
+    if background:
+        return _start_archive_job(workshop_id, restore=False)
+
+    try:
+        return db_service.archive_workshop(workshop_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except ArchiveError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to archive workshop: {e!s}") from e
+
+
+@router.post("/{workshop_id}/restore")
+def restore_workshop(
+    workshop_id: str, background: bool = False, db: Session = Depends(get_db)
+) -> WorkshopArchive | dict[str, str]:
+    """Load an archived workshop's rows back into the database (facilitator only).
+
+    With ``background=true`` the restore runs as a job, like /archive.
+    """
+    db_service = DatabaseService(db)
+    workshop = db_service.get_workshop(workshop_id)
+    if not workshop:
+        raise HTTPException(status_code=404, detail="Workshop not found")
+
+    if background:
+        return _start_archive_job(workshop_id, restore=True)
+
+    try:
+        return db_service.restore_workshop(workshop_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except ArchiveError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to restore workshop: {e!s}") from e
+
+
 # Phase Completion Management Endpoints
 @router.post("/{workshop_id}/complete-phase/{phase}")
 async def complete_phase(workshop_id: str, phase: str, db: Session = Depends(get_db)):
@@ -2609,7 +2816,7 @@ async def create_judge_prompt(
 
 
 @router.get("/{workshop_id}/judge-prompts")
-async def get_judge_prompts(workshop_id: str, db: Session = Depends(get_db)) -> list[JudgePrompt]:
+async def get_judge_prompts(workshop_id: str, db: Session = Depends(get_results_db)) -> list[JudgePrompt]:
     """Get all judge prompts for a workshop."""
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
@@ -2652,11 +2859,13 @@ async def evaluate_judge_prompt(
         raise HTTPException(status_code=404, detail="Workshop not found")
 
     try:
+        from starlette.concurrency import run_in_threadpool
+
         from server.services.judge_service import JudgeService
 
         judge_service = JudgeService(db_service)
 
-        return judge_service.evaluate_prompt(workshop_id, evaluation_request)
+        return await run_in_threadpool(judge_service.evaluate_prompt, workshop_id, evaluation_request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to evaluate judge: {e!s}") from e
 
@@ -2672,18 +2881,20 @@ async def evaluate_judge_prompt_direct(
         raise HTTPException(status_code=404, detail="Workshop not found")
 
     try:
+        from starlette.concurrency import run_in_threadpool
+
         from server.services.judge_service import JudgeService
 
         judge_service = JudgeService(db_service)
 
-        return judge_service.evaluate_prompt_direct(workshop_id, evaluation_request)
+        return await run_in_threadpool(judge_service.evaluate_prompt_direct, workshop_id, evaluation_request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to evaluate judge: {e!s}") from e
 
 
 @router.get("/{workshop_id}/judge-evaluations/{prompt_id}")
 async def get_judge_evaluations(
-    workshop_id: str, prompt_id: str, db: Session = Depends(get_db)
+    workshop_id: str, prompt_id: str, db: Session = Depends(get_results_db)
 ) -> list[JudgeEvaluation]:
     """Get evaluation results for a specific judge prompt."""
     db_service = DatabaseService(db)
@@ -2934,6 +3145,9 @@ async def upload_csv_traces(
        - Optional columns: trace_id, trace, execution_duration, state, etc.
        - Previews are extracted from the JSON request/response using the same
          logic as the live MLflow ingest path.
+
+    Rows are streamed from the upload and committed in fixed-size batches; the
+    response includes per-batch progress and any row-level errors.
     """
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
@@ -2944,158 +3158,42 @@ async def upload_csv_traces(
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="File must be a CSV file")
 
-    try:
-        import csv
-        import io
-        import json
-
-        # Raw search_traces exports can have very large JSON fields (trace column)
-        csv.field_size_limit(10 * 1024 * 1024)  # 10 MB
-
-        # Read file content
-        content = await file.read()
-        decoded_content = content.decode("utf-8")
-
-        # Parse CSV
-        csv_reader = csv.DictReader(io.StringIO(decoded_content))
-
-        # Detect CSV format: preview columns vs raw search_traces export
-        fieldnames = csv_reader.fieldnames or []
-        has_preview_cols = "request_preview" in fieldnames and "response_preview" in fieldnames
-        has_raw_cols = "request" in fieldnames and "response" in fieldnames
+    from starlette.concurrency import run_in_threadpool
 
-        if not has_preview_cols and not has_raw_cols:
-            raise HTTPException(
-                status_code=400,
-                detail='CSV must contain either "request_preview"/"response_preview" columns '
-                '(MLflow UI export) or "request"/"response" columns '
-                "(mlflow.search_traces() export). Found columns: "
-                + ", ".join(fieldnames),
-            )
-
-        is_raw_format = not has_preview_cols and has_raw_cols
-
-        # For raw format, use the same extraction logic as the live MLflow ingest path
-        intake_service = None
-        if is_raw_format:
-            from server.services.mlflow_intake_service import MLflowIntakeService
-
-            intake_service = MLflowIntakeService(db_service)
-
-        # Convert CSV rows to TraceUpload objects
-        trace_uploads = []
-        row_number = 1
-        for row in csv_reader:
-            row_number += 1
-
-            if is_raw_format:
-                # Raw search_traces format: extract previews from JSON request/response
-                raw_request = row.get("request", "")
-                raw_response = row.get("response", "")
-                if not raw_request and not raw_response:
-                    continue
-                input_text = intake_service._extract_content_from_json(raw_request) if raw_request else ""
-                output_text = intake_service._extract_content_from_json(raw_response) if raw_response else ""
-                if not input_text and not output_text:
-                    continue
-            else:
-                # Preview format: use columns directly
-                if not row.get("request_preview") or not row.get("response_preview"):
-                    continue
-                input_text = row["request_preview"].strip()
-                output_text = row["response_preview"].strip()
-
-            # Build rich context from MLflow metadata
-            context = {"source": "mlflow_csv_upload", "filename": file.filename, "csv_row_number": row_number}
-
-            # Add all available MLflow metadata to context (handle both column naming conventions)
-            mlflow_fields = {
-                "execution_duration_ms": row.get("execution_duration_ms") or row.get("execution_duration"),
-                "state": row.get("state"),
-                "request_time": row.get("request_time"),
-                "client_request_id": row.get("client_request_id"),
-            }
-
-            # Add non-empty fields to context
-            for key, value in mlflow_fields.items():
-                if value:
-                    context[key] = value
-
-            # Parse JSON fields if present
-            json_fields = ["request", "response", "spans", "tags", "trace_metadata", "trace_location", "assessments"]
-            for field in json_fields:
-                if row.get(field):
-                    try:
-                        context[field] = json.loads(row[field])
-                    except json.JSONDecodeError:
-                        # Python dict notation fallback (common in pandas CSV exports)
-                        if field == "spans":
-                            try:
-                                import ast
-                                context[field] = ast.literal_eval(row[field])
-                            except (ValueError, SyntaxError):
-                                logger.warning(f"Row {row_number}: Invalid JSON/Python in {field} column, storing as string")
-                                context[field] = row[field]
-                        else:
-                            logger.warning(f"Row {row_number}: Invalid JSON in {field} column, storing as string")
-                            context[field] = row[field]
-
-            # For raw format, parse the full trace blob for richer context
-            if is_raw_format and row.get("trace"):
-                try:
-                    trace_blob = json.loads(row["trace"])
-                    trace_info = trace_blob.get("info", {})
-                    trace_data = trace_blob.get("data", {})
-                    # Extract spans from the trace data
-                    if "spans" in trace_data and "spans" not in context:
-                        context["spans"] = trace_data["spans"]
-                    # Extract tags from trace info
-                    if "tags" in trace_info and "tags" not in context:
-                        context["tags"] = trace_info["tags"]
-                except json.JSONDecodeError:
-                    logger.warning(f"Row {row_number}: Invalid JSON in trace column")
-
-            # Extract MLflow trace ID if available
-            mlflow_trace_id = row.get("trace_id")
-
-            # Build trace metadata
-            trace_metadata = {"source": "mlflow_csv_upload", "filename": file.filename, "csv_row_number": row_number}
-
-            if row.get("trace_metadata"):
-                try:
-                    parsed_metadata = json.loads(row["trace_metadata"])
-                    if isinstance(parsed_metadata, dict):
-                        trace_metadata.update(parsed_metadata)
-                except json.JSONDecodeError:
-                    pass
-
-            trace_upload = TraceUpload(
-                input=input_text,
-                output=output_text,
-                context=context,
-                trace_metadata=trace_metadata,
-                mlflow_trace_id=mlflow_trace_id,
-            )
-            trace_uploads.append(trace_upload)
+    from server.services.csv_import_service import CsvFormatError, CsvTraceImporter
 
-        if not trace_uploads:
-            raise HTTPException(status_code=400, detail="No valid traces found in CSV file")
+    try:
+        # Stream rows from the spooled upload and commit in batches (off the event loop)
+        importer = CsvTraceImporter(db_service, workshop_id, file.filename)
+        import_result = await run_in_threadpool(importer.run, file.file)
 
-        # Add traces to workshop
-        added_traces = db_service.add_traces(workshop_id, trace_uploads)
+        if import_result.traces_imported == 0:
+            detail = "No valid traces found in CSV file"
+            if import_result.row_errors:
+                detail += f". Row errors: {import_result.row_errors[:5]}"
+            raise HTTPException(status_code=400, detail=detail)
 
         # Update intake status (similar to MLflow ingestion)
-        db_service.update_mlflow_ingestion_status(workshop_id, len(added_traces))
+        db_service.update_mlflow_ingestion_status(workshop_id, import_result.traces_imported)
 
         return {
-            "message": f"Successfully uploaded {len(added_traces)} traces from MLflow CSV export",
-            "trace_count": len(added_traces),
+            "message": f"Successfully uploaded {import_result.traces_imported} traces from MLflow CSV export",
+            "trace_count": import_result.traces_imported,
             "workshop_id": workshop_id,
             "filename": file.filename,
+            "rows_read": import_result.rows_read,
+            "rows_skipped": import_result.rows_skipped,
+            "row_error_count": import_result.row_error_count,
+            "row_errors": import_result.row_errors,
+            "batches": import_result.batches,
         }
 
     except HTTPException:
         raise
+    except CsvFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"CSV file must be UTF-8 encoded: {e!s}") from e
     except Exception as e:
         logger.error(f"Failed to process CSV file: {e!s}")
         raise HTTPException(status_code=500, detail=f"Failed to process CSV file: {e!s}") from e
@@ -3108,6 +3206,7 @@ async def upload_csv_and_log_to_mlflow(
     databricks_host: str = Form(None),
     databricks_token: str = Form(None),
     experiment_id: str = Form(None),
+    import_to_workshop: bool = Form(False),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     """Upload CSV with request/response data and log each row as an MLflow trace.
@@ -3119,19 +3218,24 @@ async def upload_csv_and_log_to_mlflow(
     - Required columns: request_preview, response_preview
     - Optional columns: any additional metadata
 
-    The endpoint will:
-    1. Parse the CSV file
-    2. For each row, create an MLflow trace with the request/response
-    3. Store the traces locally with their MLflow trace IDs
+    The endpoint validates the CSV and MLflow settings, then starts a background
+    job that logs rows as MLflow traces with a bounded worker pool. Poll
+    ``/alignment-job/{job_id}`` for progress; the final result reports created
+    traces and per-row failures. With ``import_to_workshop`` the created traces
+    are also added to the workshop in batches.
 
     Environment variables used if parameters not provided:
     - DATABRICKS_HOST
     - DATABRICKS_TOKEN
     - MLFLOW_EXPERIMENT_ID
     """
-    import csv
-    import io
     import os
+    import shutil
+    import tempfile
+
+    from starlette.concurrency import run_in_threadpool
+
+    from server.services.csv_import_service import CsvFormatError, CsvMlflowTraceLogger, read_csv_header
 
     db_service = DatabaseService(db)
     workshop = db_service.get_workshop(workshop_id)
@@ -3159,104 +3263,97 @@ async def upload_csv_and_log_to_mlflow(
     host = host.rstrip("/")
 
     try:
-        import mlflow
-
-        # Configure MLflow
-        os.environ["DATABRICKS_HOST"] = host
-        os.environ["DATABRICKS_TOKEN"] = token
-        mlflow.set_tracking_uri("databricks")
-        mlflow.set_experiment(experiment_id=exp_id)
-
-        # Read file content
-        content = await file.read()
-        decoded_content = content.decode("utf-8")
-
-        # Parse CSV
-        csv_reader = csv.DictReader(io.StringIO(decoded_content))
-
-        # Validate required columns
-        if (
-            not csv_reader.fieldnames
-            or "request_preview" not in csv_reader.fieldnames
-            or "response_preview" not in csv_reader.fieldnames
-        ):
-            raise HTTPException(
-                status_code=400,
-                detail='CSV must contain "request_preview" and "response_preview" columns. Found columns: '
-                + ", ".join(csv_reader.fieldnames or []),
-            )
+        CsvMlflowTraceLogger.validate_header(await run_in_threadpool(read_csv_header, file.file))
+    except CsvFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"CSV file must be UTF-8 encoded: {e!s}") from e
 
-        # Process each row and create MLflow traces
-        row_number = 0
-        created_traces = 0
-        errors = []
-
-        # Helper to clean CSV text
-        def clean_text(text):
-            if not text:
-                return ""
-            text = text.strip()
-            while text.startswith('"') and text.endswith('"') and len(text) > 1:
-                text = text[1:-1].strip()
-            text = text.strip('"').strip("'")
-            text = text.replace('""', '"')
-            if "\\n" in text:
-                text = text.replace("\\n", "\n")
-            return text
-
-        for row in csv_reader:
-            row_number += 1
-
-            # Skip empty rows
-            request_text = clean_text(row.get("request_preview", ""))
-            response_text = clean_text(row.get("response_preview", ""))
-
-            if not request_text or not response_text:
-                continue
+    try:
+        # The upload is closed once this request returns, so spool it to disk for the job
+        fd, csv_path = tempfile.mkstemp(prefix="csv_mlflow_", suffix=".csv")
+        with os.fdopen(fd, "wb") as tmp:
+            await run_in_threadpool(shutil.copyfileobj, file.file, tmp)
+    except Exception as e:
+        logger.error(f"Failed to prepare CSV upload to MLflow: {e!s}")
+        raise HTTPException(status_code=500, detail=f"Failed to process CSV file: {e!s}") from e
 
-            try:
-                # Create MLflow trace using start_span context manager
-                with mlflow.start_span(name=f"csv_import_row_{row_number}") as span:
-                    span.set_inputs(request_text)
-                    span.set_outputs(response_text)
-
-                created_traces += 1
-                logger.info(f"Created MLflow trace for row {row_number}")
-
-            except Exception as trace_error:
-                errors.append(f"Row {row_number}: {trace_error!s}")
-                logger.warning(f"Failed to create MLflow trace for row {row_number}: {trace_error!s}")
-                continue
-
-        if created_traces == 0:
-            error_msg = "No valid MLflow traces could be created from CSV file"
-            if errors:
-                error_msg += f". Errors: {'; '.join(errors[:5])}"
-            raise HTTPException(status_code=400, detail=error_msg)
-
-        # NOTE: This endpoint ONLY creates MLflow traces - it does NOT import into Discovery.
-        # To import the MLflow traces into Discovery, use the "Import from MLflow" feature
-        # or choose "Import directly into Discovery" when uploading CSV.
-
-        result = {
-            "message": f"Successfully created {created_traces} MLflow traces",
-            "mlflow_traces_created": created_traces,
-            "workshop_id": workshop_id,
-            "filename": file.filename,
-            "experiment_id": exp_id,
-            "mlflow_host": host,
-        }
+    job = create_job(str(uuid.uuid4()), workshop_id)
+    job.set_status("running")
+    job.add_log(f"Logging rows of {file.filename} to MLflow experiment {exp_id}")
+    filename = file.filename
 
-        if errors:
-            result["warnings"] = errors[:10]  # Include first 10 errors as warnings
+    def run_csv_mlflow_job():
+        from server.database import SessionLocal
 
-        return result
+        thread_db = SessionLocal() if import_to_workshop else None
+        try:
+            ingest = None
+            if thread_db is not None:
+                thread_db_service = DatabaseService(thread_db)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to process CSV and create MLflow traces: {e!s}")
-        raise HTTPException(status_code=500, detail=f"Failed to process CSV file: {e!s}") from e
+                def ingest(uploads):
+                    return len(thread_db_service.add_traces(workshop_id, uploads))
+
+            # The experiment and credentials are passed to the logger rather than set globally,
+            # since other workshops reconfigure MLflow while this job runs
+            csv_logger = CsvMlflowTraceLogger(
+                filename,
+                exp_id,
+                databricks_host=host,
+                databricks_token=token,
+                ingest=ingest,
+                progress_callback=job.add_log,
+            )
+            with open(csv_path, "rb") as f:
+                log_result = csv_logger.run(f)
+
+            if thread_db is not None and log_result.traces_imported:
+                DatabaseService(thread_db).update_mlflow_ingestion_status(workshop_id, log_result.traces_imported)
+
+            job.result = {
+                "success": log_result.traces_created > 0,
+                "message": f"Successfully created {log_result.traces_created} MLflow traces",
+                "mlflow_traces_created": log_result.traces_created,
+                "traces_imported": log_result.traces_imported,
+                "rows_read": log_result.rows_read,
+                "rows_skipped": log_result.rows_skipped,
+                "failed_rows": log_result.row_error_count,
+                "warnings": [f"Row {e['row']}: {e['error']}" for e in log_result.row_errors[:10]],
+                "workshop_id": workshop_id,
+                "filename": filename,
+                "experiment_id": exp_id,
+                "mlflow_host": host,
+            }
+            if log_result.traces_created == 0:
+                job.error = "No valid MLflow traces could be created from CSV file"
+                job.set_status("failed")
+            else:
+                job.set_status("completed")
+        except Exception as e:
+            logger.exception("CSV to MLflow job failed: %s", e)
+            job.error = str(e)
+            job.add_log(f"Error: {e!s}")
+            job.set_status("failed")
+        finally:
+            if thread_db is not None:
+                thread_db.close()
+            try:
+                os.remove(csv_path)
+            except OSError:
+                pass
+
+    threading.Thread(target=run_csv_mlflow_job, daemon=True).start()
+
+    return {
+        "message": f"Started logging {file.filename} to MLflow",
+        "job_id": job.job_id,
+        "status": "running",
+        "workshop_id": workshop_id,
+        "filename": file.filename,
+        "experiment_id": exp_id,
+        "mlflow_host": host,
+    }
 
 
 # User Discovery Completion endpoints
@@ -3334,6 +3431,8 @@ async def analyze_discovery(
     Aggregates feedback by trace, detects disagreements deterministically,
     and calls an LLM to distill findings.
     """
+    from starlette.concurrency import run_in_threadpool
+
     from server.services.databricks_service import DatabricksService
     from server.services.discovery_analysis_service import DiscoveryAnalysisService
 
@@ -3356,7 +3455,8 @@ async def analyze_discovery(
     analysis_service = DiscoveryAnalysisService(db_service, databricks_service)
 
     try:
-        result = analysis_service.run_analysis(
+        result = await run_in_threadpool(
+            analysis_service.run_analysis,
             workshop_id=workshop_id,
             template=request.template,
             model=request.model,
@@ -4032,11 +4132,15 @@ async def start_simple_evaluation(
     def run_simple_evaluation_background():
         import re
 
+        from server.utils.llm_admission import mark_batch_thread
+
+        mark_batch_thread()
         try:
             from sklearn.metrics import accuracy_score, cohen_kappa_score, confusion_matrix
 
             from server.database import SessionLocal
             from server.services.databricks_service import DatabricksService
+            from server.services.ground_truth import GroundTruthIndex, majority, rounded_mean
 
             thread_db = SessionLocal()
             try:
@@ -4133,19 +4237,8 @@ async def start_simple_evaluation(
 
                 # Group annotations by trace to get human ratings
                 # Use per-question ratings if available (supports binary 0/1), fall back to legacy rating
-                trace_annotations = {}
-                for ann in annotations:
-                    if ann.trace_id not in trace_annotations:
-                        trace_annotations[ann.trace_id] = []
-
-                    # Prefer ratings dict (contains actual 0/1 for binary, 1-5 for likert)
-                    if ann.ratings and len(ann.ratings) > 0:
-                        # Get all ratings from the dict (could be multiple questions)
-                        for rating in ann.ratings.values():
-                            trace_annotations[ann.trace_id].append(rating)
-                    else:
-                        # Fall back to legacy rating field
-                        trace_annotations[ann.trace_id].append(ann.rating)
+                ground_truth = GroundTruthIndex.from_annotations(annotations)
+                trace_annotations = {truth.trace_id: truth.pooled_ratings for truth in ground_truth}
 
                 # Get trace data mapping
                 trace_map = {t.id: t for t in traces}
@@ -4197,13 +4290,8 @@ async def start_simple_evaluation(
                         job.add_log(f"⚠️ Skipping trace {trace_id[:8]}... - no valid ratings (all None)")
                         continue
 
-                    # Get human rating based on judge type
-                    if is_binary_judge:
-                        # For binary, use majority vote (mode)
-                        human_rating = 1 if sum(valid_ratings) > len(valid_ratings) / 2 else 0
-                    else:
-                        # For Likert, use rounded average
-                        human_rating = round(sum(valid_ratings) / len(valid_ratings))
+                    # Get human rating based on judge type: majority vote for binary, rounded average for Likert
+                    human_rating = majority(valid_ratings) if is_binary_judge else rounded_mean(valid_ratings)
 
                     # Get trace input and output directly from the Trace model
                     trace_input = trace.input or ""
@@ -5009,19 +5097,18 @@ async def get_auto_evaluation_results(
     if not workshop:
         raise HTTPException(status_code=404, detail="Workshop not found")
 
-    # Get the auto-evaluation job status first
+    # Get the auto-evaluation job status first (job files are read once)
     job_id = db_service.get_auto_evaluation_job_id(workshop_id)
     derived_prompt = db_service.get_auto_evaluation_prompt(workshop_id)
 
     job_status = "not_started"
-    if job_id:
-        job = get_job(job_id)
-        if job:
-            job_status = job.status
+    job = get_job(job_id) if job_id else None
+    if job:
+        job_status = job.status
 
-    # Get the latest evaluations from the database
-    # These are stored when the auto-evaluation job completes
-    evaluations = db_service.get_latest_evaluations(workshop_id)
+    # Get the latest evaluations from the database with DB UUID and MLflow trace ID
+    # already resolved. These are stored when the auto-evaluation job completes.
+    evaluations = db_service.get_latest_evaluation_results(workshop_id)
 
     # If we have evaluations in DB but job status is unknown (e.g., after app restart
     # when /tmp job files are lost), report status as "completed" so the frontend
@@ -5029,54 +5116,10 @@ async def get_auto_evaluation_results(
     if evaluations and job_status in ("not_started", "not_found"):
         job_status = "completed"
 
-    # Get metrics if available
-    metrics = None
-    if evaluations:
-        # Get the prompt that was used for evaluation
-        # Note: get_judge_prompts returns prompts ordered by version DESC, so [0] is the latest
-        prompts = db_service.get_judge_prompts(workshop_id)
-        if prompts:
-            latest_prompt = prompts[0]  # [0] is latest (version DESC order)
-            if latest_prompt.performance_metrics:
-                metrics = latest_prompt.performance_metrics
-
-    # Build lookups for trace ID mapping (both directions)
-    traces = db_service.get_traces(workshop_id)
-    # DB UUID -> MLflow trace ID
-    db_to_mlflow_map = {t.id: t.mlflow_trace_id for t in traces if t.mlflow_trace_id}
-    # MLflow trace ID -> DB UUID (for cases where evaluation was stored with MLflow ID)
-    mlflow_to_db_map = {t.mlflow_trace_id: t.id for t in traces if t.mlflow_trace_id}
-
-    logger.info(
-        f"auto-evaluation-results: {len(evaluations) if evaluations else 0} evaluations, {len(traces)} traces, {len(db_to_mlflow_map)} with mlflow_trace_id"
-    )
-    if evaluations:
-        sample_eval_ids = [e.trace_id[:20] + "..." for e in evaluations[:3]]
-        logger.info(f"Sample evaluation trace_ids: {sample_eval_ids}")
-        sample_trace_ids = [t.id[:20] + "..." for t in traces[:3]]
-        logger.info(f"Sample DB trace_ids: {sample_trace_ids}")
-
-    def resolve_trace_ids(eval_trace_id: str):
-        """Resolve trace IDs to ensure both DB UUID and MLflow trace ID are available."""
-        # Check if eval_trace_id is a DB UUID (exists in db_to_mlflow_map)
-        if eval_trace_id in db_to_mlflow_map:
-            logger.debug(
-                f"resolve_trace_ids: {eval_trace_id[:8]}... is DB UUID -> mlflow={db_to_mlflow_map[eval_trace_id][:20] if db_to_mlflow_map[eval_trace_id] else None}..."
-            )
-            return eval_trace_id, db_to_mlflow_map[eval_trace_id]
-        # Check if eval_trace_id is an MLflow trace ID (exists in mlflow_to_db_map)
-        if eval_trace_id in mlflow_to_db_map:
-            logger.debug(
-                f"resolve_trace_ids: {eval_trace_id[:20]}... is MLflow ID -> db_uuid={mlflow_to_db_map[eval_trace_id][:8]}..."
-            )
-            return mlflow_to_db_map[eval_trace_id], eval_trace_id
-        # Fallback: return as-is with None for the other
-        logger.warning(f"resolve_trace_ids: {eval_trace_id[:20]}... not found in any map!")
-        return eval_trace_id, None
-
-    # Add diagnostic info
+    # Note: get_judge_prompts returns prompts ordered by version DESC, so [0] is the latest
     prompts = db_service.get_judge_prompts(workshop_id)
     latest_prompt_info = None
+    metrics = None
     if prompts:
         latest = prompts[0]
         latest_prompt_info = {
@@ -5084,34 +5127,30 @@ async def get_auto_evaluation_results(
             "version": latest.version,
             "has_metrics": latest.performance_metrics is not None,
         }
+        # Metrics of the prompt that was used for evaluation
+        if evaluations and latest.performance_metrics:
+            metrics = latest.performance_metrics
+
+    trace_counts = db_service.count_traces(workshop_id)
+    logger.info(
+        f"auto-evaluation-results: {len(evaluations)} evaluations, {trace_counts['total']} traces, "
+        f"{trace_counts['with_mlflow_id']} with mlflow_trace_id"
+    )
 
     return {
         "status": job_status,
         "job_id": job_id,
         "derived_prompt": derived_prompt,
-        "evaluations": [
-            {
-                "trace_id": resolve_trace_ids(e.trace_id)[0],  # Always return DB UUID if possible
-                "mlflow_trace_id": resolve_trace_ids(e.trace_id)[1],  # MLflow trace ID for matching
-                "predicted_rating": e.predicted_rating,
-                "human_rating": e.human_rating,
-                "confidence": e.confidence,
-                "reasoning": e.reasoning,
-                "judge_name": e.predicted_feedback or "",  # Rubric question identifier
-            }
-            for e in evaluations
-        ]
-        if evaluations
-        else [],
-        "evaluation_count": len(evaluations) if evaluations else 0,
+        "evaluations": evaluations,
+        "evaluation_count": len(evaluations),
         "metrics": metrics,
         # Diagnostic info
         "diagnostics": {
-            "trace_count": len(traces),
-            "traces_with_mlflow_id": len(db_to_mlflow_map),
+            "trace_count": trace_counts["total"],
+            "traces_with_mlflow_id": trace_counts["with_mlflow_id"],
             "prompts_count": len(prompts) if prompts else 0,
             "latest_prompt": latest_prompt_info,
-            "job_logs": get_job(job_id).logs if job_id and get_job(job_id) else None,
+            "job_logs": job.logs if job else None,
         },
     }
 
@@ -14,14 +14,16 @@ import math
 import os
 import threading
 import time
-from collections import Counter
 from collections.abc import Generator
 from typing import Any
 
 import pandas as pd
 from sklearn.metrics import accuracy_score, cohen_kappa_score, confusion_matrix
 
+from server import metrics
+from server.services import trace_search
 from server.services.database_service import DatabaseService
+from server.services.ground_truth import GroundTruthIndex
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -133,19 +135,16 @@ class AlignmentService:
         """
         import mlflow
 
-        filter_parts = [
-            f"tags.{tag_type} = 'true'",
-            f"tags.workshop_id = '{workshop_id}'",
-        ]
-        filter_string = " AND ".join(filter_parts)
+        filter_string = trace_search.tag_filter(workshop_id, tag_type)
 
         logger.info("Searching for traces with tag_type='%s' in workshop '%s'", tag_type, workshop_id)
 
-        return mlflow.search_traces(
-            experiment_ids=[mlflow_config.experiment_id],
-            filter_string=filter_string,
-            return_type=return_type,
-        )
+        with metrics.timed("mlflow", "search_traces"):
+            return mlflow.search_traces(
+                experiment_ids=[mlflow_config.experiment_id],
+                filter_string=filter_string,
+                return_type=return_type,
+            )
 
     def prepare_alignment_data(self, workshop_id: str, judge_name: str) -> dict[str, Any]:
         """Prepare traces with human feedback for alignment.
@@ -161,37 +160,25 @@ class AlignmentService:
         # Get all annotations
         annotations = self.db_service.get_annotations(workshop_id)
 
-        # Group annotations by trace and calculate mode rating + aggregate feedback
+        # Group annotations by trace once; mode rating is the ground truth
+        ground_truth = GroundTruthIndex.from_annotations(annotations)
         trace_data = []
         missing_mlflow_ids = 0
         for trace in traces:
-            trace_annotations = [a for a in annotations if a.trace_id == trace.id]
+            truth = ground_truth.get(trace.id)
 
-            if not trace_annotations:
+            if truth is None:
                 continue
             if not trace.mlflow_trace_id:
                 missing_mlflow_ids += 1
                 continue
 
-            # Calculate mode (most common rating) as ground truth
-            ratings = [a.rating for a in trace_annotations]
-            rating_counts = Counter(ratings)
-            mode_rating = rating_counts.most_common(1)[0][0]
-
-            # Aggregate feedback from all annotations
-            feedback_parts = []
-            for ann in trace_annotations:
-                if ann.comment and ann.comment.strip():
-                    feedback_parts.append(ann.comment.strip())
-
-            aggregated_feedback = "\n".join(feedback_parts) if feedback_parts else None
-
             trace_data.append(
                 {
                     "trace_id": trace.mlflow_trace_id,
                     "workshop_id": trace.id,
-                    "human_rating": mode_rating,
-                    "sme_feedback": aggregated_feedback,
+                    "human_rating": truth.mode_rating(),
+                    "sme_feedback": truth.feedback,
                 }
             )
 
@@ -479,38 +466,34 @@ class AlignmentService:
             yield "Auto-evaluation mode: will evaluate all tagged traces without human ratings"
 
         try:
-            # Use specified tag_type: 'eval' for auto-evaluation, 'align' for re-evaluation
-            trace_df = self._search_tagged_traces(mlflow_config, workshop_id, return_type="pandas", tag_type=tag_type)
+            # Use specified tag_type: 'eval' for auto-evaluation, 'align' for re-evaluation.
+            # Only IDs are needed here; full traces are fetched below for the ones evaluated.
+            tagged_trace_ids = trace_search.search_tagged_trace_ids(
+                mlflow_config.experiment_id, workshop_id, tag_type=tag_type
+            )
         except Exception as exc:
             yield f"ERROR: Failed to query MLflow traces: {exc}"
             yield {"error": f"Failed to query MLflow traces: {exc}", "success": False}
             return
 
-        if trace_df is None or trace_df.empty:
+        if not tagged_trace_ids:
             yield f"ERROR: No MLflow traces found with label '{tag_type}'"
             yield {"error": "No tagged MLflow traces found", "success": False}
             return
 
-        if "trace_id" not in trace_df.columns:
-            yield "ERROR: MLflow traces result is missing 'trace_id'"
-            yield {"error": "search_traces missing trace_id", "success": False}
-            return
-
-        trace_df = trace_df.copy()
-        trace_df["trace_id"] = trace_df["trace_id"].astype(str).str.strip()
-
         # Filter traces based on mode
         if require_human_ratings:
             # Only include traces with human ratings
-            filtered_df = trace_df[trace_df["trace_id"].isin(human_feedback_map.keys())]
+            trace_ids_for_eval = [tid for tid in tagged_trace_ids if tid in human_feedback_map]
         elif trace_ids_override:
             # Use specific trace IDs if provided
-            filtered_df = trace_df[trace_df["trace_id"].isin(trace_ids_override)]
+            wanted = set(trace_ids_override)
+            trace_ids_for_eval = [tid for tid in tagged_trace_ids if tid in wanted]
             yield f"Filtering to {len(trace_ids_override)} specific trace IDs"
         else:
             # Auto-evaluation: use all tagged traces
-            filtered_df = trace_df
-        if filtered_df.empty:
+            trace_ids_for_eval = tagged_trace_ids
+        if not trace_ids_for_eval:
             if require_human_ratings:
                 yield "ERROR: MLflow trace_ids do not match annotated traces"
                 yield {"error": "No overlap between MLflow traces and annotations", "success": False}
@@ -519,7 +502,6 @@ class AlignmentService:
                 yield {"error": "No tagged traces found", "success": False}
             return
 
-        trace_ids_for_eval = filtered_df["trace_id"].tolist()
         yield f"Prepared {len(trace_ids_for_eval)} traces for evaluation"
 
         # Only check for missing IDs when human ratings are required
@@ -533,8 +515,7 @@ class AlignmentService:
                     f"(sample: {preview}{suffix})"
                 )
 
-        eval_df = filtered_df
-        yield f"search_traces returned {len(trace_df)} tagged rows; evaluating {len(eval_df)} traces"
+        yield f"search_traces returned {len(tagged_trace_ids)} tagged traces; evaluating {len(trace_ids_for_eval)}"
 
         experiment_id = mlflow_config.experiment_id
         if not experiment_id:
@@ -551,8 +532,6 @@ class AlignmentService:
             yield {"error": error_msg, "success": False}
             return
 
-        yield f"Created evaluation DataFrame with {len(eval_df)} rows via search_traces"
-
         # Determine model URI for evaluation judge
         if evaluation_model_name.startswith("databricks-"):
             model_uri = f"databricks:/{evaluation_model_name}"
@@ -635,65 +614,36 @@ class AlignmentService:
 
             yield f"Judge ready for evaluation: {judge_name}"
 
-            # Ensure eval_df has 'inputs' and 'outputs' columns required by MLflow evaluate()
-            # MLflow's search_traces returns traces, but we need to fetch full trace data to get inputs/outputs
-            if "inputs" not in eval_df.columns or "outputs" not in eval_df.columns:
-                yield "Preparing inputs/outputs columns from MLflow trace data..."
-
-                # Fetch full trace data for each trace_id to extract inputs/outputs
-                eval_df = eval_df.copy()
-                inputs_list = []
-                outputs_list = []
-
-                for trace_id in eval_df["trace_id"]:
-                    try:
-                        full_trace = mlflow.get_trace(trace_id)
-                        # Extract inputs/outputs from trace data structure
-                        # MLflow traces have data.request and data.response
-                        trace_inputs = None
-                        trace_outputs = None
-
-                        if hasattr(full_trace, "data"):
-                            if hasattr(full_trace.data, "request"):
-                                trace_inputs = full_trace.data.request
-                            if hasattr(full_trace.data, "response"):
-                                trace_outputs = full_trace.data.response
-
-                        inputs_list.append(trace_inputs)
-                        outputs_list.append(trace_outputs)
-                    except Exception as e:
-                        yield f"WARNING: Could not fetch trace {trace_id[:8]}...: {e}"
-                        inputs_list.append(None)
-                        outputs_list.append(None)
-
-                # Add inputs and outputs columns
-                if "inputs" not in eval_df.columns:
-                    eval_df["inputs"] = inputs_list
-                if "outputs" not in eval_df.columns:
-                    eval_df["outputs"] = outputs_list
-
-                # Check if we successfully created the columns
-                missing_inputs = eval_df["inputs"].isna().sum() if "inputs" in eval_df.columns else len(eval_df)
-                missing_outputs = eval_df["outputs"].isna().sum() if "outputs" in eval_df.columns else len(eval_df)
-
-                if missing_inputs > 0 or missing_outputs > 0:
-                    yield f"WARNING: Missing inputs for {missing_inputs} traces, missing outputs for {missing_outputs} traces"
-                    # Filter out rows with missing inputs or outputs
-                    before_count = len(eval_df)
-                    eval_df = eval_df[eval_df["inputs"].notna() & eval_df["outputs"].notna()]
-                    after_count = len(eval_df)
-                    if before_count != after_count:
-                        yield f"Filtered out {before_count - after_count} traces with missing inputs/outputs"
-                else:
-                    yield f"✅ Successfully prepared inputs/outputs columns for {len(eval_df)} traces"
+            # Fetch full traces only for the IDs being evaluated. evaluate() needs the trace
+            # (so judge feedback is logged on it) plus 'inputs' and 'outputs' columns.
+            yield f"Fetching {len(trace_ids_for_eval)} traces for evaluation..."
+            rows = []
+            for trace_id, full_trace in trace_search.fetch_traces(trace_ids_for_eval).items():
+                if isinstance(full_trace, Exception):
+                    yield f"WARNING: Could not fetch trace {trace_id[:8]}...: {full_trace}"
+                    continue
+                data = getattr(full_trace, "data", None)
+                trace_inputs = getattr(data, "request", None)
+                trace_outputs = getattr(data, "response", None)
+                if trace_inputs is None or trace_outputs is None:
+                    continue
+                rows.append({"trace_id": trace_id, "trace": full_trace, "inputs": trace_inputs, "outputs": trace_outputs})
+
+            skipped = len(trace_ids_for_eval) - len(rows)
+            if skipped:
+                yield f"Filtered out {skipped} traces with missing inputs/outputs"
+            else:
+                yield f"✅ Successfully prepared inputs/outputs columns for {len(rows)} traces"
+            eval_df = pd.DataFrame(rows)
 
             # Run evaluation using the judge as a scorer
             yield "Running mlflow.genai.evaluate()..."
 
-            results = evaluate(
-                data=eval_df,
-                scorers=[judge],  # Judge can be used as scorer
-            )
+            with metrics.timed("mlflow", "genai_evaluate"):
+                results = evaluate(
+                    data=eval_df,
+                    scorers=[judge],  # Judge can be used as scorer
+                )
 
             yield "Evaluation complete. Processing results..."
 
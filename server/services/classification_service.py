@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from server.models import ClassifiedFinding, Disagreement
 from server.services.database_service import DatabaseService
@@ -79,7 +80,8 @@ class ClassificationService:
             ClassifyDiscoveryFinding = get_classification_signature()
             predictor = get_predictor(ClassifyDiscoveryFinding, lm, temperature=0.1, max_tokens=50)
 
-            result = run_predict(
+            result = await run_in_threadpool(
+                run_predict,
                 predictor,
                 lm,
                 finding_text=finding_text[:1000],  # Trim to avoid token limits
@@ -154,7 +156,8 @@ class ClassificationService:
                 f"{f.user_id}|{f.id}|{f.text[:200]}" for f in findings[:10]
             ]
 
-            result = run_predict(
+            result = await run_in_threadpool(
+                run_predict,
                 predictor,
                 lm,
                 trace_id=trace_id,
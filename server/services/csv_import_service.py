@@ -0,0 +1,420 @@
+"""Streaming import of MLflow trace-export CSV files.
+
+Rows are parsed one at a time from the (spooled) upload file, converted to
+TraceUpload objects and committed in fixed-size batches, so memory use is
+bounded by the batch size rather than by the size of the export.
+"""
+
+from __future__ import annotations
+
+import ast
+import csv
+import io
+import json
+import logging
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from server.models import TraceUpload
+
+logger = logging.getLogger(__name__)
+
+# Raw search_traces exports can have very large JSON fields (trace column)
+CSV_FIELD_SIZE_LIMIT = 10 * 1024 * 1024  # 10 MB per field
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ROW_ERRORS = 100
+# Concurrent trace creations when logging CSV rows as new MLflow traces
+CSV_MLFLOW_LOG_MAX_WORKERS = int(os.getenv("CSV_MLFLOW_LOG_MAX_WORKERS", "8"))
+
+PREVIEW_COLUMNS = ("request_preview", "response_preview")
+RAW_COLUMNS = ("request", "response")
+JSON_CONTEXT_FIELDS = ("request", "response", "spans", "tags", "trace_metadata", "trace_location", "assessments")
+
+
+class CsvFormatError(ValueError):
+    """The CSV header does not match a supported export format."""
+
+
+@contextmanager
+def open_csv_reader(binary_file: IO[bytes]) -> Iterator[csv.DictReader]:
+    """Yield a DictReader that decodes ``binary_file`` incrementally as UTF-8.
+
+    The underlying file is left open so the caller (e.g. FastAPI's UploadFile)
+    keeps ownership of it.
+    """
+    csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+    binary_file.seek(0)
+    text_stream = io.TextIOWrapper(binary_file, encoding="utf-8", newline="")
+    try:
+        yield csv.DictReader(text_stream)
+    finally:
+        text_stream.detach()
+
+
+def read_csv_header(binary_file: IO[bytes]) -> list[str]:
+    """Return the header row of ``binary_file`` and rewind it."""
+    with open_csv_reader(binary_file) as reader:
+        fieldnames = list(reader.fieldnames or [])
+    binary_file.seek(0)
+    return fieldnames
+
+
+def clean_preview_text(text: str | None) -> str:
+    """Strip the extra quoting and escaped newlines spreadsheet exports add to preview cells."""
+    if not text:
+        return ""
+    text = text.strip()
+    while text.startswith('"') and text.endswith('"') and len(text) > 1:
+        text = text[1:-1].strip()
+    text = text.strip('"').strip("'")
+    text = text.replace('""', '"')
+    if "\\n" in text:
+        text = text.replace("\\n", "\n")
+    return text
+
+
+@dataclass
+class CsvImportResult:
+    """Outcome of a streaming CSV import."""
+
+    rows_read: int = 0
+    traces_imported: int = 0
+    rows_skipped: int = 0
+    row_errors: list[dict[str, Any]] = field(default_factory=list)
+    row_error_count: int = 0
+    batches: list[dict[str, int]] = field(default_factory=list)
+
+    def add_row_error(self, row_number: int, error: str) -> None:
+        self.row_error_count += 1
+        if len(self.row_errors) < MAX_REPORTED_ROW_ERRORS:
+            self.row_errors.append({"row": row_number, "error": error})
+
+
+class CsvTraceImporter:
+    """Imports an MLflow trace-export CSV into a workshop in fixed-size batches.
+
+    Supports the MLflow UI export (``request_preview``/``response_preview``) and
+    the raw ``mlflow.search_traces()`` export (``request``/``response``), whose
+    previews are extracted with the same logic as the live MLflow ingest path.
+    """
+
+    def __init__(
+        self,
+        db_service: Any,
+        workshop_id: str,
+        filename: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress_callback: Callable[[str], None] | None = None,
+    ):
+        self.db_service = db_service
+        self.workshop_id = workshop_id
+        self.filename = filename
+        self.batch_size = max(1, batch_size)
+        self.progress_callback = progress_callback
+        self.is_raw_format = False
+        self._intake_service = None
+
+    def _detect_format(self, fieldnames: list[str]) -> None:
+        has_preview_cols = all(c in fieldnames for c in PREVIEW_COLUMNS)
+        has_raw_cols = all(c in fieldnames for c in RAW_COLUMNS)
+        if not has_preview_cols and not has_raw_cols:
+            raise CsvFormatError(
+                'CSV must contain either "request_preview"/"response_preview" columns '
+                '(MLflow UI export) or "request"/"response" columns '
+                "(mlflow.search_traces() export). Found columns: " + ", ".join(fieldnames)
+            )
+        self.is_raw_format = not has_preview_cols and has_raw_cols
+        if self.is_raw_format:
+            from server.services.mlflow_intake_service import MLflowIntakeService
+
+            self._intake_service = MLflowIntakeService(self.db_service)
+
+    def row_to_upload(self, row_number: int, row: dict[str, str]) -> TraceUpload | None:
+        """Convert one CSV row to a TraceUpload, or None when the row has no content."""
+        if self.is_raw_format:
+            # Raw search_traces format: extract previews from JSON request/response
+            raw_request = row.get("request", "")
+            raw_response = row.get("response", "")
+            if not raw_request and not raw_response:
+                return None
+            input_text = self._intake_service._extract_content_from_json(raw_request) if raw_request else ""
+            output_text = self._intake_service._extract_content_from_json(raw_response) if raw_response else ""
+            if not input_text and not output_text:
+                return None
+        else:
+            # Preview format: use columns directly
+            if not row.get("request_preview") or not row.get("response_preview"):
+                return None
+            input_text = row["request_preview"].strip()
+            output_text = row["response_preview"].strip()
+
+        # Build rich context from MLflow metadata
+        context: dict[str, Any] = {"source": "mlflow_csv_upload", "filename": self.filename, "csv_row_number": row_number}
+
+        # Add all available MLflow metadata to context (handle both column naming conventions)
+        mlflow_fields = {
+            "execution_duration_ms": row.get("execution_duration_ms") or row.get("execution_duration"),
+            "state": row.get("state"),
+            "request_time": row.get("request_time"),
+            "client_request_id": row.get("client_request_id"),
+        }
+        for key, value in mlflow_fields.items():
+            if value:
+                context[key] = value
+
+        # Parse JSON fields if present
+        for json_field in JSON_CONTEXT_FIELDS:
+            if row.get(json_field):
+                try:
+                    context[json_field] = json.loads(row[json_field])
+                except json.JSONDecodeError:
+                    # Python dict notation fallback (common in pandas CSV exports)
+                    if json_field == "spans":
+                        try:
+                            context[json_field] = ast.literal_eval(row[json_field])
+                        except (ValueError, SyntaxError):
+                            logger.warning(f"Row {row_number}: Invalid JSON/Python in {json_field} column, storing as string")
+                            context[json_field] = row[json_field]
+                    else:
+                        logger.warning(f"Row {row_number}: Invalid JSON in {json_field} column, storing as string")
+                        context[json_field] = row[json_field]
+
+        # For raw format, parse the full trace blob for richer context
+        if self.is_raw_format and row.get("trace"):
+            try:
+                trace_blob = json.loads(row["trace"])
+                trace_info = trace_blob.get("info", {})
+                trace_data = trace_blob.get("data", {})
+                if "spans" in trace_data and "spans" not in context:
+                    context["spans"] = trace_data["spans"]
+                if "tags" in trace_info and "tags" not in context:
+                    context["tags"] = trace_info["tags"]
+            except json.JSONDecodeError:
+                logger.warning(f"Row {row_number}: Invalid JSON in trace column")
+
+        trace_metadata = {"source": "mlflow_csv_upload", "filename": self.filename, "csv_row_number": row_number}
+        if row.get("trace_metadata"):
+            try:
+                parsed_metadata = json.loads(row["trace_metadata"])
+                if isinstance(parsed_metadata, dict):
+                    trace_metadata.update(parsed_metadata)
+            except json.JSONDecodeError:
+                pass
+
+        return TraceUpload(
+            input=input_text,
+            output=output_text,
+            context=context,
+            trace_metadata=trace_metadata,
+            mlflow_trace_id=row.get("trace_id"),
+        )
+
+    def _flush(self, batch: list[TraceUpload], result: CsvImportResult) -> None:
+        added = self.db_service.add_traces(self.workshop_id, batch)
+        result.traces_imported += len(added)
+        result.batches.append({"batch": len(result.batches) + 1, "rows_read": result.rows_read, "traces": len(added)})
+        self._report(
+            f"Batch {len(result.batches)}: imported {len(added)} traces "
+            f"({result.traces_imported} total, {result.rows_read} rows read, {result.row_error_count} row errors)"
+        )
+        batch.clear()
+
+    def _report(self, message: str) -> None:
+        logger.info(message)
+        if self.progress_callback:
+            self.progress_callback(message)
+
+    def run(self, binary_file: IO[bytes]) -> CsvImportResult:
+        """Stream ``binary_file`` into the workshop, committing every ``batch_size`` traces.
+
+        Raises:
+            CsvFormatError: if the header matches neither supported format.
+        """
+        result = CsvImportResult()
+        batch: list[TraceUpload] = []
+
+        with open_csv_reader(binary_file) as reader:
+            self._detect_format(reader.fieldnames or [])
+            row_number = 1  # Header is row 1
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    # Malformed line: record it and keep going
+                    row_number += 1
+                    result.rows_read += 1
+                    result.add_row_error(row_number, str(e))
+                    continue
+                row_number += 1
+                result.rows_read += 1
+                try:
+                    upload = self.row_to_upload(row_number, row)
+                except Exception as e:
+                    result.add_row_error(row_number, str(e))
+                    continue
+                if upload is None:
+                    result.rows_skipped += 1
+                    continue
+                batch.append(upload)
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, result)
+
+        if batch:
+            self._flush(batch, result)
+        return result
+
+
+@dataclass
+class CsvMlflowLogResult(CsvImportResult):
+    """Outcome of logging CSV rows as MLflow traces."""
+
+    traces_created: int = 0
+
+
+class CsvMlflowTraceLogger:
+    """Logs each row of a preview-format CSV as a new MLflow trace.
+
+    Rows are read incrementally and handed to a bounded worker pool; at most
+    ``max_workers * 4`` rows are in flight at once. When ``ingest`` is given,
+    created traces are passed to it in batches of ``batch_size`` TraceUploads
+    (carrying their new MLflow trace IDs) so they can be added to the workshop.
+
+    Traces are created through an MlflowClient with an explicit
+    ``experiment_id``, so the process-wide active experiment (which other
+    workshops change) is never used. MLflow reads Databricks credentials from
+    the environment, so the job's ``databricks_host``/``databricks_token`` are
+    re-applied before each row rather than once when the job starts.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        experiment_id: str,
+        databricks_host: str | None = None,
+        databricks_token: str | None = None,
+        max_workers: int = CSV_MLFLOW_LOG_MAX_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ingest: Callable[[list[TraceUpload]], int] | None = None,
+        progress_callback: Callable[[str], None] | None = None,
+    ):
+        self.filename = filename
+        self.experiment_id = experiment_id
+        self.databricks_host = databricks_host
+        self.databricks_token = databricks_token
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.ingest = ingest
+        self.progress_callback = progress_callback
+        self._client = None
+
+    @staticmethod
+    def validate_header(fieldnames: list[str]) -> None:
+        if not all(c in fieldnames for c in PREVIEW_COLUMNS):
+            raise CsvFormatError(
+                'CSV must contain "request_preview" and "response_preview" columns. Found columns: '
+                + ", ".join(fieldnames)
+            )
+
+    def _apply_credentials(self) -> None:
+        if self.databricks_host and self.databricks_token:
+            os.environ["DATABRICKS_HOST"] = self.databricks_host
+            os.environ["DATABRICKS_TOKEN"] = self.databricks_token
+
+    def _log_row(self, row_number: int, request_text: str, response_text: str) -> str:
+        self._apply_credentials()
+        root = self._client.start_trace(
+            name=f"csv_import_row_{row_number}", inputs=request_text, experiment_id=self.experiment_id
+        )
+        self._client.end_trace(root.trace_id, outputs=response_text)
+        return root.trace_id
+
+    def _report(self, message: str) -> None:
+        logger.info(message)
+        if self.progress_callback:
+            self.progress_callback(message)
+
+    def _flush(self, pending: list[TraceUpload], result: CsvMlflowLogResult) -> None:
+        if not pending or not self.ingest:
+            return
+        imported = self.ingest(list(pending))
+        result.traces_imported += imported
+        result.batches.append({"batch": len(result.batches) + 1, "rows_read": result.rows_read, "traces": imported})
+        pending.clear()
+
+    def run(self, binary_file: IO[bytes]) -> CsvMlflowLogResult:
+        """Log every non-empty row to MLflow.
+
+        Raises:
+            CsvFormatError: if the preview columns are missing.
+        """
+        import mlflow
+
+        result = CsvMlflowLogResult()
+        pending: list[TraceUpload] = []
+        in_flight: dict[Future, tuple[int, str, str]] = {}
+        self._apply_credentials()
+        # The trace exporter follows the global tracking URI; every workshop uses Databricks
+        mlflow.set_tracking_uri("databricks")
+        self._client = mlflow.MlflowClient(tracking_uri="databricks")
+
+        def _collect(done: set[Future]) -> None:
+            for future in done:
+                row_number, request_text, response_text = in_flight.pop(future)
+                try:
+                    mlflow_trace_id = future.result()
+                except Exception as e:
+                    result.add_row_error(row_number, str(e))
+                    logger.warning(f"Failed to create MLflow trace for row {row_number}: {e!s}")
+                    continue
+                result.traces_created += 1
+                if self.ingest:
+                    context = {"source": "mlflow_csv_upload", "filename": self.filename, "csv_row_number": row_number}
+                    pending.append(
+                        TraceUpload(
+                            input=request_text,
+                            output=response_text,
+                            context=context,
+                            trace_metadata=dict(context),
+                            mlflow_trace_id=mlflow_trace_id,
+                        )
+                    )
+                    if len(pending) >= self.batch_size:
+                        self._flush(pending, result)
+                if result.traces_created % 100 == 0:
+                    self._report(
+                        f"Created {result.traces_created} MLflow traces ({result.rows_read} rows read, "
+                        f"{result.row_error_count} failed)"
+                    )
+
+        with open_csv_reader(binary_file) as reader, ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="csv-mlflow"
+        ) as executor:
+            self.validate_header(list(reader.fieldnames or []))
+            for row_number, row in enumerate(reader, start=1):
+                result.rows_read += 1
+                request_text = clean_preview_text(row.get("request_preview", ""))
+                response_text = clean_preview_text(row.get("response_preview", ""))
+                if not request_text or not response_text:
+                    result.rows_skipped += 1
+                    continue
+                future = executor.submit(self._log_row, row_number, request_text, response_text)
+                in_flight[future] = (row_number, request_text, response_text)
+                if len(in_flight) >= self.max_workers * 4:
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    _collect(done)
+            if in_flight:
+                done, _ = wait(list(in_flight))
+                _collect(done)
+
+        self._flush(pending, result)
+        self._report(
+            f"Created {result.traces_created} MLflow traces from {result.rows_read} rows "
+            f"({result.row_error_count} failed, {result.rows_skipped} skipped)"
+        )
+        return result
@@ -1,13 +1,15 @@
 """Database service layer for workshop operations."""
 
+import base64
+import json
 import logging
 import os
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, inspect
+from sqlalchemy.orm import Session, undefer
 
 from server.database import (
   AnnotationDB,
@@ -33,10 +35,14 @@ from server.database import (
   UserTraceOrderDB,
   WorkshopDB,
   WorkshopParticipantDB,
+  normalize_email,
 )
 from server.models import (
   Annotation,
   AnnotationCreate,
+  AnnotationQueuePage,
+  BulkAnnotationItemResult,
+  BulkAnnotationResult,
   DiscoveryFeedback,
   DiscoveryFeedbackCreate,
   DiscoveryFinding,
@@ -56,6 +62,8 @@ from server.models import (
   ParticipantNoteCreate,
   Rubric,
   RubricCreate,
+  SearchHit,
+  SearchResults,
   Trace,
   TraceUpload,
   User,
@@ -64,17 +72,30 @@ from server.models import (
   UserStatus,
   UserTraceOrder,
   Workshop,
+  WorkshopArchive,
   WorkshopCreate,
   WorkshopParticipant,
   WorkshopPhase,
 )
+from server import metrics
+from server.services import search_index, trace_search, workshop_archive
 from server.services.token_storage_service import token_storage
+from server.services.trace_order import assign_batches, user_trace_order
+from server.sqlite_writer import SQLiteWriteQueue, get_write_queue
 from server.utils.config import get_facilitator_config
-from server.utils.password import generate_default_password, hash_password, verify_password
+from server.utils.password import generate_default_password, hash_password_bounded, verify_password_bounded
+from server.utils.span_filter_utils import build_span_index, normalize_context
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent MLflow tag writes per tagging call. The tracking
+# server rate-limits aggressively, so keep this small.
+MLFLOW_TAG_MAX_WORKERS = int(os.getenv('MLFLOW_TAG_MAX_WORKERS', '8'))
+# Worker count and request rate for bulk feedback re-sync
+MLFLOW_SYNC_MAX_WORKERS = int(os.getenv('MLFLOW_SYNC_MAX_WORKERS', '8'))
+MLFLOW_SYNC_RATE_PER_SEC = float(os.getenv('MLFLOW_SYNC_RATE_PER_SEC', '20'))
+
 
 def _retry_mlflow_operation(operation, max_retries: int = 3, base_delay: float = 1.0, description: str = "MLflow operation"):
   """Retry an MLflow operation with exponential backoff.
@@ -118,6 +139,30 @@ def _retry_mlflow_operation(operation, max_retries: int = 3, base_delay: float =
   return None
 
 
+def _encode_trace_cursor(position: int, ordered_ids: List[str]) -> str:
+  """Opaque resume token: the position in the user's order plus the last trace served."""
+  payload = json.dumps({'p': position, 't': ordered_ids[position - 1] if position > 0 else None})
+  return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_trace_cursor(cursor: Optional[str], ordered_ids: List[str]) -> int:
+  """Position to resume from. If the order changed since the token was issued,
+  resume after the last served trace; if that trace is gone, start over."""
+  if not cursor:
+    return 0
+  try:
+    data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    position, last_trace_id = int(data['p']), data['t']
+  except (ValueError, TypeError, KeyError) as e:
+    raise ValueError(f'Invalid cursor: {cursor}') from e
+  if 0 < position <= len(ordered_ids) and ordered_ids[position - 1] == last_trace_id:
+    return position
+  try:
+    return ordered_ids.index(last_trace_id) + 1
+  except ValueError:
+    return 0
+
+
 class DatabaseService:
   """Service layer for database operations."""
 
@@ -386,6 +431,7 @@ class DatabaseService:
     if not db_workshop:
       return None
 
+    self._record_trace_batches(db_workshop, 'discovery', trace_ids)
     db_workshop.active_discovery_trace_ids = trace_ids
     self.db.commit()
     self.db.refresh(db_workshop)
@@ -398,12 +444,33 @@ class DatabaseService:
     if not db_workshop:
       return None
 
+    self._record_trace_batches(db_workshop, 'annotation', trace_ids)
     db_workshop.active_annotation_trace_ids = trace_ids
     self.db.commit()
     self.db.refresh(db_workshop)
 
     return self._workshop_from_db(db_workshop)
 
+  def _record_trace_batches(self, db_workshop: WorkshopDB, phase: str, trace_ids: List[str]) -> None:
+    """Store the addition batch of each trace about to become active in ``phase``.
+
+    Randomized orders put later batches after earlier ones, so traces added to
+    a phase are appended to each user's order instead of reshuffling it.
+    """
+    if phase == 'discovery':
+      previous_ids = db_workshop.active_discovery_trace_ids or []
+    else:
+      previous_ids = db_workshop.active_annotation_trace_ids or []
+    trace_batches = db_workshop.trace_batches or {}
+    stored = trace_batches.get(phase) or {}
+    previous = {trace_id: stored.get(trace_id, 0) for trace_id in previous_ids}
+    db_workshop.trace_batches = {**trace_batches, phase: assign_batches(trace_ids, previous)}
+
+  def _trace_batches(self, workshop_id: str, phase: str) -> Dict[str, int]:
+    """Addition batch of each active trace in ``phase`` (empty for workshops from before batches were kept)."""
+    trace_batches = self.db.query(WorkshopDB.trace_batches).filter(WorkshopDB.id == workshop_id).scalar()
+    return (trace_batches or {}).get(phase) or {}
+
   def update_discovery_randomize_setting(self, workshop_id: str, randomize: bool) -> Optional[Workshop]:
     """Update the discovery trace randomization setting for a workshop."""
     db_workshop = self.db.query(WorkshopDB).filter(WorkshopDB.id == workshop_id).first()
@@ -476,6 +543,9 @@ class DatabaseService:
     db_traces = []
 
     for trace_data in traces:
+      # Normalise spans once here so span filtering can use the index instead of re-parsing
+      context = normalize_context(trace_data.context)
+      span_index = build_span_index(context)
       existing: Optional[TraceDB] = None
       if trace_data.mlflow_trace_id is not None:
         existing = (
@@ -491,7 +561,8 @@ class DatabaseService:
         # Update mutable fields on the existing row
         existing.input = trace_data.input
         existing.output = trace_data.output
-        existing.context = trace_data.context
+        existing.context = context
+        existing.span_index = span_index
         existing.trace_metadata = trace_data.trace_metadata
         existing.mlflow_url = trace_data.mlflow_url
         existing.mlflow_host = trace_data.mlflow_host
@@ -504,7 +575,8 @@ class DatabaseService:
           workshop_id=workshop_id,
           input=trace_data.input,
           output=trace_data.output,
-          context=trace_data.context,
+          context=context,
+          span_index=span_index,
           trace_metadata=trace_data.trace_metadata,
           mlflow_trace_id=trace_data.mlflow_trace_id,
           mlflow_url=trace_data.mlflow_url,
@@ -524,9 +596,15 @@ class DatabaseService:
 
     return result_traces
 
-  def get_traces(self, workshop_id: str) -> List[Trace]:
-    """Get all traces for a workshop in chronological order."""
-    db_traces = self.db.query(TraceDB).filter(TraceDB.workshop_id == workshop_id).order_by(TraceDB.created_at).all()
+  def get_traces(self, workshop_id: str, with_span_index: bool = False) -> List[Trace]:
+    """Get all traces for a workshop in chronological order.
+
+    The span lookup index is deferred; pass ``with_span_index`` to load it for span filtering.
+    """
+    query = self.db.query(TraceDB)
+    if with_span_index:
+      query = query.options(undefer(TraceDB.span_index))
+    db_traces = query.filter(TraceDB.workshop_id == workshop_id).order_by(TraceDB.created_at).all()
 
     return [self._trace_from_db(db_trace) for db_trace in db_traces]
 
@@ -540,7 +618,7 @@ class DatabaseService:
     """Get only the active discovery traces for a workshop.
 
     If randomization is enabled for the workshop, each user sees traces in a different 
-    randomized order (deterministic per user based on user_id seed).
+    randomized order (deterministic per user, from a keyed hash of user and trace ID).
     If randomization is disabled (default), all users see traces in the same chronological order.
 
     Args:
@@ -565,116 +643,33 @@ class DatabaseService:
     if not workshop or not workshop.active_discovery_trace_ids:
       return []
 
-    active_trace_ids = workshop.active_discovery_trace_ids
-    
-    # Check if randomization is enabled for this workshop
     randomize_enabled = getattr(workshop, 'discovery_randomize_traces', False) or False
-
-    if not randomize_enabled:
-      # Randomization OFF: Return traces in chronological order (same for all users)
-      # Fetch traces in the order they appear in active_discovery_trace_ids
-      db_traces = self.db.query(TraceDB).filter(TraceDB.id.in_(active_trace_ids)).all()
-      
-      # Create ordered result - preserve the chronological order from active_discovery_trace_ids
-      trace_map = {t.id: t for t in db_traces}
-      result = []
-      for tid in active_trace_ids:
-        if tid in trace_map:
-          result.append(self._trace_from_db(trace_map[tid]))
-
-      # Log performance metrics
-      load_time = time.time() - start_time
-      if load_time > 0.1:
-        print(f'⚠️ Slow trace load: {load_time:.3f}s for {len(result)} traces (user: {user_id[:8]}..., no randomization)')
-
-      return result
-
-    # Randomization ON: Get or create user-specific trace order
-    user_order = self.get_user_trace_order(workshop_id, user_id)
-    
-    if not user_order:
-      # Create new user trace order with randomized discovery traces
-      user_order = self.create_user_trace_order(workshop_id, user_id)
-      # Generate randomized order for this user
-      user_order.discovery_traces = self._generate_randomized_trace_order(active_trace_ids, user_id)
-      self.update_user_trace_order(user_order)
-    elif not user_order.discovery_traces or set(user_order.discovery_traces) != set(active_trace_ids):
-      # Update if trace set has changed (e.g., new traces added)
-      # Preserve existing order for traces already seen, add new ones randomly
-      existing_traces = [tid for tid in user_order.discovery_traces if tid in active_trace_ids]
-      new_traces = [tid for tid in active_trace_ids if tid not in user_order.discovery_traces]
-      
-      # Randomize only the new traces
-      randomized_new_traces = self._generate_randomized_trace_order(new_traces, user_id)
-      
-      # Combine: existing traces first (in their original order), then new randomized traces
-      user_order.discovery_traces = existing_traces + randomized_new_traces
-      self.update_user_trace_order(user_order)
-
-    # Use the user's personalized trace order
-    ordered_ids = user_order.discovery_traces
+    active_trace_ids = workshop.active_discovery_trace_ids
+    if randomize_enabled:
+      # Per-user order derived from a keyed hash - nothing stored, nothing written
+      ordered_ids = user_trace_order(
+        active_trace_ids, workshop_id, 'discovery', user_id, self._trace_batches(workshop_id, 'discovery')
+      )
+    else:
+      # Randomization OFF: chronological order from active_discovery_trace_ids (same for all users)
+      ordered_ids = active_trace_ids
 
     # Optimized trace fetching - single query with IN clause
-    if not ordered_ids:
-      return []
-
-    db_traces = self.db.query(TraceDB).filter(TraceDB.id.in_(ordered_ids)).all()
-
-    # Create ordered result efficiently - preserve the user-specific order
-    trace_map = {t.id: t for t in db_traces}
-    result = []
-    for tid in ordered_ids:
-      if tid in trace_map:
-        result.append(self._trace_from_db(trace_map[tid]))
+    result = self._traces_in_order(ordered_ids)
 
     # Log performance metrics
     load_time = time.time() - start_time
     if load_time > 0.1:  # Log slow requests
-      print(f'⚠️ Slow trace load: {load_time:.3f}s for {len(result)} traces (user: {user_id[:8]}..., randomized)')
+      mode = 'randomized' if randomize_enabled else 'no randomization'
+      print(f'⚠️ Slow trace load: {load_time:.3f}s for {len(result)} traces (user: {user_id[:8]}..., {mode})')
 
     return result
 
-  def _generate_randomized_trace_order(self, trace_ids: List[str], user_id: str) -> List[str]:
-    """Generate a randomized order of trace IDs for a specific user.
-
-    Uses the user_id combined with the sorted trace IDs as a seed to ensure:
-    1. Consistent randomization per user for the same set of traces
-    2. Different randomization when the trace set changes
-
-    Args:
-        trace_ids: List of trace IDs to randomize
-        user_id: User ID to use as random seed
-
-    Returns:
-        Randomized list of trace IDs
-    """
-    import random
-    import hashlib
-
-    if not trace_ids:
-      return []
-
-    # Create a deterministic seed from user_id + sorted trace IDs
-    # This ensures that the same user sees the same order for the same set of traces,
-    # but different traces (e.g., newly added ones) will have different randomization
-    sorted_trace_ids = sorted(trace_ids)
-    seed_string = f"{user_id}::{','.join(sorted_trace_ids)}"
-    seed = int(hashlib.md5(seed_string.encode()).hexdigest(), 16) % (2**31)
-    
-    # Create a new random instance with the user-specific seed
-    rng = random.Random(seed)
-    
-    # Create a copy and shuffle it
-    randomized_ids = trace_ids.copy()
-    rng.shuffle(randomized_ids)
-    
-    return randomized_ids
-
   def get_active_annotation_traces(self, workshop_id: str, user_id: str) -> List[Trace]:
     """Get only the active annotation traces for a workshop.
 
     If randomization is enabled for the workshop, each user sees traces in a different 
-    randomized order (deterministic per user based on user_id seed).
+    randomized order (deterministic per user, from a keyed hash of user and trace ID).
     If randomization is disabled (default), all users see traces in the same chronological order.
 
     Args:
@@ -698,76 +693,205 @@ class DatabaseService:
     if not workshop or not workshop.active_annotation_trace_ids:
       return []
 
-    active_trace_ids = workshop.active_annotation_trace_ids
-    
-    # Check if randomization is enabled for this workshop
     randomize_enabled = getattr(workshop, 'annotation_randomize_traces', False) or False
-
-    if not randomize_enabled:
-      # Randomization OFF: Return traces in chronological order (same for all users)
-      # Fetch traces in the order they appear in active_annotation_trace_ids
-      db_traces = self.db.query(TraceDB).filter(TraceDB.id.in_(active_trace_ids)).all()
-      
-      # Create ordered result - preserve the chronological order from active_annotation_trace_ids
-      trace_map = {t.id: t for t in db_traces}
-      result = []
-      for tid in active_trace_ids:
-        if tid in trace_map:
-          result.append(self._trace_from_db(trace_map[tid]))
-
-      # Log performance metrics
-      load_time = time.time() - start_time
-      if load_time > 0.1:
-        print(f'⚠️ Slow annotation trace load: {load_time:.3f}s for {len(result)} traces (user: {user_id[:8]}..., no randomization)')
-
-      return result
-
-    # Randomization ON: Get or create user-specific trace order
-    user_order = self.get_user_trace_order(workshop_id, user_id)
-    
-    if not user_order:
-      # Create new user trace order with randomized annotation traces
-      user_order = self.create_user_trace_order(workshop_id, user_id)
-      # Generate randomized order for this user
-      user_order.annotation_traces = self._generate_randomized_trace_order(active_trace_ids, user_id)
-      self.update_user_trace_order(user_order)
-    elif not user_order.annotation_traces or set(user_order.annotation_traces) != set(active_trace_ids):
-      # Update if trace set has changed (e.g., new traces added)
-      # Preserve existing order for traces already seen, add new ones randomly
-      existing_traces = [tid for tid in user_order.annotation_traces if tid in active_trace_ids]
-      new_traces = [tid for tid in active_trace_ids if tid not in user_order.annotation_traces]
-      
-      # Randomize only the new traces
-      randomized_new_traces = self._generate_randomized_trace_order(new_traces, user_id)
-      
-      # Combine: existing traces first (in their original order), then new randomized traces
-      user_order.annotation_traces = existing_traces + randomized_new_traces
-      self.update_user_trace_order(user_order)
-
-    # Use the user's personalized trace order
-    ordered_ids = user_order.annotation_traces
-
-    # Optimized trace fetching - single query with IN clause
+    ordered_ids = self._annotation_trace_order(workshop, user_id)
     if not ordered_ids:
       return []
 
-    db_traces = self.db.query(TraceDB).filter(TraceDB.id.in_(ordered_ids)).all()
-
-    # Create ordered result efficiently - preserve the user-specific order
-    trace_map = {t.id: t for t in db_traces}
-    result = []
-    for tid in ordered_ids:
-      if tid in trace_map:
-        result.append(self._trace_from_db(trace_map[tid]))
+    # Optimized trace fetching - single query with IN clause
+    result = self._traces_in_order(ordered_ids)
 
     # Log performance metrics
     load_time = time.time() - start_time
     if load_time > 0.1:  # Log slow requests
-      print(f'⚠️ Slow annotation trace load: {load_time:.3f}s for {len(result)} traces (user: {user_id[:8]}..., randomized)')
+      mode = 'randomized' if randomize_enabled else 'no randomization'
+      print(
+        f'⚠️ Slow annotation trace load: {load_time:.3f}s for {len(result)} traces '
+        f'(user: {user_id[:8]}..., {mode})'
+      )
 
     return result
 
+  def _traces_in_order(self, trace_ids: List[str]) -> List[Trace]:
+    """Load traces with one IN query, returned in the order of ``trace_ids`` (unknown IDs are dropped)."""
+    trace_map = {t.id: t for t in self.db.query(TraceDB).filter(TraceDB.id.in_(trace_ids)).all()}
+    return [self._trace_from_db(trace_map[tid]) for tid in trace_ids if tid in trace_map]
+
+  def _annotation_trace_order(self, workshop: Workshop, user_id: str) -> List[str]:
+    """Active annotation trace IDs in the order this user should see them.
+
+    If randomization is disabled, this is the chronological order shared by all
+    users. Otherwise it is the user's keyed-hash permutation (see
+    ``server.services.trace_order``), with traces added later appended after
+    the ones the user already has.
+    """
+    active_trace_ids = workshop.active_annotation_trace_ids or []
+    if not getattr(workshop, 'annotation_randomize_traces', False):
+      # Randomization OFF: traces in chronological order (same for all users)
+      return list(active_trace_ids)
+    return user_trace_order(
+      active_trace_ids, workshop.id, 'annotation', user_id, self._trace_batches(workshop.id, 'annotation')
+    )
+
+  def search_workshop(
+    self,
+    workshop_id: str,
+    query: str,
+    doc_types: Optional[List[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+  ) -> SearchResults:
+    """Ranked full-text search over a workshop's traces, findings, discovery feedback and notes.
+
+    Raises ValueError for unknown ``doc_types`` and SearchUnavailableError when
+    the database has no full-text support.
+    """
+    total, hits = search_index.search(self.db, workshop_id, query, doc_types, limit=limit, offset=offset)
+    next_offset = offset + len(hits) if offset + len(hits) < total else None
+    return SearchResults(query=query, total=total, results=[SearchHit(**hit) for hit in hits], next_offset=next_offset)
+
+  def archive_workshop(self, workshop_id: str) -> WorkshopArchive:
+    """Move a finished workshop's rows to Parquet cold storage under WORKSHOP_ARCHIVE_PATH.
+
+    Raises ValueError when the workshop is not completed or cancelled, or already archived.
+    """
+    return self._workshop_archive_from_manifest(workshop_archive.archive_workshop(self.db, workshop_id))
+
+  def restore_workshop(self, workshop_id: str) -> WorkshopArchive:
+    """Load an archived workshop's rows back into the database.
+
+    Raises ValueError when the workshop is not archived.
+    """
+    return self._workshop_archive_from_manifest(workshop_archive.restore_workshop(self.db, workshop_id))
+
+  def _workshop_archive_from_manifest(self, manifest: Dict[str, Any]) -> WorkshopArchive:
+    return WorkshopArchive(
+      workshop_id=manifest['workshop_id'],
+      location=manifest['location'],
+      archived_at=datetime.fromisoformat(manifest['archived_at']),
+      tables=manifest['tables'],
+    )
+
+  def get_next_annotation_traces(
+    self, workshop_id: str, user_id: str, limit: int = 3, cursor: Optional[str] = None
+  ) -> AnnotationQueuePage:
+    """Next ``limit`` traces in the user's annotation order that they have not annotated yet.
+
+    Only trace IDs are walked: the user's annotations are checked a chunk of
+    the order at a time (served by the (user_id, trace_id) index) until enough
+    unannotated traces are found, and payloads are loaded for those traces
+    only. Pass the returned ``next_cursor`` back to continue after the last
+    trace served; without a cursor the walk starts at the beginning, so a
+    reload resumes at the first unannotated trace.
+    """
+    if not user_id:
+      raise ValueError('user_id is required for fetching annotation traces')
+
+    workshop = self.get_workshop(workshop_id)
+    if not workshop or not workshop.active_annotation_trace_ids:
+      return AnnotationQueuePage(traces=[], total=0, annotated=0)
+
+    ordered_ids = self._annotation_trace_order(workshop, user_id)
+    start = _decode_trace_cursor(cursor, ordered_ids)
+
+    next_ids = []
+    position = start
+    chunk_size = max(limit * 4, 50)
+    while position < len(ordered_ids) and len(next_ids) < limit:
+      chunk = ordered_ids[position:position + chunk_size]
+      annotated = {
+        row[0]
+        for row in self.db.query(AnnotationDB.trace_id)
+        .filter(AnnotationDB.user_id == user_id, AnnotationDB.trace_id.in_(chunk))
+        .all()
+      }
+      for offset, trace_id in enumerate(chunk):
+        if trace_id not in annotated:
+          next_ids.append(trace_id)
+          if len(next_ids) == limit:
+            position += offset + 1
+            break
+      else:
+        position += len(chunk)
+
+    annotated_count = (
+      self.db.query(func.count(AnnotationDB.id))
+      .filter(AnnotationDB.user_id == user_id, AnnotationDB.trace_id.in_(ordered_ids))
+      .scalar()
+      if ordered_ids
+      else 0
+    )
+    has_more = position < len(ordered_ids)
+    return AnnotationQueuePage(
+      traces=self._traces_in_order(next_ids),
+      next_cursor=_encode_trace_cursor(position, ordered_ids) if has_more else None,
+      total=len(ordered_ids),
+      annotated=annotated_count or 0,
+    )
+
+  def _write_queue(self) -> Optional[SQLiteWriteQueue]:
+    """The SQLite write queue for this session's engine, or None to write through the session.
+
+    A session with uncommitted writes holds the SQLite write lock, which the
+    writer thread would wait on, so such callers keep writing through their
+    own session (with its lock retries) and their transaction is left alone.
+    """
+    write_queue = get_write_queue(self.db.get_bind())
+    if write_queue is None:
+      return None
+    if self.db.new or self.db.dirty or self.db.deleted:
+      return None
+    if self.db.in_transaction():
+      dbapi_connection = self.db.connection().connection.dbapi_connection
+      if getattr(dbapi_connection, 'in_transaction', False):
+        return None
+    return write_queue
+
   # Discovery finding operations
+  def _add_finding_queued(
+    self, write_queue: SQLiteWriteQueue, workshop_id: str, finding_data: DiscoveryFindingCreate
+  ) -> DiscoveryFinding:
+    """Upsert a discovery finding through the SQLite write queue (no lock retries needed)."""
+
+    def upsert(session) -> str:
+      existing = session.query(DiscoveryFindingDB).filter(
+        DiscoveryFindingDB.workshop_id == workshop_id,
+        DiscoveryFindingDB.trace_id == finding_data.trace_id,
+        DiscoveryFindingDB.user_id == finding_data.user_id
+      ).first()
+      if existing:
+        existing.insight = finding_data.insight
+        if finding_data.category is not None:
+          existing.category = finding_data.category
+        return existing.id
+
+      finding_id = str(uuid.uuid4())
+      session.add(
+        DiscoveryFindingDB(
+          id=finding_id,
+          workshop_id=workshop_id,
+          trace_id=finding_data.trace_id,
+          user_id=finding_data.user_id,
+          insight=finding_data.insight,
+          category=finding_data.category,
+        )
+      )
+      return finding_id
+
+    finding_id = write_queue.submit(upsert)
+
+    db_finding = self.db.query(DiscoveryFindingDB).populate_existing().filter(DiscoveryFindingDB.id == finding_id).one()
+    logger.info(f"✅ Finding saved via write queue: id={db_finding.id}")
+    return DiscoveryFinding(
+      id=db_finding.id,
+      workshop_id=db_finding.workshop_id,
+      trace_id=db_finding.trace_id,
+      user_id=db_finding.user_id,
+      insight=db_finding.insight,
+      category=db_finding.category,
+      created_at=db_finding.created_at,
+    )
+
   def add_finding(self, workshop_id: str, finding_data: DiscoveryFindingCreate) -> DiscoveryFinding:
     """Add or update a discovery finding (upsert) with automatic retry on failure.
 
@@ -783,6 +907,11 @@ class DatabaseService:
     """
     from sqlalchemy.exc import IntegrityError, OperationalError
     import time
+
+    # SQLite: hand the upsert to the single writer, which serialises writes instead of retrying on locks
+    write_queue = self._write_queue()
+    if write_queue is not None:
+      return self._add_finding_queued(write_queue, workshop_id, finding_data)
     
     finding_id = str(uuid.uuid4())
     max_retries = 3
@@ -1641,11 +1770,95 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     return result
 
   # Annotation operations
-  def add_annotation(self, workshop_id: str, annotation_data: AnnotationCreate) -> Annotation:
-    """Add an annotation. If a duplicate exists, update the existing one."""
-    logger.info(f"📝 add_annotation called: trace_id={annotation_data.trace_id}, user_id={annotation_data.user_id}, rating={annotation_data.rating}, ratings={annotation_data.ratings}")
-    
-    # Get rubric to determine judge type for validation
+  def _apply_annotation_update(
+    self,
+    existing_annotation: AnnotationDB,
+    annotation_data: AnnotationCreate,
+    validated_rating: Optional[int],
+    validated_ratings: Optional[Dict[str, Any]],
+  ) -> None:
+    """Copy the provided fields of an annotation submission onto an existing row."""
+    # Update existing annotation - only update fields that are provided
+    if validated_rating is not None:
+      existing_annotation.rating = validated_rating
+      logger.info(f"  → Updated rating: {validated_rating}")
+    # Always update ratings if provided and validated
+    # validated_ratings will be None if ratings was not provided, or a dict if it was
+    if annotation_data.ratings is not None and validated_ratings is not None:
+      # Only update if we have validated ratings
+      # Note: validated_ratings can be {} if all validations failed, but we still update to clear
+      # However, if we received ratings but got empty dict, log a warning
+      if len(validated_ratings) == 0 and len(annotation_data.ratings) > 0:
+        logger.warning(f"⚠️ All ratings failed validation! Received: {annotation_data.ratings}, but validated_ratings is empty")
+        logger.warning("⚠️ Not updating ratings to avoid clearing existing data")
+      else:
+        existing_annotation.ratings = validated_ratings
+        logger.info(f"  → Updated ratings: {existing_annotation.ratings}")
+    elif annotation_data.ratings is not None:
+      # Ratings were provided but validation failed completely - log error
+      logger.error(f"❌ Ratings provided but validation failed completely: {annotation_data.ratings}")
+    if annotation_data.comment is not None:
+      existing_annotation.comment = annotation_data.comment
+      logger.info("  → Updated comment")
+
+  def _add_annotation_queued(
+    self,
+    write_queue: SQLiteWriteQueue,
+    workshop_id: str,
+    annotation_data: AnnotationCreate,
+    validated_rating: Optional[int],
+    validated_ratings: Optional[Dict[str, Any]],
+  ) -> Annotation:
+    """Upsert an annotation through the SQLite write queue (no lock retries needed)."""
+
+    def upsert(session) -> str:
+      existing = (
+        session.query(AnnotationDB)
+        .filter(AnnotationDB.user_id == annotation_data.user_id, AnnotationDB.trace_id == annotation_data.trace_id)
+        .first()
+      )
+      if existing:
+        logger.info(f"🔄 Updating existing annotation: id={existing.id}, current ratings={existing.ratings}")
+        self._apply_annotation_update(existing, annotation_data, validated_rating, validated_ratings)
+        return existing.id
+
+      annotation_id = str(uuid.uuid4())
+      session.add(
+        AnnotationDB(
+          id=annotation_id,
+          workshop_id=workshop_id,
+          trace_id=annotation_data.trace_id,
+          user_id=annotation_data.user_id,
+          rating=validated_rating,
+          ratings=validated_ratings,
+          comment=annotation_data.comment,
+        )
+      )
+      return annotation_id
+
+    annotation_id = write_queue.submit(upsert)
+
+    db_annotation = self.db.query(AnnotationDB).populate_existing().filter(AnnotationDB.id == annotation_id).one()
+    logger.info(f"✅ Annotation saved via write queue: id={db_annotation.id}, ratings={db_annotation.ratings}")
+    self._sync_annotation_with_mlflow(workshop_id, db_annotation)
+
+    return Annotation(
+      id=db_annotation.id,
+      workshop_id=db_annotation.workshop_id,
+      trace_id=db_annotation.trace_id,
+      user_id=db_annotation.user_id,
+      rating=db_annotation.rating,
+      ratings=db_annotation.ratings,
+      comment=db_annotation.comment,
+      mlflow_trace_id=db_annotation.trace.mlflow_trace_id if db_annotation.trace else None,
+      created_at=db_annotation.created_at,
+    )
+
+  def _rubric_judge_types(self, workshop_id: str) -> tuple:
+    """Judge types used to validate annotation ratings, parsed once from the workshop rubric.
+
+    Returns (default_judge_type, judge types by question ID, judge types by question index).
+    """
     rubric = self.get_rubric(workshop_id)
     default_judge_type = rubric.judge_type if rubric else 'likert'
     logger.info(f"🔍 Default judge type: {default_judge_type}")
@@ -1678,8 +1891,12 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       logger.info(f"📋 Question judge types by ID: {question_judge_types_by_id}")
       logger.info(f"📋 Question judge types by index: {question_judge_types_by_index}")
       logger.info(f"📋 Parsed {len(parsed_questions)} questions from rubric")
-    
-    # Validate and normalize ratings based on judge type
+
+    return default_judge_type, question_judge_types_by_id, question_judge_types_by_index
+
+  def _validate_annotation_ratings(self, annotation_data: AnnotationCreate, judge_types: tuple) -> tuple:
+    """Validate and normalize an annotation's ratings; returns (rating, ratings)."""
+    default_judge_type, question_judge_types_by_id, question_judge_types_by_index = judge_types
     validated_rating = None
     validated_ratings = None
     
@@ -1729,7 +1946,22 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
           # rating_value is None - skip this question
           logger.debug(f"⏭️ Skipping {question_id}: rating_value is None")
       logger.info(f"📊 Final validated_ratings: {validated_ratings}")
+
+    return validated_rating, validated_ratings
+
+  def add_annotation(self, workshop_id: str, annotation_data: AnnotationCreate) -> Annotation:
+    """Add an annotation. If a duplicate exists, update the existing one."""
+    logger.info(f"📝 add_annotation called: trace_id={annotation_data.trace_id}, user_id={annotation_data.user_id}, rating={annotation_data.rating}, ratings={annotation_data.ratings}")
+    
+    # Validate and normalize ratings based on the rubric's judge types
+    judge_types = self._rubric_judge_types(workshop_id)
+    validated_rating, validated_ratings = self._validate_annotation_ratings(annotation_data, judge_types)
     
+    # SQLite: hand the upsert to the single writer, which serialises writes instead of retrying on locks
+    write_queue = self._write_queue()
+    if write_queue is not None:
+      return self._add_annotation_queued(write_queue, workshop_id, annotation_data, validated_rating, validated_ratings)
+
     # Check if annotation already exists for this user and trace
     # Use retry logic to handle concurrent write conflicts transparently
     # Retries are automatic and invisible to the frontend
@@ -1757,28 +1989,7 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
 
         if existing_annotation:
           logger.info(f"🔄 Updating existing annotation: id={existing_annotation.id}, current ratings={existing_annotation.ratings}")
-          # Update existing annotation - only update fields that are provided
-          if validated_rating is not None:
-            existing_annotation.rating = validated_rating
-            logger.info(f"  → Updated rating: {validated_rating}")
-          # Always update ratings if provided and validated
-          # validated_ratings will be None if ratings was not provided, or a dict if it was
-          if annotation_data.ratings is not None and validated_ratings is not None:
-            # Only update if we have validated ratings
-            # Note: validated_ratings can be {} if all validations failed, but we still update to clear
-            # However, if we received ratings but got empty dict, log a warning
-            if len(validated_ratings) == 0 and len(annotation_data.ratings) > 0:
-              logger.warning(f"⚠️ All ratings failed validation! Received: {annotation_data.ratings}, but validated_ratings is empty")
-              logger.warning("⚠️ Not updating ratings to avoid clearing existing data")
-            else:
-              existing_annotation.ratings = validated_ratings
-              logger.info(f"  → Updated ratings: {existing_annotation.ratings}")
-          elif annotation_data.ratings is not None:
-            # Ratings were provided but validation failed completely - log error
-            logger.error(f"❌ Ratings provided but validation failed completely: {annotation_data.ratings}")
-          if annotation_data.comment is not None:
-            existing_annotation.comment = annotation_data.comment
-            logger.info("  → Updated comment")
+          self._apply_annotation_update(existing_annotation, annotation_data, validated_rating, validated_ratings)
           self.db.commit()
           self.db.refresh(existing_annotation)
           logger.info(f"✅ Annotation updated in DB: id={existing_annotation.id}, ratings={existing_annotation.ratings}")
@@ -1910,6 +2121,134 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     logger.error(f"❌ Failed to save annotation after all {max_retries} retries (loop exhausted)")
     raise last_error or Exception("Failed to save annotation after all retries")
 
+  def add_annotations_bulk(self, workshop_id: str, annotations: List[AnnotationCreate]) -> BulkAnnotationResult:
+    """Validate and upsert a batch of annotations in one transaction.
+
+    The rubric is parsed once for the whole batch. Existing annotations for the
+    batch's (user, trace) pairs are loaded with one query and updated in place;
+    the rest are inserted. Items whose trace is not in the workshop, whose
+    ratings all fail validation, or that repeat an earlier (user, trace) pair in
+    the batch are reported as errors and not saved.
+
+    MLflow sync is not done here; callers sync the saved annotations in one
+    pass with ``resync_annotations_to_mlflow(annotation_ids=...)``.
+    """
+    from sqlalchemy.exc import IntegrityError, OperationalError
+    import random
+    import time
+
+    judge_types = self._rubric_judge_types(workshop_id)
+    requested_trace_ids = {a.trace_id for a in annotations}
+    known_trace_ids = {
+      row[0]
+      for row in self.db.query(TraceDB.id)
+      .filter(TraceDB.workshop_id == workshop_id, TraceDB.id.in_(requested_trace_ids))
+      .all()
+    }
+
+    results = []
+    pending = []  # (item result, annotation data, validated rating, validated ratings)
+    first_index: Dict[tuple, int] = {}
+    for index, annotation_data in enumerate(annotations):
+      item = BulkAnnotationItemResult(
+        index=index, trace_id=annotation_data.trace_id, user_id=annotation_data.user_id, status='error'
+      )
+      results.append(item)
+      if annotation_data.trace_id not in known_trace_ids:
+        item.error = 'Trace not found in workshop'
+        continue
+      key = (annotation_data.user_id, annotation_data.trace_id)
+      if key in first_index:
+        item.error = f'Duplicate of item {first_index[key]} in this batch'
+        continue
+      first_index[key] = index
+
+      validated_rating, validated_ratings = self._validate_annotation_ratings(annotation_data, judge_types)
+      if annotation_data.ratings and not validated_ratings:
+        item.error = 'No ratings passed validation'
+        continue
+      pending.append((item, annotation_data, validated_rating, validated_ratings))
+
+    def upsert(session) -> List[tuple]:
+      existing = {
+        (row.user_id, row.trace_id): row
+        for row in session.query(AnnotationDB)
+        .filter(
+          AnnotationDB.trace_id.in_({data.trace_id for _, data, _, _ in pending}),
+          AnnotationDB.user_id.in_({data.user_id for _, data, _, _ in pending}),
+        )
+        .all()
+      }
+      outcomes = []
+      new_rows = []
+      for _, data, validated_rating, validated_ratings in pending:
+        row = existing.get((data.user_id, data.trace_id))
+        if row is not None:
+          self._apply_annotation_update(row, data, validated_rating, validated_ratings)
+          outcomes.append(('updated', row.id))
+          continue
+        annotation_id = str(uuid.uuid4())
+        new_rows.append(
+          AnnotationDB(
+            id=annotation_id,
+            workshop_id=workshop_id,
+            trace_id=data.trace_id,
+            user_id=data.user_id,
+            rating=validated_rating,
+            ratings=validated_ratings,
+            comment=data.comment,
+          )
+        )
+        outcomes.append(('created', annotation_id))
+      session.add_all(new_rows)
+      return outcomes
+
+    outcomes = []
+    if pending:
+      # SQLite: the whole batch is one unit of work for the single writer
+      write_queue = self._write_queue()
+      if write_queue is not None:
+        outcomes = write_queue.submit(upsert)
+      else:
+        max_retries = 5
+        for attempt in range(max_retries):
+          try:
+            outcomes = upsert(self.db)
+            self.db.commit()
+            break
+          except IntegrityError as e:
+            # Another request inserted one of these (user, trace) pairs since they
+            # were loaded (idx_annotations_unique); retrying reloads it as an update
+            self.db.rollback()
+            self.db.expire_all()
+            if attempt == max_retries - 1:
+              raise
+            logger.warning(f"⚠️ Concurrent insert on bulk annotation save (attempt {attempt + 1}), retrying: {e}")
+          except OperationalError as e:
+            self.db.rollback()
+            self.db.expire_all()
+            if attempt == max_retries - 1:
+              raise
+            delay = min(0.3 * (2 ** attempt) + random.uniform(0, 0.5), 5.0)
+            logger.warning(f"⚠️ Database contention on bulk annotation save (attempt {attempt + 1}): {e}")
+            time.sleep(delay)
+
+    for (item, _, _, _), (status, annotation_id) in zip(pending, outcomes, strict=True):
+      item.status = status
+      item.annotation_id = annotation_id
+
+    result = BulkAnnotationResult(
+      created=sum(1 for item in results if item.status == 'created'),
+      updated=sum(1 for item in results if item.status == 'updated'),
+      failed=sum(1 for item in results if item.status == 'error'),
+      results=results,
+    )
+    logger.info(
+      f"📝 Bulk annotation save for workshop {workshop_id}: "
+      f"{result.created} created, {result.updated} updated, {result.failed} failed"
+    )
+    return result
+
   def _validate_and_normalize_rating(self, rating: any, judge_type: str) -> Optional[int]:
     """Validate and normalize a rating based on judge type.
     
@@ -2038,7 +2377,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       for key, value in tags.items():
         # Use retry logic for tagging - bind variables via default args
         def _set_tag(_tid=mlflow_trace_id, _key=key, _val=value, _set_fn=set_trace_tag):
-          _set_fn(trace_id=_tid, key=_key, value=_val)
+          with metrics.timed('mlflow', 'set_trace_tag'):
+            _set_fn(trace_id=_tid, key=_key, value=_val)
           return True
 
         _retry_mlflow_operation(
@@ -2046,36 +2386,13 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
           max_retries=3,
           description=f"set_trace_tag({key}) for {mlflow_trace_id[:12]}..."
         )
+      trace_search.invalidate(workshop_id, 'align')
     else:
       logger.debug('mlflow.set_trace_tag not available; skip tagging for trace %s', mlflow_trace_id)
 
     # Get rubric questions to map question IDs to titles for judge names
     rubric_db = self.db.query(RubricDB).filter(RubricDB.workshop_id == workshop_id).first()
-    question_titles_by_index = {}
-    if rubric_db and rubric_db.question:
-      # Parse rubric questions to get titles
-      # Support both new delimiter (|||QUESTION_SEPARATOR|||) and legacy delimiter (---) 
-      QUESTION_DELIMITER_NEW = '|||QUESTION_SEPARATOR|||'
-      QUESTION_DELIMITER_LEGACY = '---'
-      
-      if QUESTION_DELIMITER_NEW in rubric_db.question:
-        questions = rubric_db.question.split(QUESTION_DELIMITER_NEW)
-      else:
-        questions = rubric_db.question.split(QUESTION_DELIMITER_LEGACY)
-      
-      for idx, q in enumerate(questions):
-        q = q.strip()
-        if not q:
-          continue
-        # Extract title (before first colon, or before |||JUDGE_TYPE|||)
-        if '|||JUDGE_TYPE|||' in q:
-          content_part = q.split('|||JUDGE_TYPE|||')[0]
-        else:
-          content_part = q
-        colon_idx = content_part.find(':')
-        title = content_part[:colon_idx].strip() if colon_idx > 0 else content_part.strip()
-        question_titles_by_index[idx] = title
-        logger.debug(f"Parsed rubric question {idx}: title='{title}'")
+    question_titles_by_index = self._rubric_question_titles(rubric_db.question if rubric_db else None)
 
     rationale = annotation_db.comment.strip() if annotation_db.comment else None
     source = AssessmentSource(
@@ -2088,7 +2405,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     existing_assessments = set()  # Set of (name, source_id) tuples
     current_user_id = annotation_db.user_id or workshop_id
     try:
-      trace = mlflow.get_trace(mlflow_trace_id)
+      with metrics.timed('mlflow', 'get_trace'):
+        trace = mlflow.get_trace(mlflow_trace_id)
       if trace and hasattr(trace, 'info') and hasattr(trace.info, 'assessments'):
         for assessment in (trace.info.assessments or []):
           # Track existing human assessments by (name, source_id) - allows multiple users
@@ -2114,25 +2432,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
           logger.debug(f"Skipping question_id={question_id} (rating is None)")
           continue
         
-        # Extract index from question_id
-        # Supports two formats:
-        # - "q_1", "q_2", etc. (1-based, old format)
-        # - "{rubric_id}_0", "{rubric_id}_1", etc. (0-based, new format)
-        try:
-          index_str = question_id.split('_')[-1]
-          index = int(index_str)
-          
-          # If format is "q_N" (1-based), convert to 0-based
-          # If format is "{uuid}_N" (0-based), use as-is
-          if question_id.startswith('q_'):
-            index = index - 1  # Convert 1-based to 0-based
-          # else: already 0-based (rubric_id_N format)
-          
-          logger.debug(f"Parsed question_id={question_id} → index={index}")
-        except (ValueError, IndexError) as e:
-          logger.warning(f"Failed to parse question_id={question_id}: {e}, defaulting to index=0")
-          index = 0
-        
+        index = self._rating_question_index(question_id)
+
         # Get question title and derive judge name
         question_title = question_titles_by_index.get(index, f"question_{index + 1}")
         judge_name = self._derive_judge_name_from_title(question_title)
@@ -2149,13 +2450,14 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
         rationale_for_this = rationale if logged_count == 0 else None
         # Bind loop variables via default args to avoid closure issues
         def _log_feedback(_tid=mlflow_trace_id, _name=judge_name, _val=rating_value, _src=source, _rat=rationale_for_this):
-          mlflow.log_feedback(
-            trace_id=_tid,
-            name=_name,
-            value=_val,
-            source=_src,
-            rationale=_rat,
-          )
+          with metrics.timed('mlflow', 'log_feedback'):
+            mlflow.log_feedback(
+              trace_id=_tid,
+              name=_name,
+              value=_val,
+              source=_src,
+              rationale=_rat,
+            )
           return True
 
         api_result = _retry_mlflow_operation(
@@ -2185,13 +2487,14 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       # Use retry logic for legacy rating
       rating_val = annotation_db.rating
       def _log_legacy_feedback(_tid=mlflow_trace_id, _name=judge_name, _val=rating_val, _src=source, _rat=rationale):
-        mlflow.log_feedback(
-          trace_id=_tid,
-          name=_name,
-          value=_val,
-          source=_src,
-          rationale=_rat,
-        )
+        with metrics.timed('mlflow', 'log_feedback'):
+          mlflow.log_feedback(
+            trace_id=_tid,
+            name=_name,
+            value=_val,
+            source=_src,
+            rationale=_rat,
+          )
         return True
 
       api_result = _retry_mlflow_operation(
@@ -2205,112 +2508,321 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
 
     return {'logged': 0, 'skipped': 0, 'error': 'no ratings to sync'}
 
-  def resync_annotations_to_mlflow(self, workshop_id: str) -> Dict[str, Any]:
+  @staticmethod
+  def _rubric_question_titles(rubric_text: Optional[str]) -> Dict[int, str]:
+    """Map rubric question index to title, as used for MLflow judge names.
+
+    Indexes follow the raw delimiter split (empty chunks keep their slot) so
+    they line up with the question IDs stored in annotation ratings.
+    """
+    titles: Dict[int, str] = {}
+    if not rubric_text:
+      return titles
+    # Support both new delimiter (|||QUESTION_SEPARATOR|||) and legacy delimiter (---)
+    if '|||QUESTION_SEPARATOR|||' in rubric_text:
+      questions = rubric_text.split('|||QUESTION_SEPARATOR|||')
+    else:
+      questions = rubric_text.split('---')
+    for idx, q in enumerate(questions):
+      q = q.strip()
+      if not q:
+        continue
+      content_part = q.split('|||JUDGE_TYPE|||')[0] if '|||JUDGE_TYPE|||' in q else q
+      colon_idx = content_part.find(':')
+      titles[idx] = content_part[:colon_idx].strip() if colon_idx > 0 else content_part.strip()
+    return titles
+
+  @staticmethod
+  def _rating_question_index(question_id: str) -> int:
+    """Parse a ratings key ("q_1" 1-based, or "{rubric_id}_0" 0-based) into a 0-based index."""
+    try:
+      index = int(question_id.split('_')[-1])
+    except (ValueError, IndexError):
+      logger.warning(f"Failed to parse question_id={question_id}, defaulting to index=0")
+      return 0
+    return index - 1 if question_id.startswith('q_') else index
+
+  def _load_human_assessments(self, mlflow, experiment_id: str, workshop_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Read existing HUMAN assessments and tags for all workshop traces with one search.
+
+    Returns:
+        Dict keyed by MLflow trace ID with 'assessments' (set of (name, source_id))
+        and 'tags', or None when the bulk read is unavailable.
+    """
+    from mlflow.entities import AssessmentSourceType
+
+    try:
+      with metrics.timed('mlflow', 'search_traces'):
+        traces = mlflow.search_traces(
+          experiment_ids=[experiment_id],
+          filter_string=f"tags.workshop_id = '{workshop_id}'",
+          return_type='list',
+          include_spans=False,
+        )
+    except Exception as e:
+      logger.warning(f"Bulk assessment read failed for workshop {workshop_id}, falling back to per-trace reads: {e}")
+      return None
+
+    existing: Dict[str, Dict[str, Any]] = {}
+    for trace in traces or []:
+      info = getattr(trace, 'info', None)
+      trace_id = getattr(info, 'trace_id', None) or getattr(info, 'request_id', None)
+      if not trace_id:
+        continue
+      assessments = set()
+      for assessment in (getattr(info, 'assessments', None) or []):
+        source = getattr(assessment, 'source', None)
+        if source and getattr(source, 'source_type', None) == AssessmentSourceType.HUMAN and hasattr(assessment, 'name'):
+          assessments.add((assessment.name, getattr(source, 'source_id', None)))
+      existing[trace_id] = {'assessments': assessments, 'tags': dict(getattr(info, 'tags', None) or {})}
+    return existing
+
+  def resync_annotations_to_mlflow(
+    self, workshop_id: str, progress_callback=None, annotation_ids: Optional[List[str]] = None
+  ) -> Dict[str, Any]:
     """Re-sync all annotations to MLflow with judge names derived from rubric questions.
 
     This is useful when rubric question titles change after annotations were created.
     Creates new MLflow feedback entries with the correct judge names (one per rubric question).
+
+    Annotations and their traces are loaded in one query, feedback already in
+    MLflow is read with one bulk search, and only the missing tags/feedback
+    are sent through a bounded, rate-limited worker pool.
+
+    Args:
+        workshop_id: The workshop ID
+        progress_callback: Optional callable receiving human-readable progress messages
+        annotation_ids: Only sync these annotations (default: all in the workshop)
     """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    from sqlalchemy.orm import joinedload
+
+    from server.utils.rate_limiter import RateLimiter
+
+    def _progress(message: str) -> None:
+      logger.info(message)
+      if progress_callback:
+        try:
+          progress_callback(message)
+        except Exception as e:
+          logger.debug(f"Resync progress callback failed: {e}")
+
     workshop_db = self.db.query(WorkshopDB).filter(WorkshopDB.id == workshop_id).first()
     if not workshop_db:
       return {'error': 'Workshop not found', 'synced': 0}
 
     # Get rubric questions to derive judge names
     rubric_db = self.db.query(RubricDB).filter(RubricDB.workshop_id == workshop_id).first()
-    judge_names = []
-    question_titles = []
-    if rubric_db and rubric_db.question:
-      logger.info(f"📋 Rubric raw question text (first 500 chars): {rubric_db.question[:500]}")
-      # Support both new delimiter (|||QUESTION_SEPARATOR|||) and legacy delimiter (---)
-      QUESTION_DELIMITER_NEW = '|||QUESTION_SEPARATOR|||'
-      QUESTION_DELIMITER_LEGACY = '---'
-
-      if QUESTION_DELIMITER_NEW in rubric_db.question:
-        questions = rubric_db.question.split(QUESTION_DELIMITER_NEW)
-      else:
-        questions = rubric_db.question.split(QUESTION_DELIMITER_LEGACY)
-
-      for q in questions:
-        q = q.strip()
-        if not q:
-          continue
-        if '|||JUDGE_TYPE|||' in q:
-          content_part = q.split('|||JUDGE_TYPE|||')[0]
-        else:
-          content_part = q
-        colon_idx = content_part.find(':')
-        title = content_part[:colon_idx].strip() if colon_idx > 0 else content_part.strip()
-        question_titles.append(title)
-        judge_names.append(self._derive_judge_name_from_title(title))
+    titles_by_index = self._rubric_question_titles(rubric_db.question if rubric_db else None)
+    question_titles = list(titles_by_index.values())
+    judge_names = [self._derive_judge_name_from_title(title) for title in question_titles]
+    legacy_judge_name = workshop_db.judge_name or 'workshop_judge'
 
-    # Get all annotations
-    annotations = self.get_annotations(workshop_id)
+    # Preload annotations together with their traces
+    query = (
+      self.db.query(AnnotationDB)
+      .options(joinedload(AnnotationDB.trace))
+      .filter(AnnotationDB.workshop_id == workshop_id)
+    )
+    if annotation_ids is not None:
+      query = query.filter(AnnotationDB.id.in_(annotation_ids))
+    annotations = query.all()
 
-    synced_count = 0
-    total_logged = 0
-    total_skipped_existing = 0
     skipped_no_mlflow_id = 0
     skipped_no_trace = 0
     skipped_no_ratings = 0
     sync_errors = []
     errors = []
 
-    # Log summary of what's in annotations for debugging
     ratings_keys_found = set()
-    for annotation in annotations:
-      if annotation.ratings:
-        ratings_keys_found.update(annotation.ratings.keys())
+    for annotation_db in annotations:
+      if annotation_db.ratings:
+        ratings_keys_found.update(annotation_db.ratings.keys())
     logger.info(f"📊 Found rating keys across all annotations: {ratings_keys_found}")
     logger.info(f"📊 Expected judge names: {judge_names}")
-    logger.info(f"📊 Expected question titles: {question_titles}")
-
-    for annotation in annotations:
-      try:
-        # Get the annotation DB record to access trace relationship
-        annotation_db = self.db.query(AnnotationDB).filter(AnnotationDB.id == annotation.id).first()
-        if not annotation_db:
-          skipped_no_trace += 1
-          continue
-
-        # Check if trace has mlflow_trace_id
-        if not annotation_db.trace or not annotation_db.trace.mlflow_trace_id:
-          skipped_no_mlflow_id += 1
-          logger.warning(f"⚠️ Annotation {annotation_db.id[:8]}... has no mlflow_trace_id, skipping MLflow sync")
-          continue
-
-        # Check if annotation has ratings
-        if not annotation_db.ratings and annotation_db.rating is None:
-          skipped_no_ratings += 1
-          logger.warning(f"⚠️ Annotation {annotation_db.id[:8]}... has no ratings, skipping MLflow sync")
-          continue
 
-        logger.info(f"📊 Syncing annotation: trace_id={annotation_db.trace_id[:8]}..., mlflow_id={annotation_db.trace.mlflow_trace_id[:20]}..., ratings={annotation_db.ratings}, legacy_rating={annotation_db.rating}")
-        sync_result = self._sync_annotation_with_mlflow(workshop_id, annotation_db)
-        if sync_result:
-          total_logged += sync_result.get('logged', 0)
-          total_skipped_existing += sync_result.get('skipped', 0)
-          if sync_result.get('error'):
-            sync_errors.append(f"Annotation {annotation.id}: {sync_result['error']}")
-          if sync_result.get('logged', 0) > 0 or sync_result.get('skipped', 0) > 0:
-            synced_count += 1
-      except Exception as e:
-        errors.append(f"Annotation {annotation.id}: {str(e)}")
-        logger.warning('Failed to resync annotation %s: %s', annotation.id, e)
+    candidates = []
+    for annotation_db in annotations:
+      if not annotation_db.trace:
+        skipped_no_trace += 1
+        continue
+      if not annotation_db.trace.mlflow_trace_id:
+        skipped_no_mlflow_id += 1
+        logger.warning(f"⚠️ Annotation {annotation_db.id[:8]}... has no mlflow_trace_id, skipping MLflow sync")
+        continue
+      if not annotation_db.ratings and annotation_db.rating is None:
+        skipped_no_ratings += 1
+        logger.warning(f"⚠️ Annotation {annotation_db.id[:8]}... has no ratings, skipping MLflow sync")
+        continue
+      candidates.append(annotation_db)
 
-    return {
-      'synced': synced_count,
+    result = {
+      'synced': 0,
       'total': len(annotations),
-      'total_logged': total_logged,
-      'total_skipped_existing': total_skipped_existing,
+      'total_logged': 0,
+      'total_skipped_existing': 0,
       'skipped_no_mlflow_id': skipped_no_mlflow_id,
       'skipped_no_trace': skipped_no_trace,
       'skipped_no_ratings': skipped_no_ratings,
       'judge_names': judge_names,
       'question_titles': question_titles,
       'ratings_keys_found': list(ratings_keys_found),
-      'sync_errors': sync_errors if sync_errors else None,
-      'errors': errors if errors else None
+      'sync_errors': None,
+      'errors': None,
     }
+    if not candidates:
+      _progress(f"MLflow re-sync: nothing to sync ({len(annotations)} annotations)")
+      return result
+
+    mlflow, error = self._configure_mlflow(workshop_id)
+    if error:
+      result['sync_errors'] = [f"Annotation {a.id}: {error}" for a in candidates]
+      return result
+
+    from mlflow.entities import AssessmentSource, AssessmentSourceType
+
+    experiment_id = (
+      self.db.query(MLflowIntakeConfigDB.experiment_id)
+      .filter(MLflowIntakeConfigDB.workshop_id == workshop_id)
+      .scalar()
+    )
+    existing = self._load_human_assessments(mlflow, experiment_id, workshop_id)
+    if existing is not None:
+      _progress(f"MLflow re-sync: loaded existing feedback for {len(existing)} traces")
+
+    fallback_reads: Dict[str, set] = {}
+
+    def _existing_for(mlflow_trace_id: str) -> set:
+      if existing is not None:
+        return existing.get(mlflow_trace_id, {}).get('assessments', set())
+      if mlflow_trace_id in fallback_reads:
+        return fallback_reads[mlflow_trace_id]
+      # Bulk read unavailable: fall back to reading this trace
+      found = fallback_reads[mlflow_trace_id] = set()
+      try:
+        with metrics.timed('mlflow', 'get_trace'):
+          trace = mlflow.get_trace(mlflow_trace_id)
+        for assessment in (getattr(getattr(trace, 'info', None), 'assessments', None) or []):
+          source = getattr(assessment, 'source', None)
+          if source and getattr(source, 'source_type', None) == AssessmentSourceType.HUMAN:
+            found.add((assessment.name, getattr(source, 'source_id', None)))
+      except Exception as e:
+        logger.warning(f"Could not fetch existing assessments for trace {mlflow_trace_id}: {e}")
+      return found
+
+    # Work out exactly which tags and feedback entries are still missing
+    traces_to_tag = []
+    feedback_items = []  # (annotation_id, mlflow_trace_id, judge_name, value, source, rationale)
+    skipped_by_annotation: Dict[str, int] = {}
+    for annotation_db in candidates:
+      mlflow_trace_id = annotation_db.trace.mlflow_trace_id
+      tags = existing.get(mlflow_trace_id, {}).get('tags', {}) if existing is not None else {}
+      if tags.get('align') != 'true' and mlflow_trace_id not in traces_to_tag:
+        traces_to_tag.append(mlflow_trace_id)
+
+      source_id = annotation_db.user_id or workshop_id
+      source = AssessmentSource(source_type=AssessmentSourceType.HUMAN, source_id=source_id)
+      rationale = annotation_db.comment.strip() if annotation_db.comment else None
+      already = _existing_for(mlflow_trace_id)
+
+      entries = []
+      for question_id, rating_value in (annotation_db.ratings or {}).items():
+        if rating_value is None:
+          continue
+        index = self._rating_question_index(question_id)
+        title = titles_by_index.get(index, f"question_{index + 1}")
+        entries.append((self._derive_judge_name_from_title(title), rating_value))
+      if not entries and annotation_db.rating is not None:
+        entries.append((legacy_judge_name, annotation_db.rating))
+
+      skipped = 0
+      first = True  # Only the first entry logged for an annotation carries the comment
+      for judge_name, value in entries:
+        if (judge_name, source_id) in already:
+          skipped += 1
+          continue
+        feedback_items.append((annotation_db.id, mlflow_trace_id, judge_name, value, source, rationale if first else None))
+        first = False
+      skipped_by_annotation[annotation_db.id] = skipped
+
+    _progress(
+      f"MLflow re-sync: {len(candidates)} annotations, {len(feedback_items)} feedback entries to log, "
+      f"{sum(skipped_by_annotation.values())} already present, {len(traces_to_tag)} traces to tag"
+    )
+
+    limiter = RateLimiter(MLFLOW_SYNC_RATE_PER_SEC)
+    set_trace_tag = getattr(mlflow, 'set_trace_tag', None)
+
+    def _tag(mlflow_trace_id: str) -> bool:
+      def _set_tags():
+        for key, value in (('align', 'true'), ('workshop_id', workshop_id)):
+          limiter.acquire()
+          with metrics.timed('mlflow', 'set_trace_tag'):
+            set_trace_tag(trace_id=mlflow_trace_id, key=key, value=value)
+        return True
+
+      return bool(_retry_mlflow_operation(
+        _set_tags, max_retries=3, description=f"set_trace_tag(align) for {mlflow_trace_id[:12]}..."
+      ))
+
+    def _log(item) -> bool:
+      _, mlflow_trace_id, judge_name, value, source, rationale = item
+
+      def _log_feedback():
+        limiter.acquire()
+        with metrics.timed('mlflow', 'log_feedback'):
+          mlflow.log_feedback(
+            trace_id=mlflow_trace_id, name=judge_name, value=value, source=source, rationale=rationale
+          )
+        return True
+
+      return bool(_retry_mlflow_operation(
+        _log_feedback, max_retries=3, description=f"log_feedback({judge_name}) for trace {mlflow_trace_id[:12]}..."
+      ))
+
+    logged_by_annotation: Dict[str, int] = {}
+    total_work = len(feedback_items) + (len(traces_to_tag) if set_trace_tag else 0)
+    done = 0
+    with ThreadPoolExecutor(max_workers=MLFLOW_SYNC_MAX_WORKERS, thread_name_prefix='mlflow-resync') as executor:
+      futures = {}
+      if set_trace_tag:
+        for mlflow_trace_id in traces_to_tag:
+          futures[executor.submit(_tag, mlflow_trace_id)] = ('tag', mlflow_trace_id)
+      for item in feedback_items:
+        futures[executor.submit(_log, item)] = ('feedback', item)
+
+      for future in as_completed(futures):
+        kind, payload = futures[future]
+        done += 1
+        try:
+          ok = future.result()
+        except Exception as e:
+          ok = False
+          errors.append(f"{kind} {payload if kind == 'tag' else payload[0]}: {e}")
+        if kind == 'feedback':
+          if ok:
+            logged_by_annotation[payload[0]] = logged_by_annotation.get(payload[0], 0) + 1
+          else:
+            sync_errors.append(f"Annotation {payload[0]}: failed to log {payload[2]}")
+        if done % 25 == 0 or done == total_work:
+          _progress(f"MLflow re-sync progress: {done}/{total_work}")
+
+    if set_trace_tag and traces_to_tag:
+      trace_search.invalidate(workshop_id, 'align')
+
+    result['total_logged'] = sum(logged_by_annotation.values())
+    result['total_skipped_existing'] = sum(skipped_by_annotation.values())
+    result['synced'] = sum(
+      1 for a in candidates if logged_by_annotation.get(a.id, 0) > 0 or skipped_by_annotation.get(a.id, 0) > 0
+    )
+    result['sync_errors'] = sync_errors or None
+    result['errors'] = errors or None
+    _progress(
+      f"MLflow re-sync complete: {result['synced']}/{len(annotations)} annotations synced, "
+      f"logged={result['total_logged']}, skipped_existing={result['total_skipped_existing']}"
+    )
+    return result
 
   def sync_evaluations_to_mlflow(self, workshop_id: str, judge_name: str, evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Sync AI evaluation results to MLflow as Feedback entries.
@@ -2409,7 +2921,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       if mlflow_trace_id not in existing_assessments_cache:
         existing_ai = set()
         try:
-          trace = mlflow.get_trace(mlflow_trace_id)
+          with metrics.timed('mlflow', 'get_trace'):
+            trace = mlflow.get_trace(mlflow_trace_id)
           if trace and hasattr(trace, 'info') and hasattr(trace.info, 'assessments'):
             for assessment in (trace.info.assessments or []):
               if hasattr(assessment, 'source') and assessment.source:
@@ -2429,13 +2942,14 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       reasoning = eval_result.get('reasoning')
       rating_float = float(predicted_rating)
       def _log_ai_feedback(_tid=mlflow_trace_id, _name=judge_name, _val=rating_float, _src=source, _rat=reasoning):
-        mlflow.log_feedback(
-          trace_id=_tid,
-          name=_name,
-          value=_val,
-          source=_src,
-          rationale=_rat,
-        )
+        with metrics.timed('mlflow', 'log_feedback'):
+          mlflow.log_feedback(
+            trace_id=_tid,
+            name=_name,
+            value=_val,
+            source=_src,
+            rationale=_rat,
+          )
         return True
 
       result = _retry_mlflow_operation(
@@ -2459,38 +2973,36 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       'errors': errors if errors else None
     }
 
-  def tag_traces_for_evaluation(self, workshop_id: str, trace_ids: List[str], tag_type: str = 'eval') -> Dict[str, Any]:
-    """Tag MLflow traces with a label for auto-evaluation.
-
-    Args:
-        workshop_id: The workshop ID
-        trace_ids: List of workshop trace IDs to tag
-        tag_type: The tag value (default 'eval')
+  def _configure_mlflow(self, workshop_id: str):
+    """Configure MLflow credentials and experiment for trace tagging and feedback sync.
 
     Returns:
-        Dict with 'tagged' count and 'failed' list
+        Tuple of (mlflow module, error message). The module is None when setup failed.
     """
-    # Get MLflow config
     config = (
       self.db.query(MLflowIntakeConfigDB)
       .filter(MLflowIntakeConfigDB.workshop_id == workshop_id)
       .first()
     )
-    if not config:
-      logger.warning('Skipping MLflow tagging: config missing for workshop %s', workshop_id)
-      return {'tagged': 0, 'failed': trace_ids, 'error': 'MLflow config missing'}
+    if not config or not config.databricks_host or not config.experiment_id:
+      logger.warning('Skipping MLflow call: config missing for workshop %s', workshop_id)
+      return None, 'MLflow config missing'
 
-    # Get token from token storage
+    # Get token from token storage, falling back to the encrypted DB copy
     databricks_token = token_storage.get_token(workshop_id)
     if not databricks_token:
-      logger.warning('Skipping MLflow tagging: token missing for workshop %s', workshop_id)
-      return {'tagged': 0, 'failed': trace_ids, 'error': 'Databricks token missing'}
+      databricks_token = self.get_databricks_token(workshop_id)
+      if databricks_token:
+        token_storage.store_token(workshop_id, databricks_token)
+    if not databricks_token:
+      logger.warning('Skipping MLflow call: token missing for workshop %s', workshop_id)
+      return None, 'Databricks token missing'
 
     try:
       import mlflow
     except ImportError:
-      logger.warning('MLflow is not available; cannot tag traces.')
-      return {'tagged': 0, 'failed': trace_ids, 'error': 'MLflow not available'}
+      logger.warning('MLflow is not available; cannot tag traces or sync feedback.')
+      return None, 'MLflow not available'
 
     # Set up MLflow credentials
     os.environ['DATABRICKS_HOST'] = config.databricks_host.rstrip('/')
@@ -2504,7 +3016,36 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       mlflow.set_experiment(experiment_id=config.experiment_id)
     except Exception as exc:
       logger.warning('Failed to set MLflow experiment %s: %s', config.experiment_id, exc)
-      return {'tagged': 0, 'failed': trace_ids, 'error': f'Failed to set experiment: {exc}'}
+      return None, f'Failed to set experiment: {exc}'
+
+    return mlflow, None
+
+  def _get_mlflow_trace_id_map(self, workshop_id: str, trace_ids: List[str]) -> Dict[str, str]:
+    """Map workshop trace IDs to MLflow trace IDs in a single query."""
+    rows = (
+      self.db.query(TraceDB.id, TraceDB.mlflow_trace_id)
+      .filter(TraceDB.workshop_id == workshop_id, TraceDB.id.in_(trace_ids))
+      .all()
+    )
+    return {row.id: row.mlflow_trace_id for row in rows if row.mlflow_trace_id}
+
+  def tag_traces_for_evaluation(self, workshop_id: str, trace_ids: List[str], tag_type: str = 'eval') -> Dict[str, Any]:
+    """Tag MLflow traces with a label for auto-evaluation.
+
+    Tags are written concurrently (bounded by MLFLOW_TAG_MAX_WORKERS); each
+    trace still goes through _retry_mlflow_operation.
+
+    Args:
+        workshop_id: The workshop ID
+        trace_ids: List of workshop trace IDs to tag
+        tag_type: The tag value (default 'eval')
+
+    Returns:
+        Dict with 'tagged' count and 'failed' list
+    """
+    mlflow, error = self._configure_mlflow(workshop_id)
+    if error:
+      return {'tagged': 0, 'failed': trace_ids, 'error': error}
 
     # Get set_trace_tag function
     set_trace_tag = getattr(mlflow, 'set_trace_tag', None)
@@ -2512,44 +3053,133 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       logger.warning('mlflow.set_trace_tag not available')
       return {'tagged': 0, 'failed': trace_ids, 'error': 'set_trace_tag not available'}
 
-    # Get traces from database to get their MLflow trace IDs
-    db_traces = self.db.query(TraceDB).filter(
-      TraceDB.workshop_id == workshop_id,
-      TraceDB.id.in_(trace_ids)
-    ).all()
-
-    trace_id_map = {t.id: t.mlflow_trace_id for t in db_traces if t.mlflow_trace_id}
+    trace_id_map = self._get_mlflow_trace_id_map(workshop_id, trace_ids)
 
-    tagged = []
-    failed = []
+    failed = [trace_id for trace_id in trace_ids if trace_id not in trace_id_map]
+    for trace_id in failed:
+      logger.debug(f"No MLflow trace ID for workshop trace {trace_id}")
+    to_tag = [trace_id for trace_id in trace_ids if trace_id in trace_id_map]
 
-    for trace_id in trace_ids:
-      mlflow_trace_id = trace_id_map.get(trace_id)
-      if not mlflow_trace_id:
-        logger.debug(f"No MLflow trace ID for workshop trace {trace_id}")
-        failed.append(trace_id)
-        continue
+    def _tag_trace(trace_id: str) -> bool:
+      mlflow_trace_id = trace_id_map[trace_id]
 
-      # Use retry logic for tagging - bind variables via default args
-      def _tag_trace(_tid=mlflow_trace_id, _tag=tag_type, _wid=workshop_id, _set_tag=set_trace_tag):
-        _set_tag(trace_id=_tid, key=_tag, value='true')
-        _set_tag(trace_id=_tid, key='workshop_id', value=_wid)
+      def _set_tags():
+        with metrics.timed('mlflow', 'set_trace_tag'):
+          set_trace_tag(trace_id=mlflow_trace_id, key=tag_type, value='true')
+        with metrics.timed('mlflow', 'set_trace_tag'):
+          set_trace_tag(trace_id=mlflow_trace_id, key='workshop_id', value=workshop_id)
         return True
 
       result = _retry_mlflow_operation(
-        _tag_trace,
+        _set_tags,
         max_retries=3,
         description=f"tag_trace for {mlflow_trace_id[:12]}..."
       )
       if result:
-        tagged.append(trace_id)
         logger.debug(f"Tagged trace {mlflow_trace_id} with {tag_type}=true")
-      else:
-        failed.append(trace_id)
+      return bool(result)
+
+    tagged = []
+    if to_tag:
+      from concurrent.futures import ThreadPoolExecutor
+
+      max_workers = max(1, min(MLFLOW_TAG_MAX_WORKERS, len(to_tag)))
+      with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mlflow-tag') as executor:
+        # map() preserves input order so 'failed' stays in request order
+        for trace_id, ok in zip(to_tag, executor.map(_tag_trace, to_tag), strict=True):
+          if ok:
+            tagged.append(trace_id)
+          else:
+            failed.append(trace_id)
 
     logger.info(f"Tagged {len(tagged)} traces for {tag_type}, {len(failed)} failed")
+    if tagged:
+      trace_search.invalidate(workshop_id, tag_type)
     return {'tagged': len(tagged), 'failed': failed}
 
+  def verify_trace_tags(
+    self,
+    workshop_id: str,
+    trace_ids: List[str],
+    tag_type: str = 'eval',
+    max_attempts: int = 5,
+    initial_delay: float = 0.5,
+    max_delay: float = 4.0,
+  ) -> Dict[str, Any]:
+    """Confirm tagged traces are visible to mlflow.search_traces, re-tagging stragglers.
+
+    Each attempt issues one search filtered on the tag and workshop, then diffs
+    the result against the expected MLflow trace IDs. While the index is still
+    catching up (more traces visible than last time) we just wait, doubling the
+    delay up to max_delay. When a poll makes no progress, only the traces that
+    are still missing are re-tagged.
+
+    Returns:
+        Dict with 'verified' count, 'missing' list (workshop trace IDs),
+        'retagged' count and 'attempts' made.
+    """
+    import time
+
+    trace_id_map = self._get_mlflow_trace_id_map(workshop_id, trace_ids)
+    expected = {mlflow_id: trace_id for trace_id, mlflow_id in trace_id_map.items()}
+    result = {'verified': 0, 'missing': list(trace_id_map), 'retagged': 0, 'attempts': 0}
+    if not expected:
+      return result
+
+    mlflow, error = self._configure_mlflow(workshop_id)
+    if error:
+      result['error'] = error
+      return result
+
+    experiment_id = (
+      self.db.query(MLflowIntakeConfigDB.experiment_id)
+      .filter(MLflowIntakeConfigDB.workshop_id == workshop_id)
+      .scalar()
+    )
+    filter_string = trace_search.tag_filter(workshop_id, tag_type)
+
+    delay = initial_delay
+    last_found = -1
+    for attempt in range(1, max_attempts + 1):
+      time.sleep(delay)
+      result['attempts'] = attempt
+      try:
+        with metrics.timed('mlflow', 'search_traces'):
+          trace_df = mlflow.search_traces(
+            experiment_ids=[experiment_id],
+            filter_string=filter_string,
+            return_type='pandas',
+            include_spans=False,
+          )
+      except Exception as exc:
+        logger.debug('Tag verification search %d failed: %s', attempt, exc)
+        delay = min(delay * 2, max_delay)
+        continue
+
+      found = set()
+      if trace_df is not None and not trace_df.empty and 'trace_id' in trace_df.columns:
+        found = {str(tid).strip() for tid in trace_df['trace_id']}
+
+      missing = [trace_id for mlflow_id, trace_id in expected.items() if mlflow_id not in found]
+      result['verified'] = len(expected) - len(missing)
+      result['missing'] = missing
+      if not missing:
+        # The evaluation job runs the same search right after; let it reuse this one
+        trace_search.store_tagged_trace_ids(workshop_id, tag_type, experiment_id, sorted(found))
+        break
+
+      if result['verified'] <= last_found and attempt < max_attempts:
+        retag = self.tag_traces_for_evaluation(workshop_id, missing, tag_type=tag_type)
+        result['retagged'] += retag.get('tagged', 0)
+      last_found = result['verified']
+      delay = min(delay * 2, max_delay)
+
+    logger.info(
+      'Verified %d/%d %s-tagged traces after %d search(es), re-tagged %d',
+      result['verified'], len(expected), tag_type, result['attempts'], result['retagged'],
+    )
+    return result
+
   def get_annotations(self, workshop_id: str, user_id: Optional[str] = None) -> List[Annotation]:
     """Get annotations for a workshop, optionally filtered by user."""
     query = self.db.query(AnnotationDB).join(TraceDB).filter(AnnotationDB.workshop_id == workshop_id)
@@ -2632,7 +3262,7 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       user_data.password = generate_default_password(normalized_email)
 
     # Hash the password
-    password_hash = hash_password(user_data.password)
+    password_hash = hash_password_bounded(user_data.password)
 
     # Create user with PENDING status
     user = User(
@@ -2649,8 +3279,7 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
 
   def authenticate_user(self, email: str, password: str) -> Optional[User]:
     """Authenticate a user with email and password. SMEs and participants only need email."""
-    # Case-insensitive email comparison
-    db_user = self.db.query(UserDB).filter(UserDB.email.ilike(email)).first()
+    db_user = self._get_user_db_by_email(email)
     if not db_user:
       return None
 
@@ -2659,11 +3288,11 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       pass  # No password verification needed
     # For facilitators, require password verification
     elif db_user.role == 'facilitator':
-      if not verify_password(password, db_user.password_hash or ''):
+      if not verify_password_bounded(password, db_user.password_hash or ''):
         return None
     else:
       # Unknown role, require password for security
-      if not verify_password(password, db_user.password_hash or ''):
+      if not verify_password_bounded(password, db_user.password_hash or ''):
         return None
 
     return User(
@@ -2700,7 +3329,7 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       return existing_user
 
     # Create new facilitator user
-    password_hash = hash_password(facilitator_data['password'])
+    password_hash = hash_password_bounded(facilitator_data['password'])
 
     user = User(
       id=str(uuid.uuid4()),
@@ -2713,10 +3342,20 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
 
     return self.create_user(user)
 
+  def _get_user_db_by_email(self, email: str) -> Optional[UserDB]:
+    """Case-insensitive user lookup through the indexed email_normalized column.
+
+    Accounts whose emails differ only by case have no normalized email (see
+    migration 0017) and are matched by exact email instead.
+    """
+    db_user = self.db.query(UserDB).filter(UserDB.email_normalized == normalize_email(email)).first()
+    if db_user is None and email:
+      db_user = self.db.query(UserDB).filter(UserDB.email == email).first()
+    return db_user
+
   def get_user_by_email(self, email: str) -> Optional[User]:
     """Get user by email address."""
-    # Case-insensitive email comparison
-    db_user = self.db.query(UserDB).filter(UserDB.email.ilike(email)).first()
+    db_user = self._get_user_db_by_email(email)
     if not db_user:
       return None
 
@@ -2734,7 +3373,7 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
 
   def create_facilitator_config(self, config_data: FacilitatorConfigCreate) -> FacilitatorConfig:
     """Create a facilitator configuration."""
-    password_hash = hash_password(config_data.password)
+    password_hash = hash_password_bounded(config_data.password)
 
     db_config = FacilitatorConfigDB(
       id=str(uuid.uuid4()),
@@ -3693,6 +4332,20 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     self.db.query(JudgeEvaluationDB).filter(and_(JudgeEvaluationDB.workshop_id == workshop_id, JudgeEvaluationDB.prompt_id == prompt_id)).delete()
     self.db.commit()
 
+  def _latest_evaluated_prompt_id(self, workshop_id: str):
+    """Scalar subquery selecting the newest prompt (by created_at) that has evaluations."""
+    return (
+      self.db.query(JudgePromptDB.id)
+      .join(JudgeEvaluationDB, and_(
+        JudgeEvaluationDB.prompt_id == JudgePromptDB.id,
+        JudgeEvaluationDB.workshop_id == workshop_id,
+      ))
+      .filter(JudgePromptDB.workshop_id == workshop_id)
+      .order_by(JudgePromptDB.created_at.desc())
+      .limit(1)
+      .scalar_subquery()
+    )
+
   def get_latest_evaluations(self, workshop_id: str) -> List[JudgeEvaluation]:
     """Get the most recent evaluation results for a workshop (from any prompt).
 
@@ -3703,31 +4356,15 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     prompt. This is important because alignment creates new prompt versions (with aligned
     instructions) that don't yet have evaluations until re-evaluation is run.
     """
-    # Get prompts ordered by creation date (newest first)
-    prompts = (
-      self.db.query(JudgePromptDB)
-      .filter(JudgePromptDB.workshop_id == workshop_id)
-      .order_by(JudgePromptDB.created_at.desc())
+    db_evaluations = (
+      self.db.query(JudgeEvaluationDB)
+      .filter(and_(
+        JudgeEvaluationDB.workshop_id == workshop_id,
+        JudgeEvaluationDB.prompt_id == self._latest_evaluated_prompt_id(workshop_id),
+      ))
       .all()
     )
 
-    if not prompts:
-      return []
-
-    # Find the latest prompt that actually has evaluations
-    db_evaluations = []
-    for prompt in prompts:
-      db_evaluations = (
-        self.db.query(JudgeEvaluationDB)
-        .filter(and_(
-          JudgeEvaluationDB.workshop_id == workshop_id,
-          JudgeEvaluationDB.prompt_id == prompt.id
-        ))
-        .all()
-      )
-      if db_evaluations:
-        break
-    
     return [
       JudgeEvaluation(
         id=db_eval.id,
@@ -3743,6 +4380,82 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       for db_eval in db_evaluations
     ]
 
+  def get_latest_evaluation_results(self, workshop_id: str) -> List[Dict[str, Any]]:
+    """Get the latest evaluations with both trace IDs resolved, in one query.
+
+    Same prompt selection as get_latest_evaluations. Evaluations may have been
+    stored under either the workshop trace UUID or the MLflow trace ID, so the
+    trace is joined on both and each row carries the DB UUID as 'trace_id' and
+    the MLflow ID as 'mlflow_trace_id' (None when it cannot be resolved).
+    Only evaluation and ID-mapping columns are selected; trace content is not loaded.
+    """
+    from sqlalchemy.orm import aliased
+
+    trace_by_id = aliased(TraceDB)
+    # mlflow_trace_id is not unique, so resolve each MLflow ID to a single trace
+    # (the lowest ID) to keep one row per evaluation
+    trace_by_mlflow_id = (
+      self.db.query(TraceDB.mlflow_trace_id, func.min(TraceDB.id).label('id'))
+      .filter(TraceDB.workshop_id == workshop_id, TraceDB.mlflow_trace_id.isnot(None))
+      .group_by(TraceDB.mlflow_trace_id)
+      .subquery()
+    )
+
+    rows = (
+      self.db.query(
+        JudgeEvaluationDB.trace_id,
+        JudgeEvaluationDB.predicted_rating,
+        JudgeEvaluationDB.human_rating,
+        JudgeEvaluationDB.confidence,
+        JudgeEvaluationDB.reasoning,
+        JudgeEvaluationDB.predicted_feedback,
+        trace_by_id.id.label('db_trace_id'),
+        trace_by_id.mlflow_trace_id.label('db_trace_mlflow_id'),
+        trace_by_mlflow_id.c.id.label('mlflow_trace_db_id'),
+      )
+      .outerjoin(trace_by_id, and_(
+        trace_by_id.id == JudgeEvaluationDB.trace_id,
+        trace_by_id.mlflow_trace_id.isnot(None),
+      ))
+      .outerjoin(trace_by_mlflow_id, trace_by_mlflow_id.c.mlflow_trace_id == JudgeEvaluationDB.trace_id)
+      .filter(and_(
+        JudgeEvaluationDB.workshop_id == workshop_id,
+        JudgeEvaluationDB.prompt_id == self._latest_evaluated_prompt_id(workshop_id),
+      ))
+      .all()
+    )
+
+    results = []
+    for row in rows:
+      if row.db_trace_id:
+        trace_id, mlflow_trace_id = row.db_trace_id, row.db_trace_mlflow_id
+      elif row.mlflow_trace_db_id:
+        trace_id, mlflow_trace_id = row.mlflow_trace_db_id, row.trace_id
+      else:
+        logger.warning(f"get_latest_evaluation_results: {row.trace_id[:20]}... matches no trace")
+        trace_id, mlflow_trace_id = row.trace_id, None
+      results.append({
+        'trace_id': trace_id,
+        'mlflow_trace_id': mlflow_trace_id,
+        'predicted_rating': row.predicted_rating,
+        'human_rating': row.human_rating,
+        'confidence': row.confidence,
+        'reasoning': row.reasoning,
+        'judge_name': row.predicted_feedback or '',
+      })
+    return results
+
+  def count_traces(self, workshop_id: str) -> Dict[str, int]:
+    """Count a workshop's traces and how many have an MLflow trace ID, without loading them."""
+    from sqlalchemy import func
+
+    total, with_mlflow_id = (
+      self.db.query(func.count(TraceDB.id), func.count(TraceDB.mlflow_trace_id))
+      .filter(TraceDB.workshop_id == workshop_id)
+      .one()
+    )
+    return {'total': total, 'with_mlflow_id': with_mlflow_id}
+
   # User trace order operations
   def get_user_trace_order(self, workshop_id: str, user_id: str) -> Optional[UserTraceOrder]:
     """Get user's trace order for a workshop."""
@@ -3819,6 +4532,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
       mlflow_experiment_id=db_trace.mlflow_experiment_id,
       include_in_alignment=db_trace.include_in_alignment if db_trace.include_in_alignment is not None else True,
       sme_feedback=db_trace.sme_feedback,
+      # Deferred column: only passed on when the query loaded it, to avoid a lazy load per trace
+      span_index=None if 'span_index' in inspect(db_trace).unloaded else db_trace.span_index,
       created_at=db_trace.created_at,
     )
 
@@ -3912,6 +4627,8 @@ Provide your rating as a single number (1-5) followed by a brief explanation."""
     
     # Delete all traces
     deleted_count = self.db.query(TraceDB).filter(TraceDB.workshop_id == workshop_id).delete(synchronize_session=False)
+    # Bulk deletes bypass the search sync listener
+    search_index.purge_workshop(self.db, workshop_id, doc_types=['trace', 'finding'])
     
     # Delete rubric for this workshop
     self.db.query(RubricDB).filter(RubricDB.workshop_id == workshop_id).delete(synchronize_session=False)
@@ -12,6 +12,9 @@ import requests
 from fastapi import HTTPException
 from openai import OpenAI
 
+from server import metrics
+from server.utils.llm_admission import AdmissionTimeout, llm_admission
+
 logger = logging.getLogger(__name__)
 
 # Global client cache to reuse OpenAI clients across requests
@@ -198,25 +201,30 @@ class DatabricksService:
             logger.info(f"Calling Databricks serving endpoint: {endpoint_name}")
             logger.debug(f"Request parameters: {request_params}")
 
-            try:
-                result = _do_call(request_params)
-            except Exception as e:
-                if response_format:
-                    logger.warning(
-                        "Structured outputs request failed for endpoint=%s; retrying without response_format. Error: %s",
-                        endpoint_name,
-                        e,
-                    )
-                    request_params.pop("response_format", None)
+            with llm_admission(endpoint_name), metrics.timed("llm", "call_serving_endpoint"):
+                try:
                     result = _do_call(request_params)
-                else:
-                    raise
+                except Exception as e:
+                    if response_format:
+                        logger.warning(
+                            "Structured outputs request failed for endpoint=%s; retrying without response_format. "
+                            "Error: %s",
+                            endpoint_name,
+                            e,
+                        )
+                        request_params.pop("response_format", None)
+                        result = _do_call(request_params)
+                    else:
+                        raise
 
             logger.info(f"Successfully called serving endpoint: {endpoint_name}")
             logger.debug(f"Response: {result}")
 
             return result
 
+        except AdmissionTimeout as e:
+            logger.warning(f"Serving endpoint {endpoint_name} is saturated: {e}")
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"}) from e
         except Exception as e:
             logger.error(f"Error calling serving endpoint {endpoint_name}: {e}")
             logger.error(f"Error type: {type(e)}")
@@ -344,7 +352,8 @@ class DatabricksService:
             logger.debug(f"Request parameters: {request_params}")
 
             # Make the API call using OpenAI client
-            response = self.client.chat.completions.create(**request_params)
+            with llm_admission(endpoint_name), metrics.timed("llm", "call_chat_completion"):
+                response = self.client.chat.completions.create(**request_params)
 
             # Convert response to dictionary format
             try:
@@ -376,6 +385,9 @@ class DatabricksService:
 
             return result
 
+        except AdmissionTimeout as e:
+            logger.warning(f"Serving endpoint {endpoint_name} is saturated: {e}")
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"}) from e
         except Exception as e:
             logger.error(f"Error calling serving endpoint {endpoint_name}: {e}")
             logger.error(f"Error type: {type(e)}")
@@ -429,7 +441,8 @@ class DatabricksService:
             print(f"Using token starting with: {token_prefix}...")
 
             # Make the HTTP request
-            response = requests.post(api_url, headers=headers, json=payload, timeout=60)
+            with llm_admission(endpoint_name), metrics.timed("llm", "call_serving_endpoint_direct"):
+                response = requests.post(api_url, headers=headers, json=payload, timeout=60)
 
             # Add detailed error logging for 403 errors
             if response.status_code == 403:
@@ -450,6 +463,9 @@ class DatabricksService:
 
             return result
 
+        except AdmissionTimeout as e:
+            logger.warning(f"Serving endpoint {endpoint_name} is saturated: {e}")
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"}) from e
         except requests.exceptions.RequestException as e:
             logger.error(f"HTTP request error calling endpoint {endpoint_name}: {e}")
             raise HTTPException(status_code=500, detail=f"HTTP request error: {e!s}") from e
@@ -0,0 +1,213 @@
+"""Local screening of new findings before LLM disagreement detection.
+
+Each trace keeps an in-process TF-IDF index of its findings, updated as they
+arrive. When a participant submits a finding we compare it only against other
+participants' findings on the same trace:
+
+- nothing lexically related -> no disagreement is possible, skip the LLM
+- every related finding is a near-paraphrase with the same polarity -> agreement, skip the LLM
+- otherwise (opposite or unclear polarity on a shared topic) -> ambiguous, ask the LLM,
+  sending only the new finding and its related candidates
+
+The index is a cache: it is re-synced from the findings passed in on every
+screen (new ones added, deleted ones dropped), so it stays correct across
+workers and restarts.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from server.utils.text_similarity import TfidfIndex
+
+# Cosine similarity above which two findings are considered to talk about the same thing
+RELATED_SIMILARITY = 0.15
+# Cosine similarity above which same-polarity findings are treated as paraphrases
+PARAPHRASE_SIMILARITY = 0.6
+# Traces whose indexes are kept in memory (least recently used are dropped)
+MAX_CACHED_TRACES = 512
+
+POSITIVE_CUES = frozenset(
+    {
+        "good",
+        "great",
+        "excellent",
+        "accurate",
+        "correct",
+        "clear",
+        "concise",
+        "helpful",
+        "appropriate",
+        "complete",
+        "thorough",
+        "relevant",
+        "useful",
+        "effective",
+        "well",
+        "strong",
+        "solid",
+        "right",
+        "precise",
+        "reasonable",
+        "fine",
+        "nice",
+        "perfect",
+        "polite",
+        "safe",
+        "fast",
+        "succinct",
+    }
+)
+NEGATIVE_CUES = frozenset(
+    {
+        "bad",
+        "poor",
+        "awful",
+        "terrible",
+        "wrong",
+        "incorrect",
+        "inaccurate",
+        "unclear",
+        "verbose",
+        "confusing",
+        "unhelpful",
+        "inappropriate",
+        "incomplete",
+        "irrelevant",
+        "useless",
+        "weak",
+        "missing",
+        "lacks",
+        "lacking",
+        "fails",
+        "failed",
+        "failure",
+        "error",
+        "errors",
+        "hallucinated",
+        "hallucination",
+        "hallucinates",
+        "misleading",
+        "rude",
+        "unsafe",
+        "slow",
+        "vague",
+        "broken",
+        "worse",
+        "worst",
+    }
+)
+NEGATIONS = frozenset({"not", "no", "never", "isn't", "wasn't", "doesn't", "didn't", "hardly", "barely", "without"})
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def polarity(text: str | None) -> int:
+    """Crude sentiment sign of a finding: 1 positive, -1 negative, 0 mixed or neutral.
+
+    A cue word preceded by a negation within two words counts for the opposite side.
+    """
+    words = _WORD_RE.findall((text or "").lower())
+    score = 0
+    for i, word in enumerate(words):
+        sign = 1 if word in POSITIVE_CUES else -1 if word in NEGATIVE_CUES else 0
+        if sign and any(w in NEGATIONS for w in words[max(0, i - 2) : i]):
+            sign = -sign
+        score += sign
+    return (score > 0) - (score < 0)
+
+
+@dataclass
+class DisagreementScreen:
+    """Outcome of screening one finding against the rest of its trace."""
+
+    needs_llm: bool
+    reason: str
+    # IDs of other participants' findings worth sending to the LLM with the new one
+    candidate_ids: list[str] = field(default_factory=list)
+
+
+class TraceFindingIndex:
+    """Similarity index over one trace's findings."""
+
+    def __init__(self):
+        self._index = TfidfIndex()
+        self._users: dict[str, str] = {}
+        self._polarity: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def sync(self, findings: list[dict[str, Any]]) -> None:
+        """Add findings the index hasn't seen yet and drop ones no longer present (matched by ID)."""
+        with self._lock:
+            current = {str(f.get("id") or "") for f in findings}
+            for stale in [fid for fid in self._users if fid not in current]:
+                self._index.remove(stale)
+                del self._users[stale]
+                del self._polarity[stale]
+
+            for f in findings:
+                finding_id = str(f.get("id") or "")
+                if not finding_id or finding_id in self._index:
+                    continue
+                text = f.get("text") or f.get("insight") or ""
+                self._index.add(finding_id, text)
+                self._users[finding_id] = str(f.get("user_id") or "")
+                self._polarity[finding_id] = polarity(text)
+
+    def screen(self, finding_id: str) -> DisagreementScreen:
+        with self._lock:
+            if finding_id not in self._index:
+                return DisagreementScreen(True, "finding not indexed")
+
+            user_id = self._users[finding_id]
+            others = [fid for fid, uid in self._users.items() if uid != user_id]
+            if not others:
+                return DisagreementScreen(False, "no findings from other participants")
+
+            related = [
+                (fid, score)
+                for fid, score in self._index.most_similar(finding_id, others)
+                if score >= RELATED_SIMILARITY
+            ]
+            if not related:
+                return DisagreementScreen(False, "no related findings from other participants")
+
+            own = self._polarity[finding_id]
+            agreeing = own != 0 and all(
+                self._polarity[fid] == own and score >= PARAPHRASE_SIMILARITY for fid, score in related
+            )
+            if agreeing:
+                return DisagreementScreen(False, "related findings agree")
+
+            return DisagreementScreen(True, "related findings may conflict", [fid for fid, _ in related])
+
+
+_trace_indexes: OrderedDict[tuple[str, str], TraceFindingIndex] = OrderedDict()
+_trace_indexes_lock = threading.Lock()
+
+
+def get_trace_index(workshop_id: str, trace_id: str) -> TraceFindingIndex:
+    key = (workshop_id, trace_id)
+    with _trace_indexes_lock:
+        index = _trace_indexes.get(key)
+        if index is None:
+            index = TraceFindingIndex()
+            _trace_indexes[key] = index
+            while len(_trace_indexes) > MAX_CACHED_TRACES:
+                _trace_indexes.popitem(last=False)
+        else:
+            _trace_indexes.move_to_end(key)
+        return index
+
+
+def screen_finding(
+    workshop_id: str, trace_id: str, finding_id: str, findings: list[dict[str, Any]]
+) -> DisagreementScreen:
+    """Sync the trace's index with ``findings`` and screen ``finding_id`` against it."""
+    index = get_trace_index(workshop_id, trace_id)
+    index.sync(findings)
+    return index.screen(finding_id)
@@ -151,7 +151,7 @@ class DiscoveryAnalysisService:
         span_filter = workshop.span_attribute_filter if workshop else None
 
         # Get traces for input/output
-        traces = self.db_service.get_traces(workshop_id)
+        traces = self.db_service.get_traces(workshop_id, with_span_index=bool(span_filter))
         trace_map = {t.id: t for t in traces}
 
         aggregated: dict[str, Any] = {}
@@ -162,7 +162,7 @@ class DiscoveryAnalysisService:
                     # First apply span filter if configured
                     trace_input = trace.input
                     trace_output = trace.output
-                    span_input, span_output = apply_span_filter(trace.context, span_filter)
+                    span_input, span_output = apply_span_filter(trace.context, span_filter, trace.span_index)
                     if span_input is not None:
                         trace_input = span_input
                     if span_output is not None:
@@ -353,8 +353,14 @@ def get_predictor(signature_cls: type, lm: Any, *, temperature: float = 0.2, max
 
 def run_predict(predictor: Any, lm: Any, **kwargs):
     """Execute a DSPy predictor call within the LM context."""
+    from server import metrics
+    from server.utils.llm_admission import llm_admission
+
     _maybe_enable_mlflow_dspy_autolog()
-    with _dspy_with_lm(lm):
+    model = getattr(lm, "model", None)
+    endpoint = model.removeprefix("openai/") if isinstance(model, str) else None
+    operation = getattr(getattr(predictor, "signature", None), "__name__", None) or "predict"
+    with llm_admission(endpoint), _dspy_with_lm(lm), metrics.timed("llm", operation):
         return predictor(**kwargs)
 
 
@@ -8,6 +8,9 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 from fastapi import HTTPException
@@ -26,13 +29,34 @@ from server.models import (
     WorkshopPhase,
 )
 from server.services.database_service import DatabaseService
+from server.services.disagreement_prefilter import screen_finding
 from server.services.discovery_dspy import QUESTION_CATEGORIES
+from server.utils.llm_admission import mark_batch_thread
+from server.utils.text_similarity import tokenize
 
 logger = logging.getLogger(__name__)
 
 # Maximum number of generated questions per (user, trace) before stopping
 MAX_GENERATED_QUESTIONS_PER_TRACE = 6
 
+# Questions pre-generated at begin-discovery are stored under this sentinel user and
+# copied to participants as they ask for more, so most reads skip the LLM round trip.
+QUESTION_POOL_USER_ID = "__question_pool__"
+
+# Pre-generation budget (env-configurable)
+DISCOVERY_PREGEN_MAX_WORKERS = int(os.getenv("DISCOVERY_PREGEN_MAX_WORKERS", "4"))
+DISCOVERY_PREGEN_QUESTIONS_PER_TRACE = int(os.getenv("DISCOVERY_PREGEN_QUESTIONS_PER_TRACE", "3"))
+
+# Discovery summary map-reduce budget (env-configurable)
+DISCOVERY_SUMMARY_MAX_WORKERS = int(os.getenv("DISCOVERY_SUMMARY_MAX_WORKERS", "8"))
+SUMMARY_FINDINGS_PER_CHUNK = 50  # Finding lines per map call (overall summary + disagreements)
+SUMMARY_BLOCKS_PER_CALL = 10  # Trace/user blocks per SummarizeTraces/SummarizeUsers call
+SUMMARY_MERGE_FAN_IN = 4  # Partial overall summaries merged per reduce call
+
+# Workshops with a pre-generation run in flight (one run per workshop at a time)
+_pregeneration_active: set[str] = set()
+_pregeneration_lock = threading.Lock()
+
 
 class DiscoveryService:
     def __init__(self, db: Session):
@@ -248,6 +272,11 @@ class DiscoveryService:
                 "coverage": coverage,
             }
 
+        # Serve from the pre-generated pool when it has something new for this user.
+        pooled = self._take_pooled_question(workshop_id, trace_id, user_id, existing_questions, coverage)
+        if pooled is not None:
+            return self._questions_response_after_add(fixed_question, existing_questions, existing_questions_raw, pooled)
+
         # Collect existing findings to steer the question towards novel insights / themes.
         user_prior_finding_text = ""
         other_findings_texts: list[str] = []
@@ -270,10 +299,8 @@ class DiscoveryService:
         # Detect if there's a potential disagreement
         has_disagreement = self._detect_disagreement(user_prior_finding_text, other_findings_texts)
 
-        # Need MLflow config (Databricks host) + token in order to call model serving.
-        mlflow_config = self.db_service.get_mlflow_config(workshop_id)
-        if not mlflow_config:
-            logger.warning("Discovery question generation requested but MLflow config missing; falling back to fixed.")
+        credentials = self._question_llm_credentials(workshop_id)
+        if credentials is None:
             return {
                 "questions": [fixed_question, *existing_questions],
                 "can_generate_more": True,
@@ -281,13 +308,34 @@ class DiscoveryService:
                 "coverage": coverage,
             }
 
-        from server.services.token_storage_service import token_storage
+        try:
+            lm, predictor = self._build_question_predictor(model_name, *credentials)
+            generated = self._generate_question(
+                lm,
+                predictor,
+                workshop_id=workshop_id,
+                user_id=user_id,
+                trace=trace,
+                previous_prompts=[str(q.get("prompt") or "").strip() for q in existing_questions if q.get("prompt")],
+                user_prior_finding=user_prior_finding_text,
+                other_findings=other_findings_texts,
+                coverage=coverage,
+                has_disagreement=has_disagreement,
+            )
 
-        databricks_token = token_storage.get_token(workshop_id) or self.db_service.get_databricks_token(workshop_id)
-        if not databricks_token:
-            logger.warning(
-                "Discovery question generation requested but Databricks token missing; falling back to fixed."
+            created = self.db_service.add_discovery_question(
+                workshop_id=workshop_id,
+                trace_id=trace_id,
+                user_id=user_id,
+                prompt=generated["prompt"],
+                placeholder=generated["placeholder"],
+                category=generated["category"],
             )
+            return self._questions_response_after_add(fixed_question, existing_questions, existing_questions_raw, created)
+
+        except Exception as e:
+            # Safety fallback: return fixed + any existing questions.
+            logger.exception("Failed to generate discovery questions via DSPy; falling back to fixed: %s", e)
             return {
                 "questions": [fixed_question, *existing_questions],
                 "can_generate_more": True,
@@ -295,120 +343,231 @@ class DiscoveryService:
                 "coverage": coverage,
             }
 
-        try:
-            from server.services.discovery_dspy import (
-                build_databricks_lm,
-                get_predictor,
-                get_question_signature,
-                run_predict,
-            )
+    def _questions_response_after_add(
+        self,
+        fixed_question: dict[str, Any],
+        existing_questions: list[dict],
+        existing_questions_raw: list[dict[str, Any]],
+        created: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Build the get_discovery_questions response after a new question was stored for the user."""
+        existing_questions.append(
+            {
+                "id": str(created["id"]),
+                "prompt": str(created["prompt"]),
+                "placeholder": (str(created["placeholder"]).strip() if created.get("placeholder") is not None else None),
+                "category": created.get("category"),
+            }
+        )
 
-            GenerateDiscoveryQuestion = get_question_signature()
-            lm = build_databricks_lm(
-                endpoint_name=model_name,
-                workspace_url=mlflow_config.databricks_host,
-                token=databricks_token,
-                temperature=0.2,
-            )
-            predictor = get_predictor(GenerateDiscoveryQuestion, lm, temperature=0.2, max_tokens=300)
+        # Recompute coverage after adding new question
+        updated_coverage = self._compute_coverage(existing_questions_raw + [{"category": created.get("category")}])
+        new_generated_count = len(existing_questions)
+        can_generate = len(updated_coverage["missing"]) > 0 and new_generated_count < MAX_GENERATED_QUESTIONS_PER_TRACE
 
-            trace_context_json = json.dumps(trace.context, ensure_ascii=False) if trace.context is not None else ""
-            previous_prompts = [str(q.get("prompt") or "").strip() for q in existing_questions if q.get("prompt")]
-            other_findings_trimmed = [
-                self._trim(txt, 600) for txt in other_findings_texts if txt and self._trim(txt, 600)
-            ]
+        return {
+            "questions": [fixed_question, *existing_questions],
+            "can_generate_more": can_generate,
+            "stop_reason": None
+            if can_generate
+            else (
+                "All categories covered"
+                if len(updated_coverage["missing"]) == 0
+                else f"Maximum questions reached ({MAX_GENERATED_QUESTIONS_PER_TRACE})"
+            ),
+            "coverage": updated_coverage,
+        }
 
-            result = run_predict(
-                predictor,
-                lm,
-                workshop_id=workshop_id,
-                user_id=user_id,
-                trace_id=trace_id,
-                trace_input=self._trim(trace.input or "", 2000),
-                trace_output=self._trim(trace.output or "", 2000),
-                trace_context_json=self._trim(trace_context_json, 2000),
-                user_prior_finding=self._trim(user_prior_finding_text, 1200),
-                previous_questions=previous_prompts,
-                other_users_findings=other_findings_trimmed,
-                covered_categories=coverage["covered"],
-                missing_categories=coverage["missing"],
-                has_disagreement=has_disagreement,
-            )
+    def _question_llm_credentials(self, workshop_id: str) -> tuple[str, str] | None:
+        """Return (databricks_host, token) for question generation, or None if unavailable."""
+        # Need MLflow config (Databricks host) + token in order to call model serving.
+        mlflow_config = self.db_service.get_mlflow_config(workshop_id)
+        if not mlflow_config:
+            logger.warning("Discovery question generation requested but MLflow config missing; falling back to fixed.")
+            return None
 
-            # DSPy returns a Prediction-like object; grab the structured output.
-            q_obj = getattr(result, "question", None)
-            if q_obj is None:
-                raise ValueError("DSPy output missing `question`")
+        from server.services.token_storage_service import token_storage
 
-            # Support either a pydantic model or a dict-like.
-            q_prompt = getattr(q_obj, "prompt", None) if not isinstance(q_obj, dict) else q_obj.get("prompt")
-            q_placeholder = (
-                getattr(q_obj, "placeholder", None) if not isinstance(q_obj, dict) else q_obj.get("placeholder")
+        databricks_token = token_storage.get_token(workshop_id) or self.db_service.get_databricks_token(workshop_id)
+        if not databricks_token:
+            logger.warning(
+                "Discovery question generation requested but Databricks token missing; falling back to fixed."
             )
-            q_category = getattr(q_obj, "category", None) if not isinstance(q_obj, dict) else q_obj.get("category")
+            return None
 
-            q_prompt = str(q_prompt or "").strip()
-            if not q_prompt:
-                raise ValueError("DSPy returned empty question prompt")
+        return mlflow_config.databricks_host, databricks_token
 
-            # Validate category
-            if q_category and q_category not in QUESTION_CATEGORIES:
-                q_category = coverage["missing"][0] if coverage["missing"] else None
+    @staticmethod
+    def _build_question_predictor(model_name: str, workspace_url: str, token: str) -> tuple[Any, Any]:
+        from server.services.discovery_dspy import build_databricks_lm, get_predictor, get_question_signature
 
-            generated = {
-                "prompt": q_prompt,
-                "placeholder": (str(q_placeholder).strip() if q_placeholder else None),
-                "category": q_category,
-            }
+        GenerateDiscoveryQuestion = get_question_signature()
+        lm = build_databricks_lm(
+            endpoint_name=model_name,
+            workspace_url=workspace_url,
+            token=token,
+            temperature=0.2,
+        )
+        predictor = get_predictor(GenerateDiscoveryQuestion, lm, temperature=0.2, max_tokens=300)
+        return lm, predictor
 
-            created = self.db_service.add_discovery_question(
+    def _generate_question(
+        self,
+        lm: Any,
+        predictor: Any,
+        *,
+        workshop_id: str,
+        user_id: str,
+        trace: Any,
+        previous_prompts: list[str],
+        user_prior_finding: str,
+        other_findings: list[str],
+        coverage: dict[str, Any],
+        has_disagreement: bool,
+    ) -> dict[str, Any]:
+        """Run the question signature once and return a validated {prompt, placeholder, category}."""
+        from server.services.discovery_dspy import run_predict
+
+        trace_context_json = json.dumps(trace.context, ensure_ascii=False) if trace.context is not None else ""
+        other_findings_trimmed = [self._trim(txt, 600) for txt in other_findings if txt and self._trim(txt, 600)]
+
+        result = run_predict(
+            predictor,
+            lm,
+            workshop_id=workshop_id,
+            user_id=user_id,
+            trace_id=trace.id,
+            trace_input=self._trim(trace.input or "", 2000),
+            trace_output=self._trim(trace.output or "", 2000),
+            trace_context_json=self._trim(trace_context_json, 2000),
+            user_prior_finding=self._trim(user_prior_finding, 1200),
+            previous_questions=previous_prompts,
+            other_users_findings=other_findings_trimmed,
+            covered_categories=coverage["covered"],
+            missing_categories=coverage["missing"],
+            has_disagreement=has_disagreement,
+        )
+
+        # DSPy returns a Prediction-like object; grab the structured output.
+        q_obj = getattr(result, "question", None)
+        if q_obj is None:
+            raise ValueError("DSPy output missing `question`")
+
+        # Support either a pydantic model or a dict-like.
+        q_prompt = getattr(q_obj, "prompt", None) if not isinstance(q_obj, dict) else q_obj.get("prompt")
+        q_placeholder = getattr(q_obj, "placeholder", None) if not isinstance(q_obj, dict) else q_obj.get("placeholder")
+        q_category = getattr(q_obj, "category", None) if not isinstance(q_obj, dict) else q_obj.get("category")
+
+        q_prompt = str(q_prompt or "").strip()
+        if not q_prompt:
+            raise ValueError("DSPy returned empty question prompt")
+
+        # Validate category
+        if q_category and q_category not in QUESTION_CATEGORIES:
+            q_category = coverage["missing"][0] if coverage["missing"] else None
+
+        return {
+            "prompt": q_prompt,
+            "placeholder": (str(q_placeholder).strip() if q_placeholder else None),
+            "category": q_category,
+        }
+
+    # ---------------------------------------------------------------------
+    # Pre-generated question pool
+    # ---------------------------------------------------------------------
+    def _take_pooled_question(
+        self,
+        workshop_id: str,
+        trace_id: str,
+        user_id: str,
+        existing_questions: list[dict],
+        coverage: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Copy the next useful pre-generated question to the user, or return None.
+
+        A pooled question is useful if the user hasn't seen its prompt yet and it
+        targets a category the user still has missing.
+        """
+        pool = self.db_service.get_discovery_questions(workshop_id, trace_id, QUESTION_POOL_USER_ID)
+        if not pool:
+            return None
+
+        seen_prompts = {q["prompt"] for q in existing_questions}
+        for q in pool:
+            if q.get("prompt") in seen_prompts or q.get("category") not in coverage["missing"]:
+                continue
+            return self.db_service.add_discovery_question(
                 workshop_id=workshop_id,
                 trace_id=trace_id,
                 user_id=user_id,
-                prompt=generated["prompt"],
-                placeholder=generated["placeholder"],
-                category=generated["category"],
-            )
-            existing_questions.append(
-                {
-                    "id": str(created["id"]),
-                    "prompt": str(created["prompt"]),
-                    "placeholder": (
-                        str(created["placeholder"]).strip() if created.get("placeholder") is not None else None
-                    ),
-                    "category": created.get("category"),
-                }
+                prompt=q["prompt"],
+                placeholder=q.get("placeholder"),
+                category=q.get("category"),
             )
+        return None
 
-            # Recompute coverage after adding new question
-            updated_coverage = self._compute_coverage(existing_questions_raw + [{"category": generated["category"]}])
-            new_generated_count = len(existing_questions)
-            can_generate = (
-                len(updated_coverage["missing"]) > 0 and new_generated_count < MAX_GENERATED_QUESTIONS_PER_TRACE
-            )
+    def question_generator_for(self, workshop_id: str) -> tuple[Any, Any] | None:
+        """Build the (lm, predictor) pair for a workshop, or None if generation isn't configured."""
+        workshop = self._get_workshop_or_404(workshop_id)
+        model_name = (getattr(workshop, "discovery_questions_model_name", None) or "demo").strip()
+        if not model_name or model_name == "demo":
+            return None
 
-            return {
-                "questions": [fixed_question, *existing_questions],
-                "can_generate_more": can_generate,
-                "stop_reason": None
-                if can_generate
-                else (
-                    "All categories covered"
-                    if len(updated_coverage["missing"]) == 0
-                    else f"Maximum questions reached ({MAX_GENERATED_QUESTIONS_PER_TRACE})"
-                ),
-                "coverage": updated_coverage,
-            }
+        credentials = self._question_llm_credentials(workshop_id)
+        if credentials is None:
+            return None
+        return self._build_question_predictor(model_name, *credentials)
 
-        except Exception as e:
-            # Safety fallback: return fixed + any existing questions.
-            logger.exception("Failed to generate discovery questions via DSPy; falling back to fixed: %s", e)
-            return {
-                "questions": [fixed_question, *existing_questions],
-                "can_generate_more": True,
-                "stop_reason": None,
-                "coverage": coverage,
-            }
+    def pregenerate_trace_questions(
+        self,
+        workshop_id: str,
+        trace_id: str,
+        lm: Any,
+        predictor: Any,
+        target: int = DISCOVERY_PREGEN_QUESTIONS_PER_TRACE,
+    ) -> int:
+        """Fill the question pool for one trace up to ``target`` questions.
+
+        Each question is steered towards a category the pool doesn't cover yet.
+        'disagreements' is left to on-demand generation since it depends on
+        participants' findings. Returns the number of questions created.
+        """
+        trace = self.db_service.get_trace(trace_id)
+        if not trace or trace.workshop_id != workshop_id:
+            return 0
+
+        pool = self.db_service.get_discovery_questions(workshop_id, trace_id, QUESTION_POOL_USER_ID)
+        created = 0
+        while len(pool) < target:
+            coverage = self._compute_coverage(pool)
+            missing = [c for c in coverage["missing"] if c != "disagreements"]
+            if not missing:
+                break
+
+            generated = self._generate_question(
+                lm,
+                predictor,
+                workshop_id=workshop_id,
+                user_id=QUESTION_POOL_USER_ID,
+                trace=trace,
+                previous_prompts=[q["prompt"] for q in pool],
+                user_prior_finding="",
+                other_findings=[],
+                coverage={"covered": coverage["covered"], "missing": missing},
+                has_disagreement=False,
+            )
+            pool.append(
+                self.db_service.add_discovery_question(
+                    workshop_id=workshop_id,
+                    trace_id=trace_id,
+                    user_id=QUESTION_POOL_USER_ID,
+                    prompt=generated["prompt"],
+                    placeholder=generated["placeholder"],
+                    category=generated["category"],
+                )
+            )
+            created += 1
+        return created
 
     def set_discovery_questions_model(self, workshop_id: str, model_name: str) -> str:
         self._get_workshop_or_404(workshop_id)
@@ -418,7 +577,7 @@ class DiscoveryService:
         return updated.discovery_questions_model_name
 
     # ---------------------------------------------------------------------
-    # Discovery summaries (iterative pipeline)
+    # Discovery summaries (map-reduce pipeline)
     # ---------------------------------------------------------------------
     def _chunk_list(self, items: list, chunk_size: int) -> list:
         """Split a list into chunks of specified size."""
@@ -454,20 +613,22 @@ class DiscoveryService:
         if not by_user or not themes:
             return {"theme_agreement": {}, "overall_alignment_score": 0.0}
 
+        # Inverted index token -> users, built in one pass over the findings
+        users_by_token: dict[str, set] = {}
+        for uid, user_findings in by_user.items():
+            for f in user_findings:
+                for token in tokenize(f.get("insight")):
+                    users_by_token.setdefault(token, set()).add(uid)
+
         theme_agreement: dict = {}
         user_count = len(by_user)
 
         for theme in themes[:20]:  # Limit to first 20 themes
-            theme_lower = theme.lower()
-            users_mentioning = 0
-            for _uid, user_findings in by_user.items():
-                # Check if any of the user's findings mention this theme
-                for f in user_findings:
-                    insight = (f.get("insight") or "").lower()
-                    if theme_lower in insight or any(word in insight for word in theme_lower.split()[:3]):
-                        users_mentioning += 1
-                        break
-            theme_agreement[theme] = users_mentioning / user_count if user_count > 0 else 0.0
+            # A user mentions a theme if any of its first 3 content words appear in their findings
+            users_mentioning: set = set()
+            for token in tokenize(theme)[:3]:
+                users_mentioning |= users_by_token.get(token, set())
+            theme_agreement[theme] = len(users_mentioning) / user_count if user_count > 0 else 0.0
 
         # Overall alignment = average agreement across themes
         if theme_agreement:
@@ -499,17 +660,135 @@ class DiscoveryService:
 
         return has_enough_questions and has_alignment and has_surfaced_disagreements
 
+    @staticmethod
+    def _pack_trace_chunks(trace_line_groups: list[list[str]], chunk_size: int) -> list[list[str]]:
+        """Pack per-trace line groups into chunks of about ``chunk_size`` lines without splitting a trace.
+
+        A trace with more than ``chunk_size`` lines gets a chunk of its own.
+        """
+        chunks: list[list[str]] = []
+        current: list[str] = []
+        for lines in trace_line_groups:
+            if current and len(current) + len(lines) > chunk_size:
+                chunks.append(current)
+                current = []
+            current.extend(lines)
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _as_dict(obj: Any) -> dict | None:
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump()
+        if isinstance(obj, dict):
+            return obj
+        return None
+
+    def _as_dict_list(self, items: Any) -> list[dict]:
+        if not items or not isinstance(items, list):
+            return []
+        return [d for d in (self._as_dict(item) for item in items) if d is not None]
+
+    @staticmethod
+    def _gather(futures: list, label: str) -> list:
+        """Collect future results in order; failures are logged and become None."""
+        results = []
+        for index, future in enumerate(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning("%s %d/%d failed, continuing: %s", label, index + 1, len(futures), e)
+                results.append(None)
+        return results
+
+    @staticmethod
+    def _overall_summary_lines(summary: Any) -> list[str]:
+        """Flatten a partial overall summary into lines the refine signature can incorporate."""
+        lines = []
+        for field_name, label in (
+            ("themes", "THEME"),
+            ("patterns", "PATTERN"),
+            ("tendencies", "TENDENCY"),
+            ("risks_or_failure_modes", "RISK"),
+            ("strengths", "STRENGTH"),
+        ):
+            lines.extend(f"{label}: {item}" for item in getattr(summary, field_name, []) or [])
+        return lines
+
+    @staticmethod
+    def _union_overall_summaries(summaries: list, summary_cls: type) -> Any:
+        """Local fallback merge: de-duplicated union of every list field."""
+        merged: dict[str, list[str]] = {}
+        for field_name in ("themes", "patterns", "tendencies", "risks_or_failure_modes", "strengths"):
+            seen: dict[str, str] = {}
+            for summary in summaries:
+                for item in getattr(summary, field_name, []) or []:
+                    seen.setdefault(str(item).strip().lower(), item)
+            merged[field_name] = list(seen.values())
+        return summary_cls(**merged)
+
+    def _reduce_overall_summaries(self, executor: Any, refine: Any, partials: list, summary_cls: type) -> Any:
+        """Merge partial overall summaries in rounds of SUMMARY_MERGE_FAN_IN until one remains.
+
+        Each round's merges run concurrently. A failed merge falls back to a local union
+        so no partial is dropped.
+        """
+        if not partials:
+            return summary_cls()
+
+        while len(partials) > 1:
+            groups = self._chunk_list(partials, SUMMARY_MERGE_FAN_IN)
+            futures = [
+                executor.submit(
+                    refine, group[0], [line for p in group[1:] for line in self._overall_summary_lines(p)]
+                )
+                if len(group) > 1
+                else None
+                for group in groups
+            ]
+            merged = []
+            for group, future in zip(groups, futures, strict=True):
+                if future is None:
+                    merged.append(group[0])
+                    continue
+                try:
+                    merged.append(future.result())
+                except Exception as e:
+                    logger.warning("Overall summary merge failed, using local union: %s", e)
+                    merged.append(self._union_overall_summaries(group, summary_cls))
+            partials = merged
+        return partials[0]
+
+    @staticmethod
+    def _merge_disagreements(chunk_results: list) -> list[dict]:
+        """Combine per-chunk disagreements, folding ones with the same theme together."""
+        by_theme: dict[str, dict] = {}
+        for disagreements in chunk_results:
+            for d in disagreements or []:
+                theme = str(d.get("theme") or "").strip()
+                if not theme:
+                    continue
+                merged = by_theme.setdefault(theme.lower(), {"theme": theme, "trace_ids": [], "viewpoints": []})
+                for key in ("trace_ids", "viewpoints"):
+                    for value in d.get(key) or []:
+                        if value not in merged[key]:
+                            merged[key].append(value)
+        return list(by_theme.values())
+
     def generate_discovery_summaries(self, workshop_id: str, refresh: bool = False) -> dict[str, Any]:
-        """Generate discovery summaries using iterative pipeline.
+        """Generate discovery summaries using a map-reduce pipeline.
 
         Steps:
-        A. Iteratively refine overall summary from finding chunks
-        B. Extract candidate rubric questions
-        C. Identify key disagreements
-        D. Generate discussion prompts
-        E. Compute convergence metrics
-        F. Determine ready-for-rubric signal
-        G. Aggregate by trace and by user
+        A. Map: summarize finding chunks, identify disagreements per chunk and
+           summarize trace/user batches, all concurrently
+        B. Reduce: merge partial overall summaries hierarchically and merge disagreements
+        C. Extract candidate rubric questions and generate discussion prompts (concurrently)
+        D. Compute convergence metrics
+        E. Determine ready-for-rubric signal
+
+        All findings, traces and users are included; wall-clock time is roughly
+        map + reduce depth + one final round of LLM calls.
         """
         workshop = self._get_workshop_or_404(workshop_id)
 
@@ -544,12 +823,18 @@ class DiscoveryService:
                 "ready_for_rubric": False,
             }
 
-        # Format corpus lines
-        corpus_lines: list = []
-        for f in findings[:300]:
-            corpus_lines.append(
-                f"TRACE {f.get('trace_id')} | USER {f.get('user_name')} ({f.get('user_id')}): {self._trim(f.get('insight') or '', 800)}"
-            )
+        # Format corpus chunks; a trace's findings stay in one chunk so disagreements on it are seen together
+        trace_groups = self._group_findings_by_trace(findings)
+        corpus_chunks = self._pack_trace_chunks(
+            [
+                [
+                    f"TRACE {f.get('trace_id')} | USER {f.get('user_name')} ({f.get('user_id')}): {self._trim(f.get('insight') or '', 800)}"
+                    for f in tfindings
+                ]
+                for tfindings in trace_groups.values()
+            ],
+            SUMMARY_FINDINGS_PER_CHUNK,
+        )
 
         mlflow_config = self.db_service.get_mlflow_config(workshop_id)
         if not mlflow_config:
@@ -578,81 +863,102 @@ class DiscoveryService:
                 token=databricks_token,
                 temperature=0.2,
             )
+            refine_predictor = get_predictor(sigs["RefineOverallSummary"], lm, temperature=0.2)
+            extract_predictor = get_predictor(sigs["ExtractRubricCandidates"], lm, temperature=0.2)
+            disagree_predictor = get_predictor(sigs["IdentifyDisagreements"], lm, temperature=0.2)
+            prompts_predictor = get_predictor(sigs["GenerateDiscussionPrompts"], lm, temperature=0.2)
+            trace_predictor = get_predictor(sigs["SummarizeTraces"], lm, temperature=0.2)
+            user_predictor = get_predictor(sigs["SummarizeUsers"], lm, temperature=0.2)
+
+            def refine(current_state, lines: list[str]):
+                result = run_predict(refine_predictor, lm, current_state=current_state, findings_chunk=lines)
+                updated = self._as_dict(getattr(result, "updated_state", None))
+                if updated is None:
+                    raise ValueError("DSPy output missing `updated_state`")
+                return DiscoveryOverallSummary(**updated)
+
+            def identify_disagreements(lines: list[str]) -> list[dict]:
+                result = run_predict(disagree_predictor, lm, findings=lines)
+                return self._as_dict_list(getattr(result, "disagreements", None))
+
+            def summarize_traces(blocks: list[str]) -> list[dict]:
+                result = run_predict(trace_predictor, lm, trace_findings_blocks=blocks)
+                return self._as_dict_list(getattr(result, "summaries", None))
+
+            def summarize_users(blocks: list[str]) -> list[dict]:
+                result = run_predict(user_predictor, lm, user_findings_blocks=blocks)
+                return self._as_dict_list(getattr(result, "summaries", None))
+
+            # Per-trace and per-user blocks, batched so each call stays small
+            trace_blocks = []
+            for tid, tfindings in trace_groups.items():
+                block_lines = [f"TRACE {tid}:"]
+                for f in tfindings:
+                    block_lines.append(f"  - {f.get('user_name')}: {self._trim(f.get('insight') or '', 200)}")
+                trace_blocks.append("\n".join(block_lines))
+
+            user_blocks = []
+            for uid, ufindings in self._group_findings_by_user(findings).items():
+                uname = ufindings[0].get("user_name", uid) if ufindings else uid
+                block_lines = [f"USER {uname} ({uid}):"]
+                for f in ufindings:
+                    block_lines.append(f"  - Trace {f.get('trace_id')}: {self._trim(f.get('insight') or '', 200)}")
+                user_blocks.append("\n".join(block_lines))
+
+            # Summary fan-out runs at batch priority so SME-facing calls are admitted first
+            with ThreadPoolExecutor(
+                max_workers=max(1, DISCOVERY_SUMMARY_MAX_WORKERS),
+                thread_name_prefix="discovery-summary",
+                initializer=mark_batch_thread,
+            ) as executor:
+                # Map: every corpus chunk, trace batch and user batch in one concurrent round
+                overall_futures = [executor.submit(refine, DiscoveryOverallSummary(), c) for c in corpus_chunks]
+                disagreement_futures = [executor.submit(identify_disagreements, c) for c in corpus_chunks]
+                trace_futures = [
+                    executor.submit(summarize_traces, b) for b in self._chunk_list(trace_blocks, SUMMARY_BLOCKS_PER_CALL)
+                ]
+                user_futures = [
+                    executor.submit(summarize_users, b) for b in self._chunk_list(user_blocks, SUMMARY_BLOCKS_PER_CALL)
+                ]
+
+                # Reduce: merge partial overall summaries hierarchically
+                partials = [p for p in self._gather(overall_futures, "Overall summary chunk") if p is not None]
+                overall_state = self._reduce_overall_summaries(executor, refine, partials, DiscoveryOverallSummary)
+
+                key_disagreements = self._merge_disagreements(
+                    self._gather(disagreement_futures, "Disagreement identification chunk")
+                )
 
-            # Step A: Iteratively refine overall summary
-            overall_state = DiscoveryOverallSummary()
-            chunks = self._chunk_list(corpus_lines, 50)
+                # Final round: rubric candidates and discussion prompts only depend on the reduced results
+                candidates_future = executor.submit(
+                    run_predict, extract_predictor, lm, overall_summary=overall_state
+                )
+                prompts_future = executor.submit(
+                    run_predict,
+                    prompts_predictor,
+                    lm,
+                    themes=overall_state.themes[:10],
+                    disagreements=[KeyDisagreement(**d) for d in key_disagreements],
+                )
 
-            RefineOverallSummary = sigs["RefineOverallSummary"]
-            refine_predictor = get_predictor(RefineOverallSummary, lm, temperature=0.2)
+                by_trace = [s for batch in self._gather(trace_futures, "Trace summarization batch") for s in batch or []]
+                by_user = [s for batch in self._gather(user_futures, "User summarization batch") for s in batch or []]
 
-            for chunk in chunks[:6]:  # Limit to 6 chunks (300 findings max)
+                # Step B: Extract candidate rubric questions
+                candidate_rubric_questions: list = []
                 try:
-                    result = run_predict(
-                        refine_predictor,
-                        lm,
-                        current_state=overall_state,
-                        findings_chunk=chunk,
-                    )
-                    updated = getattr(result, "updated_state", None)
-                    if updated:
-                        if hasattr(updated, "model_dump"):
-                            overall_state = DiscoveryOverallSummary(**updated.model_dump())
-                        elif isinstance(updated, dict):
-                            overall_state = DiscoveryOverallSummary(**updated)
+                    candidates = getattr(candidates_future.result(), "candidates", None)
+                    if candidates and isinstance(candidates, list):
+                        candidate_rubric_questions = [str(c) for c in candidates if c][:10]
                 except Exception as e:
-                    logger.warning("Refinement step failed, continuing: %s", e)
+                    logger.warning("Rubric candidate extraction failed: %s", e)
 
-            # Step B: Extract candidate rubric questions
-            candidate_rubric_questions: list = []
-            try:
-                ExtractRubricCandidates = sigs["ExtractRubricCandidates"]
-                extract_predictor = get_predictor(ExtractRubricCandidates, lm, temperature=0.2)
-                result = run_predict(extract_predictor, lm, overall_summary=overall_state)
-                candidates = getattr(result, "candidates", None)
-                if candidates and isinstance(candidates, list):
-                    candidate_rubric_questions = [str(c) for c in candidates if c][:10]
-            except Exception as e:
-                logger.warning("Rubric candidate extraction failed: %s", e)
-
-            # Step C: Identify key disagreements
-            key_disagreements: list = []
-            try:
-                IdentifyDisagreements = sigs["IdentifyDisagreements"]
-                disagree_predictor = get_predictor(IdentifyDisagreements, lm, temperature=0.2)
-                result = run_predict(disagree_predictor, lm, findings=corpus_lines)
-                disagreements = getattr(result, "disagreements", None)
-                if disagreements and isinstance(disagreements, list):
-                    for d in disagreements[:10]:
-                        if hasattr(d, "model_dump"):
-                            key_disagreements.append(d.model_dump())
-                        elif isinstance(d, dict):
-                            key_disagreements.append(d)
-            except Exception as e:
-                logger.warning("Disagreement identification failed: %s", e)
-
-            # Step D: Generate discussion prompts
-            discussion_prompts: list = []
-            try:
-                GenerateDiscussionPrompts = sigs["GenerateDiscussionPrompts"]
-                prompts_predictor = get_predictor(GenerateDiscussionPrompts, lm, temperature=0.2)
-                # Pass key disagreements as list of KeyDisagreement objects
-                disagreement_objs = [KeyDisagreement(**d) for d in key_disagreements]
-                result = run_predict(
-                    prompts_predictor,
-                    lm,
-                    themes=overall_state.themes[:10],
-                    disagreements=disagreement_objs,
-                )
-                prompts = getattr(result, "prompts", None)
-                if prompts and isinstance(prompts, list):
-                    for p in prompts[:10]:
-                        if hasattr(p, "model_dump"):
-                            discussion_prompts.append(p.model_dump())
-                        elif isinstance(p, dict):
-                            discussion_prompts.append(p)
-            except Exception as e:
-                logger.warning("Discussion prompt generation failed: %s", e)
+                # Step D: Generate discussion prompts
+                discussion_prompts: list = []
+                try:
+                    discussion_prompts = self._as_dict_list(getattr(prompts_future.result(), "prompts", None))[:10]
+                except Exception as e:
+                    logger.warning("Discussion prompt generation failed: %s", e)
 
             # Step E: Compute convergence metrics (non-LLM)
             convergence = self._compute_convergence_metrics(findings, overall_state.themes)
@@ -662,58 +968,6 @@ class DiscoveryService:
                 candidate_rubric_questions, convergence, key_disagreements
             )
 
-            # Step G: Aggregate by trace and by user
-            by_trace: list = []
-            by_user: list = []
-
-            try:
-                # Group findings for batch summarization
-                trace_groups = self._group_findings_by_trace(findings)
-                trace_blocks = []
-                for tid, tfindings in list(trace_groups.items())[:20]:
-                    block_lines = [f"TRACE {tid}:"]
-                    for f in tfindings[:10]:
-                        block_lines.append(f"  - {f.get('user_name')}: {self._trim(f.get('insight') or '', 200)}")
-                    trace_blocks.append("\n".join(block_lines))
-
-                if trace_blocks:
-                    SummarizeTraces = sigs["SummarizeTraces"]
-                    trace_predictor = get_predictor(SummarizeTraces, lm, temperature=0.2)
-                    result = run_predict(trace_predictor, lm, trace_findings_blocks=trace_blocks)
-                    summaries = getattr(result, "summaries", None)
-                    if summaries and isinstance(summaries, list):
-                        for s in summaries:
-                            if hasattr(s, "model_dump"):
-                                by_trace.append(s.model_dump())
-                            elif isinstance(s, dict):
-                                by_trace.append(s)
-            except Exception as e:
-                logger.warning("Trace summarization failed: %s", e)
-
-            try:
-                user_groups = self._group_findings_by_user(findings)
-                user_blocks = []
-                for uid, ufindings in list(user_groups.items())[:20]:
-                    uname = ufindings[0].get("user_name", uid) if ufindings else uid
-                    block_lines = [f"USER {uname} ({uid}):"]
-                    for f in ufindings[:10]:
-                        block_lines.append(f"  - Trace {f.get('trace_id')}: {self._trim(f.get('insight') or '', 200)}")
-                    user_blocks.append("\n".join(block_lines))
-
-                if user_blocks:
-                    SummarizeUsers = sigs["SummarizeUsers"]
-                    user_predictor = get_predictor(SummarizeUsers, lm, temperature=0.2)
-                    result = run_predict(user_predictor, lm, user_findings_blocks=user_blocks)
-                    summaries = getattr(result, "summaries", None)
-                    if summaries and isinstance(summaries, list):
-                        for s in summaries:
-                            if hasattr(s, "model_dump"):
-                                by_user.append(s.model_dump())
-                            elif isinstance(s, dict):
-                                by_user.append(s)
-            except Exception as e:
-                logger.warning("User summarization failed: %s", e)
-
             # Build final payload
             payload = {
                 "overall": overall_state.model_dump() if hasattr(overall_state, "model_dump") else {},
@@ -770,7 +1024,7 @@ class DiscoveryService:
     def begin_discovery_phase(
         self, workshop_id: str, trace_limit: int | None = None, randomize: bool = False
     ) -> dict[str, Any]:
-        self._get_workshop_or_404(workshop_id)
+        workshop = self._get_workshop_or_404(workshop_id)
 
         # Update workshop phase to discovery and mark discovery as started
         self.db_service.update_workshop_phase(workshop_id, WorkshopPhase.DISCOVERY)
@@ -802,6 +1056,9 @@ class DiscoveryService:
             traces_used = total_traces
 
         self.db_service.update_active_discovery_traces(workshop_id, trace_ids_to_use)
+        pregenerating = start_question_pregeneration(
+            workshop_id, trace_ids_to_use, getattr(workshop, "discovery_questions_model_name", None)
+        )
 
         return {
             "message": f"Discovery phase started with {traces_used} traces from {total_traces} total (each user will see traces in randomized order)",
@@ -809,6 +1066,7 @@ class DiscoveryService:
             "total_traces": total_traces,
             "traces_used": traces_used,
             "trace_limit": trace_limit,
+            "questions_pregenerating": pregenerating,
         }
 
     def reset_discovery(self, workshop_id: str) -> dict[str, Any]:
@@ -1087,7 +1345,8 @@ class DiscoveryService:
         This method:
         1. Classifies finding into category using LLM (or falls back to keyword-based)
         2. Persists finding with category to database
-        3. Runs disagreement detection
+        3. Screens it against the trace's other findings locally and runs disagreement
+           detection only on related findings that might conflict
         4. Returns classified finding
         """
         self._get_workshop_or_404(workshop_id)
@@ -1113,9 +1372,18 @@ class DiscoveryService:
         # Persist the classified finding to database
         saved_finding = self.db_service.add_classified_finding(workshop_id, finding_data)
 
-        # Run disagreement detection against other findings for this trace
+        # Run disagreement detection against other findings for this trace, but only when the
+        # local similarity screen finds another participant's finding that might conflict
         trace_findings = self.db_service.get_classified_findings_by_trace(workshop_id, trace_id)
-        await self._detect_disagreements_with_llm(workshop_id, trace_id, trace_findings, trace)
+        finding_id = str(saved_finding.get("id") or "")
+        screen = screen_finding(workshop_id, trace_id, finding_id, trace_findings)
+        if screen.needs_llm:
+            if screen.candidate_ids:
+                candidate_ids = {finding_id, *screen.candidate_ids}
+                trace_findings = [f for f in trace_findings if str(f.get("id")) in candidate_ids]
+            await self._detect_disagreements_with_llm(workshop_id, trace_id, trace_findings, trace)
+        else:
+            logger.debug("Skipping disagreement detection for finding %s: %s", finding_id, screen.reason)
 
         result = {
             "id": saved_finding.get("id"),
@@ -1582,9 +1850,9 @@ class DiscoveryService:
         return True
 
     def suggest_draft_rubric_groups(
-        self, workshop_id: str
+        self, workshop_id: str, method: str = "local"
     ) -> list[dict[str, Any]]:
-        """LLM-suggested grouping of draft rubric items."""
+        """Suggested grouping of draft rubric items (local clustering, optionally LLM-refined)."""
         self._get_workshop_or_404(workshop_id)
         items = self.db_service.get_draft_rubric_items(workshop_id)
 
@@ -1594,7 +1862,7 @@ class DiscoveryService:
         from server.services.draft_rubric_grouping_service import DraftRubricGroupingService
 
         grouping_service = DraftRubricGroupingService(self.db)
-        return grouping_service.suggest_groups(workshop_id, items)
+        return grouping_service.suggest_groups(workshop_id, items, method=method)
 
     def apply_draft_rubric_groups(
         self, workshop_id: str, groups: list[dict[str, Any]]
@@ -1690,3 +1958,82 @@ class DiscoveryService:
         self.db_service.save_thresholds(workshop_id, trace_id, thresholds)
 
         return {"trace_id": trace_id, "thresholds": thresholds, "updated": True}
+
+
+def start_question_pregeneration(workshop_id: str, trace_ids: list[str], model_name: str | None) -> bool:
+    """Warm the discovery question pool for ``trace_ids`` in a background thread.
+
+    Returns False without starting anything when the workshop uses the demo model,
+    there are no traces, or a run for this workshop is already in flight.
+    """
+    model_name = (model_name or "demo").strip()
+    if not trace_ids or not model_name or model_name == "demo":
+        return False
+
+    with _pregeneration_lock:
+        if workshop_id in _pregeneration_active:
+            return False
+        _pregeneration_active.add(workshop_id)
+
+    threading.Thread(
+        target=run_question_pregeneration,
+        args=(workshop_id, list(trace_ids)),
+        name=f"discovery-pregen-{workshop_id}",
+        daemon=True,
+    ).start()
+    return True
+
+
+def run_question_pregeneration(
+    workshop_id: str,
+    trace_ids: list[str],
+    session_factory: Any = None,
+    max_workers: int = DISCOVERY_PREGEN_MAX_WORKERS,
+    questions_per_trace: int = DISCOVERY_PREGEN_QUESTIONS_PER_TRACE,
+) -> int:
+    """Fill the question pool for each trace, at most ``max_workers`` traces at a time.
+
+    Every worker uses its own session. Failures on one trace are logged and don't
+    stop the others; participants fall back to on-demand generation for that trace.
+    Returns the number of questions created.
+    """
+    if session_factory is None:
+        from server.database import SessionLocal
+
+        session_factory = SessionLocal
+
+    created = 0
+    try:
+        with session_factory() as db:
+            generator = DiscoveryService(db).question_generator_for(workshop_id)
+        if generator is None:
+            return 0
+        lm, predictor = generator
+
+        def _fill(trace_id: str) -> int:
+            with session_factory() as worker_db:
+                return DiscoveryService(worker_db).pregenerate_trace_questions(
+                    workshop_id, trace_id, lm, predictor, target=questions_per_trace
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="discovery-pregen", initializer=mark_batch_thread
+        ) as executor:
+            futures = {executor.submit(_fill, trace_id): trace_id for trace_id in trace_ids}
+            for future in as_completed(futures):
+                try:
+                    created += future.result()
+                except Exception as e:
+                    logger.warning(
+                        "Question pre-generation failed (workshop=%s trace=%s): %s", workshop_id, futures[future], e
+                    )
+
+        logger.info(
+            "Pre-generated %d discovery questions for %d traces in workshop %s", created, len(trace_ids), workshop_id
+        )
+    except Exception as e:
+        logger.exception("Question pre-generation aborted for workshop %s: %s", workshop_id, e)
+    finally:
+        with _pregeneration_lock:
+            _pregeneration_active.discard(workshop_id)
+    return created
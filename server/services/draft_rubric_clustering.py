@@ -0,0 +1,117 @@
+"""Deterministic local clustering of draft rubric item text.
+
+TF-IDF vectors (NumPy) plus average-linkage agglomerative clustering on cosine
+distance. Merging stops once the closest pair of clusters is further apart than
+``distance_threshold``, so unrelated items stay in their own groups. Runs in
+milliseconds for a few hundred items and gives the same answer every time.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from server.utils.text_similarity import tokenize
+
+# Average cosine distance above which two clusters are not merged
+DEFAULT_DISTANCE_THRESHOLD = 0.8
+
+
+def tfidf_matrix(texts: list[str]) -> tuple[np.ndarray, list[str]]:
+    """Return the L2-normalised TF-IDF matrix (one row per text) and its vocabulary."""
+    token_lists = [tokenize(text) for text in texts]
+    vocabulary = sorted({token for tokens in token_lists for token in tokens})
+    if not vocabulary:
+        return np.zeros((len(texts), 0)), []
+
+    column = {term: j for j, term in enumerate(vocabulary)}
+    counts = np.zeros((len(texts), len(vocabulary)))
+    for i, tokens in enumerate(token_lists):
+        for token in tokens:
+            counts[i, column[token]] += 1
+
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0), vocabulary
+
+
+def agglomerative_clusters(
+    vectors: np.ndarray, distance_threshold: float = DEFAULT_DISTANCE_THRESHOLD
+) -> list[list[int]]:
+    """Average-linkage clustering of normalised row vectors; returns lists of row indices."""
+    n = vectors.shape[0]
+    if n == 0:
+        return []
+
+    distances = 1.0 - vectors @ vectors.T
+    # Rows without any terms are unrelated to everything, themselves included
+    empty = ~vectors.any(axis=1)
+    distances[empty, :] = 1.0
+    distances[:, empty] = 1.0
+    np.fill_diagonal(distances, np.inf)
+
+    members: list[list[int]] = [[i] for i in range(n)]
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+
+    while active.sum() > 1:
+        flat = int(np.argmin(distances))
+        a, b = divmod(flat, n)
+        if distances[a, b] > distance_threshold:
+            break
+        if b < a:
+            a, b = b, a
+
+        # Lance-Williams update for average linkage, then retire b
+        merged = (sizes[a] * distances[a] + sizes[b] * distances[b]) / (sizes[a] + sizes[b])
+        distances[a, :] = merged
+        distances[:, a] = merged
+        distances[a, a] = np.inf
+        distances[b, :] = np.inf
+        distances[:, b] = np.inf
+        sizes[a] += sizes[b]
+        members[a].extend(members[b])
+        members[b] = []
+        active[b] = False
+
+    clusters = [sorted(members[i]) for i in range(n) if active[i]]
+    clusters.sort(key=lambda c: (-len(c), c[0]))
+    return clusters
+
+
+def cluster_items(
+    item_ids: list[str], texts: list[str], distance_threshold: float = DEFAULT_DISTANCE_THRESHOLD
+) -> list[dict[str, Any]]:
+    """Group items by text similarity.
+
+    Returns group dicts shaped like ProposedGroup: ``name`` is the text of the
+    item closest to the group centroid, ``rationale`` lists the group's top terms.
+    """
+    vectors, vocabulary = tfidf_matrix(texts)
+    groups = []
+    for cluster in agglomerative_clusters(vectors, distance_threshold):
+        if len(cluster) == 1 or not vocabulary:
+            index = cluster[0]
+            groups.append(
+                {
+                    "name": texts[index],
+                    "item_ids": [item_ids[i] for i in cluster],
+                    "rationale": "No closely related items.",
+                }
+            )
+            continue
+
+        centroid = vectors[cluster].sum(axis=0)
+        representative = cluster[int(np.argmax(vectors[cluster] @ centroid))]
+        top_terms = [vocabulary[j] for j in np.argsort(-centroid, kind="stable")[:3] if centroid[j] > 0]
+        groups.append(
+            {
+                "name": texts[representative],
+                "item_ids": [item_ids[i] for i in cluster],
+                "rationale": f"Items share the terms: {', '.join(top_terms)}.",
+            }
+        )
+    return groups
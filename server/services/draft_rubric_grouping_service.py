@@ -1,4 +1,8 @@
-"""Service for suggesting groupings of draft rubric items via LLM."""
+"""Service for suggesting groupings of draft rubric items.
+
+Local TF-IDF clustering is the fast default and the fallback; the LLM can
+optionally refine the local clusters into named rubric questions.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from server.models import DraftRubricItem
 from server.services.database_service import DatabaseService
+from server.services.draft_rubric_clustering import cluster_items
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +24,13 @@ class DraftRubricGroupingService:
         self.db_service = DatabaseService(db)
 
     def suggest_groups(
-        self, workshop_id: str, items: list[DraftRubricItem]
+        self, workshop_id: str, items: list[DraftRubricItem], method: str = "local"
     ) -> list[dict[str, Any]]:
-        """LLM-suggested grouping of draft rubric items.
+        """Suggest a grouping of draft rubric items.
+
+        ``method="local"`` returns local clusters directly. ``method="llm"`` asks the
+        LLM to refine those clusters and falls back to them when the LLM is not
+        configured or fails.
 
         Returns a list of group dicts (not persisted). The facilitator
         reviews and calls apply_groups() to persist.
@@ -29,24 +38,28 @@ class DraftRubricGroupingService:
         if not items:
             return []
 
+        local_groups = self._local_grouping(items)
+        if method != "llm":
+            return local_groups
+
         # Try LLM-based grouping
         workshop = self.db_service.get_workshop(workshop_id)
         if not workshop:
-            return self._fallback_grouping(items)
+            return local_groups
 
         model_name = (getattr(workshop, "discovery_questions_model_name", None) or "").strip()
         if not model_name or model_name == "demo":
-            return self._fallback_grouping(items)
+            return local_groups
 
         mlflow_config = self.db_service.get_mlflow_config(workshop_id)
         if not mlflow_config:
-            return self._fallback_grouping(items)
+            return local_groups
 
         from server.services.token_storage_service import token_storage
 
         databricks_token = token_storage.get_token(workshop_id) or self.db_service.get_databricks_token(workshop_id)
         if not databricks_token:
-            return self._fallback_grouping(items)
+            return local_groups
 
         try:
             from server.services.discovery_dspy import (
@@ -63,33 +76,59 @@ class DraftRubricGroupingService:
                 token=databricks_token,
                 temperature=0.2,
             )
-            predictor = get_predictor(SuggestRubricGroups, lm, temperature=0.2, max_tokens=1000)
+            # Output grows with the number of items (IDs are echoed back)
+            max_tokens = min(4000, 1000 + 40 * len(items))
+            predictor = get_predictor(SuggestRubricGroups, lm, temperature=0.2, max_tokens=max_tokens)
 
-            # Format items as "ID | TEXT" lines
+            # Format items as "ID | TEXT" lines, seeded with the local clusters as a starting point
             items_text = "\n".join(f"{item.id} | {item.text}" for item in items)
+            candidate_lines = [f"- {', '.join(g['item_ids'])}" for g in local_groups if len(g["item_ids"]) > 1]
+            if candidate_lines:
+                items_text += (
+                    "\n\nCandidate clusters from lexical similarity (item IDs; refine, split or merge as needed):\n"
+                    + "\n".join(candidate_lines)
+                )
 
             result = run_predict(predictor, lm, items=items_text)
 
             groups_out = getattr(result, "groups", None)
             if not groups_out or not isinstance(groups_out, list):
-                return self._fallback_grouping(items)
+                return local_groups
 
-            # Convert to plain dicts
+            # Convert to plain dicts, keeping only known item IDs
+            known_ids = {item.id for item in items}
+            assigned: set[str] = set()
             proposed = []
             for g in groups_out:
                 if hasattr(g, "model_dump"):
-                    proposed.append(g.model_dump())
-                elif isinstance(g, dict):
-                    proposed.append(g)
-            return proposed
+                    g = g.model_dump()
+                elif not isinstance(g, dict):
+                    continue
+                item_ids = [i for i in g.get("item_ids") or [] if i in known_ids and i not in assigned]
+                if item_ids:
+                    assigned.update(item_ids)
+                    proposed.append({**g, "item_ids": item_ids})
+
+            # Items the LLM dropped keep their local grouping
+            leftovers = [item for item in items if item.id not in assigned]
+            return proposed + (self._local_grouping(leftovers) if leftovers else [])
 
         except Exception as e:
-            logger.warning("LLM grouping failed, using fallback: %s", e)
-            return self._fallback_grouping(items)
+            logger.warning("LLM grouping failed, using local clusters: %s", e)
+            return local_groups
+
+    @classmethod
+    def _local_grouping(cls, items: list[DraftRubricItem]) -> list[dict[str, Any]]:
+        """Deterministic TF-IDF clustering of item text."""
+        try:
+            return cluster_items([item.id for item in items], [item.text for item in items])
+        except Exception as e:
+            logger.warning("Local draft rubric clustering failed: %s", e)
+            return cls._fallback_grouping(items)
 
     @staticmethod
     def _fallback_grouping(items: list[DraftRubricItem]) -> list[dict[str, Any]]:
-        """Single-group fallback when LLM is unavailable."""
+        """Single-group fallback when local clustering fails."""
         if not items:
             return []
         return [
@@ -0,0 +1,138 @@
+"""Ground-truth aggregation of SME annotations.
+
+Alignment, judge evaluation, judge export and few-shot selection all need the
+same thing: the human ratings and feedback for each trace, reduced to a single
+reference value. ``GroundTruthIndex`` groups a workshop's annotations by trace
+(and by rubric question for multi-question rubrics) in one pass, so callers
+look traces up instead of re-filtering the full annotation list per trace.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from server.models import Annotation
+
+
+def mode(values: list[int]) -> int | None:
+    """Most common value; ties go to the value seen first."""
+    if not values:
+        return None
+    return Counter(values).most_common(1)[0][0]
+
+
+def majority(values: list[int]) -> int | None:
+    """Binary majority vote: 1 if more than half the values are truthy, else 0."""
+    if not values:
+        return None
+    return 1 if sum(1 for v in values if v) > len(values) / 2 else 0
+
+
+def rounded_mean(values: list[int]) -> int | None:
+    if not values:
+        return None
+    return round(sum(values) / len(values))
+
+
+@dataclass
+class TraceGroundTruth:
+    """All SME judgements for one trace."""
+
+    trace_id: str
+    # Legacy single rating, one per annotation
+    ratings: list[int] = field(default_factory=list)
+    # Per-question ratings, question_id -> one rating per annotation that answered it
+    question_ratings: dict[str, list[int]] = field(default_factory=dict)
+    comments: list[str] = field(default_factory=list)
+    user_ids: list[str] = field(default_factory=list)
+    # Per-question ratings where an annotation has them, else its legacy rating
+    pooled_ratings: list[int] = field(default_factory=list)
+
+    def add(self, annotation: Annotation) -> None:
+        self.user_ids.append(annotation.user_id)
+        if annotation.rating is not None:
+            self.ratings.append(annotation.rating)
+        if annotation.ratings:
+            for question_id, value in annotation.ratings.items():
+                if value is None:
+                    continue
+                self.question_ratings.setdefault(question_id, []).append(value)
+                self.pooled_ratings.append(value)
+        elif annotation.rating is not None:
+            self.pooled_ratings.append(annotation.rating)
+        if annotation.comment and annotation.comment.strip():
+            self.comments.append(annotation.comment.strip())
+
+    @property
+    def annotation_count(self) -> int:
+        return len(self.user_ids)
+
+    def values(self, question_id: str | None = None) -> list[int]:
+        """Ratings for ``question_id``, or the legacy per-annotation ratings."""
+        if question_id is None:
+            return self.ratings
+        return self.question_ratings.get(question_id, [])
+
+    def mode_rating(self, question_id: str | None = None) -> int | None:
+        return mode(self.values(question_id))
+
+    def majority_rating(self, question_id: str | None = None) -> int | None:
+        return majority(self.values(question_id))
+
+    @property
+    def feedback(self) -> str | None:
+        """Non-empty SME comments joined one per line."""
+        return "\n".join(self.comments) if self.comments else None
+
+
+class GroundTruthIndex:
+    """Annotations grouped by trace, built in a single pass."""
+
+    def __init__(self):
+        self._traces: dict[str, TraceGroundTruth] = {}
+
+    @classmethod
+    def from_annotations(cls, annotations: Iterable[Annotation]) -> "GroundTruthIndex":
+        index = cls()
+        for annotation in annotations:
+            index.add(annotation)
+        return index
+
+    def add(self, annotation: Annotation) -> None:
+        entry = self._traces.get(annotation.trace_id)
+        if entry is None:
+            entry = self._traces[annotation.trace_id] = TraceGroundTruth(annotation.trace_id)
+        entry.add(annotation)
+
+    def get(self, trace_id: str) -> TraceGroundTruth | None:
+        return self._traces.get(trace_id)
+
+    def __contains__(self, trace_id: str) -> bool:
+        return trace_id in self._traces
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def __iter__(self) -> Iterator[TraceGroundTruth]:
+        """Traces in order of their first annotation."""
+        return iter(self._traces.values())
+
+    @property
+    def trace_ids(self) -> list[str]:
+        return list(self._traces)
+
+    def restrict(self, trace_ids: Iterable[str]) -> "GroundTruthIndex":
+        """A view limited to ``trace_ids`` (order of this index is kept)."""
+        wanted = set(trace_ids)
+        restricted = GroundTruthIndex()
+        restricted._traces = {tid: entry for tid, entry in self._traces.items() if tid in wanted}
+        return restricted
+
+    def by_mode_rating(self, question_id: str | None = None) -> dict[int, list[str]]:
+        """Trace IDs grouped by their mode rating."""
+        groups: dict[int, list[str]] = {}
+        for entry in self._traces.values():
+            rating = entry.mode_rating(question_id)
+            if rating is not None:
+                groups.setdefault(rating, []).append(entry.trace_id)
+        return groups
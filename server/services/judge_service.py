@@ -20,6 +20,7 @@ from server.models import (
     JudgePrompt,
 )
 from server.services.database_service import DatabaseService
+from server.services.ground_truth import GroundTruthIndex
 
 try:
     import mlflow
@@ -51,9 +52,12 @@ class JudgeService:
         if not annotations:
             raise ValueError("No annotations found for evaluation")
 
+        # Group annotations by trace once; the mode rating is each trace's ground truth
+        ground_truth = GroundTruthIndex.from_annotations(annotations)
+
         # Filter to specific traces if requested
         if evaluation_request.trace_ids:
-            annotations = [a for a in annotations if a.trace_id in evaluation_request.trace_ids]
+            ground_truth = ground_truth.restrict(evaluation_request.trace_ids)
 
         # Check if we should use real MLflow or simulation
         # IMPORTANT: Use override_model from UI if provided (e.g., user selected 'demo')
@@ -106,33 +110,13 @@ class JudgeService:
                     detail="Cannot use MLflow evaluation with demo model. Select a real model (databricks-*, openai-*)",
                 )
 
-        # Calculate mode-based ground truth at the evaluate_prompt level for meaningful aggregation
-        from collections import Counter
-
-        # Group annotations by trace_id and calculate mode (most common rating) as ground truth
-        trace_ground_truth = {}
-        trace_objects = {}
-
-        for annotation in annotations:
-            trace_id = annotation.trace_id
-            if trace_id not in trace_ground_truth:
-                trace_ground_truth[trace_id] = []
-                # Get trace object
-                trace = self.db_service.get_trace(trace_id)
-                if trace:
-                    trace_objects[trace_id] = trace
-
-            trace_ground_truth[trace_id].append(annotation.rating)
-
-        # Calculate mode for each trace and create unique evaluations
+        # Evaluate each annotated trace against its mode rating
         unique_evaluations = []
-        for trace_id, ratings in trace_ground_truth.items():
-            if trace_id in trace_objects:
-                # Calculate mode (most common rating)
-                rating_counts = Counter(ratings)
-                mode_rating = rating_counts.most_common(1)[0][0]  # Most frequent rating
-
-                trace = trace_objects[trace_id]
+        for truth in ground_truth:
+            trace_id = truth.trace_id
+            trace = self.db_service.get_trace(trace_id)
+            if trace:
+                mode_rating = truth.mode_rating()
 
                 # Evaluate using either MLflow or simulation
                 if use_mlflow:
@@ -197,9 +181,12 @@ class JudgeService:
         if not annotations:
             raise ValueError("No annotations found for evaluation")
 
+        # Group annotations by trace once; the mode rating is each trace's ground truth
+        ground_truth = GroundTruthIndex.from_annotations(annotations)
+
         # Filter to specific traces if requested
         if evaluation_request.trace_ids:
-            annotations = [a for a in annotations if a.trace_id in evaluation_request.trace_ids]
+            ground_truth = ground_truth.restrict(evaluation_request.trace_ids)
 
         # Use the model from the request
         use_mlflow = evaluation_request.model_name != "demo" and MLFLOW_AVAILABLE
@@ -220,33 +207,13 @@ class JudgeService:
                     status_code=400, detail="Invalid MLflow configuration: missing Databricks host or token"
                 )
 
-        # Calculate mode-based ground truth
-        from collections import Counter
-
-        # Group annotations by trace_id and calculate mode (most common rating) as ground truth
-        trace_ground_truth = {}
-        trace_objects = {}
-
-        for annotation in annotations:
-            trace_id = annotation.trace_id
-            if trace_id not in trace_ground_truth:
-                trace_ground_truth[trace_id] = []
-                # Get trace object
-                trace = self.db_service.get_trace(trace_id)
-                if trace:
-                    trace_objects[trace_id] = trace
-
-            trace_ground_truth[trace_id].append(annotation.rating)
-
-        # Calculate mode for each trace and create unique evaluations
+        # Evaluate each annotated trace against its mode rating
         unique_evaluations = []
-        for trace_id, ratings in trace_ground_truth.items():
-            if trace_id in trace_objects:
-                # Calculate mode (most common rating)
-                rating_counts = Counter(ratings)
-                mode_rating = rating_counts.most_common(1)[0][0]
-
-                trace = trace_objects[trace_id]
+        for truth in ground_truth:
+            trace_id = truth.trace_id
+            trace = self.db_service.get_trace(trace_id)
+            if trace:
+                mode_rating = truth.mode_rating()
 
                 # Evaluate using either MLflow or simulation
                 if use_mlflow:
@@ -545,15 +512,14 @@ class JudgeService:
         # Get few-shot examples if requested
         few_shot_examples = []
         if export_config.include_examples and prompt.few_shot_examples:
+            ground_truth = GroundTruthIndex.from_annotations(self.db_service.get_annotations(workshop_id, user_id=None))
             for trace_id in prompt.few_shot_examples:
-                trace = self.db_service.get_trace(trace_id)
-                annotations = self.db_service.get_annotations(workshop_id, user_id=None)
-                trace_annotations = [a for a in annotations if a.trace_id == trace_id]
+                truth = ground_truth.get(trace_id)
+                trace = self.db_service.get_trace(trace_id) if truth else None
 
-                if trace and trace_annotations:
+                if trace:
                     # Use the most common rating if multiple annotations
-                    ratings = [a.rating for a in trace_annotations]
-                    most_common_rating = max(set(ratings), key=ratings.count)
+                    most_common_rating = truth.mode_rating()
 
                     few_shot_examples.append(
                         {
@@ -695,33 +661,25 @@ examples = {json.dumps(few_shot_examples[:3], indent=4)}
 
     def select_few_shot_examples(self, workshop_id: str, num_examples: int = 3) -> list[str]:
         """Intelligently select few-shot examples from annotations."""
-        annotations = self.db_service.get_annotations(workshop_id)
+        ground_truth = GroundTruthIndex.from_annotations(self.db_service.get_annotations(workshop_id))
 
-        if len(annotations) < num_examples:
-            return [a.trace_id for a in annotations]
+        if len(ground_truth) <= num_examples:
+            return ground_truth.trace_ids
 
-        # Group by rating to get diverse examples
-        by_rating = {}
-        for annotation in annotations:
-            if annotation.rating not in by_rating:
-                by_rating[annotation.rating] = []
-            by_rating[annotation.rating].append(annotation)
+        # Group traces by their mode rating to get diverse examples
+        by_rating = ground_truth.by_mode_rating()
 
         selected = []
-        ratings = sorted(by_rating.keys())
-
         # Try to get examples from different rating levels
-        for rating in ratings:
+        for rating in sorted(by_rating):
             if len(selected) >= num_examples:
                 break
             # Select one example from this rating level
-            examples_at_rating = by_rating[rating]
-            selected.append(random.choice(examples_at_rating).trace_id)
+            selected.append(random.choice(by_rating[rating]))
 
         # Fill remaining slots randomly if needed
-        remaining_annotations = [a for a in annotations if a.trace_id not in selected]
-        while len(selected) < num_examples and remaining_annotations:
-            selected.append(random.choice(remaining_annotations).trace_id)
-            remaining_annotations = [a for a in remaining_annotations if a.trace_id != selected[-1]]
+        chosen = set(selected)
+        remaining = [trace_id for trace_id in ground_truth.trace_ids if trace_id not in chosen]
+        selected.extend(random.sample(remaining, min(num_examples - len(selected), len(remaining))))
 
         return selected
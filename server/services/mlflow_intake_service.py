@@ -5,6 +5,7 @@ import math
 import mlflow
 from typing import Any, Dict, List, Literal
 
+from server import metrics
 from server.models import MLflowIntakeConfig, MLflowTraceInfo, TraceUpload
 from server.services.database_service import DatabaseService
 
@@ -63,12 +64,13 @@ class MLflowIntakeService:
       self.configure_mlflow(config)
 
       # Search for traces with error handling
-      traces = mlflow.search_traces(
-        experiment_ids=[config.experiment_id],
-        max_results=config.max_traces or 100,
-        filter_string=config.filter_string,
-        return_type='list',
-      )
+      with metrics.timed('mlflow', 'search_traces'):
+        traces = mlflow.search_traces(
+          experiment_ids=[config.experiment_id],
+          max_results=config.max_traces or 100,
+          filter_string=config.filter_string,
+          return_type='list',
+        )
 
       trace_info_list = []
       for trace in traces:
@@ -132,7 +134,8 @@ class MLflowIntakeService:
       for trace_info in trace_infos:
         try:
           # Get full trace data
-          full_trace = mlflow.get_trace(trace_info.trace_id)
+          with metrics.timed('mlflow', 'get_trace'):
+            full_trace = mlflow.get_trace(trace_info.trace_id)
 
           # Extract content from JSON input/output
           # Safely handle traces with missing or incomplete data
@@ -446,11 +449,12 @@ class MLflowIntakeService:
 
       # Try to search for traces to verify access (with minimal request)
       try:
-        traces = mlflow.search_traces(
-          locations=[config.experiment_id],
-          max_results=1,
-          return_type='list',
-        )
+        with metrics.timed('mlflow', 'search_traces'):
+          traces = mlflow.search_traces(
+            locations=[config.experiment_id],
+            max_results=1,
+            return_type='list',
+          )
         trace_count = len(traces)
       except Exception as trace_error:
         trace_count = 0
@@ -9,6 +9,8 @@ import json
 import logging
 from typing import Any
 
+from starlette.concurrency import run_in_threadpool
+
 from server.models import RubricSuggestion
 from server.services.database_service import DatabaseService
 from server.services.databricks_service import DatabricksService
@@ -98,7 +100,8 @@ class RubricGenerationService:
 
         # 3. Call Databricks endpoint
         try:
-            response = self.databricks_service.call_chat_completion(
+            response = await run_in_threadpool(
+                self.databricks_service.call_chat_completion,
                 endpoint_name=endpoint_name,
                 messages=[
                     {"role": "system", "content": RUBRIC_GENERATION_SYSTEM_PROMPT},
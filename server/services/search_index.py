@@ -0,0 +1,456 @@
+"""Full-text search over workshop traces, discovery findings, discovery feedback and participant notes.
+
+Every searchable row is mirrored into a search document:
+(doc_type, doc_id, workshop_id, trace_id, user_id, body). The backend decides
+how it is stored:
+
+- SQLite: ``search_documents`` holds the keys, and the FTS5 table
+  ``search_documents_fts`` holds the body under the same rowid. Ranking uses bm25.
+- PostgreSQL (Lakebase): ``search_documents`` also holds the body, plus a
+  generated ``tsvector`` column with a GIN index. Ranking uses ts_rank_cd.
+
+The search tables are created by migration 0020 and at startup
+(``ensure_schema``), never from a request. Documents are kept in sync by an ORM
+``after_flush`` listener that runs in the writer's transaction and only writes
+rows; if the tables are missing it does nothing. The listener sees decoded
+payloads, so compressed trace columns are indexed as text. Bulk
+``query(...).delete()`` calls bypass the listener, so searches only return
+documents whose source row still exists. ``purge_workshop`` drops a
+workshop's documents outright.
+
+Snippets are HTML-escaped text with each match wrapped in ``<mark>``/``</mark>``.
+
+Configuration via environment variables:
+- SEARCH_INDEX_ENABLED: keep the index in sync on writes (default: 1)
+- SEARCH_MAX_BODY_CHARS: longest body indexed per document (default: 100000)
+"""
+
+import html
+import logging
+import os
+import re
+import weakref
+from typing import Any
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from server.database import DiscoveryFeedbackDB, DiscoveryFindingDB, ParticipantNoteDB, TraceDB
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "1").lower() not in ("0", "false", "no")
+SEARCH_MAX_BODY_CHARS = int(os.getenv("SEARCH_MAX_BODY_CHARS", "100000"))
+
+MAX_PAGE_SIZE = 100
+
+# Match delimiters emitted by the database; replaced by <mark> tags after the snippet is escaped
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# doc_type -> (model, source table, attributes whose change requires re-indexing)
+_SOURCES: dict[str, tuple[type, str, tuple[str, ...]]] = {
+    "trace": (TraceDB, "traces", ("stored_input", "stored_output", "workshop_id")),
+    "finding": (DiscoveryFindingDB, "discovery_findings", ("insight", "trace_id", "workshop_id")),
+    "feedback": (DiscoveryFeedbackDB, "discovery_feedback", ("comment", "followup_qna", "trace_id", "workshop_id")),
+    "note": (ParticipantNoteDB, "participant_notes", ("content", "trace_id", "workshop_id")),
+}
+DOC_TYPES = tuple(_SOURCES)
+_DOC_TYPE_BY_MODEL = {model: doc_type for doc_type, (model, _, _) in _SOURCES.items()}
+
+_unavailable_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+class SearchUnavailableError(RuntimeError):
+    """The database does not support the search index (e.g. SQLite without FTS5)."""
+
+
+def _join(*parts: Any) -> str:
+    body = "\n".join(str(part) for part in parts if part)[:SEARCH_MAX_BODY_CHARS]
+    return body.replace(_MATCH_START, "").replace(_MATCH_END, "")
+
+
+def _highlight(snippet: str | None) -> str:
+    """HTML-escape a database snippet and turn its match delimiters into ``<mark>`` tags."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_MATCH_START, "<mark>").replace(_MATCH_END, "</mark>")
+
+
+def _document(doc_type: str, obj: Any) -> dict[str, Any]:
+    if doc_type == "trace":
+        trace_id, user_id, body = obj.id, None, _join(obj.input, obj.output)
+    elif doc_type == "finding":
+        trace_id, user_id, body = obj.trace_id, obj.user_id, _join(obj.insight)
+    elif doc_type == "feedback":
+        qna = [part for item in obj.followup_qna or [] for part in (item.get("question"), item.get("answer"))]
+        trace_id, user_id, body = obj.trace_id, obj.user_id, _join(obj.comment, *qna)
+    else:
+        trace_id, user_id, body = obj.trace_id, obj.user_id, _join(obj.content)
+    return {
+        "doc_type": doc_type,
+        "doc_id": obj.id,
+        "workshop_id": obj.workshop_id,
+        "trace_id": trace_id,
+        "user_id": user_id,
+        "body": body,
+    }
+
+
+def _exists_guard() -> str:
+    return " OR ".join(
+        f"(d.doc_type = '{doc_type}' AND EXISTS (SELECT 1 FROM {table} s WHERE s.id = d.doc_id))"
+        for doc_type, (_, table, _) in _SOURCES.items()
+    )
+
+
+def _type_filter(doc_types: list[str] | None, params: dict[str, Any]) -> str:
+    if not doc_types:
+        return ""
+    names = []
+    for i, doc_type in enumerate(doc_types):
+        params[f"type_{i}"] = doc_type
+        names.append(f":type_{i}")
+    return f" AND d.doc_type IN ({', '.join(names)})"
+
+
+class _SQLiteBackend:
+    def schema_exists(self, conn: Connection) -> bool:
+        return (
+            conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'search_documents_fts'")).first() is not None
+        )
+
+    def ensure_schema(self, conn: Connection) -> None:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS search_documents (
+                    id INTEGER PRIMARY KEY,
+                    doc_type VARCHAR NOT NULL,
+                    doc_id VARCHAR NOT NULL,
+                    workshop_id VARCHAR NOT NULL,
+                    trace_id VARCHAR,
+                    user_id VARCHAR,
+                    UNIQUE (doc_type, doc_id)
+                )
+                """
+            )
+        )
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_search_documents_workshop ON search_documents (workshop_id, doc_type)")
+        )
+        conn.execute(
+            text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts "
+                "USING fts5(body, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+
+    def _rowid(self, conn: Connection, doc_type: str, doc_id: str) -> int | None:
+        return conn.execute(
+            text("SELECT id FROM search_documents WHERE doc_type = :doc_type AND doc_id = :doc_id"),
+            {"doc_type": doc_type, "doc_id": doc_id},
+        ).scalar()
+
+    def upsert(self, conn: Connection, doc: dict[str, Any]) -> None:
+        rowid = self._rowid(conn, doc["doc_type"], doc["doc_id"])
+        if rowid is None:
+            rowid = conn.execute(
+                text(
+                    "INSERT INTO search_documents (doc_type, doc_id, workshop_id, trace_id, user_id) "
+                    "VALUES (:doc_type, :doc_id, :workshop_id, :trace_id, :user_id)"
+                ),
+                doc,
+            ).lastrowid
+        else:
+            conn.execute(
+                text(
+                    "UPDATE search_documents SET workshop_id = :workshop_id, trace_id = :trace_id, "
+                    "user_id = :user_id WHERE id = :rowid"
+                ),
+                {**doc, "rowid": rowid},
+            )
+            conn.execute(text("DELETE FROM search_documents_fts WHERE rowid = :rowid"), {"rowid": rowid})
+        conn.execute(
+            text("INSERT INTO search_documents_fts (rowid, body) VALUES (:rowid, :body)"),
+            {"rowid": rowid, "body": doc["body"]},
+        )
+
+    def delete(self, conn: Connection, doc_type: str, doc_id: str) -> None:
+        rowid = self._rowid(conn, doc_type, doc_id)
+        if rowid is not None:
+            conn.execute(text("DELETE FROM search_documents_fts WHERE rowid = :rowid"), {"rowid": rowid})
+            conn.execute(text("DELETE FROM search_documents WHERE id = :rowid"), {"rowid": rowid})
+
+    def purge_workshop(self, conn: Connection, workshop_id: str, doc_types: list[str] | None) -> int:
+        params: dict[str, Any] = {"workshop_id": workshop_id}
+        where = f"d.workshop_id = :workshop_id{_type_filter(doc_types, params)}"
+        conn.execute(
+            text(
+                "DELETE FROM search_documents_fts WHERE rowid IN "
+                f"(SELECT d.id FROM search_documents d WHERE {where})"
+            ),
+            params,
+        )
+        return conn.execute(
+            text(f"DELETE FROM search_documents WHERE id IN (SELECT d.id FROM search_documents d WHERE {where})"),
+            params,
+        ).rowcount
+
+    @staticmethod
+    def match_expression(query: str) -> str | None:
+        # Quote every term so user input cannot inject FTS5 syntax; the last term matches as a prefix
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def search(
+        self, conn: Connection, workshop_id: str, query: str, doc_types: list[str] | None, limit: int, offset: int
+    ) -> tuple[int, list[dict[str, Any]]]:
+        match = self.match_expression(query)
+        if match is None:
+            return 0, []
+        params: dict[str, Any] = {
+            "match": match,
+            "workshop_id": workshop_id,
+            "limit": limit,
+            "offset": offset,
+            "match_start": _MATCH_START,
+            "match_end": _MATCH_END,
+        }
+        where = (
+            "search_documents_fts MATCH :match AND d.workshop_id = :workshop_id"
+            f"{_type_filter(doc_types, params)} AND ({_exists_guard()})"
+        )
+        source = "FROM search_documents_fts JOIN search_documents d ON d.id = search_documents_fts.rowid"
+        total = conn.execute(text(f"SELECT count(*) {source} WHERE {where}"), params).scalar()
+        rows = conn.execute(
+            text(
+                "SELECT d.doc_type, d.doc_id, d.trace_id, d.user_id, "
+                "snippet(search_documents_fts, 0, :match_start, :match_end, '…', 24) AS snippet, "
+                f"-bm25(search_documents_fts) AS score {source} WHERE {where} "
+                "ORDER BY bm25(search_documents_fts) LIMIT :limit OFFSET :offset"
+            ),
+            params,
+        ).mappings()
+        return total, [{**row, "snippet": _highlight(row["snippet"])} for row in rows]
+
+
+class _PostgresBackend:
+    def schema_exists(self, conn: Connection) -> bool:
+        return conn.execute(text("SELECT to_regclass('search_documents')")).scalar() is not None
+
+    def ensure_schema(self, conn: Connection) -> None:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS search_documents (
+                    id BIGSERIAL PRIMARY KEY,
+                    doc_type VARCHAR NOT NULL,
+                    doc_id VARCHAR NOT NULL,
+                    workshop_id VARCHAR NOT NULL,
+                    trace_id VARCHAR,
+                    user_id VARCHAR,
+                    body TEXT NOT NULL,
+                    tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', body)) STORED,
+                    UNIQUE (doc_type, doc_id)
+                )
+                """
+            )
+        )
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING GIN (tsv)"))
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_search_documents_workshop ON search_documents (workshop_id, doc_type)")
+        )
+
+    def upsert(self, conn: Connection, doc: dict[str, Any]) -> None:
+        conn.execute(
+            text(
+                "INSERT INTO search_documents (doc_type, doc_id, workshop_id, trace_id, user_id, body) "
+                "VALUES (:doc_type, :doc_id, :workshop_id, :trace_id, :user_id, :body) "
+                "ON CONFLICT (doc_type, doc_id) DO UPDATE SET workshop_id = EXCLUDED.workshop_id, "
+                "trace_id = EXCLUDED.trace_id, user_id = EXCLUDED.user_id, body = EXCLUDED.body"
+            ),
+            doc,
+        )
+
+    def delete(self, conn: Connection, doc_type: str, doc_id: str) -> None:
+        conn.execute(
+            text("DELETE FROM search_documents WHERE doc_type = :doc_type AND doc_id = :doc_id"),
+            {"doc_type": doc_type, "doc_id": doc_id},
+        )
+
+    def purge_workshop(self, conn: Connection, workshop_id: str, doc_types: list[str] | None) -> int:
+        params: dict[str, Any] = {"workshop_id": workshop_id}
+        where = f"d.workshop_id = :workshop_id{_type_filter(doc_types, params)}"
+        return conn.execute(text(f"DELETE FROM search_documents d WHERE {where}"), params).rowcount
+
+    def search(
+        self, conn: Connection, workshop_id: str, query: str, doc_types: list[str] | None, limit: int, offset: int
+    ) -> tuple[int, list[dict[str, Any]]]:
+        params: dict[str, Any] = {
+            "query": query,
+            "workshop_id": workshop_id,
+            "limit": limit,
+            "offset": offset,
+            "headline_options": f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords=35, MinWords=15",
+        }
+        where = (
+            "d.tsv @@ websearch_to_tsquery('english', :query) AND d.workshop_id = :workshop_id"
+            f"{_type_filter(doc_types, params)} AND ({_exists_guard()})"
+        )
+        total = conn.execute(text(f"SELECT count(*) FROM search_documents d WHERE {where}"), params).scalar()
+        # Rank and page first, then build headlines for the page only
+        rows = conn.execute(
+            text(
+                "WITH hits AS ("
+                "SELECT d.doc_type, d.doc_id, d.trace_id, d.user_id, d.body, "
+                "ts_rank_cd(d.tsv, websearch_to_tsquery('english', :query)) AS score "
+                f"FROM search_documents d WHERE {where} "
+                "ORDER BY score DESC, d.id LIMIT :limit OFFSET :offset) "
+                "SELECT doc_type, doc_id, trace_id, user_id, score, "
+                "ts_headline('english', body, websearch_to_tsquery('english', :query), :headline_options) AS snippet "
+                "FROM hits ORDER BY score DESC"
+            ),
+            params,
+        ).mappings()
+        return total, [{**row, "snippet": _highlight(row["snippet"])} for row in rows]
+
+
+_BACKENDS = {"sqlite": _SQLiteBackend(), "postgresql": _PostgresBackend()}
+
+
+def _backend(conn: Connection):
+    backend = _BACKENDS.get(conn.dialect.name)
+    if backend is None:
+        raise SearchUnavailableError(f"Full-text search is not supported on {conn.dialect.name}")
+    return backend
+
+
+def ensure_schema(conn: Connection) -> bool:
+    """Create the search tables on this connection's database if needed; return whether search is available.
+
+    Runs DDL, so it is called at startup on a connection of its own; the caller
+    commits on success and rolls back otherwise. A database that cannot host
+    the index is remembered and not retried.
+    """
+    if conn.engine in _unavailable_engines:
+        return False
+    try:
+        backend = _backend(conn)
+        if not backend.schema_exists(conn):
+            backend.ensure_schema(conn)
+    except Exception as e:
+        logger.warning("Full-text search unavailable on %s: %s", conn.dialect.name, e)
+        _unavailable_engines.add(conn.engine)
+        return False
+    return True
+
+
+def is_available(conn: Connection) -> bool:
+    """Whether the search tables exist on this connection's database (one catalog lookup, no DDL)."""
+    if conn.engine in _unavailable_engines or conn.dialect.name not in _BACKENDS:
+        return False
+    return _backend(conn).schema_exists(conn)
+
+
+def index_objects(conn: Connection, objects: list[Any]) -> int:
+    """Upsert the search documents for ``objects`` (instances of the indexed models)."""
+    if not objects or not is_available(conn):
+        return 0
+    backend = _backend(conn)
+    indexed = 0
+    for obj in objects:
+        if obj.workshop_id is None:
+            continue
+        backend.upsert(conn, _document(_DOC_TYPE_BY_MODEL[type(obj)], obj))
+        indexed += 1
+    return indexed
+
+
+def reindex(session: Session, workshop_id: str | None = None, batch_size: int = 500) -> int:
+    """Rebuild search documents from the source tables, for one workshop or all of them."""
+    conn = session.connection()
+    if not is_available(conn):
+        return 0
+    indexed = 0
+    for model, _, _ in _SOURCES.values():
+        query = session.query(model)
+        if workshop_id is not None:
+            query = query.filter(model.workshop_id == workshop_id)
+        batch = []
+        for obj in query.yield_per(batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                indexed += index_objects(conn, batch)
+                batch = []
+        indexed += index_objects(conn, batch)
+    return indexed
+
+
+def purge_workshop(session: Session, workshop_id: str, doc_types: list[str] | None = None) -> int:
+    """Delete a workshop's search documents (optionally only some types); return the number removed."""
+    conn = session.connection()
+    if not is_available(conn):
+        return 0
+    return _backend(conn).purge_workshop(conn, workshop_id, doc_types)
+
+
+def search(
+    session: Session,
+    workshop_id: str,
+    query: str,
+    doc_types: list[str] | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> tuple[int, list[dict[str, Any]]]:
+    """Ranked matches for ``query`` in one workshop.
+
+    Returns (total matches, one page of hits). Each hit has doc_type, doc_id,
+    trace_id, user_id, snippet and score (higher is better).
+    """
+    unknown = set(doc_types or []) - set(DOC_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown search types: {', '.join(sorted(unknown))}")
+    conn = session.connection()
+    if not is_available(conn):
+        raise SearchUnavailableError("Full-text search is not available on this database")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return _backend(conn).search(conn, workshop_id, query, doc_types, limit, max(0, offset))
+
+
+def _changed(obj: Any, attributes: tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_after_flush(session: Session, flush_context) -> None:
+    if not SEARCH_INDEX_ENABLED:
+        return
+    upserts = []
+    deletes = []
+    for obj in session.new:
+        if type(obj) in _DOC_TYPE_BY_MODEL:
+            upserts.append(obj)
+    for obj in session.dirty:
+        doc_type = _DOC_TYPE_BY_MODEL.get(type(obj))
+        if doc_type is not None and _changed(obj, _SOURCES[doc_type][2]):
+            upserts.append(obj)
+    for obj in session.deleted:
+        doc_type = _DOC_TYPE_BY_MODEL.get(type(obj))
+        if doc_type is not None:
+            deletes.append((doc_type, obj.id))
+    if not upserts and not deletes:
+        return
+
+    conn = session.connection()
+    if not is_available(conn):
+        return
+    index_objects(conn, upserts)
+    backend = _backend(conn)
+    for doc_type, doc_id in deletes:
+        backend.delete(conn, doc_type, doc_id)
@@ -1,50 +1,142 @@
-"""In-memory token storage service for Databricks tokens."""
-
+"""Token storage service for Databricks tokens.
+
+The application-wide instance keeps tokens in the shared state store
+(``server.shared_state``), so a token cached by one worker process is found by
+the others instead of each worker re-reading it from the database.
+
+Tokens written to a cross-process store are encrypted with the app's
+``EncryptionManager``. Sharing therefore needs ``ENCRYPTION_KEY`` to be set
+(otherwise every worker generates its own key); without it the global instance
+keeps tokens in process memory, unencrypted like any other in-process secret.
+Decrypted tokens are cached in process for a short time so repeated lookups do
+not pay for a store read and a decrypt each time.
+
+Configuration via environment variables:
+- TOKEN_CACHE_TTL_SECONDS: how long a worker reuses a token read from the shared store (default: 30).
+  A token removed by another worker stays usable here for at most this long.
+"""
+
+import logging
+import os
 import threading
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 
+from server.shared_state import MemoryStore, SharedStore, get_store
+from server.utils.encryption import EncryptionManager, get_encryption_manager
 
-class TokenStorageService:
-    """Service for storing Databricks tokens in memory with expiration."""
+logger = logging.getLogger(__name__)
+
+_NAMESPACE = "databricks_tokens"
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "30"))
 
-    def __init__(self):
-        self._tokens: dict[str, dict[str, any]] = {}
-        self._lock = threading.Lock()
+
+class TokenStorageService:
+    """Service for storing Databricks tokens with expiration."""
+
+    def __init__(
+        self,
+        store: SharedStore | None = None,
+        *,
+        shared: bool = False,
+        encryption: EncryptionManager | None = None,
+    ):
+        """Create a token store.
+
+        Args:
+            store: Backing store. Defaults to a private in-process store.
+            shared: Use the process-wide shared store (resolved on each call) when
+                ``ENCRYPTION_KEY`` is set.
+            encryption: Cipher for stored tokens. Defaults to the app-wide manager.
+        """
+        self._shared = shared
+        self._own_store = store if store is not None else MemoryStore()
+        self._encryption = encryption
         self._default_expiry_hours = 24  # Tokens expire after 24 hours by default
+        # workshop_id -> (cached_until, plaintext entry) for entries read from an encrypted store
+        self._cache: dict[str, tuple[float, dict]] = {}
+        self._cache_lock = threading.Lock()
+
+    @property
+    def _store(self) -> SharedStore:
+        if self._shared and os.getenv("ENCRYPTION_KEY"):
+            return get_store()
+        return self._own_store
+
+    @property
+    def _cipher(self) -> EncryptionManager:
+        return self._encryption or get_encryption_manager()
+
+    @staticmethod
+    def _is_encrypted(store: SharedStore) -> bool:
+        # A MemoryStore never leaves this process, so it holds plaintext
+        return not isinstance(store, MemoryStore)
+
+    def _cache_put(self, workshop_id: str, entry: dict) -> None:
+        cached_until = min(time.time() + TOKEN_CACHE_TTL_SECONDS, entry["expires_at"])
+        with self._cache_lock:
+            self._cache[workshop_id] = (cached_until, entry)
+
+    def _cache_get(self, workshop_id: str) -> dict | None:
+        with self._cache_lock:
+            cached = self._cache.get(workshop_id)
+            if cached is None:
+                return None
+            if cached[0] <= time.time():
+                del self._cache[workshop_id]
+                return None
+            return cached[1]
 
     def store_token(self, workshop_id: str, token: str, expiry_hours: int = None) -> None:
         """Store a token for a workshop with optional expiration."""
         if expiry_hours is None:
             expiry_hours = self._default_expiry_hours
 
-        expiry_time = datetime.now() + timedelta(hours=expiry_hours)
-
-        with self._lock:
-            self._tokens[workshop_id] = {"token": token, "expires_at": expiry_time, "created_at": datetime.now()}
+        now = datetime.now().timestamp()
+        ttl = expiry_hours * 3600
+        entry = {"token": token, "expires_at": now + ttl, "created_at": now}
+        store = self._store
+        if self._is_encrypted(store):
+            store.set(_NAMESPACE, workshop_id, {**entry, "token": self._cipher.encrypt(token)}, ttl=ttl)
+            self._cache_put(workshop_id, entry)
+        else:
+            store.set(_NAMESPACE, workshop_id, entry, ttl=ttl)
+
+    def _get(self, workshop_id: str) -> dict | None:
+        """The stored entry with its token in plaintext, or None."""
+        store = self._store
+        if not self._is_encrypted(store):
+            # Expired entries are removed by the store on read
+            return store.get(_NAMESPACE, workshop_id)
+
+        entry = self._cache_get(workshop_id)
+        if entry is not None:
+            return entry
+        entry = store.get(_NAMESPACE, workshop_id)
+        if not entry:
+            return None
+        try:
+            entry = {**entry, "token": self._cipher.decrypt(entry["token"])}
+        except ValueError:
+            # Written under a different key; drop it so callers reload from the database
+            logger.warning("Discarding stored token for workshop %s that could not be decrypted", workshop_id)
+            store.delete(_NAMESPACE, workshop_id)
+            return None
+        self._cache_put(workshop_id, entry)
+        return entry
 
     def get_token(self, workshop_id: str) -> str | None:
         """Retrieve a token for a workshop if it exists and hasn't expired."""
-        with self._lock:
-            if workshop_id not in self._tokens:
-                return None
-
-            token_data = self._tokens[workshop_id]
-
-            # Check if token has expired
-            if datetime.now() > token_data["expires_at"]:
-                # Remove expired token
-                del self._tokens[workshop_id]
-                return None
-
-            return token_data["token"]
+        token_data = self._get(workshop_id)
+        if not token_data:
+            return None
+        return token_data["token"]
 
     def remove_token(self, workshop_id: str) -> bool:
         """Remove a token for a workshop."""
-        with self._lock:
-            if workshop_id in self._tokens:
-                del self._tokens[workshop_id]
-                return True
-            return False
+        with self._cache_lock:
+            self._cache.pop(workshop_id, None)
+        return self._store.delete(_NAMESPACE, workshop_id)
 
     def delete_token(self, key: str) -> bool:
         """Alias for remove_token for API consistency."""
@@ -56,34 +148,20 @@ class TokenStorageService:
 
     def cleanup_expired_tokens(self) -> int:
         """Remove all expired tokens and return count of removed tokens."""
-        current_time = datetime.now()
-        expired_workshops = []
-
-        with self._lock:
-            for workshop_id, token_data in self._tokens.items():
-                if current_time > token_data["expires_at"]:
-                    expired_workshops.append(workshop_id)
-
-            for workshop_id in expired_workshops:
-                del self._tokens[workshop_id]
-
-        return len(expired_workshops)
+        return self._store.purge_expired(_NAMESPACE)
 
     def get_token_info(self, workshop_id: str) -> dict[str, any] | None:
         """Get token information including creation and expiry times."""
-        with self._lock:
-            if workshop_id not in self._tokens:
-                return None
-
-            token_data = self._tokens[workshop_id]
-
-            # Check if token has expired
-            if datetime.now() > token_data["expires_at"]:
-                del self._tokens[workshop_id]
-                return None
+        token_data = self._get(workshop_id)
+        if not token_data:
+            return None
 
-            return {"created_at": token_data["created_at"], "expires_at": token_data["expires_at"], "is_expired": False}
+        return {
+            "created_at": datetime.fromtimestamp(token_data["created_at"]),
+            "expires_at": datetime.fromtimestamp(token_data["expires_at"]),
+            "is_expired": False,
+        }
 
 
-# Global instance for the application
-token_storage = TokenStorageService()
+# Global instance for the application, shared across worker processes
+token_storage = TokenStorageService(shared=True)
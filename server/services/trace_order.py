@@ -0,0 +1,67 @@
+"""Per-user randomized trace order derived from a keyed hash.
+
+When a workshop randomizes traces, each user gets their own order. Rather
+than shuffling and storing an order per user (and rewriting it whenever the
+active trace set changes), every trace gets a rank from a keyed BLAKE2b hash
+of its ID. The key is derived from (workshop, phase, user).
+
+Traces are grouped by the batch they were added to the phase in (recorded on
+the workshop when the active set changes, see ``assign_batches``), and the
+user's order is batch first, then rank within the batch. This gives:
+- Deterministic: the same user, phase and trace set always give the same order
+- Per user and per phase: a different key gives an unrelated permutation
+- Incremental: adding traces appends them, shuffled, after the existing ones;
+  removing traces never changes the relative order of the others
+- Stateless per user: nothing is stored per user, so reads never write, and
+  ordering is O(n log n)
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping
+
+_DIGEST_SIZE = 8
+
+
+def _order_key(workshop_id: str, phase: str, user_id: str) -> bytes:
+    # BLAKE2b keys are limited to 64 bytes, so hash the context down to a fixed-size key
+    context = "\x1f".join((workshop_id, phase, user_id)).encode()
+    return hashlib.blake2b(context, digest_size=32, person=b"trace-order").digest()
+
+
+def trace_rank(trace_id: str, key: bytes) -> bytes:
+    """Sort rank of ``trace_id`` under ``key``."""
+    return hashlib.blake2b(trace_id.encode(), digest_size=_DIGEST_SIZE, key=key).digest()
+
+
+def assign_batches(trace_ids: Iterable[str], previous: Mapping[str, int] | None = None) -> dict[str, int]:
+    """Addition batch of each of ``trace_ids`` once they become the active set.
+
+    ``previous`` maps the previously active traces to their batch. Traces that
+    stay active keep it; the newly added ones form a batch after the latest.
+    """
+    previous = previous or {}
+    trace_ids = list(dict.fromkeys(trace_ids))
+    kept = {trace_id: previous[trace_id] for trace_id in trace_ids if trace_id in previous}
+    new_batch = max(kept.values(), default=-1) + 1
+    return {trace_id: kept.get(trace_id, new_batch) for trace_id in trace_ids}
+
+
+def user_trace_order(
+    trace_ids: Iterable[str],
+    workshop_id: str,
+    phase: str,
+    user_id: str,
+    batches: Mapping[str, int] | None = None,
+) -> list[str]:
+    """Order ``trace_ids`` for one user in one workshop phase.
+
+    ``batches`` comes from ``assign_batches``; traces missing from it count as
+    the first batch. Duplicate IDs are dropped. Ties in rank (vanishingly rare)
+    fall back to the trace ID so the order is total.
+    """
+    key = _order_key(workshop_id, phase, user_id)
+    batches = batches or {}
+    return sorted(
+        dict.fromkeys(trace_ids),
+        key=lambda trace_id: (batches.get(trace_id, 0), trace_rank(trace_id, key), trace_id),
+    )
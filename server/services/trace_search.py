@@ -0,0 +1,110 @@
+"""Lean lookups of workshop-tagged MLflow traces.
+
+Evaluation, re-evaluation and begin-annotation tag verification all ask the
+same question: which traces in this experiment carry ``tags.<tag_type>='true'``
+for this workshop? Answering it with ``search_traces(return_type="pandas")``
+materialises every span of every trace into a DataFrame. Here the search runs
+without spans and only the trace IDs are kept, cached per
+(workshop, tag, experiment) for a short TTL in the shared state store, so all
+worker processes see the same entries. Tagging invalidates the cache for that
+workshop and tag, so newly tagged traces are picked up immediately whichever
+worker serves the next request.
+
+Full traces are then fetched only for the IDs that will actually be used.
+
+Configuration via environment variables:
+- TRACE_SEARCH_CACHE_TTL_SECONDS: how long tagged-ID results are reused (default: 60, 0 disables)
+- TRACE_FETCH_MAX_WORKERS: concurrent get_trace calls when fetching full traces (default: 8)
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from server import metrics
+from server.shared_state import get_store
+
+logger = logging.getLogger(__name__)
+
+TRACE_SEARCH_CACHE_TTL_SECONDS = float(os.getenv("TRACE_SEARCH_CACHE_TTL_SECONDS", "60"))
+TRACE_FETCH_MAX_WORKERS = int(os.getenv("TRACE_FETCH_MAX_WORKERS", "8"))
+
+_NAMESPACE = "tagged_trace_ids"
+
+
+def _cache_key(workshop_id: str, tag_type: str, experiment_id: str) -> str:
+    return f"{workshop_id}|{tag_type}|{experiment_id}"
+
+
+def tag_filter(workshop_id: str, tag_type: str) -> str:
+    """MLflow filter string for traces tagged ``tag_type`` for ``workshop_id``."""
+    return f"tags.{tag_type} = 'true' AND tags.workshop_id = '{workshop_id}'"
+
+
+def store_tagged_trace_ids(workshop_id: str, tag_type: str, experiment_id: str, trace_ids: list[str]) -> None:
+    """Cache a freshly observed set of tagged trace IDs."""
+    if TRACE_SEARCH_CACHE_TTL_SECONDS <= 0:
+        return
+    key = _cache_key(workshop_id, tag_type, experiment_id)
+    get_store().set(_NAMESPACE, key, list(trace_ids), ttl=TRACE_SEARCH_CACHE_TTL_SECONDS)
+
+
+def invalidate(workshop_id: str, tag_type: str | None = None) -> None:
+    """Drop cached searches for a workshop (optionally only one tag)."""
+    prefix = f"{workshop_id}|{tag_type}|" if tag_type is not None else f"{workshop_id}|"
+    get_store().delete_prefix(_NAMESPACE, prefix)
+
+
+def search_tagged_trace_ids(
+    experiment_id: str, workshop_id: str, tag_type: str = "eval", *, refresh: bool = False
+) -> list[str]:
+    """MLflow trace IDs tagged ``tag_type`` for the workshop, from cache when fresh.
+
+    The search skips span data (``include_spans=False``); MLflow pages through
+    the results internally.
+    """
+    if not refresh and TRACE_SEARCH_CACHE_TTL_SECONDS > 0:
+        cached = get_store().get(_NAMESPACE, _cache_key(workshop_id, tag_type, experiment_id))
+        if cached is not None:
+            return cached
+
+    import mlflow
+
+    with metrics.timed("mlflow", "search_traces"):
+        traces = mlflow.search_traces(
+            experiment_ids=[experiment_id],
+            filter_string=tag_filter(workshop_id, tag_type),
+            return_type="list",
+            include_spans=False,
+        )
+
+    trace_ids = []
+    seen = set()
+    for trace in traces:
+        trace_id = str(getattr(getattr(trace, "info", None), "trace_id", "") or "").strip()
+        if trace_id and trace_id not in seen:
+            seen.add(trace_id)
+            trace_ids.append(trace_id)
+
+    store_tagged_trace_ids(workshop_id, tag_type, experiment_id, trace_ids)
+    return trace_ids
+
+
+def fetch_traces(trace_ids: list[str], max_workers: int = TRACE_FETCH_MAX_WORKERS) -> dict[str, Any]:
+    """Fetch full traces concurrently; IDs that fail to load map to their exception."""
+    import mlflow
+
+    def _fetch(trace_id: str) -> Any:
+        try:
+            with metrics.timed("mlflow", "get_trace"):
+                return mlflow.get_trace(trace_id)
+        except Exception as e:
+            return e
+
+    if not trace_ids:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(trace_ids))), thread_name_prefix="mlflow-get-trace"
+    ) as executor:
+        return dict(zip(trace_ids, executor.map(_fetch, trace_ids), strict=True))
@@ -0,0 +1,510 @@
+"""Workshop archival to Parquet cold storage.
+
+Completed workshops never leave the primary database on their own: every
+trace payload, finding, annotation and judge evaluation stays in the hot
+tables, growing the SQLite backups and the Lakebase tables. Archiving writes
+each of a workshop's tables to a Parquet file and deletes the rows from the
+database. The workshop row itself stays, with status "archived" and the
+archive location, as does its small configuration (participants, intake
+settings, credentials).
+
+An archive is a directory, either local or on a Unity Catalog volume
+(``/Volumes/<catalog>/<schema>/<volume>/...``, accessed via the Databricks
+SDK Files API since Apps have no FUSE mounts), holding:
+- one ``<table>.parquet`` file per archived table, zstd-compressed
+- copies of the workshop, its participants and their users (password hashes
+  excluded) so archived results can still be joined to names
+- ``manifest.json``, written last: an archive without one is incomplete
+
+Rows are exported in their stored form, so compressed trace payloads are
+copied as-is and come back byte-identical on restore. Restoring re-inserts
+the rows (ignoring columns the current schema no longer has) and rebuilds
+the workshop's search documents.
+
+Only completed or cancelled workshops can be archived, always under
+WORKSHOP_ARCHIVE_PATH; callers cannot choose the location.
+
+Archived workshops stay readable: :func:`archive_session` loads an archive
+into a scratch SQLite database on first use and returns read-only sessions
+over it, so the usual queries serve results. The most recently used archives
+stay loaded; an evicted archive is closed once its sessions are closed.
+
+Configuration via environment variables:
+- WORKSHOP_ARCHIVE_PATH: archive root, a local directory or UC volume path (default: ./workshop_archives)
+- WORKSHOP_ARCHIVE_CACHE_SIZE: archived workshops kept loaded for reads (default: 4)
+
+Parquet support uses the optional ``pyarrow`` package.
+"""
+
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, sessionmaker
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only where pyarrow is missing
+    pa = pq = None
+
+from server.database import Base, WorkshopDB
+from server.models import WorkshopStatus
+from server.services import search_index
+
+logger = logging.getLogger(__name__)
+
+WORKSHOP_ARCHIVE_PATH = os.getenv("WORKSHOP_ARCHIVE_PATH", "./workshop_archives")
+WORKSHOP_ARCHIVE_CACHE_SIZE = int(os.getenv("WORKSHOP_ARCHIVE_CACHE_SIZE", "4"))
+
+ARCHIVE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+BATCH_SIZE = 1000
+
+# Small per-workshop configuration stays in the database
+_HOT_TABLES = {
+    "workshops",
+    "users",
+    "workshop_participants",
+    "mlflow_intake_config",
+    "databricks_tokens",
+    "custom_llm_provider_config",
+}
+# Copied into the archive for reads, never deleted or restored
+_REFERENCE_TABLES = ("workshops", "workshop_participants", "users")
+_EXCLUDED_COLUMNS = {"users": {"password_hash"}}
+
+
+class ArchiveError(RuntimeError):
+    """An archive could not be written or read."""
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ArchiveError("Workshop archival requires the pyarrow package")
+
+
+def archived_tables() -> list[sa.Table]:
+    """Tables whose workshop rows move to the archive, parents before children."""
+    return [
+        table for table in Base.metadata.sorted_tables if "workshop_id" in table.c and table.name not in _HOT_TABLES
+    ]
+
+
+def is_archivable(workshop: WorkshopDB) -> bool:
+    """Whether a workshop is finished: completed or cancelled."""
+    return workshop.status in (WorkshopStatus.COMPLETED, WorkshopStatus.CANCELLED)
+
+
+def archive_location(workshop_id: str) -> str:
+    """Archive directory of a workshop under WORKSHOP_ARCHIVE_PATH."""
+    if workshop_id in ("", ".", "..") or "/" in workshop_id or "\\" in workshop_id:
+        raise ArchiveError(f"Workshop ID {workshop_id!r} cannot be used as an archive directory name")
+    return f"{WORKSHOP_ARCHIVE_PATH.rstrip('/')}/{workshop_id}"
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+class _LocalStore:
+    def __init__(self, location: str):
+        self.location = location
+
+    @contextmanager
+    def open_write(self, name: str) -> Iterator[io.BufferedIOBase]:
+        """Write ``name`` through a ``.tmp`` file that replaces it once complete."""
+        os.makedirs(self.location, exist_ok=True)
+        path = os.path.join(self.location, name)
+        try:
+            with open(path + ".tmp", "wb") as f:
+                yield f
+            os.replace(path + ".tmp", path)
+        finally:
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+
+    def write(self, name: str, data: bytes) -> None:
+        with self.open_write(name) as f:
+            f.write(data)
+
+    def read(self, name: str) -> bytes | None:
+        path = os.path.join(self.location, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class _VolumeStore:
+    def __init__(self, location: str):
+        parts = location.split("/")
+        if len(parts) < 5 or not all(parts[2:5]):
+            raise ArchiveError(f"Invalid Unity Catalog volume path: {location}")
+        self.location = location
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from databricks.sdk import WorkspaceClient
+
+            self._client = WorkspaceClient()
+        return self._client
+
+    @contextmanager
+    def open_write(self, name: str) -> Iterator[io.BufferedIOBase]:
+        """Spool ``name`` to a local temporary file and upload it once complete."""
+        with tempfile.TemporaryFile() as f:
+            yield f
+            f.seek(0)
+            self.client.files.upload(f"{self.location}/{name}", f, overwrite=True)
+
+    def write(self, name: str, data: bytes) -> None:
+        self.client.files.upload(f"{self.location}/{name}", io.BytesIO(data), overwrite=True)
+
+    def read(self, name: str) -> bytes | None:
+        try:
+            return self.client.files.download(f"{self.location}/{name}").contents.read()
+        except Exception as e:
+            if "not found" in str(e).lower() or "404" in str(e) or "does not exist" in str(e).lower():
+                return None
+            raise
+
+
+def _store(location: str):
+    return _VolumeStore(location) if location.startswith("/Volumes/") else _LocalStore(location)
+
+
+def _read_manifest(store, workshop_id: str) -> dict[str, Any]:
+    data = store.read(MANIFEST_NAME)
+    if data is None:
+        raise ArchiveError(f"No complete archive at {store.location}")
+    manifest = json.loads(data)
+    if manifest.get("workshop_id") != workshop_id:
+        raise ArchiveError(f"Archive at {store.location} belongs to workshop {manifest.get('workshop_id')}")
+    if manifest.get("format_version", 0) > ARCHIVE_FORMAT_VERSION:
+        raise ArchiveError(f"Archive format {manifest['format_version']} is newer than this server supports")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Parquet conversion
+# ---------------------------------------------------------------------------
+
+
+def _arrow_type(column: sa.Column):
+    column_type = column.type
+    if isinstance(column_type, sa.JSON):
+        return pa.string()  # serialized, since JSON values have no fixed shape
+    if isinstance(column_type, sa.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, sa.Integer):
+        return pa.int64()
+    if isinstance(column_type, sa.Float):
+        return pa.float64()
+    if isinstance(column_type, sa.DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _export_columns(table: sa.Table) -> list[sa.Column]:
+    excluded = _EXCLUDED_COLUMNS.get(table.name, set())
+    return [column for column in table.c if column.name not in excluded]
+
+
+def _export_table(conn, store, table: sa.Table, where) -> int:
+    """Write the matching rows of ``table`` to ``<table>.parquet``; return the row count."""
+    columns = _export_columns(table)
+    json_columns = {column.name for column in columns if isinstance(column.type, sa.JSON)}
+    schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in columns])
+
+    count = 0
+    result = conn.execution_options(stream_results=True).execute(sa.select(*columns).where(where))
+    # Stream to disk rather than memory; a workshop's traces can run to gigabytes
+    with store.open_write(f"{table.name}.parquet") as f, pq.ParquetWriter(f, schema, compression="zstd") as writer:
+        while rows := result.mappings().fetchmany(BATCH_SIZE):
+            data = {
+                name: [
+                    json.dumps(row[name]) if name in json_columns and row[name] is not None else row[name]
+                    for row in rows
+                ]
+                for name in schema.names
+            }
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            count += len(rows)
+    return count
+
+
+def _import_table(conn, store, table: sa.Table) -> int:
+    """Insert the rows of ``<table>.parquet`` into ``table``; return the row count."""
+    data = store.read(f"{table.name}.parquet")
+    if data is None:
+        raise ArchiveError(f"Archive at {store.location} is missing {table.name}.parquet")
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    # Columns dropped from the schema since archiving are skipped; new columns take their defaults
+    names = [name for name in parquet.schema_arrow.names if name in table.c]
+    json_columns = {name for name in names if isinstance(table.c[name].type, sa.JSON)}
+
+    count = 0
+    for batch in parquet.iter_batches(batch_size=BATCH_SIZE, columns=names):
+        rows = batch.to_pylist()
+        for row in rows:
+            for name in json_columns:
+                if row[name] is not None:
+                    row[name] = json.loads(row[name])
+        if rows:
+            conn.execute(table.insert(), rows)
+            count += len(rows)
+    return count
+
+
+def _reference_filters(workshop: WorkshopDB) -> dict[str, Any]:
+    tables = Base.metadata.tables
+    participants, users = tables["workshop_participants"], tables["users"]
+    participant_ids = sa.select(participants.c.user_id).where(participants.c.workshop_id == workshop.id)
+    return {
+        "workshops": tables["workshops"].c.id == workshop.id,
+        "workshop_participants": participants.c.workshop_id == workshop.id,
+        "users": sa.or_(
+            users.c.workshop_id == workshop.id,
+            users.c.id.in_(participant_ids),
+            users.c.id == workshop.facilitator_id,
+        ),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Archive and restore
+# ---------------------------------------------------------------------------
+
+
+def archive_workshop(session: Session, workshop_id: str) -> dict[str, Any]:
+    """Move a finished workshop's rows to a Parquet archive under WORKSHOP_ARCHIVE_PATH; return its manifest.
+
+    The archive is written completely before anything is deleted, and the
+    deletes and the status change commit together. Raises ValueError when the
+    workshop is missing, not finished or already archived.
+    """
+    _require_pyarrow()
+    workshop = session.get(WorkshopDB, workshop_id)
+    if workshop is None:
+        raise ValueError(f"Workshop {workshop_id} not found")
+    if workshop.status == WorkshopStatus.ARCHIVED:
+        raise ValueError(f"Workshop {workshop_id} is already archived")
+    if not is_archivable(workshop):
+        raise ValueError("Only completed or cancelled workshops can be archived")
+
+    location = archive_location(workshop_id)
+    store = _store(location)
+    conn = session.connection()
+    tables = archived_tables()
+
+    try:
+        reference_rows = {
+            name: _export_table(conn, store, Base.metadata.tables[name], where)
+            for name, where in _reference_filters(workshop).items()
+        }
+        table_rows = {
+            table.name: _export_table(conn, store, table, table.c.workshop_id == workshop_id) for table in tables
+        }
+        manifest = {
+            "format_version": ARCHIVE_FORMAT_VERSION,
+            "workshop_id": workshop_id,
+            "workshop_status": workshop.status,
+            "archived_at": datetime.now().isoformat(),
+            "location": location,
+            "tables": table_rows,
+            "reference_tables": reference_rows,
+        }
+        store.write(MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+    except Exception as e:
+        session.rollback()
+        raise ArchiveError(f"Could not write archive to {location}: {e}") from e
+
+    for table in reversed(tables):
+        conn.execute(table.delete().where(table.c.workshop_id == workshop_id))
+    # Bulk deletes bypass the search sync listener
+    search_index.purge_workshop(session, workshop_id)
+    workshop.status = WorkshopStatus.ARCHIVED
+    workshop.archive_path = location
+    session.commit()
+    _evict(workshop_id)
+    logger.info("Archived workshop %s to %s (%d rows)", workshop_id, location, sum(table_rows.values()))
+    return manifest
+
+
+def restore_workshop(session: Session, workshop_id: str) -> dict[str, Any]:
+    """Load an archived workshop's rows back into the database; return the archive manifest.
+
+    The archive files are left in place. Raises ValueError when the workshop
+    is missing or not archived.
+    """
+    _require_pyarrow()
+    workshop = session.get(WorkshopDB, workshop_id)
+    if workshop is None:
+        raise ValueError(f"Workshop {workshop_id} not found")
+    if workshop.status != WorkshopStatus.ARCHIVED or not workshop.archive_path:
+        raise ValueError(f"Workshop {workshop_id} is not archived")
+
+    store = _store(workshop.archive_path)
+    manifest = _read_manifest(store, workshop_id)
+    conn = session.connection()
+    try:
+        for table in archived_tables():
+            if table.name in manifest["tables"]:
+                _import_table(conn, store, table)
+    except Exception as e:
+        session.rollback()
+        raise ArchiveError(f"Could not restore archive from {store.location}: {e}") from e
+    search_index.reindex(session, workshop_id)
+    workshop.status = manifest.get("workshop_status") or WorkshopStatus.COMPLETED
+    workshop.archive_path = None
+    session.commit()
+    _evict(workshop_id)
+    logger.info("Restored workshop %s from %s", workshop_id, store.location)
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Lazy reads
+# ---------------------------------------------------------------------------
+
+
+class _ArchiveSession(Session):
+    """Session over a loaded archive; closing it releases the archive."""
+
+    def __init__(self, *args, archive: "_LoadedArchive", **kwargs):
+        super().__init__(*args, **kwargs)
+        self._archive = archive
+
+    def close(self) -> None:
+        super().close()
+        archive, self._archive = self._archive, None
+        if archive is not None:
+            archive.release()
+
+
+class _LoadedArchive:
+    """An archive materialized into a scratch SQLite database, opened read-only.
+
+    Sessions hold a reference; an evicted archive is closed once the last one
+    is released.
+    """
+
+    def __init__(self, location: str, workshop_id: str):
+        store = _store(location)
+        manifest = _read_manifest(store, workshop_id)
+        self.location = location
+        self.directory = tempfile.mkdtemp(prefix="workshop-archive-")
+        self.users = 0
+        self.evicted = False
+        path = os.path.join(self.directory, "archive.db")
+        self.engine = sa.create_engine(f"sqlite:///{path}")
+        try:
+            Base.metadata.create_all(self.engine)
+            with self.engine.begin() as conn:
+                for name in _REFERENCE_TABLES:
+                    if name in manifest.get("reference_tables", {}):
+                        _import_table(conn, store, Base.metadata.tables[name])
+                for table in archived_tables():
+                    if table.name in manifest["tables"]:
+                        _import_table(conn, store, table)
+            self.engine.dispose()
+            self.engine = sa.create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+        except Exception:
+            self.close()
+            raise
+        self.sessionmaker = sessionmaker(bind=self.engine, class_=_ArchiveSession, archive=self)
+
+    def acquire(self) -> Session:
+        """New session over the archive; the caller holds ``_loaded_lock``."""
+        self.users += 1
+        return self.sessionmaker()
+
+    def release(self) -> None:
+        with _loaded_lock:
+            self.users -= 1
+            close = self.evicted and self.users == 0
+        if close:
+            self.close()
+
+    def close(self) -> None:
+        self.engine.dispose()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_loaded: "OrderedDict[str, _LoadedArchive]" = OrderedDict()
+_loaded_lock = threading.Lock()
+_load_locks: dict[str, threading.Lock] = {}
+
+
+def _retire(archives: list[_LoadedArchive]) -> None:
+    """Close evicted archives now, or when their last session is released."""
+    with _loaded_lock:
+        idle = []
+        for archive in archives:
+            archive.evicted = True
+            if archive.users == 0:
+                idle.append(archive)
+    for archive in idle:
+        archive.close()
+
+
+def _evict(workshop_id: str) -> None:
+    with _loaded_lock:
+        loaded = _loaded.pop(workshop_id, None)
+    if loaded is not None:
+        _retire([loaded])
+
+
+def _checkout(workshop_id: str, location: str) -> Session | None:
+    with _loaded_lock:
+        loaded = _loaded.get(workshop_id)
+        if loaded is None or loaded.location != location:
+            return None
+        _loaded.move_to_end(workshop_id)
+        return loaded.acquire()
+
+
+def archive_session(workshop_id: str, location: str) -> Session:
+    """Read-only session over an archived workshop's data, loading the archive on first use.
+
+    Archives are loaded outside the cache lock, one load per workshop at a
+    time. Raises ArchiveError when the archive cannot be read.
+    """
+    _require_pyarrow()
+    session = _checkout(workshop_id, location)
+    if session is not None:
+        return session
+
+    with _loaded_lock:
+        load_lock = _load_locks.setdefault(workshop_id, threading.Lock())
+    evicted = []
+    with load_lock:
+        # Another request may have loaded it while this one waited
+        session = _checkout(workshop_id, location)
+        if session is not None:
+            return session
+        loaded = _LoadedArchive(location, workshop_id)
+        with _loaded_lock:
+            stale = _loaded.pop(workshop_id, None)
+            if stale is not None:
+                evicted.append(stale)
+            _loaded[workshop_id] = loaded
+            while len(_loaded) > max(1, WORKSHOP_ARCHIVE_CACHE_SIZE):
+                evicted.append(_loaded.popitem(last=False)[1])
+            session = loaded.acquire()
+    _retire(evicted)
+    return session
@@ -0,0 +1,270 @@
+"""Key/value state shared by all worker processes on a host.
+
+The app runs under gunicorn with several Uvicorn workers, so anything kept in
+a module-level dict (tokens, short-lived caches) is only visible to the worker
+that wrote it. Requests served by another worker miss and fall back to the
+slow path, and invalidations made by one worker never reach the others.
+
+``get_store()`` returns the process-wide store. Values are JSON-serialisable
+and grouped by namespace; each entry may carry a TTL. Backends:
+
+- ``sqlite`` (default): a small SQLite file in WAL mode, shared by every
+  process on the host. It is separate from the application database so cache
+  traffic never contends with the SQLite write queue.
+- ``memory``: a per-process dict, for single-worker runs and tests.
+
+Other backends (e.g. Redis for multi-host deployments) can be added with
+``register_backend``.
+
+Configuration via environment variables:
+- SHARED_STATE_BACKEND: backend name (default: sqlite)
+- SHARED_STATE_PATH: SQLite file for the sqlite backend (default: ~/.cache/workshop/shared_state.db).
+  The file is kept private to the app user; a path that is a symlink or a file
+  owned by someone else is refused and the memory backend is used instead.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "sqlite").lower()
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH") or os.path.join(
+    os.path.expanduser("~"), ".cache", "workshop", "shared_state.db"
+)
+
+
+class SharedStore(Protocol):
+    def get(self, namespace: str, key: str) -> Any | None: ...
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    def delete(self, namespace: str, key: str) -> bool: ...
+
+    def delete_prefix(self, namespace: str, prefix: str) -> int: ...
+
+    def purge_expired(self, namespace: str) -> int: ...
+
+
+def _expires_at(ttl: float | None) -> float | None:
+    return None if ttl is None else time.time() + ttl
+
+
+def _ensure_private_file(path: str) -> None:
+    """Create ``path`` if needed and make it readable by the app user only.
+
+    The mode passed to ``os.open`` only applies to new files, so an existing
+    file is checked and re-chmodded. A symlink at ``path`` is refused rather
+    than followed.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        info = os.fstat(fd)
+        if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is not a regular file owned by the current user")
+        if stat.S_IMODE(info.st_mode) != 0o600:
+            os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+
+class MemoryStore:
+    """Per-process store; entries are not visible to other workers."""
+
+    def __init__(self):
+        # (namespace, key) -> (expires_at, value)
+        self._entries: dict[tuple[str, str], tuple[float | None, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[(namespace, key)]
+                return None
+        # Round-trip so callers get a copy, as with the sqlite backend
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (_expires_at(ttl), json.dumps(value))
+
+    def delete(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop((namespace, key), None) is not None
+
+    def delete_prefix(self, namespace: str, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == namespace and k[1].startswith(prefix)]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+    def purge_expired(self, namespace: str) -> int:
+        now = time.time()
+        with self._lock:
+            keys = [
+                k for k, (expires_at, _) in self._entries.items()
+                if k[0] == namespace and expires_at is not None and expires_at <= now
+            ]
+            for k in keys:
+                del self._entries[k]
+        return len(keys)
+
+
+def _miss_on_error(default: Any) -> Callable:
+    """Turn store errors (locked or full database, removed file) into ``default``.
+
+    The store is a cache: a failure is logged and treated as a miss or no-op so
+    it never fails the request that consulted it.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self: SQLiteStore, namespace: str, *args: Any, **kwargs: Any) -> Any:
+            try:
+                return method(self, namespace, *args, **kwargs)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Shared state %s in %r failed: %s", method.__name__, namespace, e)
+                # Reconnect on the next call in case the file was removed or replaced
+                self._local.conn = None
+                return default
+
+        return wrapper
+
+    return decorator
+
+
+class SQLiteStore:
+    """Store backed by a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: str = SHARED_STATE_PATH):
+        self.path = path
+        self._local = threading.local()
+        # Fail fast (and let get_store fall back) if the file can't be created
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # Connections must not cross a fork; reopen in the child
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Tokens are stored here (encrypted), so keep the file private to the app user
+        _ensure_private_file(self.path)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_state ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @_miss_on_error(None)
+    def get(self, namespace: str, key: str) -> Any | None:
+        row = (
+            self._connect()
+            .execute("SELECT value, expires_at FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._connect().execute(
+                "DELETE FROM shared_state WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                (namespace, key, time.time()),
+            )
+            return None
+        return json.loads(value)
+
+    @_miss_on_error(None)
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO shared_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), _expires_at(ttl)),
+        )
+
+    @_miss_on_error(False)
+    def delete(self, namespace: str, key: str) -> bool:
+        cursor = self._connect().execute(
+            "DELETE FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    @_miss_on_error(0)
+    def delete_prefix(self, namespace: str, prefix: str) -> int:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cursor = self._connect().execute(
+            "DELETE FROM shared_state WHERE namespace = ? AND key LIKE ? ESCAPE '\\'", (namespace, escaped + "%")
+        )
+        return cursor.rowcount
+
+    @_miss_on_error(0)
+    def purge_expired(self, namespace: str) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM shared_state WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (namespace, time.time()),
+        )
+        return cursor.rowcount
+
+
+_backends: dict[str, Callable[[], SharedStore]] = {
+    "memory": MemoryStore,
+    "sqlite": SQLiteStore,
+}
+_store: SharedStore | None = None
+_store_lock = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], SharedStore]) -> None:
+    """Make a backend selectable via SHARED_STATE_BACKEND."""
+    _backends[name.lower()] = factory
+
+
+def get_store() -> SharedStore:
+    """The process-wide shared store, created on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                factory = _backends.get(SHARED_STATE_BACKEND)
+                if factory is None:
+                    logger.warning("Unknown SHARED_STATE_BACKEND %r; using memory", SHARED_STATE_BACKEND)
+                    factory = MemoryStore
+                try:
+                    _store = factory()
+                except Exception as e:
+                    logger.warning(
+                        "Shared state backend %r unavailable (%s); falling back to per-process memory",
+                        SHARED_STATE_BACKEND,
+                        e,
+                    )
+                    _store = MemoryStore()
+    return _store
+
+
+def set_store(store: SharedStore | None) -> None:
+    """Replace the process-wide store (None recreates it from configuration on next use)."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,250 @@
+"""Single-writer commit queue for SQLite deployments.
+
+SQLite allows one writer at a time. When many request threads write at once
+they collide on the database lock and fall back to sleep-and-retry loops. This
+module funnels write transactions through one dedicated writer thread per
+engine instead:
+
+- Request threads submit a callable ``work(session)`` and block on the result.
+- The writer drains whatever is queued (up to a batch limit), runs each unit
+  of work in one shared transaction and commits once (group commit).
+- If a unit raises, the transaction is rolled back and the remaining units
+  are replayed without it, so one bad request never poisons its neighbours.
+- If the database is locked by a writer outside the queue (a migration, a
+  background job, another process), the whole batch is retried with backoff
+  before it fails.
+
+Reads are unaffected and keep using pooled WAL connections.
+
+Configuration via environment variables:
+- SQLITE_WRITE_QUEUE: set to 0 to disable the queue (default: enabled)
+- SQLITE_WRITE_MAX_BATCH: maximum units of work per commit (default: 64)
+- SQLITE_WRITE_BATCH_WAIT_MS: how long the writer waits for more work before
+  committing a partial batch (default: 2)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQLITE_WRITE_QUEUE_ENABLED = os.getenv("SQLITE_WRITE_QUEUE", "1").lower() not in ("0", "false", "no")
+SQLITE_WRITE_MAX_BATCH = int(os.getenv("SQLITE_WRITE_MAX_BATCH", "64"))
+SQLITE_WRITE_BATCH_WAIT_MS = float(os.getenv("SQLITE_WRITE_BATCH_WAIT_MS", "2"))
+
+# The writer thread exits after this long without work and restarts on the next submit
+_IDLE_SHUTDOWN_SECONDS = 30.0
+
+# Retries of a batch that hit a lock held outside the queue, with exponential backoff
+_LOCK_RETRIES = 5
+_LOCK_RETRY_BASE_DELAY = 0.2
+_LOCK_RETRY_MAX_DELAY = 5.0
+
+T = TypeVar("T")
+
+
+def _is_lock_error(error: BaseException) -> bool:
+    if not isinstance(error, OperationalError):
+        return False
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+@dataclass
+class _WriteJob:
+    work: Callable[[Session], Any]
+    future: Future = field(default_factory=Future)
+
+
+class SQLiteWriteQueue:
+    """Serialises and group-commits write transactions for one SQLite engine."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_batch: int = SQLITE_WRITE_MAX_BATCH,
+        batch_wait_seconds: float = SQLITE_WRITE_BATCH_WAIT_MS / 1000,
+    ):
+        # Weak so the module-level registry doesn't keep disposed engines alive
+        self._engine_ref = weakref.ref(engine)
+        self._max_batch = max(1, max_batch)
+        self._batch_wait = max(0.0, batch_wait_seconds)
+        self._jobs: queue.Queue[_WriteJob] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.commits = 0
+        self.units_committed = 0
+
+    @property
+    def pending(self) -> int:
+        """Units of work queued but not yet picked up by the writer."""
+        return self._jobs.qsize()
+
+    def submit(self, work: Callable[[Session], T], timeout: float | None = None) -> T:
+        """Run ``work(session)`` on the writer thread and return its result.
+
+        ``work`` must not commit or roll back; the writer owns the transaction.
+        It may run more than once if a neighbouring unit in the same batch fails,
+        so it should only touch the database. Return plain values (IDs, models)
+        rather than ORM instances, which belong to the writer's session.
+
+        Raises whatever ``work`` raised, or the commit error if the batch could
+        not be committed.
+        """
+        if threading.current_thread() is self._thread:
+            # A unit of work waiting on another unit would deadlock the writer
+            raise RuntimeError("SQLiteWriteQueue.submit cannot be called from the writer thread")
+
+        job = _WriteJob(work)
+        self._jobs.put(job)
+        self._ensure_writer()
+        return job.future.result(timeout)
+
+    def _ensure_writer(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> list[_WriteJob] | None:
+        try:
+            first = self._jobs.get(timeout=_IDLE_SHUTDOWN_SECONDS)
+        except queue.Empty:
+            return None
+
+        batch = [first]
+        while len(batch) < self._max_batch:
+            try:
+                batch.append(self._jobs.get(timeout=self._batch_wait) if self._batch_wait else self._jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                with self._lock:
+                    # Only exit if nothing slipped in while we were deciding to stop
+                    if self._jobs.empty():
+                        self._thread = None
+                        return
+                continue
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[_WriteJob]) -> None:
+        engine = self._engine_ref()
+        if engine is None:
+            for job in batch:
+                job.future.set_exception(RuntimeError("SQLite engine was disposed"))
+            return
+
+        pending = batch
+        lock_attempts = 0
+        while pending:
+            session = Session(bind=engine, autoflush=False, expire_on_commit=False)
+            results: list[tuple[_WriteJob, Any]] = []
+            failed: tuple[int, BaseException] | None = None
+            try:
+                for index, job in enumerate(pending):
+                    try:
+                        result = job.work(session)
+                        session.flush()
+                    except Exception as e:
+                        failed = (index, e)
+                        break
+                    results.append((job, result))
+
+                if failed is not None:
+                    session.rollback()
+                    index, error = failed
+                    if _is_lock_error(error):
+                        # Not this unit's fault: retry the whole batch, or fail it once retries run out
+                        raise error
+                    pending[index].future.set_exception(error)
+                    # Replay everything else in a fresh transaction
+                    pending = pending[:index] + pending[index + 1 :]
+                    continue
+
+                session.commit()
+            except Exception as e:
+                try:
+                    session.rollback()
+                except Exception:
+                    pass
+                if _is_lock_error(e) and lock_attempts < _LOCK_RETRIES:
+                    lock_attempts += 1
+                    delay = min(_LOCK_RETRY_BASE_DELAY * 2 ** (lock_attempts - 1), _LOCK_RETRY_MAX_DELAY)
+                    logger.warning(f"SQLite group commit hit a lock (attempt {lock_attempts}), retrying in {delay:.1f}s: {e}")
+                    time.sleep(delay)
+                    continue
+                logger.error(f"SQLite group commit of {len(pending)} writes failed: {e}")
+                for job in pending:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                return
+            finally:
+                session.close()
+
+            self.commits += 1
+            self.units_committed += len(results)
+            for job, result in results:
+                job.future.set_result(result)
+            return
+
+
+_queues: weakref.WeakKeyDictionary[Engine, SQLiteWriteQueue] = weakref.WeakKeyDictionary()
+_queues_lock = threading.Lock()
+
+
+def _is_file_backed_sqlite(engine: Engine) -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    # In-memory databases are per-connection, so a separate writer connection would see a different DB
+    database = engine.url.database
+    return bool(database) and database != ":memory:" and not database.startswith("file::memory:")
+
+
+def get_write_queue(bind: Any) -> SQLiteWriteQueue | None:
+    """Return the write queue for a file-backed SQLite engine, or None.
+
+    ``bind`` is an Engine or Connection (as returned by ``Session.get_bind()``).
+    Returns None for other backends, in-memory SQLite, or when the queue is
+    disabled, in which case callers write through their own session.
+    """
+    if not SQLITE_WRITE_QUEUE_ENABLED or bind is None:
+        return None
+
+    engine = getattr(bind, "engine", bind)
+    if not _is_file_backed_sqlite(engine):
+        return None
+
+    with _queues_lock:
+        write_queue = _queues.get(engine)
+        if write_queue is None:
+            write_queue = SQLiteWriteQueue(engine)
+            _queues[engine] = write_queue
+        return write_queue
+
+
+def pending_writes() -> int:
+    """Units of work waiting across all write queues in this process."""
+    with _queues_lock:
+        write_queues = list(_queues.values())
+    return sum(write_queue.pending for write_queue in write_queues)
@@ -1,15 +1,24 @@
 """Configuration utilities for loading YAML settings."""
 
 import os
+import threading
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# Parsed auth configs keyed by path, reloaded only when the file's mtime changes
+_auth_config_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_auth_config_lock = threading.Lock()
+
 
 def load_auth_config(config_path: str | None = None) -> dict[str, Any]:
     """Load authentication configuration from YAML file.
 
+    The parsed file is cached per path and re-read only when its mtime changes,
+    so edits to auth.yaml still take effect without a restart. Callers must treat
+    the returned dict as read-only.
+
     Args:
         config_path: Path to config file. If None, uses default location.
 
@@ -45,14 +54,33 @@ def load_auth_config(config_path: str | None = None) -> dict[str, Any]:
             },
         }
 
+    cache_key = str(config_path)
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-        return config or {}
-    except Exception as e:
+        mtime = os.stat(config_path).st_mtime
+    except OSError as e:
         print(f"Warning: Could not load auth config from {config_path}: {e}")
         return {}
 
+    cached = _auth_config_cache.get(cache_key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _auth_config_lock:
+        # Another thread may have reloaded while we waited for the lock
+        cached = _auth_config_cache.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(config_path) as f:
+                config = yaml.safe_load(f) or {}
+        except Exception as e:
+            print(f"Warning: Could not load auth config from {config_path}: {e}")
+            return {}
+
+        _auth_config_cache[cache_key] = (mtime, config)
+        return config
+
 
 def get_facilitator_config(email: str, config_path: str | None = None) -> dict[str, Any] | None:
     """Get facilitator configuration for a specific email.
@@ -0,0 +1,187 @@
+"""Admission control for calls to LLM serving endpoints.
+
+Every outbound model call (DatabricksService, DSPy ``run_predict``) passes
+through a gate keyed by endpoint name. A gate combines a concurrency limit
+with a token bucket, so a running evaluation and a burst of SME submissions
+share one budget instead of each hammering the endpoint into 429s.
+
+Calls are either interactive (a user is waiting on the response, the default)
+or batch (background jobs, fan-out pipelines). Batch calls never use the last
+``LLM_INTERACTIVE_RESERVE`` concurrency slots and always yield to waiting
+interactive calls.
+
+Limits are per process. The configured budgets are for the whole app and are
+divided evenly across ``LLM_WORKER_PROCESSES`` (default ``WEB_CONCURRENCY``)
+so that several gunicorn workers together stay within them.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from server.utils.rate_limiter import RateLimiter
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+LLM_WORKER_PROCESSES = max(1, int(os.getenv("LLM_WORKER_PROCESSES", os.getenv("WEB_CONCURRENCY", "1"))))
+# App-wide budgets per endpoint; each process gets its share
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "10"))
+LLM_BURST = int(os.getenv("LLM_BURST", "20"))
+# Concurrency slots per process that batch calls may not take
+LLM_INTERACTIVE_RESERVE = int(os.getenv("LLM_INTERACTIVE_RESERVE", "2"))
+# How long a call may wait for admission before failing
+LLM_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("LLM_ADMISSION_TIMEOUT_SECONDS", "120"))
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default=INTERACTIVE)
+
+
+class AdmissionTimeout(Exception):
+    """Raised when an LLM call could not be admitted within the timeout."""
+
+    def __init__(self, endpoint: str, priority: str, waited: float):
+        super().__init__(f"LLM endpoint '{endpoint}' is saturated; {priority} call waited {waited:.1f}s")
+        self.endpoint = endpoint
+        self.priority = priority
+        self.waited = waited
+
+
+class EndpointGate:
+    """Priority-aware concurrency limit plus token bucket for one endpoint."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        max_concurrency: int,
+        rate: float | None = None,
+        burst: int | None = None,
+        interactive_reserve: int = 0,
+    ):
+        self.endpoint = endpoint
+        self.max_concurrency = max(1, max_concurrency)
+        # Batch work always gets at least one slot
+        self.interactive_reserve = min(max(0, interactive_reserve), self.max_concurrency - 1)
+        self._limiter = RateLimiter(rate, burst) if rate else None
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = {INTERACTIVE: 0, BATCH: 0}
+        self._admitted = {INTERACTIVE: 0, BATCH: 0}
+        self._timeouts = {INTERACTIVE: 0, BATCH: 0}
+        self._wait_seconds = {INTERACTIVE: 0.0, BATCH: 0.0}
+
+    def _has_slot(self, priority: str) -> bool:
+        if priority == INTERACTIVE:
+            return self._in_flight < self.max_concurrency
+        return not self._waiting[INTERACTIVE] and self._in_flight < self.max_concurrency - self.interactive_reserve
+
+    def _record_timeout(self, priority: str, waited: float) -> AdmissionTimeout:
+        with self._cond:
+            self._timeouts[priority] += 1
+        return AdmissionTimeout(self.endpoint, priority, waited)
+
+    @contextmanager
+    def admit(self, priority: str = INTERACTIVE, timeout: float | None = None) -> Iterator[None]:
+        """Hold a concurrency slot and one rate-limit token for the duration of the block."""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while not self._has_slot(priority):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts[priority] += 1
+                        raise AdmissionTimeout(self.endpoint, priority, time.monotonic() - start)
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting[priority] -= 1
+                # A departing interactive waiter may unblock batch waiters
+                self._cond.notify_all()
+            self._in_flight += 1
+
+        try:
+            if self._limiter is not None:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._limiter.acquire(timeout=remaining):
+                    raise self._record_timeout(priority, time.monotonic() - start)
+            with self._cond:
+                self._admitted[priority] += 1
+                self._wait_seconds[priority] += time.monotonic() - start
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "interactive_reserve": self.interactive_reserve,
+                "rate_per_sec": self._limiter.rate if self._limiter else None,
+                "in_flight": self._in_flight,
+                "queued": dict(self._waiting),
+                "admitted_total": dict(self._admitted),
+                "timeouts_total": dict(self._timeouts),
+                "wait_seconds_total": {k: round(v, 3) for k, v in self._wait_seconds.items()},
+            }
+
+
+_gates: dict[str, EndpointGate] = {}
+_gates_lock = threading.Lock()
+
+
+def get_gate(endpoint: str) -> EndpointGate:
+    """Return the process-wide gate for ``endpoint``, creating it from the env settings."""
+    with _gates_lock:
+        gate = _gates.get(endpoint)
+        if gate is None:
+            gate = EndpointGate(
+                endpoint,
+                max_concurrency=max(1, LLM_MAX_CONCURRENCY // LLM_WORKER_PROCESSES),
+                rate=LLM_RATE_PER_SEC / LLM_WORKER_PROCESSES if LLM_RATE_PER_SEC > 0 else None,
+                burst=max(1, LLM_BURST // LLM_WORKER_PROCESSES),
+                interactive_reserve=LLM_INTERACTIVE_RESERVE,
+            )
+            _gates[endpoint] = gate
+        return gate
+
+
+def mark_batch_thread() -> None:
+    """Treat LLM calls made from the current thread as batch work.
+
+    Call at the start of a background thread's target, or pass as a
+    ``ThreadPoolExecutor`` initializer. Context variables do not carry over
+    into new threads, so each worker thread has to opt in itself.
+    """
+    _priority.set(BATCH)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def llm_admission(endpoint: str | None) -> Iterator[None]:
+    """Wait for admission to ``endpoint`` at the current thread's priority.
+
+    The gate is per worker process, not global: each process admits its own
+    share of the endpoint budget. Waiting blocks the calling thread for up to
+    ``LLM_ADMISSION_TIMEOUT_SECONDS``, so async handlers must reach this via
+    ``run_in_threadpool`` rather than calling it on the event loop.
+    """
+    with get_gate(endpoint or "default").admit(_priority.get(), LLM_ADMISSION_TIMEOUT_SECONDS):
+        yield
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    """Queue depth and throughput counters for every endpoint seen so far."""
+    with _gates_lock:
+        gates = list(_gates.values())
+    return {gate.endpoint: gate.snapshot() for gate in gates}
@@ -1,9 +1,17 @@
 """Password utilities for authentication."""
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import bcrypt
 
+# bcrypt is CPU-bound by design; cap how many hashes run at once so a burst of
+# logins queues here instead of starving the request threadpool.
+PASSWORD_HASH_MAX_WORKERS = int(os.getenv("PASSWORD_HASH_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_MAX_WORKERS, thread_name_prefix="bcrypt")
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
@@ -45,6 +53,24 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
 
+def hash_password_bounded(password: str) -> str:
+    """Hash a password on the bounded bcrypt executor.
+
+    Blocks the calling thread until the hash is ready.
+    """
+    return _hash_executor.submit(hash_password, password).result()
+
+
+def verify_password_bounded(password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded bcrypt executor.
+
+    Blocks the calling thread until the check is done.
+    """
+    if not password or not hashed_password:
+        return False
+    return _hash_executor.submit(verify_password, password, hashed_password).result()
+
+
 def validate_password_strength(
     password: str,
     min_length: int = 8,
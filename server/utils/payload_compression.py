@@ -0,0 +1,212 @@
+"""Transparent zstd compression for large trace payload columns.
+
+Trace inputs, outputs and span contexts are most of the database: they bloat
+the SQLite file that ``sqlite_rescue`` copies to the volume and every query
+that reads full traces. Values at or above a size threshold are stored as a
+marked, base64-encoded zstd frame in the same Text/JSON column, so no schema
+change is needed and PostgreSQL and SQLite are handled alike. Smaller values
+are stored as-is.
+
+Decompression is lazy: the mapped columns hold the stored form, and a
+:class:`CompressedPayload` descriptor decodes it on first attribute access
+(cached per instance). Loading trace rows that never serve their payload costs
+no decompression. Class-level access returns the raw column, so
+``query(TraceDB.input)`` yields the stored form.
+
+Compression uses the optional ``zstandard`` package. Without it new values are
+stored uncompressed, and reading a compressed value raises a RuntimeError.
+
+Configuration via environment variables:
+- TRACE_PAYLOAD_COMPRESSION: "zstd" (default) or "none" to store new values uncompressed
+- TRACE_PAYLOAD_COMPRESSION_MIN_BYTES: smallest encoded value that is compressed (default: 1024)
+- TRACE_PAYLOAD_COMPRESSION_LEVEL: zstd level (default: 3)
+
+Existing rows are compressed by migration 0018, which also compresses plain
+values that happened to start with the marker. SQLite only returns the freed
+pages to the filesystem after a ``VACUUM``.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only where zstandard is missing
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+TRACE_PAYLOAD_COMPRESSION = os.getenv("TRACE_PAYLOAD_COMPRESSION", "zstd").lower()
+TRACE_PAYLOAD_COMPRESSION_MIN_BYTES = int(os.getenv("TRACE_PAYLOAD_COMPRESSION_MIN_BYTES", "1024"))
+TRACE_PAYLOAD_COMPRESSION_LEVEL = int(os.getenv("TRACE_PAYLOAD_COMPRESSION_LEVEL", "3"))
+
+MARKER = "zstd:"
+_ZSTD_FRAME_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# zstd (de)compressor objects are not thread-safe; keep one per thread
+_local = threading.local()
+
+
+def compression_enabled() -> bool:
+    """Whether new values are compressed."""
+    return TRACE_PAYLOAD_COMPRESSION == "zstd" and zstandard is not None
+
+
+if TRACE_PAYLOAD_COMPRESSION == "zstd" and zstandard is None:
+    logger.warning("TRACE_PAYLOAD_COMPRESSION=zstd but zstandard is not installed; storing payloads uncompressed")
+
+
+def _compressor():
+    if getattr(_local, "compressor", None) is None:
+        _local.compressor = zstandard.ZstdCompressor(level=TRACE_PAYLOAD_COMPRESSION_LEVEL)
+    return _local.compressor
+
+
+def _decompressor():
+    if getattr(_local, "decompressor", None) is None:
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def is_compressed(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(MARKER)
+
+
+def _holds_zstd_frame(value: Any) -> bool:
+    """Whether a marked value really is a compressed payload, not plain text that starts with the marker."""
+    if not is_compressed(value):
+        return False
+    try:
+        return base64.b64decode(value[len(MARKER) :], validate=True).startswith(_ZSTD_FRAME_MAGIC)
+    except (binascii.Error, ValueError):
+        return False
+
+
+def compress_text(text: str) -> str:
+    return MARKER + base64.b64encode(_compressor().compress(text.encode("utf-8"))).decode("ascii")
+
+
+def decompress_text(value: str) -> str:
+    if zstandard is None:
+        raise RuntimeError("Trace payload is zstd-compressed but the zstandard package is not installed")
+    return _decompressor().decompress(base64.b64decode(value[len(MARKER) :])).decode("utf-8")
+
+
+def encode_text(text: str | None) -> str | None:
+    """Stored form of a text payload."""
+    if text is None:
+        return None
+    # Text that happens to start with the marker is always compressed so reads stay unambiguous
+    if is_compressed(text) or (compression_enabled() and len(text) >= TRACE_PAYLOAD_COMPRESSION_MIN_BYTES):
+        return compress_text(text)
+    return text
+
+
+def decode_text(value: str | None) -> str | None:
+    """Text payload from its stored form."""
+    return decompress_text(value) if is_compressed(value) else value
+
+
+def encode_json(value: Any) -> Any:
+    """Stored form of a JSON payload: the value itself, or a compressed string."""
+    if value is None:
+        return None
+    if is_compressed(value):
+        return compress_text(json.dumps(value))
+    if not compression_enabled():
+        return value
+    serialized = json.dumps(value, separators=(",", ":"))
+    return compress_text(serialized) if len(serialized) >= TRACE_PAYLOAD_COMPRESSION_MIN_BYTES else value
+
+
+def decode_json(value: Any) -> Any:
+    """JSON payload from its stored form."""
+    return json.loads(decompress_text(value)) if is_compressed(value) else value
+
+
+class CompressedPayload:
+    """Descriptor exposing a compressed column as its decoded value.
+
+    ``column`` is the name of the mapped attribute holding the stored form and
+    ``kind`` is "text" or "json". Decoded values are cached on the instance
+    until the stored form changes.
+    """
+
+    def __init__(self, column: str, kind: str = "text"):
+        if kind not in ("text", "json"):
+            raise ValueError(f"Unknown payload kind: {kind}")
+        self.column = column
+        self._encode = encode_text if kind == "text" else encode_json
+        self._decode = decode_text if kind == "text" else decode_json
+
+    def __set_name__(self, owner, name):
+        self._cache_attr = f"_{name}_decoded"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return getattr(owner, self.column)
+        stored = getattr(obj, self.column)
+        cached = obj.__dict__.get(self._cache_attr)
+        if cached is not None and cached[0] is stored:
+            return cached[1]
+        value = self._decode(stored)
+        obj.__dict__[self._cache_attr] = (stored, value)
+        return value
+
+    def __set__(self, obj, value):
+        stored = self._encode(value)
+        setattr(obj, self.column, stored)
+        obj.__dict__[self._cache_attr] = (stored, value)
+
+
+def rewrite_trace_payloads(connection, *, compress: bool = True, batch_size: int = 500) -> int:
+    """Re-encode the payload columns of existing trace rows; return the number of rows changed.
+
+    With ``compress`` rows are brought to the current stored form (compressing
+    large values); without it every payload is decompressed. Rows are walked by
+    primary key in batches so memory stays bounded on large tables.
+    """
+    import sqlalchemy as sa
+
+    if compress and not compression_enabled():
+        logger.info("Trace payload compression is disabled; leaving existing rows as they are")
+        return 0
+
+    traces = sa.table(
+        "traces",
+        sa.column("id", sa.String),
+        sa.column("input", sa.Text),
+        sa.column("output", sa.Text),
+        sa.column("context", sa.JSON),
+    )
+    if compress:
+        # Already-compressed values are left alone, so the rewrite can be re-run.
+        # Plain values that merely start with the marker are encoded (compressed)
+        def to_text(v):
+            return v if _holds_zstd_frame(v) else encode_text(v)
+
+        def to_json(v):
+            return v if _holds_zstd_frame(v) else encode_json(v)
+    else:
+        to_text, to_json = decode_text, decode_json
+
+    changed = 0
+    last_id = None
+    while True:
+        query = sa.select(traces).order_by(traces.c.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(traces.c.id > last_id)
+        rows = connection.execute(query).fetchall()
+        if not rows:
+            return changed
+        for row in rows:
+            values = {"input": to_text(row.input), "output": to_text(row.output), "context": to_json(row.context)}
+            if (values["input"], values["output"], values["context"]) != (row.input, row.output, row.context):
+                connection.execute(traces.update().where(traces.c.id == row.id).values(**values))
+                changed += 1
+        last_id = rows[-1].id
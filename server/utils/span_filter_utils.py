@@ -1,12 +1,24 @@
-"""Span filter utilities for selecting a specific span's inputs/outputs from trace context."""
+"""Span filter utilities for selecting a specific span's inputs/outputs from trace context.
+
+Traces are normalised once at ingest (``normalize_context``): spans stored as
+JSON or pandas-repr strings become a list of dicts. A compact per-trace index
+(``build_span_index``) maps span name, span type, attribute key and a short
+hash of each attribute value to span positions, so filtering a trace looks up
+candidate spans instead of scanning and JSON-unwrapping every span. Candidates
+are always re-checked against the span itself. Traces without a current index
+(ingested before it existed) fall back to the scan.
+"""
 
 import ast
+import hashlib
 import json
 import logging
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+SPAN_INDEX_VERSION = 2
+
 
 def _parse_spans(raw: Any) -> list[dict[str, Any]] | None:
     """Coerce *raw* into a list of span dicts.
@@ -55,7 +67,114 @@ def _unwrap_json_str(value: Any) -> Any:
         return value
 
 
-def find_matching_span(spans: list[dict[str, Any]], filter_config: dict[str, Any]) -> dict[str, Any] | None:
+def _span_type(span: dict[str, Any]) -> Any:
+    """Span type from the top level, else from attributes["mlflow.spanType"] (raw format)."""
+    span_type = span.get("span_type")
+    if span_type is None:
+        attributes = span.get("attributes")
+        if isinstance(attributes, dict):
+            span_type = _unwrap_json_str(attributes.get("mlflow.spanType"))
+    return span_type
+
+
+def _value_key(value: Any) -> str:
+    """Fixed-size index key for an attribute value (compared as ``str(value)``)."""
+    return hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def normalize_context(context: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Return *context* with its spans parsed into a list.
+
+    Spans stored as a JSON or pandas-repr string are parsed; the spans
+    themselves are not modified (span types are derived when read). Spans that
+    cannot be parsed are left untouched.
+    """
+    if not isinstance(context, dict) or "spans" not in context or isinstance(context["spans"], list):
+        return context
+    spans = _parse_spans(context["spans"])
+    if spans is None:
+        return context
+    return {**context, "spans": spans}
+
+
+def build_span_index(context: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Build the span lookup index for a normalised *context*.
+
+    The index maps each span name, span type and attribute key to the
+    positions of the spans that have it, and a hash of each attribute value
+    (``_value_key``) to the positions of the spans with that key/value pair.
+    Hashing keeps the index small however large the values are. Returns None
+    when the context has no span list.
+    """
+    spans = context.get("spans") if isinstance(context, dict) else None
+    if not isinstance(spans, list):
+        return None
+
+    index: dict[str, Any] = {"version": SPAN_INDEX_VERSION, "size": len(spans), "name": {}, "type": {}, "attr": {}}
+    attr_values: dict[str, dict[str, list[int]]] = {}
+    for position, span in enumerate(spans):
+        if not isinstance(span, dict):
+            continue
+        name = span.get("name")
+        if isinstance(name, str):
+            index["name"].setdefault(name, []).append(position)
+        span_type = _span_type(span)
+        if isinstance(span_type, str):
+            index["type"].setdefault(span_type, []).append(position)
+        attributes = span.get("attributes")
+        if isinstance(attributes, dict):
+            for key, value in attributes.items():
+                if value is None:
+                    continue
+                index["attr"].setdefault(key, []).append(position)
+                attr_values.setdefault(key, {}).setdefault(_value_key(value), []).append(position)
+    index["attr_value"] = attr_values
+    return index
+
+
+def _candidate_positions(span_index: dict[str, Any], filter_config: dict[str, Any]) -> list[int] | None:
+    """Positions of spans that can match *filter_config*, in span order.
+
+    Returns None when the index cannot answer the filter (unknown version or
+    non-string criteria); callers then scan all spans.
+    """
+    if span_index.get("version") != SPAN_INDEX_VERSION:
+        return None
+
+    candidates: set[int] | None = None
+
+    def narrow(positions: list[int]) -> None:
+        nonlocal candidates
+        candidates = set(positions) if candidates is None else candidates & set(positions)
+
+    if "span_name" in filter_config:
+        if not isinstance(filter_config["span_name"], str):
+            return None
+        narrow(span_index["name"].get(filter_config["span_name"], []))
+    if "span_type" in filter_config:
+        if not isinstance(filter_config["span_type"], str):
+            return None
+        narrow(span_index["type"].get(filter_config["span_type"], []))
+    if "attribute_key" in filter_config:
+        key = filter_config["attribute_key"]
+        expected_value = filter_config.get("attribute_value")
+        if not isinstance(key, str):
+            return None
+        if expected_value is None:
+            narrow(span_index["attr"].get(key, []))
+        else:
+            narrow(span_index["attr_value"].get(key, {}).get(_value_key(expected_value), []))
+
+    if candidates is None:
+        return list(range(span_index["size"]))
+    return sorted(candidates)
+
+
+def find_matching_span(
+    spans: list[dict[str, Any]],
+    filter_config: dict[str, Any],
+    span_index: dict[str, Any] | None = None,
+) -> dict[str, Any] | None:
     """Find the first span matching the filter configuration.
 
     Filter config supports:
@@ -65,13 +184,23 @@ def find_matching_span(spans: list[dict[str, Any]], filter_config: dict[str, Any
 
     Multiple keys can be combined (all must match).
 
+    With a *span_index* built for these spans, only the indexed candidates are
+    checked.
+
     Returns the first matching span dict, or None.
     """
     if not spans or not filter_config:
         return None
 
-    for span in spans:
-        if _span_matches(span, filter_config):
+    positions = None
+    if span_index and span_index.get("size") == len(spans):
+        positions = _candidate_positions(span_index, filter_config)
+    if positions is None:
+        positions = range(len(spans))
+
+    for position in positions:
+        span = spans[position]
+        if isinstance(span, dict) and _span_matches(span, filter_config):
             return span
 
     return None
@@ -86,10 +215,7 @@ def _span_matches(span: dict[str, Any], filter_config: dict[str, Any]) -> bool:
 
     # Match by span_type (check top-level, then attributes["mlflow.spanType"] for raw format)
     if "span_type" in filter_config:
-        span_type = span.get("span_type")
-        if span_type is None:
-            span_type = _unwrap_json_str(span.get("attributes", {}).get("mlflow.spanType"))
-        if span_type != filter_config["span_type"]:
+        if _span_type(span) != filter_config["span_type"]:
             return False
 
     # Match by attribute key/value
@@ -111,12 +237,14 @@ def _span_matches(span: dict[str, Any], filter_config: dict[str, Any]) -> bool:
 def apply_span_filter(
     context: dict[str, Any] | None,
     filter_config: dict[str, Any] | None,
+    span_index: dict[str, Any] | None = None,
 ) -> tuple[str | None, str | None]:
     """Find matching span and return its (inputs_json, outputs_json).
 
     Args:
         context: The trace context dict (must contain a "spans" list)
         filter_config: The span attribute filter configuration
+        span_index: The trace's precomputed span index, if it has one
 
     Returns:
         (inputs_json, outputs_json) from the matching span, or (None, None)
@@ -129,7 +257,7 @@ def apply_span_filter(
     if not spans:
         return None, None
 
-    matched = find_matching_span(spans, filter_config)
+    matched = find_matching_span(spans, filter_config, span_index)
     if not matched:
         return None, None
 
@@ -0,0 +1,225 @@
+"""Lexical similarity for short participant texts (findings, rubric items).
+
+Pure-Python TF-IDF over normalised word tokens. Documents are added one at a
+time and IDF weights are derived from the current document frequencies on
+demand, so an index can grow incrementally as text arrives without refitting.
+"""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset(
+    {
+        "a",
+        "about",
+        "above",
+        "after",
+        "again",
+        "against",
+        "all",
+        "am",
+        "an",
+        "and",
+        "any",
+        "are",
+        "as",
+        "at",
+        "be",
+        "because",
+        "been",
+        "before",
+        "being",
+        "below",
+        "between",
+        "both",
+        "but",
+        "by",
+        "can",
+        "could",
+        "did",
+        "do",
+        "does",
+        "doing",
+        "down",
+        "during",
+        "each",
+        "few",
+        "for",
+        "from",
+        "further",
+        "had",
+        "has",
+        "have",
+        "having",
+        "he",
+        "her",
+        "here",
+        "hers",
+        "him",
+        "his",
+        "how",
+        "i",
+        "if",
+        "in",
+        "into",
+        "is",
+        "it",
+        "its",
+        "itself",
+        "just",
+        "me",
+        "more",
+        "most",
+        "my",
+        "no",
+        "nor",
+        "not",
+        "of",
+        "off",
+        "on",
+        "once",
+        "only",
+        "or",
+        "other",
+        "our",
+        "ours",
+        "out",
+        "over",
+        "own",
+        "same",
+        "she",
+        "should",
+        "so",
+        "some",
+        "such",
+        "than",
+        "that",
+        "the",
+        "their",
+        "theirs",
+        "them",
+        "then",
+        "there",
+        "these",
+        "they",
+        "this",
+        "those",
+        "through",
+        "to",
+        "too",
+        "under",
+        "until",
+        "up",
+        "very",
+        "was",
+        "we",
+        "were",
+        "what",
+        "when",
+        "where",
+        "which",
+        "while",
+        "who",
+        "whom",
+        "why",
+        "will",
+        "with",
+        "would",
+        "you",
+        "your",
+        "yours",
+        "also",
+        "it's",
+        "i'm",
+        "don't",
+        "doesn't",
+        "didn't",
+        "isn't",
+        "wasn't",
+        "aren't",
+    }
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase word tokens with stopwords dropped and plural 's' stripped."""
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class TfidfIndex:
+    """Incremental TF-IDF index with cosine similarity between documents.
+
+    Not thread-safe; callers that share an index guard it with their own lock.
+    """
+
+    def __init__(self):
+        self._tf: dict[str, Counter] = {}
+        self._df: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._tf)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._tf
+
+    def add(self, doc_id: str, text: str | None) -> None:
+        """Index ``text`` under ``doc_id``; re-adding an existing ID is a no-op."""
+        if doc_id in self._tf:
+            return
+        tf = Counter(tokenize(text))
+        self._tf[doc_id] = tf
+        self._df.update(tf.keys())
+
+    def remove(self, doc_id: str) -> None:
+        tf = self._tf.pop(doc_id, None)
+        if tf is None:
+            return
+        self._df.subtract(tf.keys())
+        for term in tf:
+            if self._df[term] <= 0:
+                del self._df[term]
+
+    def idf(self, term: str) -> float:
+        # Smoothed so terms in every document still carry a little weight
+        return math.log((1 + len(self._tf)) / (1 + self._df.get(term, 0))) + 1.0
+
+    def vector(self, doc_id: str) -> dict[str, float]:
+        return {term: count * self.idf(term) for term, count in self._tf.get(doc_id, {}).items()}
+
+    @staticmethod
+    def cosine(a: dict[str, float], b: dict[str, float]) -> float:
+        if not a or not b:
+            return 0.0
+        if len(a) > len(b):
+            a, b = b, a
+        dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+        if not dot:
+            return 0.0
+        return dot / (math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values())))
+
+    def similarity(self, doc_a: str, doc_b: str) -> float:
+        return self.cosine(self.vector(doc_a), self.vector(doc_b))
+
+    def most_similar(self, doc_id: str, candidates: Iterable[str] | None = None) -> list[tuple[str, float]]:
+        """Return ``(candidate_id, score)`` pairs with a non-zero score, best first."""
+        query = self.vector(doc_id)
+        scored = []
+        for other in self._tf if candidates is None else candidates:
+            if other == doc_id or other not in self._tf:
+                continue
+            score = self.cosine(query, self.vector(other))
+            if score > 0:
+                scored.append((other, score))
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored
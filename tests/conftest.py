@@ -40,6 +40,19 @@ def pytest_collection_modifyitems(config, items):
     items[:] = selected
 
 
+@pytest.fixture(autouse=True)
+def shared_state_store():
+    """Give each test a fresh in-memory shared state store (no /tmp file, no leakage between tests)."""
+    from server.shared_state import MemoryStore, set_store
+
+    store = MemoryStore()
+    set_store(store)
+    try:
+        yield store
+    finally:
+        set_store(None)
+
+
 @pytest.fixture(scope="session")
 def app():
     # Import lazily so test collection doesn't accidentally trigger app startup.
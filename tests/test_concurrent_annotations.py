@@ -368,5 +368,70 @@ def test_rapid_fire_annotations_single_user(isolated_test_db):
         db.close()
 
 
+@pytest.mark.spec("SQLITE_CONCURRENCY")
+def test_fifty_users_annotate_without_lock_retries(isolated_test_db):
+    """
+    Test that 50 concurrent SMEs are serialised by the SQLite write queue.
+
+    Writes go through a single writer that group-commits them, so no request
+    should hit a lock error or fall into the sleep-and-retry path.
+    """
+    from server.sqlite_writer import get_write_queue
+
+    test_data = isolated_test_db
+    workshop_id = test_data["workshop_id"]
+    trace_ids = test_data["trace_ids"]
+    session_factory = test_data["session_factory"]
+
+    db = session_factory()
+    try:
+        user_ids = []
+        for i in range(50):
+            user_id = str(uuid.uuid4())
+            db.add(UserDB(id=user_id, email=f"storm_{i}_{user_id[:8]}@test.com", name=f"SME {i}", role="sme"))
+            user_ids.append(user_id)
+        db.commit()
+    finally:
+        db.close()
+
+    sleeps = []
+    real_sleep = time.sleep
+    write_queue = get_write_queue(test_data["engine"])
+    commits_before = write_queue.commits
+
+    def record_sleep(seconds):
+        sleeps.append(seconds)
+        real_sleep(seconds)
+
+    start = time.perf_counter()
+    with patch("time.sleep", side_effect=record_sleep), ThreadPoolExecutor(max_workers=50) as executor:
+        results = list(
+            executor.map(
+                lambda i: submit_annotation_isolated(
+                    session_factory, workshop_id, user_ids[i], trace_ids[i % len(trace_ids)], (i % 5) + 1
+                ),
+                range(50),
+            )
+        )
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if not r["success"]]
+    commits = write_queue.commits - commits_before
+
+    print("\n=== 50 Concurrent Users (SQLite write queue) ===")
+    print(f"Elapsed: {elapsed:.2f}s, commits: {commits}, retry sleeps: {len(sleeps)}")
+
+    assert not errors, f"Failed submissions: {errors}"
+    assert sleeps == []
+    assert commits <= 50
+
+    db = session_factory()
+    try:
+        saved = db.query(AnnotationDB).filter(AnnotationDB.user_id.in_(user_ids)).count()
+        assert saved == 50
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,120 @@
+"""
+Benchmark concurrent logins against a file-backed SQLite database.
+
+Simulates the start of a workshop, when every SME and a few facilitators hit
+the login path at once. Verifies that all logins succeed and prints throughput
+so regressions in the auth path (config parsing, email lookup, bcrypt) show up.
+"""
+
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, UserDB
+from server.services.database_service import DatabaseService
+from server.utils.password import PASSWORD_HASH_MAX_WORKERS, hash_password
+
+SME_COUNT = 40
+FACILITATOR_COUNT = 8
+FACILITATOR_PASSWORD = "Facilitator123"
+
+
+@pytest.fixture
+def login_test_db():
+    """Create an isolated SQLite database populated with SMEs and facilitators."""
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = f.name
+
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=20,
+        max_overflow=30,
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=60000")
+        cursor.close()
+
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+    db = session_factory()
+    try:
+        password_hash = hash_password(FACILITATOR_PASSWORD)
+        logins = []
+        for i in range(SME_COUNT):
+            email = f"SME_{i}_{uuid.uuid4().hex[:6]}@Example.com"
+            db.add(UserDB(id=str(uuid.uuid4()), email=email, name=f"SME {i}", role="sme"))
+            logins.append((email.upper(), ""))
+        for i in range(FACILITATOR_COUNT):
+            email = f"fac_{i}_{uuid.uuid4().hex[:6]}@example.com"
+            db.add(
+                UserDB(
+                    id=str(uuid.uuid4()),
+                    email=email,
+                    name=f"Facilitator {i}",
+                    role="facilitator",
+                    password_hash=password_hash,
+                )
+            )
+            logins.append((email, FACILITATOR_PASSWORD))
+        db.commit()
+
+        yield {"session_factory": session_factory, "logins": logins}
+    finally:
+        db.close()
+        engine.dispose()
+        for ext in ["", "-wal", "-shm"]:
+            try:
+                os.unlink(db_path + ext)
+            except FileNotFoundError:
+                pass
+
+
+def login_isolated(session_factory, email: str, password: str) -> dict:
+    """Run the login lookup path in its own session, as a request would."""
+    db = session_factory()
+    try:
+        service = DatabaseService(db)
+        service.authenticate_facilitator_from_yaml(email, password)
+        user = service.authenticate_user(email, password)
+        return {"success": user is not None, "email": email}
+    except Exception as e:
+        return {"success": False, "email": email, "error": str(e)}
+    finally:
+        db.close()
+
+
+@pytest.mark.spec("AUTHENTICATION_SPEC")
+def test_concurrent_login_storm(login_test_db):
+    """All SMEs and facilitators log in at once; every login must succeed."""
+    session_factory = login_test_db["session_factory"]
+    logins = login_test_db["logins"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(logins)) as executor:
+        results = list(executor.map(lambda creds: login_isolated(session_factory, *creds), logins))
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if not r["success"]]
+
+    print("\n=== Concurrent Login Benchmark ===")
+    print(f"Logins: {len(results)} ({SME_COUNT} SMEs, {FACILITATOR_COUNT} facilitators)")
+    print(f"bcrypt workers: {PASSWORD_HASH_MAX_WORKERS}")
+    print(f"Elapsed: {elapsed:.2f}s ({len(results) / elapsed:.1f} logins/s)")
+
+    assert not errors, f"Failed logins: {errors}"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
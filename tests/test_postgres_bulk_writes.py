@@ -0,0 +1,107 @@
+"""
+Benchmark PostgresManager bulk writes against a live Lakebase/PostgreSQL database.
+
+Compares the row-at-a-time paths (executemany INSERT, repeated upsert) with the
+COPY-based write_many / upsert_many. Skipped unless DATABASE_ENV=postgres and
+the PG* connection variables are set, e.g.:
+
+    DATABASE_ENV=postgres PGHOST=... PGDATABASE=... PGUSER=... \\
+        pytest tests/test_postgres_bulk_writes.py -s --no-cov
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+
+ROW_COUNT = int(os.getenv("PG_BENCH_ROWS", "2000"))
+UPSERT_LOOP_ROWS = min(ROW_COUNT, 200)
+
+_HAS_POSTGRES = os.getenv("DATABASE_ENV", "").lower() == "postgres" and all(
+    os.getenv(v) for v in ("PGHOST", "PGDATABASE", "PGUSER")
+)
+
+pytestmark = pytest.mark.skipif(
+    not _HAS_POSTGRES,
+    reason="requires a PostgreSQL database (DATABASE_ENV=postgres and PGHOST/PGDATABASE/PGUSER)",
+)
+
+
+@pytest.fixture
+def bench_workshop():
+    """Create a throwaway workshop and remove it with all its traces afterwards."""
+    from server.postgres_manager import PostgresManager
+
+    mgr = PostgresManager.get_instance()
+    mgr.create_tables()
+    workshop_id = f"bench-{uuid.uuid4().hex[:8]}"
+    mgr.write("workshops", {"id": workshop_id, "name": "Bulk write benchmark", "facilitator_id": "bench"})
+    try:
+        yield mgr, workshop_id
+    finally:
+        mgr.execute("DELETE FROM traces WHERE workshop_id = %s", (workshop_id,))
+        mgr.execute("DELETE FROM workshops WHERE id = %s", (workshop_id,))
+
+
+def _trace_rows(workshop_id: str, count: int, suffix: str = "") -> list[dict]:
+    return [
+        {
+            "id": f"{workshop_id}-{suffix}{i}",
+            "workshop_id": workshop_id,
+            "input": f"Benchmark input {i}",
+            "output": f"Benchmark output {i}",
+            "context": {"row": i},
+        }
+        for i in range(count)
+    ]
+
+
+def _timed(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+@pytest.mark.spec("TRACE_INGESTION_SPEC")
+def test_copy_write_many_vs_executemany(bench_workshop):
+    mgr, workshop_id = bench_workshop
+    from psycopg.types.json import Json
+
+    # executemany does not adapt dicts, so wrap JSON explicitly for the legacy path
+    legacy_rows = [{**row, "context": Json(row["context"])} for row in _trace_rows(workshop_id, ROW_COUNT, "em-")]
+    copy_rows = _trace_rows(workshop_id, ROW_COUNT, "cp-")
+
+    executemany_s = _timed(mgr.write_many, "traces", legacy_rows, use_copy=False)
+    copy_s = _timed(mgr.write_many, "traces", copy_rows)
+
+    print("\n=== PostgresManager.write_many benchmark ===")
+    print(f"Rows: {ROW_COUNT}")
+    print(f"executemany: {executemany_s:.2f}s ({ROW_COUNT / executemany_s:.0f} rows/s)")
+    print(f"COPY:        {copy_s:.2f}s ({ROW_COUNT / copy_s:.0f} rows/s)")
+
+    stored = mgr.execute("SELECT count(*) AS n FROM traces WHERE workshop_id = %s", (workshop_id,))
+    assert stored[0]["n"] == 2 * ROW_COUNT
+
+
+@pytest.mark.spec("TRACE_INGESTION_SPEC")
+def test_upsert_many_vs_upsert_loop(bench_workshop):
+    mgr, workshop_id = bench_workshop
+    mgr.write_many("traces", _trace_rows(workshop_id, ROW_COUNT))
+    updated = [{**row, "output": "updated", "context": None} for row in _trace_rows(workshop_id, ROW_COUNT)]
+
+    loop_s = _timed(lambda: [mgr.upsert("traces", row, ["id"]) for row in updated[:UPSERT_LOOP_ROWS]])
+    bulk_s = _timed(mgr.upsert_many, "traces", updated, ["id"])
+
+    print("\n=== PostgresManager.upsert_many benchmark ===")
+    print(f"upsert loop: {UPSERT_LOOP_ROWS / loop_s:.0f} rows/s ({UPSERT_LOOP_ROWS} rows)")
+    print(f"upsert_many: {ROW_COUNT / bulk_s:.0f} rows/s ({ROW_COUNT} rows)")
+
+    stored = mgr.execute(
+        "SELECT count(*) AS n FROM traces WHERE workshop_id = %s AND output = 'updated'", (workshop_id,)
+    )
+    assert stored[0]["n"] == ROW_COUNT
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
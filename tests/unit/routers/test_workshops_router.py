@@ -307,14 +307,26 @@ async def test_auto_evaluation_results_endpoint_returns_stored_results(
         def get_auto_evaluation_prompt(self, workshop_id):
             return "Evaluate quality."
 
-        def get_latest_evaluations(self, workshop_id):
-            return stored_evals
+        def get_latest_evaluation_results(self, workshop_id):
+            traces = {t.id: t for t in (FakeTrace("t1"), FakeTrace("t2"))}
+            return [
+                {
+                    "trace_id": e.trace_id,
+                    "mlflow_trace_id": traces[e.trace_id].mlflow_trace_id,
+                    "predicted_rating": e.predicted_rating,
+                    "human_rating": e.human_rating,
+                    "confidence": e.confidence,
+                    "reasoning": e.reasoning,
+                    "judge_name": e.predicted_feedback,
+                }
+                for e in stored_evals
+            ]
 
         def get_judge_prompts(self, workshop_id):
             return [FakePrompt()]
 
-        def get_traces(self, workshop_id):
-            return [FakeTrace("t1"), FakeTrace("t2")]
+        def count_traces(self, workshop_id):
+            return {"total": 2, "with_mlflow_id": 2}
 
     monkeypatch.setattr(workshops_router, "DatabaseService", FakeDatabaseService)
     # Mock get_job since it's imported at module level
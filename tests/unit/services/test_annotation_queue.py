@@ -0,0 +1,113 @@
+"""Tests for the next-trace cursor used by annotators.
+
+Spec: ANNOTATION_SPEC
+Covers get_next_annotation_traces and GET /workshops/{id}/traces/next:
+- Returns the next N traces the user has not annotated, in their order
+- The cursor resumes after the last trace served, even if the order changed
+- Payloads are loaded only for the traces returned
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import AnnotationDB, Base, TraceDB, WorkshopDB
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+TRACE_IDS = [f"t{i}" for i in range(10)]
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        WorkshopDB(
+            id=WORKSHOP_ID,
+            name="Test Workshop",
+            facilitator_id="fac-1",
+            current_phase="annotation",
+            active_annotation_trace_ids=TRACE_IDS,
+        )
+    )
+    for trace_id in TRACE_IDS:
+        session.add(TraceDB(id=trace_id, workshop_id=WORKSHOP_ID, input=f"in {trace_id}", output="out"))
+    for trace_id in ("t0", "t1", "t3"):
+        session.add(
+            AnnotationDB(id=f"a-{trace_id}", workshop_id=WORKSHOP_ID, trace_id=trace_id, user_id="u1", rating=4)
+        )
+    session.add(AnnotationDB(id="a-other", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u2", rating=4))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.spec("ANNOTATION_SPEC")
+@pytest.mark.unit
+class TestNextAnnotationTraces:
+    def test_skips_traces_the_user_annotated(self, db_session):
+        page = DatabaseService(db_session).get_next_annotation_traces(WORKSHOP_ID, "u1", limit=3)
+
+        assert [t.id for t in page.traces] == ["t2", "t4", "t5"]
+        assert page.traces[0].input == "in t2"
+        assert (page.total, page.annotated) == (10, 3)
+        assert page.next_cursor
+
+    def test_cursor_walks_to_the_end(self, db_session):
+        service = DatabaseService(db_session)
+        seen = []
+        cursor = None
+        while True:
+            page = service.get_next_annotation_traces(WORKSHOP_ID, "u1", limit=3, cursor=cursor)
+            seen.extend(t.id for t in page.traces)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == ["t2", "t4", "t5", "t6", "t7", "t8", "t9"]
+
+    def test_cursor_survives_order_changes(self, db_session):
+        service = DatabaseService(db_session)
+        page = service.get_next_annotation_traces(WORKSHOP_ID, "u1", limit=2)  # t2, t4
+
+        workshop = db_session.query(WorkshopDB).filter(WorkshopDB.id == WORKSHOP_ID).one()
+        workshop.active_annotation_trace_ids = ["t9", *TRACE_IDS[:-1]]
+        db_session.commit()
+
+        resumed = service.get_next_annotation_traces(WORKSHOP_ID, "u1", limit=2, cursor=page.next_cursor)
+        assert [t.id for t in resumed.traces] == ["t5", "t6"]
+
+    def test_reload_without_cursor_starts_at_first_unannotated(self, db_session):
+        db_session.add(AnnotationDB(id="a-t2", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u1", rating=3))
+        db_session.commit()
+
+        page = DatabaseService(db_session).get_next_annotation_traces(WORKSHOP_ID, "u1", limit=1)
+
+        assert [t.id for t in page.traces] == ["t4"]
+
+    def test_invalid_cursor_is_rejected(self, db_session):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            DatabaseService(db_session).get_next_annotation_traces(WORKSHOP_ID, "u1", cursor="not-a-cursor")
+
+
+@pytest.mark.spec("ANNOTATION_SPEC")
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_next_traces_endpoint_validates_limit_and_cursor(async_client, override_get_db, monkeypatch):
+    import server.routers.workshops as workshops_router
+
+    monkeypatch.setattr(workshops_router.DatabaseService, "get_workshop", lambda self, workshop_id: object())
+
+    def _raise(self, workshop_id, user_id, limit, cursor):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    monkeypatch.setattr(workshops_router.DatabaseService, "get_next_annotation_traces", _raise)
+
+    url = f"/workshops/{WORKSHOP_ID}/traces/next"
+    too_many = await async_client.get(url, params={"user_id": "u1", "limit": 500})
+    bad_cursor = await async_client.get(url, params={"user_id": "u1", "cursor": "x"})
+
+    assert too_many.status_code == 422
+    assert bad_cursor.status_code == 400
@@ -0,0 +1,151 @@
+"""Tests for bulk annotation → MLflow re-sync.
+
+Spec: ANNOTATION_SPEC
+Covers resync_annotations_to_mlflow:
+- One bulk search_traces read instead of a get_trace per annotation
+- Feedback already present in MLflow (same name + HUMAN source) is skipped
+- Only traces missing the align tag are tagged
+- Progress is reported through the callback
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mlflow.entities import AssessmentSource, AssessmentSourceType
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import AnnotationDB, Base, MLflowIntakeConfigDB, RubricDB, TraceDB, UserDB, WorkshopDB
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite with a two-question rubric and two annotated traces."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    session.add(WorkshopDB(id=WORKSHOP_ID, name="Test Workshop", facilitator_id="fac-1"))
+    session.add(
+        MLflowIntakeConfigDB(
+            id="cfg-1", workshop_id=WORKSHOP_ID, databricks_host="https://test.databricks.com", experiment_id="exp-1"
+        )
+    )
+    session.add(
+        RubricDB(
+            id="r1",
+            workshop_id=WORKSHOP_ID,
+            question="Helpfulness: Is it helpful?|||QUESTION_SEPARATOR|||Accuracy: Is it correct?",
+            created_by="fac-1",
+        )
+    )
+    for uid in ("user-1", "user-2"):
+        session.add(UserDB(id=uid, email=f"{uid}@example.com", name=uid, role="participant", workshop_id=WORKSHOP_ID))
+    session.add(TraceDB(id="t1", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-1"))
+    session.add(TraceDB(id="t2", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-2"))
+    session.add(TraceDB(id="t3", workshop_id=WORKSHOP_ID, input="q", output="a"))
+    session.add(
+        AnnotationDB(
+            id="a1", workshop_id=WORKSHOP_ID, trace_id="t1", user_id="user-1", rating=4,
+            ratings={"r1_0": 4, "r1_1": 5}, comment=" good ",
+        )
+    )
+    session.add(
+        AnnotationDB(id="a2", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="user-2", rating=3, ratings={"r1_0": 3})
+    )
+    session.add(AnnotationDB(id="a3", workshop_id=WORKSHOP_ID, trace_id="t3", user_id="user-1", rating=2))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+def _mlflow_trace(trace_id, assessments=(), tags=None):
+    trace = MagicMock()
+    trace.info.trace_id = trace_id
+    trace.info.tags = tags or {}
+    trace.info.assessments = []
+    for name, source_id in assessments:
+        # MagicMock reserves the name kwarg, so set it afterwards
+        assessment = MagicMock(source=AssessmentSource(source_type=AssessmentSourceType.HUMAN, source_id=source_id))
+        assessment.name = name
+        trace.info.assessments.append(assessment)
+    return trace
+
+
+@pytest.fixture
+def mlflow_mocks():
+    with patch("server.services.database_service.token_storage") as mock_storage, \
+         patch("mlflow.set_tracking_uri"), \
+         patch("mlflow.set_experiment"), \
+         patch("mlflow.set_trace_tag") as mock_set_tag, \
+         patch("mlflow.log_feedback") as mock_log, \
+         patch("mlflow.get_trace") as mock_get_trace, \
+         patch("mlflow.search_traces") as mock_search:
+        mock_storage.get_token.return_value = "test-token"
+        yield MagicMock(set_trace_tag=mock_set_tag, log_feedback=mock_log, get_trace=mock_get_trace, search_traces=mock_search)
+
+
+@pytest.mark.spec("ANNOTATION_SPEC")
+@pytest.mark.req("Annotations sync to MLflow as feedback on save (one entry per rubric question)")
+@pytest.mark.unit
+class TestBulkResync:
+    def test_skips_existing_feedback_with_single_bulk_read(self, db_session, mlflow_mocks):
+        mlflow_mocks.search_traces.return_value = [
+            _mlflow_trace("tr-1", assessments=[("helpfulness_judge", "user-1")], tags={"align": "true"}),
+        ]
+        messages = []
+
+        result = DatabaseService(db_session).resync_annotations_to_mlflow(WORKSHOP_ID, progress_callback=messages.append)
+
+        mlflow_mocks.search_traces.assert_called_once()
+        assert mlflow_mocks.search_traces.call_args.kwargs["include_spans"] is False
+        mlflow_mocks.get_trace.assert_not_called()
+
+        logged = {(c.kwargs["trace_id"], c.kwargs["name"]) for c in mlflow_mocks.log_feedback.call_args_list}
+        assert logged == {("tr-1", "accuracy_judge"), ("tr-2", "helpfulness_judge")}
+        assert result["total_logged"] == 2
+        assert result["total_skipped_existing"] == 1
+        assert result["synced"] == 2
+        assert result["skipped_no_mlflow_id"] == 1
+        assert result["judge_names"] == ["helpfulness_judge", "accuracy_judge"]
+
+        # tr-1 already carries the align tag; only tr-2 is tagged
+        tagged = {c.kwargs["trace_id"] for c in mlflow_mocks.set_trace_tag.call_args_list}
+        assert tagged == {"tr-2"}
+        assert any("re-sync complete" in m for m in messages)
+
+    def test_comment_attached_to_first_logged_entry_only(self, db_session, mlflow_mocks):
+        mlflow_mocks.search_traces.return_value = []
+
+        DatabaseService(db_session).resync_annotations_to_mlflow(WORKSHOP_ID)
+
+        rationales = {
+            c.kwargs["name"]: c.kwargs["rationale"]
+            for c in mlflow_mocks.log_feedback.call_args_list
+            if c.kwargs["trace_id"] == "tr-1"
+        }
+        assert rationales == {"helpfulness_judge": "good", "accuracy_judge": None}
+
+    def test_falls_back_to_per_trace_reads_when_bulk_read_fails(self, db_session, mlflow_mocks):
+        mlflow_mocks.search_traces.side_effect = Exception("search unavailable")
+        mlflow_mocks.get_trace.return_value = _mlflow_trace("tr-1", assessments=[("helpfulness_judge", "user-1")])
+
+        result = DatabaseService(db_session).resync_annotations_to_mlflow(WORKSHOP_ID)
+
+        # One read per trace; user-2's feedback on tr-2 does not collide with user-1's
+        assert mlflow_mocks.get_trace.call_count == 2
+        assert result["total_skipped_existing"] == 1
+        assert result["total_logged"] == 2
+
+    def test_missing_token_reports_errors_without_mlflow_calls(self, db_session, mlflow_mocks):
+        with patch("server.services.database_service.token_storage") as mock_storage:
+            mock_storage.get_token.return_value = None
+            result = DatabaseService(db_session).resync_annotations_to_mlflow(WORKSHOP_ID)
+
+        assert result["synced"] == 0
+        assert len(result["sync_errors"]) == 2
+        mlflow_mocks.log_feedback.assert_not_called()
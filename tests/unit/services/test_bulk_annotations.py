@@ -0,0 +1,178 @@
+"""Tests for bulk annotation submission.
+
+Spec: ANNOTATION_SPEC
+Covers add_annotations_bulk and POST /workshops/{id}/annotations/bulk:
+- One batch is validated against the rubric and upserted in one transaction
+- Existing (user, trace) annotations are updated, others created
+- Unknown traces and duplicates within the batch are reported per item
+- The saved annotations are synced to MLflow by a single background job
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from server.database import AnnotationDB, Base, RubricDB, TraceDB, WorkshopDB
+from server.models import AnnotationCreate, BulkAnnotationResult
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+
+
+def _seed(session):
+    session.add(WorkshopDB(id=WORKSHOP_ID, name="Test Workshop", facilitator_id="fac-1"))
+    session.add(WorkshopDB(id="ws-other", name="Other Workshop", facilitator_id="fac-1"))
+    session.add(
+        RubricDB(
+            id="r1",
+            workshop_id=WORKSHOP_ID,
+            question=(
+                "Helpfulness: Is it helpful?|||JUDGE_TYPE|||likert|||QUESTION_SEPARATOR|||"
+                "Accuracy: Is it correct?|||JUDGE_TYPE|||binary"
+            ),
+            created_by="fac-1",
+        )
+    )
+    for trace_id in ("t1", "t2"):
+        session.add(TraceDB(id=trace_id, workshop_id=WORKSHOP_ID, input="q", output="a"))
+    session.add(TraceDB(id="t-other", workshop_id="ws-other", input="q", output="a"))
+    session.add(AnnotationDB(id="a-existing", workshop_id=WORKSHOP_ID, trace_id="t1", user_id="u1", rating=2))
+    session.commit()
+
+
+@pytest.fixture(params=["memory", "file"])
+def db_session(request, tmp_path):
+    """Seeded SQLite session; the file-backed variant goes through the SQLite write queue."""
+    url = "sqlite:///:memory:" if request.param == "memory" else f"sqlite:///{tmp_path / 'bulk.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    _seed(session)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _batch():
+    return [
+        AnnotationCreate(trace_id="t1", user_id="u1", rating=4, ratings={"r1_0": 4, "r1_1": 1}, comment="better"),
+        AnnotationCreate(trace_id="t2", user_id="u1", rating=5, ratings={"r1_0": 9, "r1_1": 0}),
+        AnnotationCreate(trace_id="t-other", user_id="u1", rating=3),
+        AnnotationCreate(trace_id="t2", user_id="u1", rating=1),
+        AnnotationCreate(trace_id="t2", user_id="u2", rating=3, ratings={"r1_1": 1}),
+    ]
+
+
+@pytest.mark.spec("ANNOTATION_SPEC")
+@pytest.mark.unit
+class TestAddAnnotationsBulk:
+    def test_upserts_valid_items_and_reports_each_outcome(self, db_session):
+        result = DatabaseService(db_session).add_annotations_bulk(WORKSHOP_ID, _batch())
+
+        assert (result.created, result.updated, result.failed) == (2, 1, 2)
+        assert [item.status for item in result.results] == ["updated", "created", "error", "error", "created"]
+        assert result.results[0].annotation_id == "a-existing"
+        assert result.results[2].error == "Trace not found in workshop"
+        assert result.results[3].error == "Duplicate of item 1 in this batch"
+
+        db_session.expire_all()
+        rows = {(row.user_id, row.trace_id): row for row in db_session.query(AnnotationDB).all()}
+        assert len(rows) == 3
+        assert rows[("u1", "t1")].ratings == {"r1_0": 4, "r1_1": 1}
+        assert rows[("u1", "t1")].comment == "better"
+        # Likert values are clamped, binary values kept, as for single submissions
+        assert rows[("u1", "t2")].ratings == {"r1_0": 5, "r1_1": 0}
+
+    def test_concurrent_insert_is_applied_as_an_update(self, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE UNIQUE INDEX idx_annotations_unique ON annotations (user_id, trace_id)"))
+        session = sessionmaker(bind=engine)()
+        _seed(session)
+        service = DatabaseService(session)
+        monkeypatch.setattr(service, "_write_queue", lambda: None)
+        real_commit = session.commit
+
+        def commit_after_another_request_inserts():
+            monkeypatch.setattr(session, "commit", real_commit)
+            with engine.begin() as conn:
+                conn.execute(
+                    AnnotationDB.__table__.insert().values(
+                        id="a-raced", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u2", rating=1
+                    )
+                )
+            real_commit()
+
+        monkeypatch.setattr(session, "commit", commit_after_another_request_inserts)
+        result = service.add_annotations_bulk(WORKSHOP_ID, _batch())
+
+        assert [item.status for item in result.results] == ["updated", "created", "error", "error", "updated"]
+        assert result.results[4].annotation_id == "a-raced"
+        session.expire_all()
+        assert session.get(AnnotationDB, "a-raced").rating == 3
+        session.close()
+        engine.dispose()
+
+    def test_rubric_is_parsed_once_per_batch(self, db_session):
+        service = DatabaseService(db_session)
+        with patch.object(service, "_parse_rubric_questions", wraps=service._parse_rubric_questions) as parse:
+            service.add_annotations_bulk(WORKSHOP_ID, _batch())
+
+        assert parse.call_count == 1
+
+    def test_batch_with_no_valid_items_writes_nothing(self, db_session):
+        result = DatabaseService(db_session).add_annotations_bulk(
+            WORKSHOP_ID, [AnnotationCreate(trace_id="missing", user_id="u1", rating=3)]
+        )
+
+        assert (result.created, result.updated, result.failed) == (0, 0, 1)
+        assert db_session.query(AnnotationDB).count() == 1
+
+
+@pytest.mark.spec("ANNOTATION_SPEC")
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bulk_endpoint_starts_one_sync_job_for_saved_annotations(async_client, override_get_db, monkeypatch):
+    import server.routers.workshops as workshops_router
+
+    saved = BulkAnnotationResult(
+        created=1,
+        updated=1,
+        failed=1,
+        results=[
+            {"index": 0, "trace_id": "t1", "user_id": "u1", "status": "updated", "annotation_id": "a1"},
+            {"index": 1, "trace_id": "t2", "user_id": "u1", "status": "created", "annotation_id": "a2"},
+            {"index": 2, "trace_id": "t3", "user_id": "u1", "status": "error", "error": "Trace not found in workshop"},
+        ],
+    )
+    sync_calls = []
+    monkeypatch.setattr(workshops_router.DatabaseService, "get_workshop", lambda self, workshop_id: object())
+    monkeypatch.setattr(workshops_router.DatabaseService, "add_annotations_bulk", lambda self, ws, items: saved)
+    monkeypatch.setattr(
+        workshops_router,
+        "_run_resync_job",
+        lambda job, workshop_id, reason, annotation_ids=None: sync_calls.append((workshop_id, annotation_ids)),
+    )
+
+    class _InlineThread:
+        def __init__(self, target, args=(), daemon=None):
+            self._run = lambda: target(*args)
+
+        def start(self):
+            self._run()
+
+    monkeypatch.setattr(workshops_router.threading, "Thread", _InlineThread)
+
+    resp = await async_client.post(
+        f"/workshops/{WORKSHOP_ID}/annotations/bulk",
+        json={"annotations": [{"trace_id": t, "user_id": "u1", "rating": 3} for t in ("t1", "t2", "t3")]},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [item["status"] for item in body["results"]] == ["updated", "created", "error"]
+    assert workshops_router.get_job(body["sync_job_id"]) is not None  # persisted for polling
+    assert sync_calls == [(WORKSHOP_ID, ["a1", "a2"])]
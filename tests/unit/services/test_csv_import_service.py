@@ -0,0 +1,220 @@
+"""Tests for the streaming CSV trace importer.
+
+Spec: TRACE_INGESTION_SPEC
+Covers:
+- Preview and raw search_traces CSV formats
+- Fixed-size batch commits with per-batch progress
+- Row errors are reported without aborting the import
+- Unsupported headers raise CsvFormatError
+- Logging preview rows to MLflow with a worker pool and batched ingest
+"""
+
+import csv
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, TraceDB, WorkshopDB
+from server.services.csv_import_service import (
+    CsvFormatError,
+    CsvMlflowTraceLogger,
+    CsvTraceImporter,
+    clean_preview_text,
+)
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(WorkshopDB(id=WORKSHOP_ID, name="Test Workshop", facilitator_id="fac-1"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _csv_bytes(header, rows):
+    buf = io.StringIO()
+    buf.write(",".join(header) + "\n")
+    for row in rows:
+        buf.write(",".join(row) + "\n")
+    return io.BytesIO(buf.getvalue().encode("utf-8"))
+
+
+@pytest.mark.spec("TRACE_INGESTION_SPEC")
+@pytest.mark.unit
+class TestCsvTraceImporter:
+    def test_preview_format_commits_in_batches(self, db_session):
+        rows = [(f"tr-{i}", f"question {i}", f"answer {i}") for i in range(7)]
+        rows.insert(3, ("tr-empty", "", ""))
+        data = _csv_bytes(("trace_id", "request_preview", "response_preview"), rows)
+        progress = []
+
+        importer = CsvTraceImporter(
+            DatabaseService(db_session), WORKSHOP_ID, "export.csv", batch_size=3, progress_callback=progress.append
+        )
+        result = importer.run(data)
+
+        assert result.traces_imported == 7
+        assert result.rows_read == 8
+        assert result.rows_skipped == 1
+        assert [b["traces"] for b in result.batches] == [3, 3, 1]
+        assert len(progress) == 3
+
+        stored = db_session.query(TraceDB).filter(TraceDB.workshop_id == WORKSHOP_ID).all()
+        assert {t.mlflow_trace_id for t in stored} == {f"tr-{i}" for i in range(7)}
+        first = next(t for t in stored if t.mlflow_trace_id == "tr-0")
+        assert first.input == "question 0"
+        assert first.context["csv_row_number"] == 2
+        assert first.trace_metadata["filename"] == "export.csv"
+
+    def test_raw_format_extracts_previews(self, db_session):
+        request = json.dumps({"messages": [{"role": "user", "content": "What is MLflow?"}]})
+        response = json.dumps({"choices": [{"message": {"role": "assistant", "content": "A platform."}}]})
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(["trace_id", "request", "response", "state"])
+        writer.writerow(["tr-raw", request, response, "OK"])
+        importer = CsvTraceImporter(DatabaseService(db_session), WORKSHOP_ID, "raw.csv")
+
+        result = importer.run(io.BytesIO(buf.getvalue().encode("utf-8")))
+
+        assert result.traces_imported == 1
+        trace = db_session.query(TraceDB).one()
+        assert "What is MLflow?" in trace.input
+        assert "A platform." in trace.output
+        assert trace.context["state"] == "OK"
+        assert trace.context["request"]["messages"][0]["content"] == "What is MLflow?"
+
+    def test_row_errors_are_reported_and_import_continues(self, db_session):
+        data = _csv_bytes(
+            ("trace_id", "request_preview", "response_preview"),
+            [("tr-1", "q1", "a1"), ("tr-2", "q2", "a2"), ("tr-3", "q3", "a3")],
+        )
+        importer = CsvTraceImporter(DatabaseService(db_session), WORKSHOP_ID, "export.csv")
+        original = importer.row_to_upload
+
+        def flaky(row_number, row):
+            if row["trace_id"] == "tr-2":
+                raise ValueError("bad row")
+            return original(row_number, row)
+
+        importer.row_to_upload = flaky
+        result = importer.run(data)
+
+        assert result.traces_imported == 2
+        assert result.row_error_count == 1
+        assert result.row_errors == [{"row": 3, "error": "bad row"}]
+
+    def test_unsupported_header_raises(self, db_session):
+        data = _csv_bytes(("foo", "bar"), [("1", "2")])
+        importer = CsvTraceImporter(DatabaseService(db_session), WORKSHOP_ID, "export.csv")
+
+        with pytest.raises(CsvFormatError, match="Found columns: foo, bar"):
+            importer.run(data)
+
+    def test_underlying_file_left_open(self, db_session):
+        data = _csv_bytes(("request_preview", "response_preview"), [("q", "a")])
+        CsvTraceImporter(DatabaseService(db_session), WORKSHOP_ID, "export.csv").run(data)
+
+        assert not data.closed
+
+
+class _FakeMlflowClient:
+    def __init__(self, tracking_uri=None):
+        self.tracking_uri = tracking_uri
+        self.traces = {}
+
+    def start_trace(self, name, inputs=None, experiment_id=None):
+        if inputs == "boom":
+            raise RuntimeError("span rejected")
+        trace_id = f"mlflow-{name}"
+        self.traces[trace_id] = {"experiment_id": experiment_id, "inputs": inputs}
+        return SimpleNamespace(trace_id=trace_id)
+
+    def end_trace(self, trace_id, outputs=None):
+        self.traces[trace_id]["outputs"] = outputs
+
+
+@pytest.fixture
+def mlflow_client(monkeypatch):
+    import mlflow
+
+    client = _FakeMlflowClient()
+    monkeypatch.setattr(mlflow, "MlflowClient", lambda tracking_uri=None: client)
+    monkeypatch.setattr(mlflow, "set_tracking_uri", lambda uri: None)
+    monkeypatch.setenv("DATABRICKS_HOST", "https://other.example.com")
+    monkeypatch.setenv("DATABRICKS_TOKEN", "other-token")
+    return client
+
+
+@pytest.mark.spec("TRACE_INGESTION_SPEC")
+@pytest.mark.unit
+class TestCsvMlflowTraceLogger:
+    def test_logs_rows_concurrently_and_reports_failures(self, mlflow_client):
+        rows = [(f'"q{i}"', f"a{i}") for i in range(10)] + [("boom", "x"), ("", "no request")]
+        data = _csv_bytes(("request_preview", "response_preview"), rows)
+
+        result = CsvMlflowTraceLogger("export.csv", "exp-1", max_workers=3).run(data)
+
+        assert result.traces_created == 10
+        assert result.rows_read == 12
+        assert result.rows_skipped == 1
+        assert result.row_errors == [{"row": 11, "error": "span rejected"}]
+        assert result.traces_imported == 0
+
+    def test_ingests_created_traces_in_batches(self, mlflow_client):
+        data = _csv_bytes(("request_preview", "response_preview"), [(f"q{i}", f"a{i}") for i in range(5)])
+        batches = []
+
+        def ingest(uploads):
+            batches.append(uploads)
+            return len(uploads)
+
+        result = CsvMlflowTraceLogger("export.csv", "exp-1", max_workers=2, batch_size=2, ingest=ingest).run(data)
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert result.traces_imported == 5
+        uploads = [u for b in batches for u in b]
+        assert {u.mlflow_trace_id for u in uploads} == {f"mlflow-csv_import_row_{i}" for i in range(1, 6)}
+        assert {u.input for u in uploads} == {f"q{i}" for i in range(5)}
+
+    def test_traces_use_the_job_experiment_and_credentials(self, mlflow_client):
+        import os
+
+        data = _csv_bytes(("request_preview", "response_preview"), [("q", "a")])
+        csv_logger = CsvMlflowTraceLogger(
+            "export.csv", "exp-1", databricks_host="https://job.example.com", databricks_token="job-token"
+        )
+
+        def log_row(*args):
+            # Another workshop reconfigures MLflow while the job runs
+            os.environ["DATABRICKS_TOKEN"] = "other-token"
+            return CsvMlflowTraceLogger._log_row(csv_logger, *args)
+
+        with patch.object(csv_logger, "_log_row", side_effect=log_row):
+            result = csv_logger.run(data)
+
+        assert result.traces_created == 1
+        assert mlflow_client.traces["mlflow-csv_import_row_1"] == {"experiment_id": "exp-1", "inputs": "q", "outputs": "a"}
+        assert os.environ["DATABRICKS_TOKEN"] == "job-token"
+
+    def test_missing_preview_columns_raise(self, mlflow_client):
+        data = _csv_bytes(("request", "response"), [("q", "a")])
+
+        with pytest.raises(CsvFormatError, match="request_preview"):
+            CsvMlflowTraceLogger("export.csv", "exp-1").run(data)
+
+    def test_clean_preview_text(self):
+        assert clean_preview_text('""quoted""') == "quoted"
+        assert clean_preview_text("line1\\nline2") == "line1\nline2"
+        assert clean_preview_text(None) == ""
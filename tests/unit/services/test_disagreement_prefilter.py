@@ -0,0 +1,155 @@
+"""Tests for the local disagreement prefilter.
+
+Spec: ASSISTED_FACILITATION_SPEC
+Covers:
+- Unrelated or agreeing findings skip LLM disagreement detection
+- Related findings with conflicting polarity are sent to the LLM with only their candidates
+- The per-trace index follows added and deleted findings
+- Convergence metrics come from a token index instead of substring scans
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from server.services.disagreement_prefilter import TraceFindingIndex, polarity, screen_finding
+from server.services.discovery_service import DiscoveryService
+
+
+def _finding(finding_id, user_id, text):
+    return {"id": finding_id, "user_id": user_id, "text": text}
+
+
+@pytest.mark.spec("ASSISTED_FACILITATION_SPEC")
+@pytest.mark.unit
+class TestPolarity:
+    def test_cues_and_negation(self):
+        assert polarity("This is a great response.") == 1
+        assert polarity("This is an awful response.") == -1
+        assert polarity("The answer is not accurate") == -1
+        assert polarity("Mentions the refund policy") == 0
+
+
+@pytest.mark.spec("ASSISTED_FACILITATION_SPEC")
+@pytest.mark.unit
+class TestTraceFindingIndex:
+    def _screen(self, findings, finding_id):
+        index = TraceFindingIndex()
+        index.sync(findings)
+        return index.screen(finding_id)
+
+    def test_single_participant_needs_no_llm(self):
+        screen = self._screen([_finding("f1", "u1", "great"), _finding("f2", "u1", "awful")], "f2")
+
+        assert not screen.needs_llm
+
+    def test_unrelated_findings_skip_llm(self):
+        findings = [
+            _finding("f1", "u1", "The SQL query joins the wrong table"),
+            _finding("f2", "u2", "Tone is friendly and polite"),
+        ]
+
+        screen = self._screen(findings, "f2")
+
+        assert not screen.needs_llm
+        assert screen.reason == "no related findings from other participants"
+
+    def test_agreeing_paraphrase_skips_llm(self):
+        findings = [
+            _finding("f1", "u1", "The response hallucinates a citation"),
+            _finding("f2", "u2", "Response hallucinates the citation"),
+        ]
+
+        assert not self._screen(findings, "f2").needs_llm
+
+    def test_conflicting_findings_go_to_llm_with_candidates(self):
+        findings = [
+            _finding("f1", "u1", "This is a great response."),
+            _finding("f2", "u3", "The SQL query joins the wrong table"),
+            _finding("f3", "u2", "This is an awful response."),
+        ]
+
+        screen = self._screen(findings, "f3")
+
+        assert screen.needs_llm
+        assert screen.candidate_ids == ["f1"]
+
+    def test_sync_drops_deleted_findings(self):
+        findings = [_finding("f1", "u1", "This is a great response."), _finding("f2", "u2", "An awful response.")]
+        index = TraceFindingIndex()
+        index.sync(findings)
+
+        index.sync(findings[1:])
+
+        assert not index.screen("f2").needs_llm
+
+
+@pytest.mark.spec("ASSISTED_FACILITATION_SPEC")
+@pytest.mark.unit
+class TestSubmitFindingScreening:
+    def _service(self, existing):
+        service = DiscoveryService(MagicMock())
+        db_service = MagicMock()
+        db_service.get_trace.return_value = SimpleNamespace(workshop_id="ws-screen")
+        db_service.add_classified_finding.return_value = {"id": "new"}
+        db_service.get_classified_findings_by_trace.return_value = existing
+        service.db_service = db_service
+        service._classify_finding_with_llm = AsyncMock(return_value="themes")
+        service._detect_disagreements_with_llm = AsyncMock()
+        return service
+
+    def test_unrelated_finding_skips_detection(self):
+        existing = [
+            _finding("old", "u1", "Formatting of the table is clean"),
+            _finding("new", "u2", "Cites no sources"),
+        ]
+        service = self._service(existing)
+
+        asyncio.run(service.submit_finding_v2("ws-screen", "t-unrelated", "u2", "Cites no sources"))
+
+        service._detect_disagreements_with_llm.assert_not_awaited()
+
+    def test_conflicting_finding_sends_only_candidates(self):
+        existing = [
+            _finding("old", "u1", "This is a great response."),
+            _finding("other", "u3", "Formatting of the table is clean"),
+            _finding("new", "u2", "This is an awful response."),
+        ]
+        service = self._service(existing)
+
+        asyncio.run(service.submit_finding_v2("ws-screen", "t-conflict", "u2", "This is an awful response."))
+
+        sent = service._detect_disagreements_with_llm.await_args.args[2]
+        assert {f["id"] for f in sent} == {"old", "new"}
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+def test_convergence_metrics_use_token_index():
+    findings = [
+        {"user_id": "u1", "insight": "Responses are too verbose"},
+        {"user_id": "u2", "insight": "Verbose answer, also missing citations"},
+        {"user_id": "u3", "insight": "Great formatting"},
+    ]
+
+    service = DiscoveryService(MagicMock())
+
+    metrics = service._compute_convergence_metrics(findings, ["Verbosity of answers", "Citations"])
+
+    assert metrics["theme_agreement"] == {
+        "Verbosity of answers": pytest.approx(1 / 3),
+        "Citations": pytest.approx(1 / 3),
+    }
+
+
+@pytest.mark.spec("ASSISTED_FACILITATION_SPEC")
+@pytest.mark.unit
+def test_screen_finding_reuses_trace_index():
+    findings = [_finding("f1", "u1", "great answer")]
+    screen_finding("ws-cache", "t1", "f1", findings)
+
+    screen = screen_finding("ws-cache", "t1", "f2", [*findings, _finding("f2", "u2", "awful answer")])
+
+    assert screen.needs_llm
@@ -0,0 +1,189 @@
+"""Tests for the pre-generated discovery question pool.
+
+Spec: DISCOVERY_SPEC
+Covers:
+- Pre-generation fills the pool per trace with one question per missing category
+- Reads are served from the pool before falling back to the LLM
+- Pre-generation runs traces under a worker budget and survives per-trace failures
+- Demo workshops never start pre-generation
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, DiscoveryQuestionDB, TraceDB, WorkshopDB
+from server.services.discovery_service import (
+    QUESTION_POOL_USER_ID,
+    DiscoveryService,
+    run_question_pregeneration,
+    start_question_pregeneration,
+)
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add(
+            WorkshopDB(
+                id=WORKSHOP_ID,
+                name="Test Workshop",
+                facilitator_id="fac-1",
+                discovery_questions_model_name="databricks-claude-sonnet-4-5",
+            )
+        )
+        for i in range(4):
+            session.add(TraceDB(id=f"t{i}", workshop_id=WORKSHOP_ID, input=f"q{i}", output=f"a{i}"))
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+class _FakeLLM:
+    """Stands in for run_predict: one question for the first missing category."""
+
+    def __init__(self, delay=0.0, fail_trace=None):
+        self.calls = []
+        self.delay = delay
+        self.fail_trace = fail_trace
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, predictor, lm, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if kwargs["trace_id"] == self.fail_trace:
+                raise RuntimeError("endpoint unavailable")
+            category = kwargs["missing_categories"][0]
+            return SimpleNamespace(
+                question={
+                    "prompt": f"{kwargs['user_id']} {kwargs['trace_id']} {category}?",
+                    "placeholder": "...",
+                    "category": category,
+                }
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_llm():
+    llm = _FakeLLM()
+    with (
+        patch("server.services.discovery_dspy.run_predict", llm),
+        patch.object(DiscoveryService, "_question_llm_credentials", return_value=("https://host", "token")),
+        patch.object(DiscoveryService, "_build_question_predictor", return_value=(object(), object())),
+    ):
+        yield llm
+
+
+def _pool(session, trace_id):
+    return (
+        session.query(DiscoveryQuestionDB)
+        .filter_by(workshop_id=WORKSHOP_ID, trace_id=trace_id, user_id=QUESTION_POOL_USER_ID)
+        .order_by(DiscoveryQuestionDB.created_at)
+        .all()
+    )
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestQuestionPool:
+    def test_pregenerate_fills_distinct_categories(self, session_factory, fake_llm):
+        with session_factory() as db:
+            created = DiscoveryService(db).pregenerate_trace_questions(WORKSHOP_ID, "t0", None, None, target=3)
+            pool = _pool(db, "t0")
+
+        assert created == 3
+        assert [q.category for q in pool] == ["edge_cases", "boundary_conditions", "failure_modes"]
+        assert all(call["has_disagreement"] is False for call in fake_llm.calls)
+        assert "disagreements" not in fake_llm.calls[0]["missing_categories"]
+
+    def test_pregenerate_is_idempotent(self, session_factory, fake_llm):
+        with session_factory() as db:
+            svc = DiscoveryService(db)
+            svc.pregenerate_trace_questions(WORKSHOP_ID, "t0", None, None, target=2)
+            assert svc.pregenerate_trace_questions(WORKSHOP_ID, "t0", None, None, target=2) == 0
+
+        assert len(fake_llm.calls) == 2
+
+    def test_reads_are_served_from_pool(self, session_factory, fake_llm):
+        with session_factory() as db:
+            svc = DiscoveryService(db)
+            svc.pregenerate_trace_questions(WORKSHOP_ID, "t0", None, None, target=2)
+            fake_llm.calls.clear()
+
+            first = svc.get_discovery_questions(WORKSHOP_ID, "t0", user_id="sme-1", append=True)
+            second = svc.get_discovery_questions(WORKSHOP_ID, "t0", user_id="sme-1", append=True)
+            other_user = svc.get_discovery_questions(WORKSHOP_ID, "t0", user_id="sme-2", append=True)
+
+        assert fake_llm.calls == []
+        assert [q["category"] for q in second["questions"]] == ["themes", "edge_cases", "boundary_conditions"]
+        assert [q["id"] for q in second["questions"]] == ["q_1", "q_2", "q_3"]
+        assert first["coverage"]["covered"] == ["edge_cases", "themes"]
+        assert other_user["questions"][1]["prompt"] == second["questions"][1]["prompt"]
+
+    def test_falls_back_to_llm_when_pool_exhausted(self, session_factory, fake_llm):
+        with session_factory() as db:
+            svc = DiscoveryService(db)
+            svc.pregenerate_trace_questions(WORKSHOP_ID, "t0", None, None, target=1)
+            fake_llm.calls.clear()
+
+            svc.get_discovery_questions(WORKSHOP_ID, "t0", user_id="sme-1", append=True)
+            result = svc.get_discovery_questions(WORKSHOP_ID, "t0", user_id="sme-1", append=True)
+
+        assert len(fake_llm.calls) == 1
+        assert fake_llm.calls[0]["user_id"] == "sme-1"
+        assert result["questions"][-1]["prompt"] == "sme-1 t0 boundary_conditions?"
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestQuestionPregeneration:
+    def test_runs_traces_under_worker_budget(self, session_factory, fake_llm):
+        fake_llm.delay = 0.02
+        trace_ids = [f"t{i}" for i in range(4)]
+
+        created = run_question_pregeneration(
+            WORKSHOP_ID, trace_ids, session_factory, max_workers=2, questions_per_trace=2
+        )
+
+        assert created == 8
+        assert fake_llm.max_in_flight == 2
+        with session_factory() as db:
+            assert all(len(_pool(db, trace_id)) == 2 for trace_id in trace_ids)
+
+    def test_failed_trace_does_not_stop_others(self, session_factory, fake_llm):
+        fake_llm.fail_trace = "t1"
+
+        created = run_question_pregeneration(
+            WORKSHOP_ID, ["t0", "t1", "t2"], session_factory, max_workers=3, questions_per_trace=2
+        )
+
+        assert created == 4
+        with session_factory() as db:
+            assert _pool(db, "t1") == []
+            assert len(_pool(db, "t0")) == len(_pool(db, "t2")) == 2
+
+    def test_demo_model_skips_pregeneration(self):
+        with patch("server.services.discovery_service.threading.Thread") as thread:
+            assert start_question_pregeneration(WORKSHOP_ID, ["t0"], "demo") is False
+            assert start_question_pregeneration(WORKSHOP_ID, [], "databricks-claude-sonnet-4-5") is False
+
+        thread.assert_not_called()
@@ -0,0 +1,178 @@
+"""Tests for the map-reduce discovery summary pipeline.
+
+Spec: DISCOVERY_SPEC
+Covers:
+- Every trace and user is summarized (no fixed caps) in concurrent batches
+- Partial overall summaries are merged hierarchically; failed merges fall back to a local union
+- Disagreements found in different chunks are folded together by theme
+- Corpus chunks never split one trace's findings
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, WorkshopDB
+from server.services.discovery_dspy import DiscoveryOverallSummary
+from server.services.discovery_service import DiscoveryService
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def service():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        WorkshopDB(
+            id=WORKSHOP_ID,
+            name="Test Workshop",
+            facilitator_id="fac-1",
+            discovery_questions_model_name="databricks-claude-sonnet-4-5",
+        )
+    )
+    session.commit()
+    svc = DiscoveryService(session)
+    yield svc
+    session.close()
+
+
+def _findings(trace_count, per_trace, user_count):
+    return [
+        {
+            "trace_id": f"t{t}",
+            "user_id": f"u{(t * per_trace + i) % user_count}",
+            "user_name": f"User {(t * per_trace + i) % user_count}",
+            "insight": f"finding {i} on trace {t}",
+        }
+        for t in range(trace_count)
+        for i in range(per_trace)
+    ]
+
+
+class _FakeLLM:
+    """Stands in for run_predict, dispatching on the signature the predictor was built for."""
+
+    def __init__(self, fail_merges=False):
+        self.calls = []
+        self.fail_merges = fail_merges
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, predictor, lm, **kwargs):
+        with self._lock:
+            self.calls.append((predictor, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.01)
+            return getattr(self, predictor)(**kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def RefineOverallSummary(self, current_state, findings_chunk):
+        if current_state.themes and self.fail_merges:
+            raise RuntimeError("merge failed")
+        traces = sorted({line.split(" | ")[0] for line in findings_chunk if line.startswith("TRACE")})
+        themes = [*current_state.themes, *(f"theme {t}" for t in traces)]
+        themes += [line.removeprefix("THEME: ") for line in findings_chunk if line.startswith("THEME: ")]
+        return SimpleNamespace(updated_state=DiscoveryOverallSummary(themes=themes))
+
+    def IdentifyDisagreements(self, findings):
+        trace_ids = sorted({line.split(" | ")[0].removeprefix("TRACE ") for line in findings})
+        return SimpleNamespace(
+            disagreements=[{"theme": "Verbosity", "trace_ids": trace_ids[:1], "viewpoints": [f"view {trace_ids[0]}"]}]
+        )
+
+    def SummarizeTraces(self, trace_findings_blocks):
+        return SimpleNamespace(
+            summaries=[{"trace_id": b.split(":")[0].removeprefix("TRACE ")} for b in trace_findings_blocks]
+        )
+
+    def SummarizeUsers(self, user_findings_blocks):
+        return SimpleNamespace(
+            summaries=[
+                {"user_id": b.split("(")[1].split(")")[0], "user_name": b.split(" (")[0].removeprefix("USER ")}
+                for b in user_findings_blocks
+            ]
+        )
+
+    def ExtractRubricCandidates(self, overall_summary):
+        return SimpleNamespace(candidates=[f"Does it handle {t}?" for t in overall_summary.themes])
+
+    def GenerateDiscussionPrompts(self, themes, disagreements):
+        return SimpleNamespace(prompts=[{"theme": d.theme, "prompt": f"Discuss {d.theme}"} for d in disagreements])
+
+    def count(self, name):
+        return sum(1 for predictor, _ in self.calls if predictor == name)
+
+
+def _generate(service, findings, llm):
+    with (
+        patch.object(service.db_service, "get_findings_with_user_details", return_value=findings),
+        patch.object(service.db_service, "get_mlflow_config", return_value=SimpleNamespace(databricks_host="h")),
+        patch.object(service.db_service, "get_databricks_token", return_value="token"),
+        patch("server.services.discovery_dspy.build_databricks_lm", return_value=object()),
+        patch("server.services.discovery_dspy.get_predictor", side_effect=lambda sig, lm, **kw: sig.__name__),
+        patch("server.services.discovery_dspy.run_predict", llm),
+    ):
+        return service.generate_discovery_summaries(WORKSHOP_ID, refresh=True)
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestDiscoverySummariesMapReduce:
+    def test_large_workshop_is_summarized_completely(self, service):
+        llm = _FakeLLM()
+        findings = _findings(trace_count=60, per_trace=6, user_count=30)
+
+        payload = _generate(service, findings, llm)
+
+        # 360 findings -> 8 chunks of up to 50 lines; previously capped at 300 findings / 20 traces / 20 users
+        assert llm.count("RefineOverallSummary") == 8 + 3  # map + two merge rounds (4 + 2 -> 1)
+        assert {s["trace_id"] for s in payload["by_trace"]} == {f"t{t}" for t in range(60)}
+        assert {s["user_id"] for s in payload["by_user"]} == {f"u{u}" for u in range(30)}
+        assert llm.count("SummarizeTraces") == 6
+        assert set(payload["overall"]["themes"]) == {f"theme TRACE t{t}" for t in range(60)}
+        assert llm.max_in_flight > 1
+
+    def test_disagreements_are_merged_by_theme(self, service):
+        llm = _FakeLLM()
+
+        payload = _generate(service, _findings(trace_count=20, per_trace=5, user_count=4), llm)
+
+        assert llm.count("IdentifyDisagreements") == 2
+        assert payload["key_disagreements"] == [
+            {"theme": "Verbosity", "trace_ids": ["t0", "t10"], "viewpoints": ["view t0", "view t10"]}
+        ]
+        assert payload["discussion_prompts"] == [{"theme": "Verbosity", "prompt": "Discuss Verbosity"}]
+
+    def test_failed_merge_falls_back_to_union(self, service):
+        llm = _FakeLLM(fail_merges=True)
+
+        payload = _generate(service, _findings(trace_count=20, per_trace=5, user_count=4), llm)
+
+        assert set(payload["overall"]["themes"]) == {f"theme TRACE t{t}" for t in range(20)}
+
+    def test_small_workshop_needs_no_merge(self, service):
+        llm = _FakeLLM()
+
+        payload = _generate(service, _findings(trace_count=3, per_trace=2, user_count=2), llm)
+
+        assert llm.count("RefineOverallSummary") == 1
+        assert len(payload["candidate_rubric_questions"]) == 3
+
+    def test_trace_chunks_keep_traces_together(self):
+        groups = [["a"] * 30, ["b"] * 30, ["c"] * 10, ["d"] * 70]
+
+        chunks = DiscoveryService._pack_trace_chunks(groups, 50)
+
+        assert [sorted(set(c)) for c in chunks] == [["a"], ["b", "c"], ["d"]]
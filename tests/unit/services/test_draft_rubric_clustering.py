@@ -0,0 +1,115 @@
+"""Tests for local clustering of draft rubric items.
+
+Spec: DISCOVERY_SPEC
+Covers:
+- TF-IDF + agglomerative clustering groups related items and leaves unrelated ones alone
+- Clustering is deterministic and fast for hundreds of items
+- suggest_groups uses local clusters by default and as the LLM fallback
+- LLM refinement is seeded with the local clusters and keeps every item
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from server.services.draft_rubric_clustering import agglomerative_clusters, cluster_items, tfidf_matrix
+from server.services.draft_rubric_grouping_service import DraftRubricGroupingService
+
+TEXTS = [
+    "Response cites sources for factual claims",
+    "Tone is polite and professional",
+    "Sources cited for claims are real",
+    "Professional, polite tone throughout",
+    "Handles empty input gracefully",
+]
+
+
+def _items(texts):
+    return [SimpleNamespace(id=f"d{i}", text=text) for i, text in enumerate(texts)]
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestClusteringEngine:
+    def test_groups_related_items(self):
+        groups = cluster_items([f"d{i}" for i in range(len(TEXTS))], TEXTS)
+
+        assert [g["item_ids"] for g in groups] == [["d0", "d2"], ["d1", "d3"], ["d4"]]
+        assert groups[1]["name"] in (TEXTS[1], TEXTS[3])
+        assert "polite" in groups[1]["rationale"]
+        assert groups[2]["rationale"] == "No closely related items."
+
+    def test_rows_are_normalised(self):
+        vectors, vocabulary = tfidf_matrix(["accuracy accuracy", "tone", "the a of"])
+
+        assert np.allclose(np.linalg.norm(vectors, axis=1), [1.0, 1.0, 0.0])
+        assert vocabulary == ["accuracy", "tone"]
+
+    def test_items_without_terms_stay_apart(self):
+        vectors, _ = tfidf_matrix(["the", "of the", "a"])
+
+        assert agglomerative_clusters(vectors) == [[0], [1], [2]]
+
+    def test_hundreds_of_items_are_fast_and_deterministic(self):
+        topics = ["citation source", "tone polite", "latency speed", "format markdown", "refusal safety"]
+        texts = [f"{topics[i % 5]} item{i} variant{i % 7}" for i in range(400)]
+        ids = [str(i) for i in range(400)]
+
+        start = time.perf_counter()
+        first = cluster_items(ids, texts)
+        elapsed = time.perf_counter() - start
+
+        assert first == cluster_items(ids, texts)
+        assert sorted(i for g in first for i in g["item_ids"]) == sorted(ids)
+        assert elapsed < 5
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestSuggestGroupsLocalFirst:
+    def test_local_by_default_without_llm(self):
+        service = DraftRubricGroupingService(MagicMock())
+        service.db_service = MagicMock()
+
+        groups = service.suggest_groups("ws-1", _items(TEXTS))
+
+        assert len(groups) == 3
+        service.db_service.get_workshop.assert_not_called()
+
+    def test_llm_failure_falls_back_to_local_clusters(self):
+        service = DraftRubricGroupingService(MagicMock())
+        service.db_service = MagicMock()
+        service.db_service.get_workshop.return_value = SimpleNamespace(discovery_questions_model_name="demo")
+
+        groups = service.suggest_groups("ws-1", _items(TEXTS), method="llm")
+
+        assert [g["item_ids"] for g in groups] == [["d0", "d2"], ["d1", "d3"], ["d4"]]
+
+    def test_llm_is_seeded_and_dropped_items_are_kept(self):
+        service = DraftRubricGroupingService(MagicMock())
+        service.db_service = MagicMock()
+        service.db_service.get_workshop.return_value = SimpleNamespace(discovery_questions_model_name="model")
+        service.db_service.get_mlflow_config.return_value = SimpleNamespace(databricks_host="h")
+        service.db_service.get_databricks_token.return_value = "token"
+        prompts = []
+
+        def fake_predict(predictor, lm, items):
+            prompts.append(items)
+            return SimpleNamespace(
+                groups=[{"name": "Grounding", "item_ids": ["d0", "d2", "bogus"], "rationale": "Citations"}]
+            )
+
+        with (
+            patch("server.services.discovery_dspy.build_databricks_lm", return_value=object()),
+            patch("server.services.discovery_dspy.get_predictor", return_value=object()),
+            patch("server.services.discovery_dspy.run_predict", fake_predict),
+        ):
+            groups = service.suggest_groups("ws-1", _items(TEXTS), method="llm")
+
+        assert "Candidate clusters" in prompts[0]
+        assert "- d0, d2" in prompts[0]
+        assert groups[0] == {"name": "Grounding", "item_ids": ["d0", "d2"], "rationale": "Citations"}
+        assert sorted(i for g in groups for i in g["item_ids"]) == ["d0", "d1", "d2", "d3", "d4"]
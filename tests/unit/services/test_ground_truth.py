@@ -0,0 +1,137 @@
+"""Tests for the shared ground-truth builder.
+
+Spec: JUDGE_EVALUATION_SPEC
+Covers:
+- Annotations are grouped by trace and question in one pass
+- Mode, majority and pooled ratings plus concatenated feedback
+- Alignment data, judge export and few-shot selection use the index
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from server.models import Annotation, JudgeExportConfig, JudgePrompt
+from server.services.alignment_service import AlignmentService
+from server.services.ground_truth import GroundTruthIndex, majority, mode, rounded_mean
+from server.services.judge_service import JudgeService
+
+
+def _annotation(trace_id, user_id, rating, ratings=None, comment=None):
+    return Annotation(
+        id=f"{trace_id}-{user_id}",
+        workshop_id="ws-1",
+        trace_id=trace_id,
+        user_id=user_id,
+        rating=rating,
+        ratings=ratings,
+        comment=comment,
+    )
+
+
+ANNOTATIONS = [
+    _annotation("t1", "u1", 4, {"q1": 1, "q2": 4}, "Clear answer"),
+    _annotation("t2", "u1", 2, comment="  "),
+    _annotation("t1", "u2", 5, {"q1": 0, "q2": 4}, " Cites sources "),
+    _annotation("t1", "u3", 4, {"q1": 1}),
+    _annotation("t3", "u2", 1),
+]
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.unit
+class TestGroundTruthIndex:
+    def test_groups_by_trace_and_question(self):
+        index = GroundTruthIndex.from_annotations(ANNOTATIONS)
+
+        assert index.trace_ids == ["t1", "t2", "t3"]
+        t1 = index.get("t1")
+        assert t1.annotation_count == 3
+        assert t1.ratings == [4, 5, 4]
+        assert t1.question_ratings == {"q1": [1, 0, 1], "q2": [4, 4]}
+        assert t1.pooled_ratings == [1, 4, 0, 4, 1]
+        assert index.get("t2").pooled_ratings == [2]
+        assert "missing" not in index
+
+    def test_aggregates(self):
+        t1 = GroundTruthIndex.from_annotations(ANNOTATIONS).get("t1")
+
+        assert t1.mode_rating() == 4
+        assert t1.mode_rating("q2") == 4
+        assert t1.majority_rating("q1") == 1
+        assert t1.mode_rating("q3") is None
+        assert t1.feedback == "Clear answer\nCites sources"
+
+    def test_helpers(self):
+        assert mode([3, 5, 5, 3]) == 3  # ties go to the first value seen
+        assert majority([1, 0]) == 0
+        assert majority([1, 1, 0]) == 1
+        assert rounded_mean([4, 5, 5]) == 5
+        assert mode([]) is None and majority([]) is None and rounded_mean([]) is None
+
+    def test_restrict_and_group_by_rating(self):
+        index = GroundTruthIndex.from_annotations(ANNOTATIONS)
+
+        assert index.restrict(["t3", "t1"]).trace_ids == ["t1", "t3"]
+        assert index.by_mode_rating() == {4: ["t1"], 2: ["t2"], 1: ["t3"]}
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.unit
+class TestGroundTruthConsumers:
+    def test_alignment_data_uses_mode_and_feedback(self):
+        db_service = MagicMock()
+        db_service.get_traces_for_alignment.return_value = [
+            SimpleNamespace(id="t1", mlflow_trace_id="tr-1"),
+            SimpleNamespace(id="t2", mlflow_trace_id=None),
+            SimpleNamespace(id="t4", mlflow_trace_id="tr-4"),
+        ]
+        db_service.get_annotations.return_value = ANNOTATIONS
+        service = AlignmentService.__new__(AlignmentService)
+        service.db_service = db_service
+
+        data = service.prepare_alignment_data("ws-1", "judge")
+
+        assert data["traces"] == [
+            {"trace_id": "tr-1", "workshop_id": "t1", "human_rating": 4, "sme_feedback": "Clear answer\nCites sources"}
+        ]
+
+    def test_export_reads_annotations_once(self):
+        db_service = MagicMock()
+        db_service.get_judge_prompt.return_value = JudgePrompt(
+            id="p1",
+            workshop_id="ws-1",
+            prompt_text="Rate it",
+            version=1,
+            few_shot_examples=["t1", "t3", "t9"],
+            created_by="fac",
+        )
+        db_service.get_rubric.return_value = None
+        db_service.get_annotations.return_value = ANNOTATIONS
+        db_service.get_trace.side_effect = lambda trace_id: SimpleNamespace(input=f"in {trace_id}", output="out")
+
+        exported = JudgeService(db_service).export_judge("ws-1", JudgeExportConfig(prompt_id="p1"))
+
+        examples = exported["judge_config"]["few_shot_examples"]
+        assert [(e["input"], e["rating"]) for e in examples] == [("in t1", 4), ("in t3", 1)]
+        db_service.get_annotations.assert_called_once()
+
+    def test_few_shot_selection_covers_rating_levels_without_duplicates(self):
+        db_service = MagicMock()
+        db_service.get_annotations.return_value = [
+            *ANNOTATIONS,
+            _annotation("t4", "u1", 2),
+            _annotation("t5", "u1", 5),
+        ]
+
+        selected = JudgeService(db_service).select_few_shot_examples("ws-1", num_examples=4)
+
+        assert len(selected) == len(set(selected)) == 4
+        assert "t3" in selected and "t1" in selected  # only traces with ratings 1 and 4
+
+    def test_few_shot_selection_with_few_traces_returns_each_once(self):
+        db_service = MagicMock()
+        db_service.get_annotations.return_value = ANNOTATIONS
+
+        assert JudgeService(db_service).select_few_shot_examples("ws-1", num_examples=5) == ["t1", "t2", "t3"]
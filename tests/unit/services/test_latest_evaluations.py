@@ -0,0 +1,119 @@
+"""Tests for latest-evaluation lookups in DatabaseService.
+
+Spec: JUDGE_EVALUATION_SPEC
+Covers:
+- get_latest_evaluations picks the newest prompt that actually has evaluations
+- get_latest_evaluation_results resolves DB UUID and MLflow trace ID in one query
+- count_traces counts traces without loading them
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, JudgeEvaluationDB, JudgePromptDB, TraceDB, WorkshopDB
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db_session(engine):
+    """Two prompts (the newer one unevaluated) and evaluations keyed by both ID styles."""
+    session = sessionmaker(bind=engine)()
+    now = datetime.now()
+
+    session.add(WorkshopDB(id=WORKSHOP_ID, name="Test Workshop", facilitator_id="fac-1"))
+    session.add(TraceDB(id="t1", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-1"))
+    session.add(TraceDB(id="t2", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-2"))
+    session.add(TraceDB(id="t3", workshop_id=WORKSHOP_ID, input="q", output="a"))
+    for version, prompt_id in ((1, "p-old"), (2, "p-evaluated"), (3, "p-aligned")):
+        session.add(
+            JudgePromptDB(
+                id=prompt_id,
+                workshop_id=WORKSHOP_ID,
+                prompt_text="Rate it",
+                version=version,
+                created_by="fac-1",
+                created_at=now + timedelta(minutes=version),
+            )
+        )
+    session.add(JudgeEvaluationDB(id="e0", workshop_id=WORKSHOP_ID, prompt_id="p-old", trace_id="t1", predicted_rating=1))
+    # Stored under the workshop UUID
+    session.add(
+        JudgeEvaluationDB(
+            id="e1", workshop_id=WORKSHOP_ID, prompt_id="p-evaluated", trace_id="t1",
+            predicted_rating=4, human_rating=5, predicted_feedback="accuracy_judge",
+        )
+    )
+    # Stored under the MLflow trace ID
+    session.add(
+        JudgeEvaluationDB(id="e2", workshop_id=WORKSHOP_ID, prompt_id="p-evaluated", trace_id="tr-2", predicted_rating=3)
+    )
+    # Trace without an MLflow ID
+    session.add(
+        JudgeEvaluationDB(id="e3", workshop_id=WORKSHOP_ID, prompt_id="p-evaluated", trace_id="t3", predicted_rating=2)
+    )
+    session.commit()
+
+    yield session
+    session.close()
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.req("Results reload correctly in UI")
+@pytest.mark.unit
+class TestLatestEvaluations:
+    def test_latest_evaluations_skip_prompts_without_evaluations(self, db_session):
+        evaluations = DatabaseService(db_session).get_latest_evaluations(WORKSHOP_ID)
+
+        assert {e.id for e in evaluations} == {"e1", "e2", "e3"}
+        assert {e.prompt_id for e in evaluations} == {"p-evaluated"}
+
+    def test_results_resolve_both_trace_ids(self, db_session):
+        results = DatabaseService(db_session).get_latest_evaluation_results(WORKSHOP_ID)
+
+        by_trace = {r["trace_id"]: r for r in results}
+        assert set(by_trace) == {"t1", "t2", "t3"}
+        assert by_trace["t1"]["mlflow_trace_id"] == "tr-1"
+        assert by_trace["t1"]["judge_name"] == "accuracy_judge"
+        assert by_trace["t1"]["human_rating"] == 5
+        assert by_trace["t2"]["mlflow_trace_id"] == "tr-2"
+        assert by_trace["t3"]["mlflow_trace_id"] is None
+        assert by_trace["t3"]["judge_name"] == ""
+
+    def test_shared_mlflow_id_yields_one_result_per_evaluation(self, db_session):
+        db_session.add(TraceDB(id="t0", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-2"))
+        db_session.add(TraceDB(id="t9", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id="tr-2"))
+        db_session.commit()
+
+        results = DatabaseService(db_session).get_latest_evaluation_results(WORKSHOP_ID)
+
+        shared = [r for r in results if r["mlflow_trace_id"] == "tr-2"]
+        assert len(results) == 3
+        assert [r["trace_id"] for r in shared] == ["t0"]
+
+    def test_results_use_a_single_query(self, db_session, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        DatabaseService(db_session).get_latest_evaluation_results(WORKSHOP_ID)
+
+        assert len(statements) == 1
+        # Trace content columns are never selected
+        assert "input" not in statements[0] and "output" not in statements[0]
+
+    def test_no_evaluations_returns_empty(self, db_session):
+        assert DatabaseService(db_session).get_latest_evaluation_results("other-workshop") == []
+
+    def test_count_traces(self, db_session):
+        assert DatabaseService(db_session).count_traces(WORKSHOP_ID) == {"total": 3, "with_mlflow_id": 2}
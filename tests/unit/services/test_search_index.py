@@ -0,0 +1,133 @@
+"""Tests for the workshop full-text search index.
+
+Covers search_index and DatabaseService.search_workshop on SQLite (FTS5):
+- Writes through the ORM keep the index in sync (insert, update, delete)
+- Results are ranked, filtered by type and scoped to the workshop
+- Documents whose source row was bulk-deleted are not returned
+- Arbitrary user input is safe to search for
+- Snippets are HTML-escaped around the match tags
+- Writes never create the search tables
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, DiscoveryFindingDB, ParticipantNoteDB, TraceDB
+from server.services import search_index
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+BIG_OUTPUT = "Refunds are processed within five business days. " * 100
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        search_index.ensure_schema(conn)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            TraceDB(id="t1", workshop_id=WORKSHOP_ID, input="How do I get a refund?", output=BIG_OUTPUT),
+            TraceDB(id="t2", workshop_id=WORKSHOP_ID, input="Reset my password", output="Use the settings page."),
+            TraceDB(id="t3", workshop_id="ws-2", input="refund please", output="Sure."),
+            DiscoveryFindingDB(
+                id="f1", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u1", insight="Refund refund policy is vague"
+            ),
+            ParticipantNoteDB(id="n1", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u2", content="Password tone"),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _ids(results):
+    return [(hit.doc_type, hit.doc_id) for hit in results.results]
+
+
+@pytest.mark.spec("DISCOVERY_SPEC")
+@pytest.mark.unit
+class TestSearchWorkshop:
+    def test_ranks_matches_across_types_within_the_workshop(self, db_session):
+        results = DatabaseService(db_session).search_workshop(WORKSHOP_ID, "refund")
+
+        assert results.total == 2
+        assert set(_ids(results)) == {("trace", "t1"), ("finding", "f1")}
+        assert results.results[0].score >= results.results[1].score
+        assert all("<mark>" in hit.snippet for hit in results.results)
+        assert next(hit for hit in results.results if hit.doc_id == "f1").trace_id == "t2"
+
+    def test_type_filter_and_prefix_match(self, db_session):
+        service = DatabaseService(db_session)
+
+        assert _ids(service.search_workshop(WORKSHOP_ID, "passw", doc_types=["note"])) == [("note", "n1")]
+        with pytest.raises(ValueError):
+            service.search_workshop(WORKSHOP_ID, "refund", doc_types=["bogus"])
+
+    def test_pagination_reports_next_offset(self, db_session):
+        service = DatabaseService(db_session)
+
+        first = service.search_workshop(WORKSHOP_ID, "refund", limit=1)
+        second = service.search_workshop(WORKSHOP_ID, "refund", limit=1, offset=first.next_offset)
+
+        assert first.next_offset == 1 and second.next_offset is None
+        assert set(_ids(first) + _ids(second)) == {("trace", "t1"), ("finding", "f1")}
+
+    def test_updates_and_deletes_are_synced(self, db_session):
+        service = DatabaseService(db_session)
+        db_session.get(ParticipantNoteDB, "n1").content = "Latency is high"
+        db_session.delete(db_session.get(TraceDB, "t1"))
+        db_session.commit()
+
+        assert _ids(service.search_workshop(WORKSHOP_ID, "latency")) == [("note", "n1")]
+        assert service.search_workshop(WORKSHOP_ID, "password", doc_types=["note"]).total == 0
+        assert _ids(service.search_workshop(WORKSHOP_ID, "refund")) == [("finding", "f1")]
+
+    def test_bulk_deleted_rows_are_not_returned(self, db_session):
+        db_session.query(DiscoveryFindingDB).filter(DiscoveryFindingDB.workshop_id == WORKSHOP_ID).delete()
+        db_session.commit()
+
+        assert _ids(DatabaseService(db_session).search_workshop(WORKSHOP_ID, "refund")) == [("trace", "t1")]
+
+    @pytest.mark.parametrize("query", ['"', "refund OR", "NEAR(a b)", "*", "'; DROP TABLE traces; --", "   "])
+    def test_arbitrary_input_is_safe(self, db_session, query):
+        DatabaseService(db_session).search_workshop(WORKSHOP_ID, query)
+
+        assert db_session.query(TraceDB).count() == 3
+
+    def test_reindex_rebuilds_from_source_rows(self, db_session):
+        search_index.purge_workshop(db_session, WORKSHOP_ID)
+        assert DatabaseService(db_session).search_workshop(WORKSHOP_ID, "refund").total == 0
+
+        search_index.reindex(db_session, WORKSHOP_ID)
+
+        assert DatabaseService(db_session).search_workshop(WORKSHOP_ID, "refund").total == 2
+
+    def test_snippets_are_html_escaped(self, db_session):
+        db_session.add(
+            ParticipantNoteDB(
+                id="n2", workshop_id=WORKSHOP_ID, trace_id="t2", user_id="u2", content="<script>alert(1)</script> xss"
+            )
+        )
+        db_session.commit()
+
+        [hit] = DatabaseService(db_session).search_workshop(WORKSHOP_ID, "xss").results
+
+        assert "<script>" not in hit.snippet
+        assert hit.snippet == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>xss</mark>"
+
+    def test_writes_do_not_create_the_search_tables(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        session.add(TraceDB(id="t1", workshop_id=WORKSHOP_ID, input="refund", output="ok"))
+        session.commit()
+
+        assert session.execute(text("SELECT name FROM sqlite_master WHERE name LIKE 'search_documents%'")).all() == []
+        with pytest.raises(search_index.SearchUnavailableError):
+            DatabaseService(session).search_workshop(WORKSHOP_ID, "refund")
+        session.close()
@@ -0,0 +1,113 @@
+"""Tests for the stateless per-user trace permutation.
+
+Spec: DATASETS_SPEC
+Covers user_trace_order and its use by the active trace getters:
+- Orders are deterministic per (workshop, phase, user) and differ across users
+- Added traces are appended after the existing ones; removing traces keeps
+  the relative order of the others
+- Reading randomized traces stores nothing per user
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, TraceDB, UserTraceOrderDB, WorkshopDB
+from server.services.database_service import DatabaseService
+from server.services.trace_order import assign_batches, user_trace_order
+
+WORKSHOP_ID = "ws-1"
+TRACE_IDS = [f"trace-{i}" for i in range(40)]
+
+
+@pytest.mark.spec("DATASETS_SPEC")
+@pytest.mark.unit
+class TestUserTraceOrder:
+    def test_deterministic_permutation_per_user(self):
+        order = user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u1")
+
+        assert sorted(order) == sorted(TRACE_IDS)
+        assert order != TRACE_IDS
+        assert order == user_trace_order(list(reversed(TRACE_IDS)), WORKSHOP_ID, "annotation", "u1")
+        assert order != user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u2")
+
+    def test_phase_and_workshop_change_the_order(self):
+        order = user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u1")
+
+        assert order != user_trace_order(TRACE_IDS, WORKSHOP_ID, "discovery", "u1")
+        assert order != user_trace_order(TRACE_IDS, "ws-2", "annotation", "u1")
+
+    def test_added_traces_are_appended_and_removed_traces_keep_relative_order(self):
+        batches = assign_batches(TRACE_IDS)
+        before = user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u1", batches)
+        grown_ids = [*TRACE_IDS, "new-a", "new-b"]
+        grown = user_trace_order(grown_ids, WORKSHOP_ID, "annotation", "u1", assign_batches(grown_ids, batches))
+        shrunk = user_trace_order(TRACE_IDS[5:], WORKSHOP_ID, "annotation", "u1", batches)
+
+        assert grown[: len(TRACE_IDS)] == before
+        assert sorted(grown[len(TRACE_IDS) :]) == ["new-a", "new-b"]
+        assert shrunk == [t for t in before if t in set(TRACE_IDS[5:])]
+
+    def test_batches_carry_over_and_new_traces_start_a_batch(self):
+        first = assign_batches(["a", "b"])
+        second = assign_batches(["b", "c"], first)
+
+        assert first == {"a": 0, "b": 0}
+        assert second == {"b": 0, "c": 1}
+        assert assign_batches(["x", "y"], second) == {"x": 0, "y": 0}
+
+    def test_duplicates_are_dropped(self):
+        assert sorted(user_trace_order(["a", "b", "a"], WORKSHOP_ID, "annotation", "u1")) == ["a", "b"]
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(
+        WorkshopDB(
+            id=WORKSHOP_ID,
+            name="Test Workshop",
+            facilitator_id="fac-1",
+            active_discovery_trace_ids=TRACE_IDS,
+            active_annotation_trace_ids=TRACE_IDS,
+            discovery_randomize_traces=True,
+            annotation_randomize_traces=True,
+        )
+    )
+    for trace_id in TRACE_IDS:
+        session.add(TraceDB(id=trace_id, workshop_id=WORKSHOP_ID, input="q", output="a"))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.spec("DATASETS_SPEC")
+@pytest.mark.unit
+class TestRandomizedActiveTraces:
+    def test_getters_use_the_permutation_without_storing_orders(self, db_session):
+        service = DatabaseService(db_session)
+
+        discovery = [t.id for t in service.get_active_discovery_traces(WORKSHOP_ID, "u1")]
+        annotation = [t.id for t in service.get_active_annotation_traces(WORKSHOP_ID, "u1")]
+
+        assert discovery == user_trace_order(TRACE_IDS, WORKSHOP_ID, "discovery", "u1")
+        assert annotation == user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u1")
+        assert db_session.query(UserTraceOrderDB).count() == 0
+
+    def test_traces_added_to_the_phase_go_after_the_existing_order(self, db_session):
+        service = DatabaseService(db_session)
+        service.update_active_annotation_traces(WORKSHOP_ID, TRACE_IDS[:30])
+        before = [t.id for t in service.get_active_annotation_traces(WORKSHOP_ID, "u1")]
+
+        service.update_active_annotation_traces(WORKSHOP_ID, TRACE_IDS)
+        after = [t.id for t in service.get_active_annotation_traces(WORKSHOP_ID, "u1")]
+
+        assert after[:30] == before
+        assert sorted(after[30:]) == sorted(TRACE_IDS[30:])
+
+    def test_next_traces_follow_the_user_order(self, db_session):
+        page = DatabaseService(db_session).get_next_annotation_traces(WORKSHOP_ID, "u1", limit=5)
+
+        assert [t.id for t in page.traces] == user_trace_order(TRACE_IDS, WORKSHOP_ID, "annotation", "u1")[:5]
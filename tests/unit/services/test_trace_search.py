@@ -0,0 +1,79 @@
+"""Tests for lean tagged-trace lookups.
+
+Spec: JUDGE_EVALUATION_SPEC
+Covers:
+- Searches skip span data and keep only trace IDs
+- Results are cached per (workshop, tag, experiment) until TTL or invalidation
+- Full traces are fetched concurrently with per-ID failures reported
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from server.services import trace_search
+
+
+def _trace(trace_id):
+    return SimpleNamespace(info=SimpleNamespace(trace_id=trace_id))
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.unit
+class TestSearchTaggedTraceIds:
+    def test_search_skips_spans_and_dedupes_ids(self):
+        with patch("mlflow.search_traces", return_value=[_trace("tr-1"), _trace(" tr-2 "), _trace("tr-1")]) as search:
+            ids = trace_search.search_tagged_trace_ids("exp-1", "ws-1", tag_type="align")
+
+        assert ids == ["tr-1", "tr-2"]
+        kwargs = search.call_args.kwargs
+        assert kwargs["include_spans"] is False
+        assert kwargs["return_type"] == "list"
+        assert kwargs["filter_string"] == "tags.align = 'true' AND tags.workshop_id = 'ws-1'"
+
+    def test_results_are_cached_per_workshop_tag_and_experiment(self):
+        with patch("mlflow.search_traces", return_value=[_trace("tr-1")]) as search:
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1")
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1")
+            assert search.call_count == 1
+
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1", tag_type="align")
+            trace_search.search_tagged_trace_ids("exp-2", "ws-1")
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1", refresh=True)
+            assert search.call_count == 4
+
+    def test_invalidate_and_expiry_force_a_new_search(self):
+        with patch("mlflow.search_traces", return_value=[_trace("tr-1")]) as search:
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1")
+            trace_search.invalidate("ws-1", "eval")
+            trace_search.search_tagged_trace_ids("exp-1", "ws-1")
+            assert search.call_count == 2
+
+            with patch("server.shared_state.time.time", return_value=float("inf")):
+                trace_search.search_tagged_trace_ids("exp-1", "ws-1")
+            assert search.call_count == 3
+
+    def test_stored_ids_are_served_without_searching(self):
+        trace_search.store_tagged_trace_ids("ws-1", "eval", "exp-1", ["tr-9"])
+
+        with patch("mlflow.search_traces") as search:
+            assert trace_search.search_tagged_trace_ids("exp-1", "ws-1") == ["tr-9"]
+        search.assert_not_called()
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.unit
+def test_fetch_traces_maps_failures_to_exceptions():
+    def _get_trace(trace_id):
+        if trace_id == "bad":
+            raise RuntimeError("not found")
+        return f"trace:{trace_id}"
+
+    with patch("mlflow.get_trace", side_effect=_get_trace):
+        result = trace_search.fetch_traces(["a", "bad", "b"], max_workers=2)
+
+    assert list(result) == ["a", "bad", "b"]
+    assert result["a"] == "trace:a" and result["b"] == "trace:b"
+    assert isinstance(result["bad"], RuntimeError)
+    assert trace_search.fetch_traces([]) == {}
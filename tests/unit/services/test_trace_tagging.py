@@ -0,0 +1,136 @@
+"""Tests for MLflow trace tagging and tag verification in DatabaseService.
+
+Covers:
+- tag_traces_for_evaluation tags every mapped trace (concurrently) and reports unmapped ones as failed
+- verify_trace_tags stops as soon as one search sees every trace
+- verify_trace_tags re-tags only the traces still missing when a poll makes no progress
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, MLflowIntakeConfigDB, TraceDB, WorkshopDB
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+
+
+@pytest.fixture
+def db_session():
+    """In-memory SQLite database with a workshop, MLflow config and three traces."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    session.add(WorkshopDB(id=WORKSHOP_ID, name="Test Workshop", facilitator_id="facilitator-1"))
+    session.add(
+        MLflowIntakeConfigDB(
+            id="cfg-1",
+            workshop_id=WORKSHOP_ID,
+            databricks_host="https://test.databricks.com/",
+            experiment_id="exp-123",
+        )
+    )
+    for i in range(1, 4):
+        session.add(TraceDB(id=f"t{i}", workshop_id=WORKSHOP_ID, input="q", output="a", mlflow_trace_id=f"tr-{i}"))
+    session.add(TraceDB(id="t-local", workshop_id=WORKSHOP_ID, input="q", output="a"))
+    session.commit()
+
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def service(db_session):
+    return DatabaseService(db_session)
+
+
+@pytest.fixture
+def mlflow_mocks():
+    """Patch token storage and the MLflow calls used by tagging."""
+    with patch("server.services.database_service.token_storage") as mock_storage, \
+         patch("mlflow.set_tracking_uri"), \
+         patch("mlflow.set_experiment"), \
+         patch("mlflow.set_trace_tag") as mock_set_tag, \
+         patch("mlflow.search_traces") as mock_search, \
+         patch("time.sleep"):
+        mock_storage.get_token.return_value = "test-token"
+        yield MagicMock(set_trace_tag=mock_set_tag, search_traces=mock_search)
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.req("Auto-evaluation runs in background when annotation phase starts")
+@pytest.mark.unit
+class TestTagTracesForEvaluation:
+    def test_tags_all_mapped_traces(self, service, mlflow_mocks):
+        result = service.tag_traces_for_evaluation(WORKSHOP_ID, ["t1", "t2", "t3", "t-local"])
+
+        assert result == {"tagged": 3, "failed": ["t-local"]}
+        tagged_ids = {c.kwargs["trace_id"] for c in mlflow_mocks.set_trace_tag.call_args_list if c.kwargs["key"] == "eval"}
+        assert tagged_ids == {"tr-1", "tr-2", "tr-3"}
+
+    def test_failed_tag_reported_without_blocking_others(self, service, mlflow_mocks):
+        def _set_tag(trace_id, key, value):
+            if trace_id == "tr-2":
+                raise Exception("404 not found")
+
+        mlflow_mocks.set_trace_tag.side_effect = _set_tag
+
+        result = service.tag_traces_for_evaluation(WORKSHOP_ID, ["t1", "t2", "t3"])
+
+        assert result == {"tagged": 2, "failed": ["t2"]}
+
+    def test_missing_token_fails_everything(self, service, mlflow_mocks):
+        with patch("server.services.database_service.token_storage") as mock_storage:
+            mock_storage.get_token.return_value = None
+            result = service.tag_traces_for_evaluation(WORKSHOP_ID, ["t1"])
+
+        assert result["tagged"] == 0
+        assert result["failed"] == ["t1"]
+        assert result["error"] == "Databricks token missing"
+
+
+@pytest.mark.spec("JUDGE_EVALUATION_SPEC")
+@pytest.mark.req("Auto-evaluation runs in background when annotation phase starts")
+@pytest.mark.unit
+class TestVerifyTraceTags:
+    def test_single_search_when_all_visible(self, service, mlflow_mocks):
+        mlflow_mocks.search_traces.return_value = pd.DataFrame({"trace_id": ["tr-1", "tr-2", "tr-3"]})
+
+        result = service.verify_trace_tags(WORKSHOP_ID, ["t1", "t2", "t3"])
+
+        assert result["verified"] == 3
+        assert result["missing"] == []
+        assert result["attempts"] == 1
+        assert mlflow_mocks.set_trace_tag.call_count == 0
+        filter_string = mlflow_mocks.search_traces.call_args.kwargs["filter_string"]
+        assert "tags.eval = 'true'" in filter_string
+        assert f"tags.workshop_id = '{WORKSHOP_ID}'" in filter_string
+
+    def test_retags_only_missing_traces_when_stalled(self, service, mlflow_mocks):
+        partial = pd.DataFrame({"trace_id": ["tr-1"]})
+        complete = pd.DataFrame({"trace_id": ["tr-1", "tr-2", "tr-3"]})
+        mlflow_mocks.search_traces.side_effect = [partial, partial, complete]
+
+        result = service.verify_trace_tags(WORKSHOP_ID, ["t1", "t2", "t3"])
+
+        assert result["verified"] == 3
+        assert result["attempts"] == 3
+        assert result["retagged"] == 2
+        retagged_ids = {c.kwargs["trace_id"] for c in mlflow_mocks.set_trace_tag.call_args_list}
+        assert retagged_ids == {"tr-2", "tr-3"}
+
+    def test_reports_missing_after_max_attempts(self, service, mlflow_mocks):
+        mlflow_mocks.search_traces.return_value = pd.DataFrame()
+
+        result = service.verify_trace_tags(WORKSHOP_ID, ["t1", "t2"], max_attempts=3)
+
+        assert result["verified"] == 0
+        assert sorted(result["missing"]) == ["t1", "t2"]
+        assert result["attempts"] == 3
+        assert mlflow_mocks.search_traces.call_count == 3
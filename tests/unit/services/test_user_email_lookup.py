@@ -0,0 +1,76 @@
+"""Tests for case-insensitive user lookup by email.
+
+Spec: AUTHENTICATION_SPEC
+Covers:
+- email_normalized is kept in sync with email on insert and update
+- get_user_by_email / authenticate_user match regardless of case and whitespace
+- Lookups hit the email_normalized index instead of an ILIKE scan
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, UserDB
+from server.services.database_service import DatabaseService
+from server.utils.password import hash_password
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db_session(engine):
+    session = sessionmaker(bind=engine)()
+    session.add(UserDB(id="u-sme", email="Alice@Example.com", name="Alice", role="sme"))
+    session.add(
+        UserDB(id="u-fac", email="fac@example.com", name="Fac", role="facilitator", password_hash=hash_password("secret1A"))
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.spec("AUTHENTICATION_SPEC")
+@pytest.mark.unit
+class TestUserEmailLookup:
+    def test_normalized_column_tracks_email(self, db_session):
+        user = db_session.get(UserDB, "u-sme")
+        assert user.email_normalized == "alice@example.com"
+
+        user.email = "ALICE2@example.com"
+        db_session.commit()
+        assert db_session.get(UserDB, "u-sme").email_normalized == "alice2@example.com"
+
+    def test_lookup_ignores_case_and_whitespace(self, db_session):
+        service = DatabaseService(db_session)
+
+        assert service.get_user_by_email(" alice@EXAMPLE.com ").id == "u-sme"
+        assert service.authenticate_user("ALICE@example.com", "").id == "u-sme"
+        assert service.get_user_by_email("nobody@example.com") is None
+
+    def test_facilitator_password_still_checked(self, db_session):
+        service = DatabaseService(db_session)
+
+        assert service.authenticate_user("FAC@example.com", "secret1A").id == "u-fac"
+        assert service.authenticate_user("fac@example.com", "wrong") is None
+
+    def test_lookup_uses_equality_on_normalized_column(self, db_session, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        DatabaseService(db_session).get_user_by_email("Alice@Example.com")
+
+        assert any("email_normalized = " in s for s in statements)
+        assert not any("lower(" in s.lower() or "like" in s.lower() for s in statements)
+
+    def test_emails_differing_only_by_case_conflict(self, db_session):
+        db_session.add(UserDB(id="u-dup", email="ALICE@example.com", name="Dup", role="sme"))
+
+        with pytest.raises(IntegrityError):
+            db_session.commit()
@@ -0,0 +1,197 @@
+"""Tests for workshop archival to Parquet cold storage.
+
+Covers workshop_archive and the DatabaseService wrappers:
+- Archiving writes every workshop table and removes the rows from the hot tables
+- Restoring brings the rows back unchanged, including compressed payloads
+- Archives are always written under WORKSHOP_ARCHIVE_PATH
+- Archived results are readable through read-only archive sessions
+- Evicted archives stay open until their sessions are closed
+- Unfinished or already-archived workshops are rejected
+- Archiving can run as a job polled via /evaluation-job
+"""
+
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from server.database import (
+    AnnotationDB,
+    Base,
+    DiscoveryFindingDB,
+    TraceDB,
+    UserDB,
+    WorkshopDB,
+    WorkshopParticipantDB,
+)
+from server.models import WorkshopPhase, WorkshopStatus
+from server.services import search_index, workshop_archive
+from server.services.database_service import DatabaseService
+
+WORKSHOP_ID = "ws-1"
+BIG_OUTPUT = "A long and repetitive model answer. " * 200
+
+
+@pytest.fixture(autouse=True)
+def archive_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(workshop_archive, "WORKSHOP_ARCHIVE_PATH", str(tmp_path))
+    yield tmp_path
+    for workshop_id in list(workshop_archive._loaded):
+        workshop_archive._evict(workshop_id)
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        search_index.ensure_schema(conn)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            WorkshopDB(
+                id=WORKSHOP_ID,
+                name="Done",
+                facilitator_id="fac-1",
+                current_phase=WorkshopPhase.RESULTS,
+                status=WorkshopStatus.COMPLETED,
+            ),
+            WorkshopDB(id="ws-2", name="Other", facilitator_id="fac-1", current_phase=WorkshopPhase.RESULTS),
+            UserDB(id="fac-1", email="fac@example.com", name="Fac", role="facilitator", password_hash="secret"),
+            UserDB(id="u1", email="u1@example.com", name="Una", role="sme", workshop_id=WORKSHOP_ID),
+            WorkshopParticipantDB(id="p1", user_id="u1", workshop_id=WORKSHOP_ID, role="sme"),
+            TraceDB(id="t1", workshop_id=WORKSHOP_ID, input="refund?", output=BIG_OUTPUT, context={"spans": []}),
+            TraceDB(id="t2", workshop_id="ws-2", input="other", output="kept"),
+            DiscoveryFindingDB(id="f1", workshop_id=WORKSHOP_ID, trace_id="t1", user_id="u1", insight="Too long"),
+            AnnotationDB(
+                id="a1", workshop_id=WORKSHOP_ID, trace_id="t1", user_id="u1", rating=4, ratings={"q_1": 4}
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _raw_trace(session, trace_id):
+    return session.execute(text("SELECT input, output, context FROM traces WHERE id = :id"), {"id": trace_id}).first()
+
+
+@pytest.mark.spec("BUILD_AND_DEPLOY_SPEC")
+@pytest.mark.unit
+class TestWorkshopArchive:
+    def test_archive_moves_rows_out_of_the_hot_tables(self, db_session, tmp_path):
+        archive = DatabaseService(db_session).archive_workshop(WORKSHOP_ID)
+
+        assert archive.location == f"{tmp_path}/{WORKSHOP_ID}"
+        assert archive.tables["traces"] == 1 and archive.tables["annotations"] == 1
+        assert (tmp_path / WORKSHOP_ID / "traces.parquet").exists()
+        assert not list((tmp_path / WORKSHOP_ID).glob("*.tmp"))
+        assert json.loads((tmp_path / WORKSHOP_ID / "manifest.json").read_text())["workshop_id"] == WORKSHOP_ID
+
+        workshop = db_session.get(WorkshopDB, WORKSHOP_ID)
+        assert workshop.status == WorkshopStatus.ARCHIVED and workshop.archive_path == archive.location
+        assert db_session.query(TraceDB).filter(TraceDB.workshop_id == WORKSHOP_ID).count() == 0
+        assert db_session.query(AnnotationDB).count() == 0
+        assert db_session.get(TraceDB, "t2") is not None
+        assert db_session.get(UserDB, "u1") is not None
+
+    def test_restore_round_trips_rows_and_stored_payloads(self, db_session, tmp_path):
+        before = _raw_trace(db_session, "t1")
+        service = DatabaseService(db_session)
+        service.archive_workshop(WORKSHOP_ID)
+
+        service.restore_workshop(WORKSHOP_ID)
+        db_session.expire_all()
+
+        assert _raw_trace(db_session, "t1") == before
+        assert db_session.get(TraceDB, "t1").output == BIG_OUTPUT
+        assert db_session.get(AnnotationDB, "a1").ratings == {"q_1": 4}
+        workshop = db_session.get(WorkshopDB, WORKSHOP_ID)
+        assert workshop.status == WorkshopStatus.COMPLETED and workshop.archive_path is None
+        assert service.search_workshop(WORKSHOP_ID, "refund").total == 1
+
+    def test_archived_results_are_read_from_the_archive(self, db_session):
+        archive = DatabaseService(db_session).archive_workshop(WORKSHOP_ID)
+
+        archive_db = workshop_archive.archive_session(WORKSHOP_ID, archive.location)
+        try:
+            service = DatabaseService(archive_db)
+            assert [a.id for a in service.get_annotations(WORKSHOP_ID)] == ["a1"]
+            assert [t.output for t in service.get_traces(WORKSHOP_ID)] == [BIG_OUTPUT]
+            assert archive_db.get(UserDB, "u1").name == "Una"
+            assert archive_db.get(UserDB, "fac-1").password_hash is None
+        finally:
+            archive_db.close()
+
+    def test_archive_sessions_are_read_only(self, db_session):
+        archive = DatabaseService(db_session).archive_workshop(WORKSHOP_ID)
+
+        archive_db = workshop_archive.archive_session(WORKSHOP_ID, archive.location)
+        try:
+            archive_db.get(UserDB, "u1").name = "Changed"
+            with pytest.raises(OperationalError, match="readonly"):
+                archive_db.commit()
+        finally:
+            archive_db.close()
+
+    def test_evicted_archive_stays_open_until_its_sessions_close(self, db_session):
+        archive = DatabaseService(db_session).archive_workshop(WORKSHOP_ID)
+        archive_db = workshop_archive.archive_session(WORKSHOP_ID, archive.location)
+        loaded = workshop_archive._loaded[WORKSHOP_ID]
+
+        workshop_archive._evict(WORKSHOP_ID)
+
+        assert archive_db.get(UserDB, "u1").name == "Una"
+        archive_db.close()
+        assert loaded.evicted and loaded.users == 0
+        assert not os.path.exists(loaded.directory)
+
+    def test_unfinished_and_archived_workshops_are_rejected(self, db_session):
+        service = DatabaseService(db_session)
+        db_session.get(WorkshopDB, "ws-2").current_phase = WorkshopPhase.ANNOTATION
+        db_session.commit()
+
+        with pytest.raises(ValueError, match="completed or cancelled"):
+            service.archive_workshop("ws-2")
+        with pytest.raises(ValueError, match="not archived"):
+            service.restore_workshop(WORKSHOP_ID)
+
+        service.archive_workshop(WORKSHOP_ID)
+        with pytest.raises(ValueError, match="already archived"):
+            service.archive_workshop(WORKSHOP_ID)
+
+    def test_incomplete_archive_cannot_be_restored(self, db_session, tmp_path):
+        archive = DatabaseService(db_session).archive_workshop(WORKSHOP_ID)
+        (tmp_path / WORKSHOP_ID / "manifest.json").unlink()
+
+        with pytest.raises(workshop_archive.ArchiveError):
+            DatabaseService(db_session).restore_workshop(WORKSHOP_ID)
+        with pytest.raises(workshop_archive.ArchiveError):
+            workshop_archive.archive_session(WORKSHOP_ID, archive.location)
+        assert db_session.get(WorkshopDB, WORKSHOP_ID).status == WorkshopStatus.ARCHIVED
+
+    def test_archive_job_reports_the_archive(self, db_session, monkeypatch):
+        from server import database
+        from server.routers.workshops import _run_archive_job, create_job
+
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+        job = create_job("archive-job", WORKSHOP_ID)
+
+        _run_archive_job(job, WORKSHOP_ID)
+
+        assert job.status == "completed" and job.result["tables"]["traces"] == 1
+        _run_archive_job(job, WORKSHOP_ID)
+        assert job.status == "failed" and "already archived" in job.error
+
+    def test_failed_table_write_leaves_no_partial_file(self, tmp_path):
+        store = workshop_archive._LocalStore(str(tmp_path / WORKSHOP_ID))
+
+        with pytest.raises(RuntimeError), store.open_write("traces.parquet") as f:
+            f.write(b"partial")
+            raise RuntimeError("export failed")
+
+        assert os.listdir(tmp_path / WORKSHOP_ID) == []
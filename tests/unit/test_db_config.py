@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
@@ -175,6 +176,57 @@ class TestOAuthTokenManager:
         mgr._last_refresh = time.time() - 120
         assert mgr.needs_refresh is True
 
+    def test_refresh_notifies_listeners(self):
+        mgr = OAuthTokenManager(refresh_interval_seconds=60)
+        mock_client = MagicMock()
+        mock_client.config.oauth_token.return_value = MagicMock(access_token="tok123")
+        mgr._workspace_client = mock_client
+        seen = []
+        mgr.add_refresh_listener(seen.append)
+
+        mgr.get_token()
+
+        assert seen == ["tok123"]
+
+    def test_background_refresh_renews_before_expiry(self):
+        mgr = OAuthTokenManager(refresh_interval_seconds=60, refresh_lead_seconds=10)
+        mock_client = MagicMock()
+        tokens = iter(["tok_v1", "tok_v2", "tok_v3"])
+        mock_client.config.oauth_token.side_effect = lambda: MagicMock(access_token=next(tokens))
+        mgr._workspace_client = mock_client
+        refreshed = threading.Event()
+        mgr.add_refresh_listener(lambda token: token == "tok_v2" and refreshed.set())
+
+        mgr.start_background_refresh()
+        try:
+            assert mgr.get_token() == "tok_v1"
+            # Enter the lead window: the refresher renews without any caller asking
+            mgr._last_refresh = time.time() - 55
+            mgr._wake.set()
+            assert refreshed.wait(2)
+            assert mgr.get_token() == "tok_v2"
+        finally:
+            mgr.stop_background_refresh()
+
+        assert mgr.background_refresh_running is False
+
+    def test_get_token_never_fetches_inline_while_refresher_runs(self):
+        mgr = OAuthTokenManager(refresh_interval_seconds=60)
+        mock_client = MagicMock()
+        mock_client.config.oauth_token.return_value = MagicMock(access_token="tok123")
+        mgr._workspace_client = mock_client
+
+        mgr.start_background_refresh()
+        try:
+            # Past the interval, but the request path still gets the cached token
+            mgr._last_refresh = time.time() - 120
+            mock_client.config.oauth_token.side_effect = lambda: time.sleep(1) or MagicMock(access_token="slow")
+            start = time.perf_counter()
+            assert mgr.get_token() == "tok123"
+            assert time.perf_counter() - start < 0.5
+        finally:
+            mgr.stop_background_refresh()
+
 
 # ---------------------------------------------------------------------------
 # detect_database_backend
@@ -0,0 +1,110 @@
+"""Tests for the Prometheus metrics surface."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from server import metrics
+
+
+@pytest.mark.unit
+class TestExposition:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, route="/a")
+
+        lines = histogram.render()
+
+        assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'demo_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'demo_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'demo_seconds_count{route="/a"} 4' in lines
+        assert 'demo_seconds_sum{route="/a"} 6.05' in lines
+
+    def test_label_values_are_escaped(self):
+        counter = metrics.Counter("demo_total", "Demo.", ("op",))
+        counter.inc(op='say "hi"\n')
+
+        assert counter.render() == ['demo_total{op="say \\"hi\\"\\n"} 1']
+
+    def test_timed_records_outcome(self):
+        with pytest.raises(RuntimeError), metrics.timed("mlflow", "test_failing_op"):
+            raise RuntimeError("boom")
+        with metrics.timed("mlflow", "test_failing_op"):
+            pass
+
+        for outcome in ("error", "ok"):
+            count = metrics.external_call_duration.count(system="mlflow", operation="test_failing_op", outcome=outcome)
+            assert count == 1
+
+
+@pytest.mark.unit
+class TestEngineInstrumentation:
+    def test_queries_are_attributed_to_the_request_route(self):
+        engine = create_engine("sqlite:///:memory:")
+        metrics.instrument_engine(engine)
+        metrics.instrument_engine(engine)  # idempotent
+        route = "/test-metrics/{item_id}"
+
+        stats = metrics.start_request()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        metrics.finish_request(stats, "GET", route, 200, 0.01)
+        metrics._request_stats.set(None)
+
+        assert metrics.db_queries.value(route=route) == 2
+        assert metrics.db_query_duration.count(route=route) == 2
+        assert metrics.db_queries_per_request.count(route=route) == 1
+        assert metrics.db_pool_wait.count(route=route) == 1
+        assert metrics.http_request_duration.count(method="GET", route=route, status="200") == 1
+
+    def test_queries_outside_requests_count_as_background(self):
+        engine = create_engine("sqlite:///:memory:")
+        metrics.instrument_engine(engine)
+        before = metrics.db_queries.value(route=metrics.BACKGROUND_ROUTE)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert metrics.db_queries.value(route=metrics.BACKGROUND_ROUTE) == before + 1
+
+    def test_job_status_transitions_and_depth_are_tracked(self, monkeypatch, tmp_path):
+        from server.routers import workshops
+
+        monkeypatch.setattr(workshops, "JOB_DIR", str(tmp_path))
+        statuses = ("pending", "running", "failed")
+        before = {status: metrics.background_job_transitions.value(status=status) for status in statuses}
+        depth = {status: metrics.background_jobs.value(status=status) for status in statuses}
+
+        job = workshops.create_job("metrics-test-job", "ws-1")
+        job.set_status("running")
+        job.set_status("running")
+
+        assert metrics.background_job_transitions.value(status="pending") == before["pending"] + 1
+        assert metrics.background_job_transitions.value(status="running") == before["running"] + 1
+        assert metrics.background_jobs.value(status="pending") == depth["pending"]
+        assert metrics.background_jobs.value(status="running") == depth["running"] + 1
+
+        job.set_status("failed")
+
+        assert metrics.background_jobs.value(status="running") == depth["running"]
+        assert metrics.background_jobs.value(status="failed") == depth["failed"] + 1
+        assert "# TYPE background_jobs gauge" in metrics.render()
+
+
+@pytest.mark.spec("BUILD_AND_DEPLOY_SPEC")
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_latency(async_client):
+    await async_client.get("/health")
+
+    resp = await async_client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "# TYPE db_queries_total counter" in body
+    assert "# TYPE sqlite_write_queue_depth gauge" in body
+    assert "# TYPE llm_queue_depth gauge" in body
@@ -217,24 +217,86 @@ class TestPostgresManagerOperations:
         with pytest.raises(ValueError, match="not a recognised"):
             mgr.write_many("bad_table", [{"id": "1"}])
 
-    def test_write_many_executes_batch(self, monkeypatch):
-        """write_many() should use executemany for batch insert."""
-        mgr = self._make_manager(monkeypatch)
+    def _mock_cursor(self, mgr):
         mock_cursor = MagicMock()
         mock_conn = MagicMock()
         mock_conn.cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
         mock_conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
         mgr._pool.connection.return_value.__enter__ = MagicMock(return_value=mock_conn)
         mgr._pool.connection.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_conn, mock_cursor
+
+    def test_write_many_executes_batch(self, monkeypatch):
+        """write_many(use_copy=False) should use executemany for batch insert."""
+        mgr = self._make_manager(monkeypatch)
+        _, mock_cursor = self._mock_cursor(mgr)
 
         rows = [
             {"id": "u1", "email": "a@b.com"},
             {"id": "u2", "email": "c@d.com"},
         ]
-        count = mgr.write_many("users", rows)
+        count = mgr.write_many("users", rows, use_copy=False)
         assert count == 2
         mock_cursor.executemany.assert_called_once()
 
+    def test_write_many_copies_in_chunks(self, monkeypatch):
+        """write_many() should stream rows with COPY, one transaction per chunk."""
+        mgr = self._make_manager(monkeypatch)
+        mock_conn, mock_cursor = self._mock_cursor(mgr)
+        copy = mock_cursor.copy.return_value.__enter__.return_value
+
+        rows = [{"id": f"t{i}", "context": {"n": i}} for i in range(5)]
+        count = mgr.write_many("traces", rows, chunk_size=2)
+
+        assert count == 5
+        assert mock_cursor.copy.call_count == 3
+        assert mock_cursor.copy.call_args[0][0] == "COPY traces (id, context) FROM STDIN"
+        # JSON values are serialised for COPY text format
+        assert copy.write_row.call_args_list[0][0][0] == ["t0", '{"n": 0}']
+        assert mock_conn.commit.call_count == 3
+        mock_cursor.executemany.assert_not_called()
+
+    def test_upsert_many_merges_from_staging_table(self, monkeypatch):
+        """upsert_many() should COPY into a temp table and merge with ON CONFLICT."""
+        mgr = self._make_manager(monkeypatch)
+        _, mock_cursor = self._mock_cursor(mgr)
+        mock_cursor.rowcount = 2
+        copy = mock_cursor.copy.return_value.__enter__.return_value
+
+        rows = [
+            {"id": "u1", "email": "old@b.com"},
+            {"id": "u2", "email": "c@d.com"},
+            {"id": "u1", "email": "new@b.com"},
+        ]
+        assert mgr.upsert_many("users", rows, ["id"]) == 2
+
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert statements[0].startswith("CREATE TEMP TABLE _stage_users_")
+        assert "(LIKE users INCLUDING DEFAULTS) ON COMMIT DROP" in statements[0]
+        assert "ON CONFLICT (id) DO UPDATE SET email = EXCLUDED.email" in statements[1]
+        assert mock_cursor.copy.call_args[0][0].startswith("COPY _stage_users_")
+        # Duplicate keys collapse to the last occurrence
+        assert [c[0][0] for c in copy.write_row.call_args_list] == [["u1", "new@b.com"], ["u2", "c@d.com"]]
+
+    def test_upsert_many_only_conflict_columns_does_nothing(self, monkeypatch):
+        mgr = self._make_manager(monkeypatch)
+        _, mock_cursor = self._mock_cursor(mgr)
+        mock_cursor.rowcount = 1
+
+        mgr.upsert_many("workshop_participants", [{"id": "p1"}], ["id"])
+
+        assert mock_cursor.execute.call_args[0][0].endswith("ON CONFLICT (id) DO NOTHING")
+
+    def test_upsert_many_validates_arguments(self, monkeypatch):
+        mgr = self._make_manager(monkeypatch)
+        with pytest.raises(ValueError, match="not a recognised"):
+            mgr.upsert_many("bad_table", [{"id": "1"}], ["id"])
+        with pytest.raises(ValueError, match="non-empty list"):
+            mgr.upsert_many("users", [{"id": "1"}], [])
+        with pytest.raises(ValueError, match="not present"):
+            mgr.upsert_many("users", [{"email": "a@b.com"}], ["id"])
+        assert mgr.upsert_many("users", [], ["id"]) == 0
+
     def test_upsert_validates_table(self, monkeypatch):
         mgr = self._make_manager(monkeypatch)
         with pytest.raises(ValueError, match="not a recognised"):
@@ -483,7 +545,7 @@ class TestEnsurePool:
 
             PostgresManager._instance = None
 
-    def test_ensure_pool_recreates_on_token_refresh(self, monkeypatch):
+    def test_ensure_pool_reused_across_token_refresh(self, monkeypatch):
         from server.postgres_manager import PostgresManager
 
         PostgresManager._instance = None
@@ -499,15 +561,19 @@ class TestEnsurePool:
             mock_tm.return_value = mock_tm_inst
 
             mgr = PostgresManager()
-            old_pool = MagicMock()
-            mgr._pool = old_pool
+            mgr._pool = None
+            listener = mock_tm_inst.add_refresh_listener.call_args.args[0]
 
             with patch("psycopg_pool.ConnectionPool") as mock_pool_cls:
                 mock_pool_cls.return_value = MagicMock()
                 pool = mgr._ensure_pool()
-                # Old pool should be closed
-                old_pool.close.assert_called_once()
-                # New pool should be created
+                assert mock_pool_cls.call_args.kwargs["kwargs"]["password"] == "tok"
+
+                # A refresh swaps the password for new connections without a rebuild
+                listener("tok_v2")
+                assert mgr._ensure_pool() is pool
                 mock_pool_cls.assert_called_once()
+                pool.close.assert_not_called()
+                assert mock_pool_cls.call_args.kwargs["kwargs"]["password"] == "tok_v2"
 
             PostgresManager._instance = None
@@ -0,0 +1,183 @@
+"""Tests for cross-process shared state."""
+
+import multiprocessing
+import os
+import shutil
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+
+from server import shared_state
+from server.services.token_storage_service import TokenStorageService
+from server.shared_state import MemoryStore, SQLiteStore
+from server.utils.encryption import EncryptionManager
+
+
+def _store_token_in_child(path, key):
+    TokenStorageService(SQLiteStore(path), encryption=EncryptionManager(key)).store_token("ws-1", "child-token")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "state.db"))
+
+
+@pytest.mark.unit
+class TestStores:
+    def test_roundtrip_and_delete(self, store):
+        store.set("ns", "k", {"ids": ["a", "b"]})
+
+        assert store.get("ns", "k") == {"ids": ["a", "b"]}
+        assert store.get("other", "k") is None
+        assert store.delete("ns", "k") is True
+        assert store.delete("ns", "k") is False
+        assert store.get("ns", "k") is None
+
+    def test_ttl_expiry_and_purge(self, store):
+        store.set("ns", "old", 1, ttl=-1)
+        store.set("ns", "new", 2, ttl=60)
+        store.set("ns", "forever", 3)
+
+        assert store.purge_expired("ns") == 1
+        assert store.get("ns", "new") == 2
+        with patch("server.shared_state.time.time", return_value=float("inf")):
+            assert store.get("ns", "new") is None
+            assert store.get("ns", "forever") == 3
+
+    def test_delete_prefix_treats_wildcards_literally(self, store):
+        for key in ("ws_1|eval|e", "ws_1|align|e", "wsX1|eval|e", "ws_2|eval|e"):
+            store.set("ns", key, True)
+
+        assert store.delete_prefix("ns", "ws_1|") == 2
+        assert store.get("ns", "wsX1|eval|e") is True
+        assert store.get("ns", "ws_2|eval|e") is True
+
+    def test_sqlite_errors_are_misses(self, tmp_path, caplog):
+        store = SQLiteStore(str(tmp_path / "state.db"))
+        store.set("ns", "k", 1)
+
+        locked = sqlite3.OperationalError("database is locked")
+        with patch.object(SQLiteStore, "_connect", side_effect=locked):
+            assert store.get("ns", "k") is None
+            assert store.set("ns", "k", 2) is None
+            assert store.delete("ns", "k") is False
+            assert store.delete_prefix("ns", "k") == 0
+            assert store.purge_expired("ns") == 0
+        assert "database is locked" in caplog.text
+        assert store.get("ns", "k") == 1
+
+    def test_store_reconnects_after_its_directory_is_replaced(self, tmp_path):
+        directory = tmp_path / "state"
+        store = SQLiteStore(str(directory / "state.db"))
+        shutil.rmtree(directory)
+        directory.write_text("")
+        store._local.conn = None
+
+        assert store.get("ns", "k") is None
+        store.set("ns", "k", 1)
+
+        directory.unlink()
+        store.set("ns", "k", 2)
+        assert store.get("ns", "k") == 2
+
+@pytest.mark.unit
+class TestSharing:
+    def test_sqlite_entries_are_visible_to_other_processes(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        key = Fernet.generate_key().decode()
+        SQLiteStore(path)  # create the file before forking
+        ctx = multiprocessing.get_context("spawn")
+        child = ctx.Process(target=_store_token_in_child, args=(path, key))
+        child.start()
+        child.join(timeout=60)
+
+        assert child.exitcode == 0
+        assert TokenStorageService(SQLiteStore(path), encryption=EncryptionManager(key)).get_token("ws-1") == (
+            "child-token"
+        )
+
+    def test_global_token_storage_uses_the_shared_store(self, shared_state_store, monkeypatch):
+        from server.services.token_storage_service import token_storage
+
+        monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+        token_storage.store_token("ws-shared", "tok")
+
+        assert TokenStorageService(shared_state_store).get_token("ws-shared") == "tok"
+        assert token_storage.get_token_info("ws-shared")["is_expired"] is False
+
+    def test_unavailable_backend_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        shared_state.set_store(None)
+        with patch.dict(shared_state._backends, {"sqlite": lambda: SQLiteStore(str(blocker / "state.db"))}):
+            assert isinstance(shared_state.get_store(), MemoryStore)
+
+
+@pytest.mark.unit
+class TestTokenSecurity:
+    def test_tokens_are_encrypted_at_rest(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        TokenStorageService(SQLiteStore(path)).store_token("ws-1", "dapi-secret")
+
+        with sqlite3.connect(path) as conn:
+            (raw,) = conn.execute("SELECT value FROM shared_state").fetchone()
+        assert "dapi-secret" not in raw
+        assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+    def test_token_written_under_another_key_is_a_miss(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / "state.db"))
+        TokenStorageService(store, encryption=EncryptionManager()).store_token("ws-1", "tok")
+
+        assert TokenStorageService(store, encryption=EncryptionManager()).get_token("ws-1") is None
+        assert store.get("databricks_tokens", "ws-1") is None
+
+    def test_shared_reads_are_cached_in_process(self, tmp_path):
+        cipher = EncryptionManager()
+        service = TokenStorageService(SQLiteStore(str(tmp_path / "state.db")), encryption=cipher)
+        service.store_token("ws-1", "tok")
+
+        with patch.object(cipher, "decrypt", wraps=cipher.decrypt) as decrypt:
+            assert service.get_token("ws-1") == "tok"
+            assert service.get_token("ws-1") == "tok"
+        decrypt.assert_not_called()
+
+        service.remove_token("ws-1")
+        assert service.get_token("ws-1") is None
+
+    def test_private_memory_store_is_not_encrypted(self):
+        cipher = EncryptionManager()
+        store = MemoryStore()
+        service = TokenStorageService(store, encryption=cipher)
+
+        with patch.object(cipher, "encrypt") as encrypt, patch.object(cipher, "decrypt") as decrypt:
+            service.store_token("ws-1", "tok")
+            assert service.get_token("ws-1") == "tok"
+        encrypt.assert_not_called()
+        decrypt.assert_not_called()
+        assert store.get("databricks_tokens", "ws-1")["token"] == "tok"
+
+    def test_global_token_storage_is_process_local_without_a_key(self, shared_state_store, monkeypatch):
+        from server.services.token_storage_service import token_storage
+
+        monkeypatch.delenv("ENCRYPTION_KEY", raising=False)
+        token_storage.store_token("ws-local", "tok")
+
+        assert token_storage.get_token("ws-local") == "tok"
+        assert shared_state_store.get("databricks_tokens", "ws-local") is None
+        token_storage.remove_token("ws-local")
+
+    def test_existing_file_is_made_private_and_symlinks_are_refused(self, tmp_path):
+        path = tmp_path / "state.db"
+        path.write_bytes(b"")
+        path.chmod(0o644)
+        SQLiteStore(str(path))
+        assert oct(path.stat().st_mode & 0o777) == "0o600"
+
+        link = tmp_path / "link.db"
+        link.symlink_to(path)
+        with pytest.raises(OSError):
+            SQLiteStore(str(link))
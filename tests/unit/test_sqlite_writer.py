@@ -0,0 +1,143 @@
+"""Tests for server.sqlite_writer — the SQLite single-writer commit queue."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, WorkshopDB
+from server.sqlite_writer import SQLiteWriteQueue, get_write_queue
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _add_workshop(workshop_id):
+    def work(session):
+        session.add(WorkshopDB(id=workshop_id, name=workshop_id, facilitator_id="fac"))
+        return workshop_id
+
+    return work
+
+
+def _stored_ids(engine):
+    session = sessionmaker(bind=engine)()
+    try:
+        return {w.id for w in session.query(WorkshopDB).all()}
+    finally:
+        session.close()
+
+
+class TestGetWriteQueue:
+    def test_file_backed_sqlite_gets_a_shared_queue(self, engine):
+        assert isinstance(get_write_queue(engine), SQLiteWriteQueue)
+        assert get_write_queue(engine) is get_write_queue(engine)
+
+    def test_accepts_connection_bind(self, engine):
+        with engine.connect() as conn:
+            assert get_write_queue(conn) is get_write_queue(engine)
+
+    def test_in_memory_sqlite_has_no_queue(self):
+        assert get_write_queue(create_engine("sqlite:///:memory:")) is None
+
+    def test_disabled_by_env(self, engine, monkeypatch):
+        monkeypatch.setattr("server.sqlite_writer.SQLITE_WRITE_QUEUE_ENABLED", False)
+        assert get_write_queue(engine) is None
+
+
+class TestSQLiteWriteQueue:
+    def test_submit_returns_result_and_commits(self, engine):
+        queue = SQLiteWriteQueue(engine)
+
+        assert queue.submit(_add_workshop("w1")) == "w1"
+        assert _stored_ids(engine) == {"w1"}
+
+    def test_concurrent_submits_are_group_committed(self, engine):
+        queue = SQLiteWriteQueue(engine, batch_wait_seconds=0.05)
+        ids = [f"w{i}" for i in range(50)]
+
+        with ThreadPoolExecutor(max_workers=50) as executor:
+            results = list(executor.map(lambda wid: queue.submit(_add_workshop(wid)), ids))
+
+        assert results == ids
+        assert _stored_ids(engine) == set(ids)
+        assert queue.units_committed == 50
+        assert queue.commits < 50
+
+    def test_failing_unit_does_not_affect_batch_neighbours(self, engine):
+        queue = SQLiteWriteQueue(engine, batch_wait_seconds=0.2)
+        release = threading.Event()
+
+        def blocker(session):
+            # Hold the writer so the next submissions land in one batch
+            release.wait(2)
+            return "blocker"
+
+        def broken(session):
+            session.add(WorkshopDB(id="bad", name="bad", facilitator_id="fac"))
+            raise ValueError("invalid submission")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(queue.submit, blocker)
+            futures = [
+                executor.submit(queue.submit, _add_workshop("w1")),
+                executor.submit(queue.submit, broken),
+                executor.submit(queue.submit, _add_workshop("w2")),
+            ]
+            release.set()
+            assert first.result() == "blocker"
+            assert futures[0].result() == "w1"
+            with pytest.raises(ValueError, match="invalid submission"):
+                futures[1].result()
+            assert futures[2].result() == "w2"
+
+        assert _stored_ids(engine) == {"w1", "w2"}
+
+    def test_integrity_error_surfaces_to_submitter(self, engine):
+        from sqlalchemy.exc import IntegrityError
+
+        queue = SQLiteWriteQueue(engine)
+        queue.submit(_add_workshop("w1"))
+
+        with pytest.raises(IntegrityError):
+            queue.submit(_add_workshop("w1"))
+        assert queue.submit(_add_workshop("w2")) == "w2"
+
+    def test_lock_held_outside_the_queue_is_retried(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'locked.db'}", connect_args={"timeout": 0.05})
+        Base.metadata.create_all(engine)
+        holder = engine.raw_connection()
+        holder.execute("BEGIN IMMEDIATE")
+        threading.Timer(0.3, holder.commit).start()
+        try:
+            assert SQLiteWriteQueue(engine).submit(_add_workshop("w1"), timeout=10) == "w1"
+        finally:
+            holder.close()
+            engine.dispose()
+
+
+class TestDatabaseServiceWriteQueue:
+    def test_session_with_uncommitted_writes_bypasses_the_queue(self, engine):
+        from server.services.database_service import DatabaseService
+
+        session = sessionmaker(bind=engine)()
+        try:
+            service = DatabaseService(session)
+            assert service._write_queue() is get_write_queue(engine)
+
+            session.add(WorkshopDB(id="w1", name="w1", facilitator_id="fac"))
+            session.flush()
+            assert service._write_queue() is None
+            session.commit()
+            assert service._write_queue() is get_write_queue(engine)
+        finally:
+            session.close()
@@ -0,0 +1,50 @@
+"""Tests for auth.yaml loading.
+
+Spec: AUTHENTICATION_SPEC
+Covers:
+- The parsed config is cached and the file is only re-parsed when its mtime changes
+- Facilitator lookup is case-insensitive
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from server.utils import config as config_utils
+
+
+def _write(path, email, password):
+    path.write_text(f"facilitators:\n  - email: {email}\n    password: {password}\n    name: Fac\n")
+
+
+@pytest.mark.spec("AUTHENTICATION_SPEC")
+@pytest.mark.unit
+class TestAuthConfigCache:
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        path = tmp_path / "auth.yaml"
+        _write(path, "fac@example.com", "pw1")
+
+        with patch.object(config_utils.yaml, "safe_load", wraps=config_utils.yaml.safe_load) as mock_load:
+            for _ in range(5):
+                config_utils.load_auth_config(str(path))
+
+        assert mock_load.call_count == 1
+
+    def test_reloads_when_mtime_changes(self, tmp_path):
+        path = tmp_path / "auth.yaml"
+        _write(path, "fac@example.com", "pw1")
+        assert config_utils.get_facilitator_config("fac@example.com", str(path))["password"] == "pw1"
+
+        _write(path, "fac@example.com", "pw2")
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        assert config_utils.get_facilitator_config("fac@example.com", str(path))["password"] == "pw2"
+
+    def test_facilitator_lookup_is_case_insensitive(self, tmp_path):
+        path = tmp_path / "auth.yaml"
+        _write(path, "Fac@Example.com", "pw1")
+
+        assert config_utils.get_facilitator_config("FAC@example.COM", str(path)) is not None
+        assert config_utils.get_facilitator_config("other@example.com", str(path)) is None
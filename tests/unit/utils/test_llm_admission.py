@@ -0,0 +1,122 @@
+"""Tests for per-endpoint LLM admission control."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from server.utils import llm_admission
+from server.utils.llm_admission import BATCH, INTERACTIVE, AdmissionTimeout, EndpointGate
+
+
+def _hold(gate, priority, started, release, order=None):
+    def run():
+        with gate.admit(priority, timeout=5):
+            if order is not None:
+                order.append(priority)
+            started.release()
+            release.wait(5)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+@pytest.mark.unit
+class TestEndpointGate:
+    def test_limits_concurrency_and_times_out(self):
+        gate = EndpointGate("ep", max_concurrency=1)
+        started, release = threading.Semaphore(0), threading.Event()
+        holder = _hold(gate, INTERACTIVE, started, release)
+        started.acquire(timeout=2)
+
+        with pytest.raises(AdmissionTimeout), gate.admit(INTERACTIVE, timeout=0.05):
+            pass
+
+        release.set()
+        holder.join(2)
+        snap = gate.snapshot()
+        assert snap["in_flight"] == 0
+        assert snap["admitted_total"][INTERACTIVE] == 1
+        assert snap["timeouts_total"][INTERACTIVE] == 1
+
+    def test_batch_cannot_use_interactive_reserve(self):
+        gate = EndpointGate("ep", max_concurrency=2, interactive_reserve=1)
+        started, release = threading.Semaphore(0), threading.Event()
+        holder = _hold(gate, BATCH, started, release)
+        started.acquire(timeout=2)
+
+        with pytest.raises(AdmissionTimeout), gate.admit(BATCH, timeout=0.05):
+            pass
+        with gate.admit(INTERACTIVE, timeout=0.05):
+            pass
+
+        release.set()
+        holder.join(2)
+
+    def test_interactive_waiters_go_before_batch(self):
+        gate = EndpointGate("ep", max_concurrency=1)
+        started, release = threading.Semaphore(0), threading.Event()
+        order = []
+        holder = _hold(gate, INTERACTIVE, started, release)
+        started.acquire(timeout=2)
+
+        batch = _hold(gate, BATCH, started, release, order)
+        _wait_for(lambda: gate.snapshot()["queued"][BATCH] == 1)
+        interactive = _hold(gate, INTERACTIVE, started, release, order)
+        _wait_for(lambda: gate.snapshot()["queued"][INTERACTIVE] == 1)
+
+        release.set()
+        for thread in (holder, batch, interactive):
+            thread.join(2)
+        assert order == [INTERACTIVE, BATCH]
+
+    def test_rate_limit_applies(self):
+        gate = EndpointGate("ep", max_concurrency=4, rate=1, burst=1)
+
+        with gate.admit(INTERACTIVE, timeout=0.05):
+            pass
+        with pytest.raises(AdmissionTimeout), gate.admit(INTERACTIVE, timeout=0.05):
+            pass
+        assert gate.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.unit
+class TestPriorityAndWiring:
+    def test_mark_batch_thread_only_affects_that_thread(self):
+        seen = []
+
+        def worker():
+            llm_admission.mark_batch_thread()
+            seen.append(llm_admission.current_priority())
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen == [BATCH]
+        assert llm_admission.current_priority() == INTERACTIVE
+
+    def test_databricks_service_maps_saturation_to_503(self, monkeypatch):
+        from server.services.databricks_service import DatabricksService
+
+        monkeypatch.setattr(llm_admission, "_gates", {"ep-503": EndpointGate("ep-503", max_concurrency=1)})
+        monkeypatch.setattr(llm_admission, "LLM_ADMISSION_TIMEOUT_SECONDS", 0.05)
+        service = DatabricksService.__new__(DatabricksService)
+        service.client = MagicMock()
+
+        with llm_admission.get_gate("ep-503").admit(), pytest.raises(HTTPException) as exc_info:
+            service.call_chat_completion("ep-503", [{"role": "user", "content": "hi"}])
+
+        assert exc_info.value.status_code == 503
+        service.client.chat.completions.create.assert_not_called()
+        assert llm_admission.snapshot()["ep-503"]["timeouts_total"][INTERACTIVE] == 1
@@ -0,0 +1,121 @@
+"""Tests for transparent trace payload compression."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from server.database import Base, TraceDB
+from server.utils import payload_compression
+from server.utils.payload_compression import is_compressed, rewrite_trace_payloads
+
+BIG_TEXT = "The quick brown fox jumps over the lazy dog. " * 200
+BIG_CONTEXT = {"spans": [{"name": f"span-{i}", "inputs": {"q": "hello"}, "outputs": "world"} for i in range(100)]}
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _stored(session, trace_id):
+    return session.execute(text("SELECT input, output, context FROM traces WHERE id = :id"), {"id": trace_id}).one()
+
+
+@pytest.mark.unit
+class TestCompressedTraceColumns:
+    def test_large_payloads_are_stored_compressed_and_read_back(self, session):
+        session.add(TraceDB(id="t1", workshop_id="ws-1", input=BIG_TEXT, output="short", context=BIG_CONTEXT))
+        session.commit()
+
+        stored = _stored(session, "t1")
+        assert is_compressed(stored.input) and len(stored.input) < len(BIG_TEXT) / 5
+        assert stored.output == "short"
+        assert is_compressed(json.loads(stored.context))
+
+        session.expire_all()
+        trace = session.get(TraceDB, "t1")
+        assert (trace.input, trace.output, trace.context) == (BIG_TEXT, "short", BIG_CONTEXT)
+
+    def test_decompression_happens_only_on_access(self, session):
+        session.add(TraceDB(id="t1", workshop_id="ws-1", input=BIG_TEXT, output=BIG_TEXT))
+        session.commit()
+        session.expire_all()
+
+        with patch.object(payload_compression, "decompress_text", wraps=payload_compression.decompress_text) as spy:
+            trace = session.get(TraceDB, "t1")
+            assert spy.call_count == 0
+            assert trace.input == BIG_TEXT
+            assert trace.input == BIG_TEXT
+            assert spy.call_count == 1
+
+    def test_updates_replace_the_cached_value(self, session):
+        session.add(TraceDB(id="t1", workshop_id="ws-1", input=BIG_TEXT, output="a"))
+        session.commit()
+        trace = session.get(TraceDB, "t1")
+        assert trace.input == BIG_TEXT
+
+        trace.input = "now short"
+        session.commit()
+        session.expire_all()
+
+        assert session.get(TraceDB, "t1").input == "now short"
+        assert _stored(session, "t1").input == "now short"
+
+    def test_values_that_look_compressed_roundtrip(self, session):
+        lookalike = payload_compression.MARKER + "not really"
+        session.add(TraceDB(id="t1", workshop_id="ws-1", input=lookalike, output="a", context=lookalike))
+        session.commit()
+        session.expire_all()
+
+        trace = session.get(TraceDB, "t1")
+        assert (trace.input, trace.context) == (lookalike, lookalike)
+
+    def test_disabled_compression_stores_plain_values(self, session):
+        with patch.object(payload_compression, "TRACE_PAYLOAD_COMPRESSION", "none"):
+            session.add(TraceDB(id="t1", workshop_id="ws-1", input=BIG_TEXT, output="a", context=BIG_CONTEXT))
+            session.commit()
+
+        assert _stored(session, "t1").input == BIG_TEXT
+
+
+@pytest.mark.unit
+def test_rewrite_compresses_existing_rows_and_reverts(session):
+    with patch.object(payload_compression, "TRACE_PAYLOAD_COMPRESSION", "none"):
+        for i in range(5):
+            session.add(TraceDB(id=f"t{i}", workshop_id="ws-1", input=BIG_TEXT, output="a", context=BIG_CONTEXT))
+        session.add(TraceDB(id="small", workshop_id="ws-1", input="q", output="a"))
+        session.commit()
+
+    connection = session.connection()
+    assert rewrite_trace_payloads(connection, batch_size=2) == 5
+    assert rewrite_trace_payloads(connection, batch_size=2) == 0  # idempotent
+    assert is_compressed(_stored(session, "t3").input)
+
+    session.expire_all()
+    assert session.get(TraceDB, "t3").context == BIG_CONTEXT
+
+    assert rewrite_trace_payloads(connection, compress=False) == 5
+    assert _stored(session, "t3").input == BIG_TEXT
+    assert json.loads(_stored(session, "t3").context) == BIG_CONTEXT
+
+
+@pytest.mark.unit
+def test_rewrite_compresses_existing_values_that_look_compressed(session):
+    lookalike = payload_compression.MARKER + "written before compression existed"
+    session.execute(
+        text("INSERT INTO traces (id, workshop_id, input, output) VALUES ('t1', 'ws-1', :input, 'a')"),
+        {"input": lookalike},
+    )
+
+    assert rewrite_trace_payloads(session.connection()) == 1
+    assert _stored(session, "t1").input != lookalike
+
+    session.expire_all()
+    assert session.get(TraceDB, "t1").input == lookalike
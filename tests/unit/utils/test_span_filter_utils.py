@@ -1,10 +1,16 @@
 """Tests for span filter utilities."""
 
 import json
+from unittest.mock import patch
 
 import pytest
 
-from server.utils.span_filter_utils import apply_span_filter, find_matching_span
+from server.utils.span_filter_utils import (
+    apply_span_filter,
+    build_span_index,
+    find_matching_span,
+    normalize_context,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -369,3 +375,92 @@ class TestSpansStoredAsString:
         inputs, outputs = apply_span_filter(context, {"span_name": "X"})
         assert inputs is None
         assert outputs is None
+
+
+# ---------------------------------------------------------------------------
+# Span index built at ingest
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.spec("TRACE_DISPLAY_SPEC")
+class TestSpanIndex:
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_normalize_parses_string_spans_without_changing_them(self):
+        context = normalize_context({"spans": json.dumps(RAW_MLFLOW_SPANS_JSON_ENCODED), "tags": {"a": "b"}})
+
+        assert context["spans"] == RAW_MLFLOW_SPANS_JSON_ENCODED
+        assert build_span_index(context)["type"] == {"CHAIN": [0], "CHAT_MODEL": [1]}
+        assert context["tags"] == {"a": "b"}
+        assert normalize_context({"spans": "not a list"}) == {"spans": "not a list"}
+
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_indexed_lookup_matches_scan(self):
+        spans = [*SAMPLE_SPANS, dict(SAMPLE_SPANS[1], name="SecondChat")]
+        index = build_span_index({"spans": spans})
+        filters = [
+            {"span_name": "AzureChatOpenAI"},
+            {"span_type": "CHAT_MODEL"},
+            {"attribute_key": "model", "attribute_value": "gpt-4"},
+            {"attribute_key": "provider"},
+            {"span_type": "CHAT_MODEL", "span_name": "SecondChat"},
+            {"span_type": "CHAIN", "attribute_key": "model"},
+            {"span_name": "Missing"},
+        ]
+
+        for filter_config in filters:
+            assert find_matching_span(spans, filter_config, index) is find_matching_span(spans, filter_config)
+
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_attribute_values_are_indexed_by_short_hash(self):
+        long_value = "x" * 100_000
+        spans = [{"name": "A", "attributes": {"prompt": long_value}}, {"name": "B", "attributes": {"prompt": "short"}}]
+        index = build_span_index({"spans": spans})
+
+        assert len(json.dumps(index)) < 500
+        assert find_matching_span(spans, {"attribute_key": "prompt", "attribute_value": long_value}, index) is spans[0]
+        assert find_matching_span(spans, {"attribute_key": "prompt", "attribute_value": "short"}, index) is spans[1]
+
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_only_candidate_spans_are_checked(self):
+        spans = [{"name": f"span-{i}", "span_type": "CHAIN", "attributes": {}} for i in range(1000)]
+        index = build_span_index({"spans": spans})
+
+        with patch("server.utils.span_filter_utils._span_matches", return_value=True) as matches:
+            assert find_matching_span(spans, {"span_name": "span-999"}, index) is spans[999]
+        assert matches.call_count == 1
+
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_stale_index_falls_back_to_scan(self):
+        index = build_span_index({"spans": SAMPLE_SPANS[:1]})
+
+        assert find_matching_span(SAMPLE_SPANS, {"span_name": "Retriever"}, index) is SAMPLE_SPANS[2]
+
+    @pytest.mark.req("Filter criteria are AND-combined and first matching span wins")
+    def test_add_traces_stores_normalized_spans_and_index(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from server.database import Base, WorkshopDB
+        from server.models import TraceUpload
+        from server.services.database_service import DatabaseService
+
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add(WorkshopDB(id="ws-1", name="Workshop", facilitator_id="fac-1"))
+        session.commit()
+
+        upload = TraceUpload(input="q", output="a", context={"spans": json.dumps(RAW_MLFLOW_SPANS_PLAIN)})
+        service = DatabaseService(session)
+        service.add_traces("ws-1", [upload])
+        [trace] = service.get_traces("ws-1", with_span_index=True)
+        [unindexed] = service.get_traces("ws-1")
+        session.close()
+
+        assert unindexed.span_index is None
+        assert isinstance(trace.context["spans"], list)
+        assert trace.span_index["type"] == {"CHAIN": [0], "CHAT_MODEL": [1]}
+        assert "span_index" not in trace.model_dump()
+        assert apply_span_filter(trace.context, {"span_type": "CHAT_MODEL"}, trace.span_index) == apply_span_filter(
+            {"spans": RAW_MLFLOW_SPANS_PLAIN}, {"span_type": "CHAT_MODEL"}
+        )
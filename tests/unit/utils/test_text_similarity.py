@@ -0,0 +1,43 @@
+"""Tests for the incremental TF-IDF index in text_similarity."""
+
+import pytest
+
+from server.utils.text_similarity import TfidfIndex, tokenize
+
+
+@pytest.mark.unit
+class TestTokenize:
+    def test_drops_stopwords_and_plurals(self):
+        assert tokenize("The responses are NOT citing sources") == ["response", "citing", "source"]
+
+    def test_handles_empty_text(self):
+        assert tokenize(None) == []
+        assert tokenize("") == []
+
+
+@pytest.mark.unit
+class TestTfidfIndex:
+    def test_similar_documents_rank_first(self):
+        index = TfidfIndex()
+        index.add("a", "The answer hallucinates a citation")
+        index.add("b", "Hallucinated citation in the answer")
+        index.add("c", "Formatting of the table is clean")
+
+        ranked = index.most_similar("a")
+
+        assert ranked[0][0] == "b"
+        assert all(doc_id != "c" for doc_id, _ in ranked)
+
+    def test_add_is_idempotent_and_remove_updates_weights(self):
+        index = TfidfIndex()
+        index.add("a", "tone is polite")
+        index.add("a", "something else entirely")
+        index.add("b", "tone is rude")
+
+        assert len(index) == 2
+        assert index.similarity("a", "b") > 0
+
+        index.remove("b")
+
+        assert "b" not in index
+        assert index.idf("rude") == index.idf("never-seen")